@@ -18,12 +18,18 @@ use.
 from __future__ import print_function
 
 import codecs
+import collections
 import os
 import sys
 import contextlib
 import itertools
+import multiprocessing
+import warnings
+import zlib
 
+from Bio import BiopythonWarning
 from Bio._py3k import basestring
+from Bio._utils import _get_pool
 
 try:
     from collections import UserDict as _dict_base
@@ -238,7 +244,7 @@ class _IndexedSeqFileProxy(object):
     objects, and in Bio.SearchIO for indexing QueryResult objects.
 
     Subclasses for each file format should define '__iter__', 'get'
-    and optionally 'get_raw' methods.
+    and optionally 'iter_from' and 'get_raw' methods.
     """
 
     def __iter__(self):
@@ -249,6 +255,19 @@ class _IndexedSeqFileProxy(object):
         """
         raise NotImplementedError("Subclass should implement this")
 
+    def iter_from(self, offset):
+        """Return (identifier, offset, length) tuples from the given offset.
+
+        The offset should be the start of a record, as given by iterating
+        over the proxy. This is used to index records appended to a file.
+        By default the whole file is scanned and the earlier records are
+        skipped, subclasses should override this if the scan can start at
+        the offset.
+        """
+        for values in self:
+            if values[1] >= offset:
+                yield values
+
     def get(self, offset):
         """Return parsed object for this entry."""
         # Most file formats with self contained records can be handled by
@@ -266,6 +285,41 @@ class _IndexedSeqFileProxy(object):
         raise NotImplementedError("Not available for this file format.")
 
 
+class _RecordCache(object):
+    """Bounded cache of parsed records, discarding the least recently used (PRIVATE)."""
+
+    def __init__(self, size):
+        """Initialize the class to hold up to size records."""
+        self.size = size
+        self._records = collections.OrderedDict()
+
+    def __len__(self):
+        """Return the number of cached records."""
+        return len(self._records)
+
+    def get(self, key):
+        """Return the cached record for key (marking it as recently used), or None."""
+        records = self._records
+        try:
+            record = records.pop(key)
+        except KeyError:
+            return None
+        records[key] = record
+        return record
+
+    def add(self, key, record):
+        """Cache a record, discarding the least recently used if full."""
+        records = self._records
+        records.pop(key, None)
+        records[key] = record
+        if len(records) > self.size:
+            records.popitem(last=False)
+
+    def clear(self):
+        """Discard all the cached records."""
+        self._records.clear()
+
+
 class _IndexedSeqFileDict(_dict_base):
     """Read only dictionary interface to a sequential record file.
 
@@ -289,16 +343,22 @@ class _IndexedSeqFileDict(_dict_base):
 
     Note that this dictionary is essentially read only. You cannot
     add or change values, pop values, nor clear the dictionary.
+
+    With a positive cache_size, up to that many parsed records are kept
+    in memory, discarding the least recently used, so that looking up the
+    same keys again does not parse the records again. Note the same
+    object is then returned each time, so should not be modified.
     """
 
     def __init__(self, random_access_proxy, key_function,
-                 repr, obj_repr):
+                 repr, obj_repr, cache_size=0):
         """Initialize the class."""
         # Use key_function=None for default value
         self._proxy = random_access_proxy
         self._key_function = key_function
         self._repr = repr
         self._obj_repr = obj_repr
+        self._cache = _RecordCache(cache_size) if cache_size else None
         if key_function:
             offset_iter = (
                 (key_function(k), o, l) for (k, o, l) in random_access_proxy)
@@ -390,6 +450,11 @@ class _IndexedSeqFileDict(_dict_base):
 
     def __getitem__(self, key):
         """Return record for the specified key."""
+        cache = self._cache
+        if cache is not None:
+            record = cache.get(key)
+            if record is not None:
+                return record
         # Pass the offset to the proxy
         record = self._proxy.get(self._offsets[key])
         if self._key_function:
@@ -398,8 +463,46 @@ class _IndexedSeqFileDict(_dict_base):
             key2 = record.id
         if key != key2:
             raise ValueError("Key did not match (%s vs %s)" % (key, key2))
+        if cache is not None:
+            cache.add(key, record)
         return record
 
+    def get_many(self, keys):
+        """Return a list of the records for the specified keys.
+
+        The records are read in the order they are in the file, rather than
+        the order of the keys, which reduces the time spent seeking in
+        large files. If any key is not found, a KeyError exception is raised.
+        """
+        keys = list(keys)
+        records = [None] * len(keys)
+        cache = self._cache
+        offsets = self._offsets
+        todo = []
+        for i, key in enumerate(keys):
+            if cache is not None:
+                record = cache.get(key)
+                if record is not None:
+                    records[i] = record
+                    continue
+            todo.append((offsets[key], i))
+        todo.sort()
+        get = self._proxy.get
+        key_function = self._key_function
+        for offset, i in todo:
+            key = keys[i]
+            record = get(offset)
+            if key_function:
+                key2 = key_function(record.id)
+            else:
+                key2 = record.id
+            if key != key2:
+                raise ValueError("Key did not match (%s vs %s)" % (key, key2))
+            if cache is not None:
+                cache.add(key, record)
+            records[i] = record
+        return records
+
     def get(self, k, d=None):
         """Return the value in the dictionary.
 
@@ -419,6 +522,21 @@ class _IndexedSeqFileDict(_dict_base):
         # Pass the offset to the proxy
         return self._proxy.get_raw(self._offsets[key])
 
+    def get_raw_many(self, keys):
+        """Return a list of the raw records for the specified keys.
+
+        As with get_many, the records are read in the order they are in the
+        file. If any key is not found, a KeyError exception is raised.
+        """
+        keys = list(keys)
+        offsets = self._offsets
+        todo = sorted((offsets[key], i) for i, key in enumerate(keys))
+        raws = [None] * len(keys)
+        get_raw = self._proxy.get_raw
+        for offset, i in todo:
+            raws[i] = get_raw(offset)
+        return raws
+
     def __setitem__(self, key, value):
         """Would allow setting or replacing records, but not implemented.
 
@@ -488,6 +606,70 @@ class _IndexedSeqFileDict(_dict_base):
         self._proxy._handle.close()
 
 
+def _file_stats(filename):
+    """Return the size and modified time of a file (PRIVATE)."""
+    stats = os.stat(filename)
+    return stats.st_size, stats.st_mtime
+
+
+def _file_checksum(filename, size, block=65536):
+    """Return a CRC32 checksum of the start and end of a file (PRIVATE).
+
+    Only the first and last block of the first size bytes of the file are
+    read, so this is quick even for huge files, and if data was appended
+    to the file the checksum for the original size is unchanged.
+    """
+    with open(filename, "rb") as handle:
+        crc = zlib.crc32(handle.read(min(size, block)))
+        if size > block:
+            start = max(block, size - block)
+            handle.seek(start)
+            crc = zlib.crc32(handle.read(size - start), crc)
+    return "%08x" % (crc & 0xffffffff)
+
+
+def _scan_offsets(random_access_proxy, file_number, key_function=None,
+                  offset=0):
+    """Iterate over the (key, file_number, offset, length) of records (PRIVATE)."""
+    if offset:
+        offset_iter = random_access_proxy.iter_from(offset)
+    else:
+        offset_iter = iter(random_access_proxy)
+    if key_function:
+        return ((key_function(k), file_number, o, l)
+                for (k, o, l) in offset_iter)
+    else:
+        return ((k, file_number, o, l)
+                for (k, o, l) in offset_iter)
+
+
+# The proxy factory, format and key function used by worker processes
+# scanning files for index_db (set before forking, or by the initializer)
+_scan_args = None
+
+
+def _init_scan_worker(args):
+    """Set the arguments used by _scan_file in a new worker (PRIVATE)."""
+    global _scan_args
+    _scan_args = args
+
+
+def _scan_file(task):
+    """Return a list of the (key, file_number, offset, length) in a file (PRIVATE).
+
+    Called in a worker process with a (file_number, filename, offset) tuple,
+    where records before the offset are not included.
+    """
+    file_number, filename, offset = task
+    proxy_factory, format, key_function = _scan_args
+    random_access_proxy = proxy_factory(format, filename)
+    try:
+        return list(_scan_offsets(random_access_proxy, file_number,
+                                  key_function, offset))
+    finally:
+        random_access_proxy._handle.close()
+
+
 class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
     """Read only dictionary interface to many sequential record files.
 
@@ -501,11 +683,19 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
     There are OS limits on the number of files that can be open at once,
     so a pool are kept. If a record is required from a closed file, then
     one of the open handles is closed first.
+
+    When building the index, the files can be scanned by a pool of worker
+    processes (n_jobs, None meaning one per CPU), while the main process
+    inserts their offsets into the database.
+
+    As with _IndexedSeqFileDict, a cache of recently used records can be
+    kept (cache_size). The get_many and get_raw_many methods look up all
+    their keys together, rather than with a query per key.
     """
 
     def __init__(self, index_filename, filenames,
                  proxy_factory, format,
-                 key_function, repr, max_open=10):
+                 key_function, repr, max_open=10, n_jobs=1, cache_size=0):
         """Initialize the class."""
         # TODO? - Don't keep filename list in memory (just in DB)?
         # Should save a chunk of memory if dealing with 1000s of files.
@@ -528,7 +718,9 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         self._proxy_factory = proxy_factory
         self._repr = repr
         self._max_open = max_open
+        self._n_jobs = n_jobs
         self._proxies = {}
+        self._cache = _RecordCache(cache_size) if cache_size else None
 
         # Note if using SQLite :memory: trick index filename, this will
         # give $PWD as the relative path (which is fine).
@@ -621,6 +813,16 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         if not proxy_factory(self._format):
             con.close()
             raise ValueError("Unsupported format '%s'" % self._format)
+        columns = [row[1] for row in
+                   con.execute("PRAGMA table_info(file_data);").fetchall()]
+        if "checksum" in columns:
+            # Can check if the files have changed since being indexed
+            stale = self.stale_files()
+            if stale:
+                warnings.warn("%i of the files in index %r have changed since "
+                              "being indexed (e.g. %r), call update() to "
+                              "reindex them" % (len(stale), index_filename, stale[0]),
+                              BiopythonWarning)
 
     def _build_index(self):
         """Call from __init__ to create a new index (PRIVATE)."""
@@ -628,10 +830,7 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         relative_path = self._relative_path
         filenames = self._filenames
         format = self._format
-        key_function = self._key_function
         proxy_factory = self._proxy_factory
-        max_open = self._max_open
-        random_access_proxies = self._proxies
 
         if not format or not filenames:
             raise ValueError("Filenames to index and format required to build %r" % index_filename)
@@ -655,12 +854,10 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         con.execute("INSERT INTO meta_data (key, value) VALUES (?,?);",
                     ("filenames_relative_to_index", "True"))
         # TODO - Record the alphabet?
-        # TODO - Record the file size and modified date?
-        con.execute(
-            "CREATE TABLE file_data (file_number INTEGER, name TEXT);")
+        con.execute("CREATE TABLE file_data (file_number INTEGER, name TEXT, "
+                    "size INTEGER, mtime REAL, checksum TEXT);")
         con.execute("CREATE TABLE offset_data (key TEXT, "
                     "file_number INTEGER, offset INTEGER, length INTEGER);")
-        count = 0
         for i, filename in enumerate(filenames):
             # Default to storing as an absolute path,
             f = os.path.abspath(filename)
@@ -678,38 +875,27 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
                 f = os.path.relpath(filename, relative_path).replace(os.path.sep, "/")
                 assert not f.startswith("../"), f
             # print("DEBUG - storing %r as [%r] %r" % (filename, relative_path, f))
+            # Take the size and modified time before scanning the file, so
+            # that any change while it is being scanned is noticed later
+            size, mtime = _file_stats(filename)
             con.execute(
-                "INSERT INTO file_data (file_number, name) VALUES (?,?);",
-                (i, f))
-            random_access_proxy = proxy_factory(format, filename)
-            if key_function:
-                offset_iter = ((key_function(k), i, o, l)
-                               for (k, o, l) in random_access_proxy)
-            else:
-                offset_iter = ((k, i, o, l)
-                               for (k, o, l) in random_access_proxy)
-            while True:
-                batch = list(itertools.islice(offset_iter, 100))
-                if not batch:
-                    break
-                # print("Inserting batch of %i offsets, %s ... %s"
-                #       % (len(batch), batch[0][0], batch[-1][0]))
-                con.executemany(
-                    "INSERT INTO offset_data (key,file_number,offset,length) VALUES (?,?,?,?);",
-                    batch)
-                con.commit()
-                count += len(batch)
-            if len(random_access_proxies) < max_open:
-                random_access_proxies[i] = random_access_proxy
-            else:
-                random_access_proxy._handle.close()
+                "INSERT INTO file_data (file_number, name, size, mtime, checksum) "
+                "VALUES (?,?,?,?,?);",
+                (i, f, size, mtime, _file_checksum(filename, size)))
+        # All the offsets are inserted in a single transaction
+        count = 0
+        for batch in self._scan_files([(i, 0) for i in range(len(filenames))]):
+            con.executemany(
+                "INSERT INTO offset_data (key,file_number,offset,length) VALUES (?,?,?,?);",
+                batch)
+            count += len(batch)
+        con.commit()
         self._length = count
         # print("About to index %i entries" % count)
         try:
             con.execute("CREATE UNIQUE INDEX IF NOT EXISTS "
                         "key_index ON offset_data(key);")
         except _IntegrityError as err:
-            self._proxies = random_access_proxies
             self.close()
             con.close()
             raise ValueError("Duplicate key? %s" % err)
@@ -719,6 +905,222 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         con.commit()
         # print("Index created")
 
+    def _scan_files(self, starts):
+        """Scan the given files for their records, yielding batches (PRIVATE).
+
+        Takes a list of (file_number, offset) tuples, with the offset to
+        start scanning from (zero for the whole file). Each batch is a list
+        of (key, file_number, offset, length) tuples, ready to be inserted
+        into the offset_data table. If using several processes (n_jobs),
+        each file is scanned by a worker process giving a single batch for
+        the file, otherwise the files are scanned in turn and any handles
+        opened are kept (up to max_open).
+        """
+        format = self._format
+        key_function = self._key_function
+        proxy_factory = self._proxy_factory
+        filenames = self._filenames
+        tasks = [(i, filenames[i], offset) for i, offset in starts]
+        n_jobs = self._n_jobs
+        if n_jobs is None:
+            n_jobs = multiprocessing.cpu_count()
+        if n_jobs > 1 and len(tasks) > 1:
+            # Forking is needed for the nested proxy factory of
+            # SeqIO.index_db or a lambda as the key function
+            pool = _get_pool(min(n_jobs, len(tasks)),
+                             (proxy_factory, format, key_function),
+                             _init_scan_worker, check_pickle=True)
+            if pool is not None:
+                try:
+                    # Using imap (not imap_unordered) so that the keys are
+                    # stored in the same order as a serial scan
+                    for batch in pool.imap(_scan_file, tasks):
+                        yield batch
+                    pool.close()
+                finally:
+                    pool.terminate()
+                    pool.join()
+                return
+        random_access_proxies = self._proxies
+        for i, filename, offset in tasks:
+            random_access_proxy = proxy_factory(format, filename)
+            offset_iter = _scan_offsets(random_access_proxy, i, key_function,
+                                        offset)
+            while True:
+                batch = list(itertools.islice(offset_iter, 10000))
+                if not batch:
+                    break
+                # print("Inserting batch of %i offsets, %s ... %s"
+                #       % (len(batch), batch[0][0], batch[-1][0]))
+                yield batch
+            if i not in random_access_proxies and \
+                    len(random_access_proxies) < self._max_open:
+                random_access_proxies[i] = random_access_proxy
+            else:
+                random_access_proxy._handle.close()
+
+    def _changed_files(self):
+        """Return a list of the indexed files which have changed (PRIVATE).
+
+        Returns a list of (file_number, status, size, mtime) tuples, using
+        the current size and modified time of the file. The status is
+        "touched" if only the modified time has changed, "appended" if the
+        file has grown but the previously indexed data looks unchanged,
+        or otherwise "changed". Files are assumed to be unchanged if their
+        size and modified time are as recorded when indexing, otherwise
+        only the start and end of the previously indexed data is compared
+        (using a checksum).
+
+        For indexes made by older versions of Biopython, without the file
+        sizes, modified times and checksums, all files are "changed".
+        """
+        con = self._con
+        columns = [row[1] for row in
+                   con.execute("PRAGMA table_info(file_data);").fetchall()]
+        if "checksum" in columns:
+            rows = con.execute("SELECT file_number, size, mtime, checksum "
+                               "FROM file_data ORDER BY file_number;").fetchall()
+        else:
+            rows = [(i, None, None, None) for i in range(len(self._filenames))]
+        changed = []
+        for i, old_size, old_mtime, checksum in rows:
+            filename = self._filenames[i]
+            try:
+                size, mtime = _file_stats(filename)
+            except OSError:
+                # Missing file
+                changed.append((i, "changed", None, None))
+                continue
+            if size == old_size and mtime == old_mtime:
+                continue
+            if old_size is None or size < old_size or \
+                    checksum != _file_checksum(filename, old_size):
+                status = "changed"
+            elif size == old_size:
+                status = "touched"
+            else:
+                status = "appended"
+            changed.append((i, status, size, mtime))
+        return changed
+
+    def stale_files(self):
+        """Return a list of the indexed files changed since being indexed.
+
+        These are files which have been appended to, edited or replaced, so
+        the index may be missing some of their records, or give the wrong
+        offsets for them. This is checked when an existing index is loaded,
+        giving a warning. Files whose modified time has changed, but whose
+        contents look the same, are not included. Note this only compares
+        the file size and a checksum of the start and end of each file,
+        and will not spot all edits to the middle of a file.
+        """
+        return [self._filenames[i] for i, status, size, mtime
+                in self._changed_files() if status != "touched"]
+
+    def update(self, *args, **kwargs):
+        """Update the index for any files changed since being indexed.
+
+        For files which have been appended to, the last record previously
+        indexed and any new records after it are scanned and added to the
+        index. Any other changed files are scanned again from the start.
+        This is done in a single transaction, so if the records scanned
+        have duplicate keys a ValueError is raised and the index is left
+        unchanged. Returns a list of the filenames appended to or
+        rescanned.
+
+        For indexes made by older versions of Biopython, which did not
+        record the file sizes, modified times and checksums, all the
+        files are scanned again.
+
+        Unlike a dictionary's update method, this does not take any
+        arguments (the index is read only).
+        """
+        if args or kwargs:
+            raise NotImplementedError("An indexed a sequence file is read only.")
+        return self._reindex(appending=True)
+
+    def rebuild(self):
+        """Rescan any indexed files whose size or modified time has changed.
+
+        Like the update method, but any file which has changed is scanned
+        again from the start, even if records have only been appended.
+        Returns a list of the rescanned filenames.
+        """
+        return self._reindex(appending=False)
+
+    def _reindex(self, appending):
+        """Update the index for changed files, used by update and rebuild (PRIVATE)."""
+        con = self._con
+        changed = self._changed_files()
+        if not changed:
+            return []
+        for i, status, size, mtime in changed:
+            if size is None:
+                # Missing file, raise the error from os.stat
+                _file_stats(self._filenames[i])
+        columns = [row[1] for row in
+                   con.execute("PRAGMA table_info(file_data);").fetchall()]
+        for column, sql_type in [("size", "INTEGER"), ("mtime", "REAL"),
+                                 ("checksum", "TEXT")]:
+            if column not in columns:
+                # Index from an older version of Biopython
+                con.execute("ALTER TABLE file_data ADD COLUMN %s %s;"
+                            % (column, sql_type))
+        con.commit()
+        rescan = [i for i, status, size, mtime in changed
+                  if status == "changed" or (status == "appended" and not appending)]
+        appended = [i for i, status, size, mtime in changed
+                    if status == "appended" and appending]
+        for i in rescan + appended:
+            # Any open handle may be to an old (replaced) file, or a memory
+            # map of the file before it was appended to
+            proxy = self._proxies.pop(i, None)
+            if proxy is not None:
+                proxy._handle.close()
+        try:
+            starts = [(i, 0) for i in rescan]
+            if appended:
+                # The last record indexed may have been continued by the
+                # appended data, so must be scanned again
+                last = {}
+                for start in range(0, len(appended), 500):
+                    chunk = appended[start:start + 500]
+                    last.update(con.execute(
+                        "SELECT file_number, MAX(offset) FROM offset_data "
+                        "WHERE file_number IN (%s) GROUP BY file_number;"
+                        % ",".join("?" * len(chunk)), chunk).fetchall())
+                starts.extend((i, last.get(i, 0)) for i in appended)
+                con.executemany("DELETE FROM offset_data WHERE file_number = ? "
+                                "AND offset = ?;", list(last.items()))
+            for start in range(0, len(rescan), 500):
+                chunk = rescan[start:start + 500]
+                con.execute("DELETE FROM offset_data WHERE file_number IN (%s);"
+                            % ",".join("?" * len(chunk)), chunk)
+            con.executemany(
+                "UPDATE file_data SET size = ?, mtime = ?, checksum = ? "
+                "WHERE file_number = ?;",
+                [(size, mtime, _file_checksum(self._filenames[i], size), i)
+                 for i, status, size, mtime in changed])
+            starts.sort()
+            for batch in self._scan_files(starts):
+                con.executemany(
+                    "INSERT INTO offset_data (key,file_number,offset,length) VALUES (?,?,?,?);",
+                    batch)
+            count, = con.execute("SELECT COUNT(key) FROM offset_data;").fetchone()
+            con.execute("UPDATE meta_data SET value = ? WHERE key = ?;",
+                        (count, "count"))
+        except _IntegrityError as err:
+            con.rollback()
+            raise ValueError("Duplicate key? %s" % err)
+        except Exception:
+            con.rollback()
+            raise
+        con.commit()
+        self._length = count
+        if self._cache is not None:
+            self._cache.clear()
+        return [self._filenames[i] for i, offset in starts]
+
     def __repr__(self):
         return self._repr
 
@@ -751,6 +1153,11 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
 
     def __getitem__(self, key):
         """Return record for the specified key."""
+        cache = self._cache
+        if cache is not None:
+            record = cache.get(key)
+            if record is not None:
+                return record
         # Pass the offset to the proxy
         row = self._con.execute(
             "SELECT file_number, offset FROM offset_data WHERE key=?;",
@@ -758,25 +1165,114 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         if not row:
             raise KeyError
         file_number, offset = row
-        proxies = self._proxies
-        if file_number in proxies:
-            record = proxies[file_number].get(offset)
-        else:
-            if len(proxies) >= self._max_open:
-                # Close an old handle...
-                proxies.popitem()[1]._handle.close()
-            # Open a new handle...
-            proxy = self._proxy_factory(self._format, self._filenames[file_number])
-            record = proxy.get(offset)
-            proxies[file_number] = proxy
+        record = self._get_proxy(file_number).get(offset)
         if self._key_function:
             key2 = self._key_function(record.id)
         else:
             key2 = record.id
         if key != key2:
             raise ValueError("Key did not match (%s vs %s)" % (key, key2))
+        if cache is not None:
+            cache.add(key, record)
         return record
 
+    def _get_proxy(self, file_number):
+        """Return the random access proxy for a file, opening it if needed (PRIVATE)."""
+        proxies = self._proxies
+        try:
+            return proxies[file_number]
+        except KeyError:
+            pass
+        if len(proxies) >= self._max_open:
+            # Close an old handle...
+            proxies.popitem()[1]._handle.close()
+        # Open a new handle...
+        proxy = self._proxy_factory(self._format, self._filenames[file_number])
+        proxies[file_number] = proxy
+        return proxy
+
+    def _lookup_many(self, keys):
+        """Return sorted (file_number, offset, length, i) for keys[i] (PRIVATE).
+
+        The keys are looked up in the database in chunks (of up to 500 keys,
+        keeping under the SQLite limit on the number of query parameters).
+        Raises a KeyError if any key is missing.
+        """
+        positions = {}
+        for i, key in enumerate(keys):
+            positions.setdefault(key, []).append(i)
+        unique = list(positions)
+        found = []
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            for key, file_number, offset, length in self._con.execute(
+                    "SELECT key, file_number, offset, length FROM offset_data "
+                    "WHERE key IN (%s);" % ",".join("?" * len(chunk)), chunk):
+                for i in positions.pop(key):
+                    found.append((file_number, offset, length, i))
+        if positions:
+            raise KeyError(next(iter(positions)))
+        found.sort()
+        return found
+
+    def get_many(self, keys):
+        """Return a list of the records for the specified keys.
+
+        The keys are looked up together, and the records are read in the
+        order they are in the files, which reduces the time spent seeking.
+        If any key is not found, a KeyError exception is raised.
+        """
+        keys = list(keys)
+        records = [None] * len(keys)
+        cache = self._cache
+        if cache is None:
+            todo = keys
+        else:
+            todo = []
+            for i, key in enumerate(keys):
+                record = cache.get(key)
+                if record is None:
+                    todo.append(key)
+                else:
+                    records[i] = record
+        if not todo:
+            return records
+        missing = [i for i, record in enumerate(records) if record is None]
+        key_function = self._key_function
+        for file_number, offset, length, j in self._lookup_many(todo):
+            key = todo[j]
+            record = self._get_proxy(file_number).get(offset)
+            if key_function:
+                key2 = key_function(record.id)
+            else:
+                key2 = record.id
+            if key != key2:
+                raise ValueError("Key did not match (%s vs %s)" % (key, key2))
+            if cache is not None:
+                cache.add(key, record)
+            records[missing[j]] = record
+        return records
+
+    def get_raw_many(self, keys):
+        """Return a list of the raw records for the specified keys.
+
+        As with get_many, the keys are looked up together and the records
+        are read in the order they are in the files. If any key is not
+        found, a KeyError exception is raised.
+        """
+        keys = list(keys)
+        raws = [None] * len(keys)
+        for file_number, offset, length, i in self._lookup_many(keys):
+            proxy = self._get_proxy(file_number)
+            if length:
+                # Shortcut if we have the length
+                h = proxy._handle
+                h.seek(offset)
+                raws[i] = h.read(length)
+            else:
+                raws[i] = proxy.get_raw(offset)
+        return raws
+
     def get(self, k, d=None):
         """Return the value in the dictionary.
 
@@ -800,30 +1296,14 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         if not row:
             raise KeyError
         file_number, offset, length = row
-        proxies = self._proxies
-        if file_number in proxies:
-            if length:
-                # Shortcut if we have the length
-                h = proxies[file_number]._handle
-                h.seek(offset)
-                return h.read(length)
-            else:
-                return proxies[file_number].get_raw(offset)
+        proxy = self._get_proxy(file_number)
+        if length:
+            # Shortcut if we have the length
+            h = proxy._handle
+            h.seek(offset)
+            return h.read(length)
         else:
-            # This code is duplicated from __getitem__ to avoid a function call
-            if len(proxies) >= self._max_open:
-                # Close an old handle...
-                proxies.popitem()[1]._handle.close()
-            # Open a new handle...
-            proxy = self._proxy_factory(self._format, self._filenames[file_number])
-            proxies[file_number] = proxy
-            if length:
-                # Shortcut if we have the length
-                h = proxy._handle
-                h.seek(offset)
-                return h.read(length)
-            else:
-                return proxy.get_raw(offset)
+            return proxy.get_raw(offset)
 
     def close(self):
         """Close any open file handles."""
@@ -139,7 +139,7 @@ class InsdcScanner(object):
         self.line = line
         return header_lines
 
-    def parse_features(self, skip=False):
+    def parse_features(self, skip=False, feature_types=None):
         """Return list of tuples for the features (if present).
 
         Each feature is returned as a tuple (key, location, qualifiers)
@@ -147,6 +147,9 @@ class InsdcScanner(object):
         "complement(join(490883..490885,1..879))") while qualifiers
         is a list of two string tuples (feature qualifier keys and values).
 
+        If feature_types is given (e.g. ["CDS", "rRNA"]), only features
+        with these keys are returned, the others are not parsed.
+
         Assumes you have already read to the start of the features table.
         """
         if self.line.rstrip() not in self.FEATURE_START_MARKERS:
@@ -210,10 +213,45 @@ class InsdcScanner(object):
                     # white space (e.g. out of spec files with too much indentation)
                     feature_lines.append(line[self.FEATURE_QUALIFIER_INDENT:].strip())
                     line = self.handle.readline()
-                features.append(self.parse_feature(feature_key, feature_lines))
+                if feature_types is None or feature_key in feature_types:
+                    features.append(self.parse_feature(feature_key, feature_lines))
         self.line = line
         return features
 
+    def parse_feature_block(self):
+        """Return the feature table (if present) as a string, without parsing it.
+
+        This reads the same lines as parse_features, which can parse the
+        returned string later (see Bio.GenBank.LazyFeatureSeqRecord). The
+        string starts with the feature table header and ends with the line
+        after the table (e.g. the ORIGIN line), which is also left in the
+        line attribute as usual.
+
+        Assumes you have already read to the start of the features table.
+        """
+        if self.line.rstrip() not in self.FEATURE_START_MARKERS:
+            if self.debug:
+                print("Didn't find any feature table")
+            return ""
+        block = [self.line + "\n"]
+        line = self.handle.readline()
+        while True:
+            if not line:
+                raise ValueError("Premature end of line during features table")
+            if line[:self.HEADER_WIDTH].rstrip() in self.SEQUENCE_HEADERS:
+                block.append(line)
+                break
+            block.append(line)
+            line = line.rstrip()
+            if line == "//":
+                raise ValueError("Premature end of features table, marker '//' found")
+            if line in self.FEATURE_END_MARKERS:
+                line = self.handle.readline()
+                break
+            line = self.handle.readline()
+        self.line = line
+        return "".join(block)
+
     def parse_feature(self, feature_key, lines):
         r"""Parse a feature given as a list of strings into a tuple.
 
@@ -408,7 +446,8 @@ class InsdcScanner(object):
         """
         pass
 
-    def feed(self, handle, consumer, do_features=True):
+    def feed(self, handle, consumer, do_features=True, lazy_features=False,
+             feature_types=None):
         """Feed a set of data into the consumer.
 
         This method is intended for use with the "old" code in Bio.GenBank
@@ -418,6 +457,10 @@ class InsdcScanner(object):
          - consumer - The consumer that should be informed of events.
          - do_features - Boolean, should the features be parsed?
            Skipping the features can be much faster.
+         - lazy_features - Boolean, pass the unparsed feature table to
+           the consumer's lazy_feature_table method instead.
+         - feature_types - Optional list of feature keys, other features
+           are ignored.
 
         Return values:
          - true  - Passed a record
@@ -441,10 +484,14 @@ class InsdcScanner(object):
         self._feed_header_lines(consumer, self.parse_header())
 
         # Features (common to both EMBL and GenBank):
-        if do_features:
-            self._feed_feature_table(consumer, self.parse_features(skip=False))
-        else:
+        if not do_features:
             self.parse_features(skip=True)  # ignore the data
+        elif lazy_features:
+            consumer.lazy_feature_table(self.parse_feature_block(),
+                                        self.__class__, feature_types)
+        else:
+            self._feed_feature_table(consumer,
+                                     self.parse_features(feature_types=feature_types))
 
         # Footer and sequence
         misc_lines, sequence_string = self.parse_footer()
@@ -459,34 +506,44 @@ class InsdcScanner(object):
         # And we are done
         return True
 
-    def parse(self, handle, do_features=True):
+    def parse(self, handle, do_features=True, lazy_features=False,
+              feature_types=None):
         """Return a SeqRecord (with SeqFeatures if do_features=True).
 
+        With lazy_features=True a Bio.GenBank.LazyFeatureSeqRecord is
+        returned, which keeps the feature table as a string and only
+        parses it when the features are first used. The optional
+        feature_types list restricts the features to these keys.
+
         See also the method parse_records() for use on multi-record files.
         """
         from Bio.GenBank import _FeatureConsumer
         from Bio.GenBank.utils import FeatureValueCleaner
 
         consumer = _FeatureConsumer(use_fuzziness=1,
-                                    feature_cleaner=FeatureValueCleaner())
+                                    feature_cleaner=FeatureValueCleaner(),
+                                    lazy_features=lazy_features)
 
-        if self.feed(handle, consumer, do_features):
+        if self.feed(handle, consumer, do_features, lazy_features, feature_types):
             return consumer.data
         else:
             return None
 
-    def parse_records(self, handle, do_features=True):
+    def parse_records(self, handle, do_features=True, lazy_features=False,
+                      feature_types=None):
         """Parse records, return a SeqRecord object iterator.
 
         Each record (from the ID/LOCUS line to the // line) becomes a SeqRecord
 
-        The SeqRecord objects include SeqFeatures if do_features=True
+        The SeqRecord objects include SeqFeatures if do_features=True, which
+        are only parsed when first used if lazy_features=True. If given,
+        only features with keys in feature_types are included.
 
         This method is intended for use in Bio.SeqIO
         """
         # This is a generator function
         while True:
-            record = self.parse(handle, do_features)
+            record = self.parse(handle, do_features, lazy_features, feature_types)
             if record is None:
                 break
             if record.id is None:
@@ -1012,7 +1069,7 @@ class _ImgtScanner(EmblScanner):
         consumer.data_file_division(fields[4])
         self._feed_seq_length(consumer, fields[5])
 
-    def parse_features(self, skip=False):
+    def parse_features(self, skip=False, feature_types=None):
         """Return list of tuples for the features (if present).
 
         Each feature is returned as a tuple (key, location, qualifiers)
@@ -1020,6 +1077,9 @@ class _ImgtScanner(EmblScanner):
         "complement(join(490883..490885,1..879))") while qualifiers
         is a list of two string tuples (feature qualifier keys and values).
 
+        If feature_types is given (e.g. ["CDS", "rRNA"]), only features
+        with these keys are returned, the others are not parsed.
+
         Assumes you have already read to the start of the features table.
         """
         if self.line.rstrip() not in self.FEATURE_START_MARKERS:
@@ -1078,6 +1138,8 @@ class _ImgtScanner(EmblScanner):
                     assert line[:2] == "FT"
                     feature_lines.append(line[self.FEATURE_QUALIFIER_INDENT:].strip())
                     line = self.handle.readline()
+                if feature_types is not None and feature_key not in feature_types:
+                    continue
                 feature_key, location, qualifiers = \
                     self.parse_feature(feature_key, feature_lines)
                 # Try to handle known problems with IMGT locations here:
@@ -31,6 +31,8 @@ Classes:
  - ErrorFeatureParser    Catch errors caused during parsing.
  - FeatureParser         Parse GenBank data in SeqRecord and SeqFeature objects.
  - RecordParser          Parse GenBank data into a Record object.
+ - LazyFeatureSeqRecord  SeqRecord parsing its features on first use (from
+   Bio.SeqIO with lazy_features=True).
 
 Exceptions:
  - ParserFailureError    Exception indicating a failure in the parser (ie.
@@ -46,6 +48,8 @@ import sys  # for checking if Python 2
 
 # other Biopython stuff
 from Bio import SeqFeature
+from Bio._py3k import StringIO
+from Bio.SeqRecord import SeqRecord
 
 # other Bio.GenBank stuff
 from .utils import FeatureValueCleaner
@@ -434,6 +438,78 @@ class LocationParserError(Exception):
     pass
 
 
+class LazyFeatureSeqRecord(SeqRecord):
+    """SeqRecord from a GenBank or EMBL file, parsing its features when first used.
+
+    Bio.SeqIO returns these records for the "genbank", "embl" and "imgt"
+    formats when called with lazy_features=True. The feature table is kept
+    as a string, and only turned into SeqFeature objects when the features
+    property is first accessed. This makes reading just the sequences or
+    annotations of feature rich records (e.g. bacterial genomes) much
+    faster and uses much less memory:
+
+    >>> from Bio import SeqIO
+    >>> record = SeqIO.read("GenBank/NC_005816.gb", "genbank",
+    ...                     lazy_features=True, feature_types=["CDS"])
+    >>> print(record.id)
+    NC_005816.1
+    >>> record.features_parsed
+    False
+    >>> print(record.features[0].qualifiers["locus_tag"][0])
+    YP_pPCP01
+    >>> len(record.features)
+    10
+    >>> record.features_parsed
+    True
+
+    Any warnings about the features (or errors from broken features) only
+    appear when they are parsed. Otherwise this behaves like a SeqRecord.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Create the record (see SeqRecord for the arguments)."""
+        self._feature_table = None
+        SeqRecord.__init__(self, *args, **kwargs)
+
+    @property
+    def features_parsed(self):
+        """Boolean, have the features been parsed yet."""
+        return self._feature_table is None
+
+    def _set_feature_table(self, block, scanner_class, feature_types,
+                           seq_type, expected_size):
+        """Record the unparsed feature table (PRIVATE).
+
+        Called by the _FeatureConsumer at the end of the record.
+        """
+        self._feature_table = (block, scanner_class, feature_types,
+                               seq_type, expected_size)
+
+    def __get_features(self):
+        if self._feature_table is not None:
+            block, scanner_class, feature_types, seq_type, expected_size = \
+                self._feature_table
+            consumer = _FeatureConsumer(use_fuzziness=1,
+                                        feature_cleaner=FeatureValueCleaner())
+            consumer._seq_type = seq_type
+            consumer._expected_size = expected_size
+            if block:
+                scanner = scanner_class()
+                scanner.set_handle(StringIO(block))
+                scanner.line = scanner.handle.readline().rstrip()
+                scanner._feed_feature_table(
+                    consumer, scanner.parse_features(feature_types=feature_types))
+            self._features = consumer.data.features
+            self._feature_table = None
+        return self._features
+
+    def __set_features(self, features):
+        self._feature_table = None
+        self._features = features
+
+    features = property(__get_features, __set_features, doc="Features")
+
+
 class FeatureParser(object):
     """Parse GenBank files into Seq + Feature objects (OBSOLETE).
 
@@ -633,10 +709,12 @@ class _FeatureConsumer(_BaseGenBankConsumer):
 
     """
 
-    def __init__(self, use_fuzziness, feature_cleaner=None):
-        from Bio.SeqRecord import SeqRecord
+    def __init__(self, use_fuzziness, feature_cleaner=None, lazy_features=False):
         _BaseGenBankConsumer.__init__(self)
-        self.data = SeqRecord(None, id=None)
+        if lazy_features:
+            self.data = LazyFeatureSeqRecord(None, id=None)
+        else:
+            self.data = SeqRecord(None, id=None)
         self.data.id = None
         self.data.description = ""
 
@@ -648,6 +726,7 @@ class _FeatureConsumer(_BaseGenBankConsumer):
         self._cur_reference = None
         self._cur_feature = None
         self._expected_size = None
+        self._feature_table = None
 
     def locus(self, locus_name):
         """Set the locus name is set as the name of the Sequence."""
@@ -992,6 +1071,15 @@ class _FeatureConsumer(_BaseGenBankConsumer):
             self.data.annotations['references'].append(self._cur_reference)
             self._cur_reference = None
 
+    def lazy_feature_table(self, block, scanner_class, feature_types=None):
+        """Keep the unparsed feature table (string) for a LazyFeatureSeqRecord.
+
+        The scanner class is used to parse the table later, together with
+        the sequence type and length (which may come after the features).
+        """
+        self.start_feature_table()
+        self._feature_table = (block, scanner_class, feature_types)
+
     def feature_key(self, content):
         # start a new feature
         self._cur_feature = SeqFeature.SeqFeature()
@@ -1277,6 +1365,11 @@ class _FeatureConsumer(_BaseGenBankConsumer):
         else:
             self.data.seq = Seq(sequence, seq_alphabet)
 
+        if self._feature_table is not None:
+            block, scanner_class, feature_types = self._feature_table
+            self.data._set_feature_table(block, scanner_class, feature_types,
+                                         self._seq_type, self._expected_size)
+
 
 class _RecordConsumer(_BaseGenBankConsumer):
     """Create a GenBank Record object from scanner generated information (PRIVATE)."""
@@ -8,7 +8,7 @@ Module with classes representating ontologies and annotation data.
 """
 from __future__ import print_function
 
-from Bio.Ontology.Graph import DiGraph
+from Bio.Ontology.Graph import DiGraph, FrozenDiGraph
 import copy
 import sys
 
@@ -47,6 +47,28 @@ class OntologyGraph(DiGraph):
             res.add(edge.to_node.label)
         return res
     
+    def get_closure(self, oids):
+        """
+        Returns set of ids of given terms together with all their ancestors.
+        Synonyms are resolved and unknown ids are skipped.
+        """
+        res = set()
+        for oid in oids:
+            node = self.get_node(oid)
+            if node != None:
+                nid = node.data.id # because enrichments may use synonyms instead of ids
+                res.add(nid)
+                res |= self.get_ancestors(nid)
+        return res
+    
+    def freeze(self):
+        """
+        Returns compact, immutable copy of the graph (FrozenOntologyGraph)
+        with precomputed ancestors of every term. Enrichment finders
+        work faster and use less memory with it.
+        """
+        return FrozenOntologyGraph(self)
+    
     def get_relationship_types(self):
         return list(self.typedefs.keys())
         
@@ -128,6 +150,83 @@ class OntologyGraph(DiGraph):
             
             return nxgraph
             
+class FrozenOntologyGraph(FrozenDiGraph):
+    """
+    Immutable, array-backed version of OntologyGraph returned by
+    OntologyGraph.freeze.
+
+    It supports queries needed by the enrichment finders (terms,
+    parents, ancestors) but terms are stored by integer ids and
+    ancestors of all terms are precomputed as sorted arrays of ids.
+    """
+
+    def __init__(self, graph):
+        FrozenDiGraph.__init__(self, graph)
+        self.typedefs = dict(graph.typedefs)
+        self.synonyms = dict((k, self._ids[v.label]) for k, v in graph.synonyms.items())
+
+    def get_id(self, u):
+        x = self._ids.get(u)
+        if x is None:
+            return self.synonyms.get(u)
+        else:
+            return x
+
+    def node_exists(self, u):
+        return u in self._ids or u in self.synonyms
+
+    def get_term(self, oid):
+        return self.data[self.get_id(oid)]
+
+    def get_ancestors(self, oid):
+        labels = self.labels
+        return set(labels[i] for i in self.get_reachable_ids(self.get_id(oid)))
+
+    def get_parents(self, oid):
+        nid = self.get_id(oid)
+        labels = self.labels
+        return set(labels[self.succ_indices[pos]]
+                   for pos in range(self.succ_indptr[nid], self.succ_indptr[nid + 1]))
+
+    def get_closure(self, oids):
+        """
+        Returns set of ids of given terms together with all their ancestors.
+        Synonyms are resolved and unknown ids are skipped.
+        """
+        ids = set()
+        for oid in oids:
+            nid = self.get_id(oid)
+            if nid is not None:
+                ids.add(nid)
+                ids.update(self.get_reachable_ids(nid))
+        labels = self.labels
+        return set(labels[i] for i in ids)
+
+    def get_relationship_types(self):
+        return list(self.typedefs.keys())
+
+    def get_induced_subgraph(self, nodes_ids):
+        """
+        Returns OntologyGraph with only given nodes left
+        """
+        igraph = OntologyGraph()
+        id_set = set(nodes_ids)
+        for label in nodes_ids:
+            nid = self._ids[label]
+            igraph.update_node(label, self.data[nid])
+            for pos in range(self.succ_indptr[nid], self.succ_indptr[nid + 1]):
+                to_label = self.labels[self.succ_indices[pos]]
+                if to_label in id_set:
+                    igraph.add_edge(label, to_label, self.edge_data[self.succ_data[pos]])
+        igraph.synonyms = dict((k, igraph.nodes[self.labels[v]])
+                               for k, v in self.synonyms.items() if self.labels[v] in igraph.nodes)
+        igraph.typedefs = copy.copy(self.typedefs)
+        return igraph
+
+    def __repr__(self):
+        return "FrozenOntologyGraph(nodes_num = {0}, edges_num = {1})".format(len(self.labels),
+                                                                           len(self.succ_indices))
+
 class OntologyTerm(object):
     """
     Represents ontology term.
@@ -7,6 +7,7 @@
 Module containing abstract representation of graph.
 """
 
+from array import array
 from functools import total_ordering
 
 class DiGraph(object):
@@ -160,6 +161,12 @@ class DiGraph(object):
                 node.attr.pop(DiGraph._IS_VISITED)
             return (in_cycle, my_set)
     
+    def freeze(self):
+        """
+        Returns immutable, compact copy of the graph (FrozenDiGraph).
+        """
+        return FrozenDiGraph(self)
+
     def __repr__(self):
         first = True
         result = "DiGraph(nodes = " + str(list(self.nodes.keys())) + ", edges = ["
@@ -172,6 +179,186 @@ class DiGraph(object):
                 result += str(n.label) + str(e)
         return result + "])"
     
+def _strongly_connected(nodes_no, indptr, indices):
+    """
+    Iterative Tarjan's algorithm. Returns list of strongly connected
+    components (lists of nodes) in reverse topological order, i.e.
+    every component is preceded by all components reachable from it.
+    """
+    index = [-1] * nodes_no
+    low = [0] * nodes_no
+    on_stack = [False] * nodes_no
+    stack = []
+    components = []
+    counter = 0
+    for root in range(nodes_no):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, indptr[root])]
+        while work:
+            v, pos = work[-1]
+            if pos < indptr[v + 1]:
+                work[-1] = (v, pos + 1)
+                w = indices[pos]
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, indptr[w]))
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                work.pop()
+                if work and low[v] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[v]
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+    return components
+
+class FrozenDiGraph(object):
+    """
+    Immutable, array-backed representation of DiGraph.
+
+    Node labels are interned to consecutive integer ids, edges are kept in
+    compressed sparse row form and the transitive closure (all nodes
+    reachable from every node) is precomputed as sorted arrays of ids.
+    Nodes lying on one cycle share the same closure array.
+
+    >>> g = DiGraph([(1,2), (2,3), (3,4), (3,5), (5,2), (5,6), (6,8), (6,7), (2,9), (9,2)])
+    >>> fg = g.freeze()
+    >>> sorted(fg.get_reachable(2))
+    [2, 3, 4, 5, 6, 7, 8, 9]
+    >>> sorted(fg.get_reachable(6))
+    [7, 8]
+    >>> fg.cycles
+    [[9, 5, 3, 2]]
+    """
+
+    def __init__(self, graph):
+        """
+        Initialize frozen graph with a copy of given DiGraph.
+        """
+        self.labels = list(graph.nodes.keys())
+        self.data = [graph.nodes[label].data for label in self.labels]
+        self._ids = dict((label, i) for i, label in enumerate(self.labels))
+        self.attrs = dict(graph.attrs)
+
+        # edges in compressed sparse row form, edge data is interned
+        self.edge_data = []
+        edge_data_ids = {}
+        self.succ_indptr = array('i', [0])
+        self.succ_indices = array('i')
+        self.succ_data = array('i')
+        for label in self.labels:
+            edges = sorted(((self._ids[e.to_node.label], e.data) for e in graph.nodes[label].succ),
+                           key = lambda x: x[0])
+            for to_id, data in edges:
+                if data not in edge_data_ids:
+                    edge_data_ids[data] = len(self.edge_data)
+                    self.edge_data.append(data)
+                self.succ_indices.append(to_id)
+                self.succ_data.append(edge_data_ids[data])
+            self.succ_indptr.append(len(self.succ_indices))
+        self._compute_closure()
+
+    def _compute_closure(self):
+        nodes_no = len(self.labels)
+        indptr, indices = self.succ_indptr, self.succ_indices
+        components = _strongly_connected(nodes_no, indptr, indices)
+        component_of = [0] * nodes_no
+        for c, component in enumerate(components):
+            for v in component:
+                component_of[v] = c
+
+        self.reach_start = array('i', [0]) * nodes_no
+        self.reach_end = array('i', [0]) * nodes_no
+        self.reach_indices = array('i')
+        self.cycles = []
+        for c, component in enumerate(components):
+            reach = set()
+            for v in component:
+                for pos in range(indptr[v], indptr[v + 1]):
+                    w = indices[pos]
+                    if component_of[w] == c:
+                        reach.update(component)
+                    else:
+                        reach.add(w)
+                        reach.update(self.reach_indices[self.reach_start[w]:self.reach_end[w]])
+            start = len(self.reach_indices)
+            self.reach_indices.extend(sorted(reach))
+            for v in component:
+                self.reach_start[v] = start
+                self.reach_end[v] = len(self.reach_indices)
+            if component[0] in reach:
+                self.cycles.append([self.labels[v] for v in component])
+
+    def __getstate__(self):
+        # arrays may be memory mapped buffers (see Bio.Ontology.IO.SnapshotIO)
+        state = dict(self.__dict__)
+        for k, v in state.items():
+            if isinstance(v, memoryview):
+                state[k] = array(v.format, v.tobytes())
+        return state
+
+    def __len__(self):
+        return len(self.labels)
+
+    def node_exists(self, u):
+        return u in self._ids
+
+    def get_id(self, u):
+        """
+        Returns integer id of node labeled u or None if there is no such node.
+        """
+        return self._ids.get(u)
+
+    def get_reachable_ids(self, nid):
+        """
+        Returns sorted array of ids of nodes reachable from node with given id.
+        """
+        return self.reach_indices[self.reach_start[nid]:self.reach_end[nid]]
+
+    def get_reachable(self, u):
+        """
+        Returns set of labels of nodes reachable from node labeled u.
+        """
+        labels = self.labels
+        return set(labels[i] for i in self.get_reachable_ids(self._ids[u]))
+
+    def get_successors(self, u):
+        """
+        Returns set of labels of direct successors of node labeled u.
+        """
+        nid = self._ids[u]
+        labels = self.labels
+        return set(labels[self.succ_indices[pos]]
+                   for pos in range(self.succ_indptr[nid], self.succ_indptr[nid + 1]))
+
+    def iter_edges(self):
+        """
+        Iterates over all edges as (u, v, data) tuples of labels and edge data.
+        """
+        labels = self.labels
+        for nid, u in enumerate(labels):
+            for pos in range(self.succ_indptr[nid], self.succ_indptr[nid + 1]):
+                yield (u, labels[self.succ_indices[pos]], self.edge_data[self.succ_data[pos]])
+
+    def __repr__(self):
+        return "FrozenDiGraph(nodes_num = {0}, edges_num = {1})".format(len(self.labels),
+                                                                     len(self.succ_indices))
+
 class DiEdge(object):
     """
     Class representing an edge in the graph.
@@ -11,6 +11,8 @@ from __future__ import print_function
 import sys
 import csv
 import collections
+from array import array
+from Bio._py3k import unicode
 from Bio.Ontology.Data import GeneAnnotation, TermAssociation
 from .Interfaces import OntoIterator, OntoReader
 
@@ -83,6 +85,90 @@ def _split_multi21(value):  # for extension in version 2.1, where field 8: "With
     else:
         return []
 
+def _read_version(handle):
+    """
+    Reads header of gaf file up to the version line and returns the version.
+    """
+    first = handle.readline()
+    version = None
+    while first and first[0] == '!':
+        if first.startswith('!gaf-version:'):
+            version = first[(first.find(':') + 1):].strip()
+            break
+        else:
+            first = handle.readline()
+    if not version:
+        raise ValueError("Invalid gaf file: No version specified.")
+    if version not in GAF_VERSION:
+        raise ValueError("Incorrect version.")
+    return version
+
+class GafIterator(OntoIterator):
+    """
+    Iterates over rows of gaf file (lists of fields), skipping comments.
+    
+    Rows are filtered while parsing, so only the wanted associations
+    are ever kept in memory:
+    
+    >>> with open("Ontology/ga_test.fb") as handle:
+    ...     rows = list(GafIterator(handle, exclude_evidence = ["ND"], aspects = ["P"]))
+    >>> len(rows)
+    44
+    >>> rows[0][4]
+    'GO:0048149'
+    """
+    
+    def __init__(self, file_handle, evidence = None, exclude_evidence = None,
+                 aspects = None, taxa = None, exclude_qualifiers = None):
+        """
+        Parameters:
+        ----------
+        - evidence - evidence codes of associations to keep (all by default)
+        - exclude_evidence - evidence codes of associations to skip, e.g. ["IEA"]
+        - aspects - aspects of associations to keep ("P", "F" or "C")
+        - taxa - taxons of genes to keep, e.g. ["taxon:9606"]
+        - exclude_qualifiers - skip associations with any of given
+          qualifiers, e.g. ["NOT"]
+        """
+        self.handle = file_handle
+        self.version = _read_version(file_handle)
+        self.fields = GAF_VERSION[self.version]
+        self._filters = []
+        if evidence is not None:
+            evidence = frozenset(evidence)
+            self._filters.append(lambda row: row[6] in evidence)
+        if exclude_evidence:
+            exclude_evidence = frozenset(exclude_evidence)
+            self._filters.append(lambda row: row[6] not in exclude_evidence)
+        if aspects is not None:
+            aspects = frozenset(aspects)
+            self._filters.append(lambda row: row[8] in aspects)
+        if taxa is not None:
+            taxa = frozenset(taxa)
+            self._filters.append(lambda row: row[12].split('|', 1)[0] in taxa)
+        if exclude_qualifiers:
+            exclude_qualifiers = frozenset(exclude_qualifiers)
+            self._filters.append(lambda row: not row[3] or
+                                 exclude_qualifiers.isdisjoint(row[3].split('|')))
+    
+    def __next__(self):
+        row_len = len(self.fields)
+        for line in self.handle:
+            if not line or line[0] == '!' or line in ('\n', '\r\n'):
+                continue
+            row = line.rstrip('\r\n').split('\t')
+            if len(row) != row_len:
+                raise ValueError("Invalid gaf file: Incorrect row length.")
+            for f in self._filters:
+                if not f(row):
+                    break
+            else:
+                return row
+        raise StopIteration
+    
+    def next(self):
+        return self.__next__()
+
 def _to_goa(obj_rows, version):
     row = obj_rows[0]
     
@@ -143,7 +229,7 @@ class GafReader(OntoReader):
 
     _ID_IDX = 1
     
-    def __init__(self, file_handle, assoc_format = "dict"):
+    def __init__(self, file_handle, assoc_format = "dict", **filters):
         """
         Parameters:
         ----------
@@ -151,33 +237,24 @@ class GafReader(OntoReader):
           o "dict" - as a dictionary (faster)
           o "in_mem_sql" - as dict-like object with underlying in-memory database
                          (more memory efficient)
+          o "compact" - as dict-like object storing associations in integer
+                         arrays (much more memory efficient, keeps only
+                         main association fields)
+        - filters - filters applied while parsing, see GafIterator
          
         """
         self.handle = file_handle
         self.assoc_format = assoc_format
+        self.filters = filters
 
     
     def read(self):
-        first = self.handle.readline()
-        version = None
-        while first and first[0] == '!':
-            if first.startswith('!gaf-version:'):
-                version = first[(first.find(':') + 1):].strip()
-                break
-            else:
-                first = self.handle.readline()
-        if not version:
-            raise ValueError("Invalid gaf file: No version specified.")
-        if version not in GAF_VERSION:
-            raise ValueError("Incorrect version.")
-        
-        tsv_iter = TsvIterator(self.handle)
+        gaf_iter = GafIterator(self.handle, **self.filters)
+        version = gaf_iter.version
         if self.assoc_format == "dict":
             raw_records = collections.defaultdict(list)
-            for row in tsv_iter:
-                first = row[0]
-                if not first.startswith('!'):
-                    raw_records[row[self._ID_IDX]].append(row)
+            for row in gaf_iter:
+                raw_records[row[self._ID_IDX]].append(row)
             return dict([(unicode(k), _to_goa(v, version)) for k, v in raw_records.items()]) # Possible py2 slow down
         elif self.assoc_format == "in_mem_sql":
             try:
@@ -185,10 +262,10 @@ class GafReader(OntoReader):
             except ImportError:
                 print("Error: To use in_mem_sql association you need to have sqlite3 bindings installed.", file=sys.stderr)
             else:
-                for row in tsv_iter:
-                    if not row[0].startswith('!'):
-                        sqla.add_row(row)
+                sqla.add_rows(gaf_iter)
                 return sqla
+        elif self.assoc_format == "compact":
+            return CompactAssoc(gaf_iter)
         else:
             raise ValueError("Incorrect assoc_format parameter.")
             
@@ -237,6 +314,25 @@ class InSqlAssoc(object):
             cur = self.con.cursor()
             cur.execute("INSERT INTO assocs VALUES (?" + (",?" * (len(self.fields) - 1)) + ");", row)
             self.con.commit()
+    
+    def add_rows(self, rows, batch_size = 10000):
+        """
+        Inserts many rows at once. Rows are inserted in batches, every batch
+        in a single transaction.
+        """
+        query = "INSERT INTO assocs VALUES (?" + (",?" * (len(self.fields) - 1)) + ");"
+        batch = []
+        for row in rows:
+            if len(row) != len(self.fields):
+                raise TypeError("Incorrect number of fields in a row.")
+            batch.append(row)
+            if len(batch) == batch_size:
+                self.con.executemany(query, batch)
+                self.con.commit()
+                batch = []
+        if batch:
+            self.con.executemany(query, batch)
+            self.con.commit()
           
     def __len__(self):
         cur = self.con.cursor()
@@ -284,3 +380,125 @@ class InSqlAssoc(object):
     
     def values(self):
         return list(self.itervalues())
+
+    
+class CompactAssoc(object):
+    """
+    Immutable dictionary-like structure storing annotations in columnar form.
+    
+    Strings are interned and associations are kept in integer arrays grouped
+    by gene, so it needs a small fraction of memory of the "dict" format.
+    GeneAnnotation objects are built on access. Only gene fields and
+    association fields listed in assoc_fields (besides GO_ID) are kept.
+    """
+    
+    _GENE_FIELDS = [0, 2, 9, 10, 11, 12]
+    _MULTI_FIELDS = set([3, 5, 7, 10, 12, 15])
+    
+    def __init__(self, gaf_iter, assoc_fields = ("Qualifier", "Evidence", "Aspect")):
+        """
+        Parameters:
+        ----------
+        - gaf_iter - GafIterator over the associations
+        - assoc_fields - names of association fields to keep, possible
+          values are: "Qualifier", "DB:Reference", "Evidence", "With",
+          "Aspect", "Date" and "Assigned_By"
+        """
+        self.version = gaf_iter.version
+        self._gene_fields = list(self._GENE_FIELDS)
+        if self.version != "1.0":
+            self._gene_fields += [15, 16]
+        self._assoc_fields = [4] + [GAF20FIELDS.index(f) for f in assoc_fields]
+        
+        self._strings = []
+        string_ids = {}
+        self._genes = []
+        self._gene_ids = {}
+        self._gene_attrs = []
+        row_genes = array('i')
+        columns = [array('i') for _ in self._assoc_fields]
+        
+        for row in gaf_iter:
+            gid = self._gene_ids.get(row[1])
+            if gid is None:
+                gid = len(self._genes)
+                self._gene_ids[row[1]] = gid
+                self._genes.append(row[1])
+                self._gene_attrs.append(tuple(self._intern(row[i], string_ids)
+                                              for i in self._gene_fields))
+            row_genes.append(gid)
+            for column, i in zip(columns, self._assoc_fields):
+                column.append(self._intern(row[i], string_ids))
+        
+        # group associations by gene keeping order from the file (counting sort)
+        self._indptr = array('i', [0]) * (len(self._genes) + 1)
+        for gid in row_genes:
+            self._indptr[gid + 1] += 1
+        for gid in range(len(self._genes)):
+            self._indptr[gid + 1] += self._indptr[gid]
+        positions = array('i', self._indptr[:-1])
+        order = array('i', [0]) * len(row_genes)
+        for r, gid in enumerate(row_genes):
+            order[positions[gid]] = r
+            positions[gid] += 1
+        del row_genes, positions
+        self._columns = [array('i', [column[r] for r in order]) for column in columns]
+    
+    def _intern(self, value, string_ids):
+        sid = string_ids.get(value)
+        if sid is None:
+            sid = len(self._strings)
+            string_ids[value] = sid
+            self._strings.append(value)
+        return sid
+    
+    def _value(self, field, sid):
+        value = self._strings[sid]
+        if field == 7 and self.version == "2.1":
+            return _split_multi21(value)
+        elif field in self._MULTI_FIELDS:
+            return _split_multi(value)
+        return value
+    
+    def get_terms(self, key):
+        """
+        Returns list of ids of terms associated with the gene.
+        """
+        gid = self._gene_ids[key]
+        terms = self._columns[0]
+        return [self._strings[terms[r]] for r in range(self._indptr[gid], self._indptr[gid + 1])]
+    
+    def __len__(self):
+        return len(self._genes)
+    
+    def __contains__(self, key):
+        return key in self._gene_ids
+    
+    def __getitem__(self, key):
+        gid = self._gene_ids[key]
+        attrs = dict((GAF20FIELDS[f], self._value(f, sid))
+                     for f, sid in zip(self._gene_fields, self._gene_attrs[gid]))
+        assocs = []
+        for r in range(self._indptr[gid], self._indptr[gid + 1]):
+            values = [column[r] for column in self._columns]
+            assocs.append(TermAssociation(self._strings[values[0]],
+                                          dict((GAF20FIELDS[f], self._value(f, sid))
+                                               for f, sid in zip(self._assoc_fields[1:], values[1:]))))
+        return GeneAnnotation(key, assocs, attrs)
+    
+    def __iter__(self):
+        for key in self._genes:
+            yield (key, self[key])
+
+    def itervalues(self):
+        for key in self._genes:
+            yield self[key]
+            
+    def iterkeys(self):
+        return iter(self._genes)
+            
+    def keys(self):
+        return list(self._genes)
+    
+    def values(self):
+        return list(self.itervalues())
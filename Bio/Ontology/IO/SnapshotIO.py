@@ -0,0 +1,383 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""
+Binary snapshots of parsed ontologies and annotations.
+
+Snapshot keeps a FrozenOntologyGraph (with its ancestors closure) or
+an annotations dictionary in a file that is loaded through memory
+mapping: integer arrays are used in place and terms or annotations are
+unpickled only when accessed. Snapshot records size, modification time
+and checksum of the file it was created from and is considered stale
+when any of them changes.
+
+Snapshots are caches created by the user - they contain pickled objects
+so never load snapshots from untrusted sources.
+"""
+
+import collections
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+
+from Bio.Ontology.Data import FrozenOntologyGraph
+
+SNAPSHOT_VERSION = 1
+
+_MAGIC = b"BIOONTOSNAP\n"
+_HEADER_LEN = struct.Struct("<Q")
+_ALIGN = 8
+
+try:
+    array('q')
+    _OFFSET_TYPECODE = 'q'
+except ValueError:
+    # Python 2 arrays have no 64 bit integers, doubles hold offsets exactly
+    _OFFSET_TYPECODE = 'd'
+
+def source_info(path, checksum = True):
+    """
+    Returns dictionary describing the file: its size, modification time
+    and (optionally) MD5 checksum of its content.
+    """
+    st = os.stat(path)
+    info = {"size" : st.st_size,
+            "mtime" : getattr(st, "st_mtime_ns", int(st.st_mtime * 1e9))}
+    if checksum:
+        md5 = hashlib.md5()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                md5.update(block)
+        info["checksum"] = md5.hexdigest()
+    return info
+
+class _LazyList(object):
+    """
+    Read-only sequence of objects pickled one by one into a buffer,
+    unpickled on first access.
+    """
+
+    def __init__(self, buf, offsets):
+        self._buf = buf
+        self._offsets = offsets
+        self._cache = {}
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        try:
+            return self._cache[i]
+        except KeyError:
+            start, end = int(self._offsets[i]), int(self._offsets[i + 1])
+            obj = pickle.loads(bytes(self._buf[start:end]))
+            self._cache[i] = obj
+            return obj
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+class SnapshotAnnotations(object):
+    """
+    Immutable dictionary-like structure with annotations loaded from
+    a snapshot. GeneAnnotation objects are unpickled on first access.
+    """
+
+    def __init__(self, keys, values):
+        self._keys = keys
+        self._index = dict((k, i) for i, k in enumerate(keys))
+        self._values = values
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __getitem__(self, key):
+        return self._values[self._index[key]]
+
+    def get(self, key, default = None):
+        i = self._index.get(key)
+        return default if i is None else self._values[i]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def iterkeys(self):
+        return iter(self._keys)
+
+    def itervalues(self):
+        return iter(self._values)
+
+    def iteritems(self):
+        return zip(self._keys, self._values)
+
+    def keys(self):
+        return list(self._keys)
+
+    def values(self):
+        return list(self._values)
+
+    def items(self):
+        return list(zip(self._keys, self._values))
+
+def _pickled_blob(objects):
+    offsets = array(_OFFSET_TYPECODE, [0])
+    chunks = []
+    for obj in objects:
+        chunks.append(pickle.dumps(obj, 2))
+        offsets.append(offsets[-1] + len(chunks[-1]))
+    return offsets, b"".join(chunks)
+
+def _text_blob(strings):
+    if any("\n" in x for x in strings):
+        raise ValueError("Identifiers containing new lines can't be stored in a snapshot.")
+    return "\n".join(strings).encode("utf-8")
+
+def _graph_sections(graph):
+    offsets, blob = _pickled_blob(graph.data)
+    sections = collections.OrderedDict()
+    sections["labels"] = _text_blob(graph.labels)
+    for name in ("succ_indptr", "succ_indices", "succ_data",
+                 "reach_start", "reach_end", "reach_indices"):
+        sections[name] = array('i', getattr(graph, name))
+    sections["data_offsets"] = offsets
+    sections["data"] = blob
+    meta = {"edge_data" : graph.edge_data,
+            "cycles" : graph.cycles,
+            "attrs" : graph.attrs,
+            "typedefs" : graph.typedefs,
+            "synonyms" : graph.synonyms}
+    return meta, sections
+
+def _annotations_sections(annotations):
+    keys = list(annotations.keys())
+    offsets, blob = _pickled_blob(annotations[k] for k in keys)
+    sections = collections.OrderedDict()
+    sections["keys"] = _text_blob(keys)
+    sections["offsets"] = offsets
+    sections["values"] = blob
+    return {}, sections
+
+def _params_key(params):
+    """
+    Returns string identifying reader parameters, recorded in the header.
+    """
+    return repr(sorted(params.items()))
+
+def write_snapshot(obj, path, source = None, params = None):
+    """
+    Writes snapshot of FrozenOntologyGraph (OntologyGraph is frozen first)
+    or of annotations dictionary to a file.
+
+    Parameters:
+     - obj - graph or annotations to store,
+     - path - path of the snapshot file,
+     - source - path of the file obj was read from (used for invalidation),
+     - params - dictionary of reader parameters obj was read with (used
+       for invalidation).
+    """
+    if hasattr(obj, "freeze"):
+        obj = obj.freeze()
+    if isinstance(obj, FrozenOntologyGraph):
+        kind = "graph"
+        meta, sections = _graph_sections(obj)
+    else:
+        kind = "annotations"
+        meta, sections = _annotations_sections(obj)
+
+    layout = []
+    pos = 0
+    for name, data in sections.items():
+        if isinstance(data, array):
+            typecode, data = data.typecode, _array_bytes(data)
+        else:
+            typecode = None
+        pos += -pos % _ALIGN
+        layout.append((name, typecode, pos, len(data)))
+        pos += len(data)
+    header = {"version" : SNAPSHOT_VERSION,
+              "kind" : kind,
+              "byteorder" : sys.byteorder,
+              "source" : source_info(source) if source is not None else None,
+              "params" : _params_key(params or {}),
+              "meta" : meta,
+              "sections" : layout}
+    header = pickle.dumps(header, 2)
+    start = len(_MAGIC) + _HEADER_LEN.size + len(header)
+    start += -start % _ALIGN
+
+    # old snapshot may still be memory mapped, so it is replaced, not overwritten
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_MAGIC)
+        f.write(_HEADER_LEN.pack(len(header)))
+        f.write(header)
+        for (name, _, offset, _), data in zip(layout, sections.values()):
+            if isinstance(data, array):
+                data = _array_bytes(data)
+            f.write(b"\0" * (start + offset - f.tell()))
+            f.write(data)
+    if os.path.exists(path) and not hasattr(os, "replace"):
+        os.remove(path) # Python 2 on Windows can't rename over existing file
+    getattr(os, "replace", os.rename)(tmp_path, path)
+
+def _array_bytes(data):
+    # array.tobytes is called tostring on Python 2
+    return data.tobytes() if hasattr(data, "tobytes") else data.tostring()
+
+def _read_header(f):
+    """
+    Reads header of the snapshot, returns None if the file is not
+    a snapshot or is truncated or corrupt.
+    """
+    if f.read(len(_MAGIC)) != _MAGIC:
+        return None
+    try:
+        header_len, = _HEADER_LEN.unpack(f.read(_HEADER_LEN.size))
+        header = pickle.loads(f.read(header_len))
+        start = len(_MAGIC) + _HEADER_LEN.size + header_len
+        header["start"] = start + -start % _ALIGN
+        end = max([header["start"] + offset + length
+                   for _, _, offset, length in header["sections"]] or [0])
+    except Exception:
+        # e.g. struct.error, EOFError or UnpicklingError
+        return None
+    if os.fstat(f.fileno()).st_size < end:
+        return None
+    return header
+
+def _section(data, start, end, typecode):
+    """
+    Returns part of the memory mapped file, as array of given type if
+    the typecode is not None.
+    """
+    try:
+        view = memoryview(data)[start:end]
+    except TypeError:
+        # Python 2 mmap objects don't support memoryview, so the section
+        # is copied
+        view = data[start:end]
+        if typecode is None:
+            return view
+        section = array(typecode)
+        section.fromstring(view)
+        return section
+    return view.cast(typecode) if typecode else view
+
+def is_valid(header, source, verify_checksum = False, params = None):
+    """
+    Checks whether snapshot with given header is compatible with this
+    version of Biopython and is up to date with its source file and, if
+    params is given, was read with the same reader parameters.
+    """
+    if header is None or header.get("version") != SNAPSHOT_VERSION \
+            or header["byteorder"] != sys.byteorder:
+        return False
+    for _, typecode, _, _ in header["sections"]:
+        try:
+            if typecode is not None:
+                array(typecode)
+        except ValueError:
+            # e.g. 64 bit integers written by Python 3 read by Python 2
+            return False
+    if params is not None and header.get("params") != _params_key(params):
+        return False
+    if source is None:
+        return True
+    recorded = header["source"]
+    if recorded is None:
+        return False
+    current = source_info(source, verify_checksum)
+    return all(recorded[k] == v for k, v in current.items())
+
+def load_snapshot(path, source = None, verify_checksum = False, params = None):
+    """
+    Loads snapshot written by write_snapshot. Returns FrozenOntologyGraph
+    or SnapshotAnnotations or None if the snapshot does not exist,
+    was written by incompatible version or is stale.
+
+    Parameters:
+     - path - path of the snapshot file,
+     - source - path of the source file, if given size and modification
+       time of the file must match the ones recorded in the snapshot,
+     - verify_checksum - also compare checksum of the source file
+       (requires reading the whole source file),
+     - params - if given, dictionary of reader parameters which must match
+       the ones recorded in the snapshot.
+    """
+    try:
+        f = open(path, "rb")
+    except IOError:
+        return None
+    with f:
+        header = _read_header(f)
+        if not is_valid(header, source, verify_checksum, params):
+            return None
+        buf = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+
+    start = header["start"]
+    sections = {}
+    for name, typecode, offset, length in header["sections"]:
+        sections[name] = _section(buf, start + offset, start + offset + length,
+                                  typecode)
+
+    if header["kind"] == "graph":
+        graph = FrozenOntologyGraph.__new__(FrozenOntologyGraph)
+        graph.__dict__.update(header["meta"])
+        graph.labels = _split_text(sections["labels"])
+        graph._ids = dict((label, i) for i, label in enumerate(graph.labels))
+        graph.data = _LazyList(sections["data"], sections["data_offsets"])
+        for name in ("succ_indptr", "succ_indices", "succ_data",
+                     "reach_start", "reach_end", "reach_indices"):
+            setattr(graph, name, sections[name])
+        return graph
+    return SnapshotAnnotations(_split_text(sections["keys"]),
+                               _LazyList(sections["values"], sections["offsets"]))
+
+def _split_text(buf):
+    text = bytes(buf).decode("utf-8")
+    return text.split("\n") if text else []
+
+def read(path, file_format, snapshot = None, verify_checksum = False, **params):
+    """
+    Reads ontology ("obo") or annotations ("gaf") file using its snapshot.
+
+    If snapshot is up to date it is loaded, otherwise the file is parsed
+    and a new snapshot is written. Ontology is returned as
+    FrozenOntologyGraph.
+
+    Parameters:
+     - path - path of the source file,
+     - file_format - "obo" or "gaf",
+     - snapshot - path of the snapshot file (by default source path with
+       ".snapshot" suffix),
+     - verify_checksum - compare checksum of the source file, not only its
+       size and modification time,
+     - params - additional parameters passed to the reader (a snapshot
+       written with different parameters is stale).
+    """
+    from Bio.Ontology import IO
+
+    if file_format not in ("obo", "gaf"):
+        raise ValueError("Snapshots are not supported for format '%s'" % file_format)
+    if snapshot is None:
+        snapshot = path + ".snapshot"
+    result = load_snapshot(snapshot, path, verify_checksum, params)
+    if result is None:
+        result = IO.read(path, file_format, **params)
+        write_snapshot(result, snapshot, path, params)
+        result = load_snapshot(snapshot)
+    return result
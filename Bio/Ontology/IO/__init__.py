@@ -17,6 +17,7 @@ from . import GraphIO
 from . import PrettyIO
 from . import NexoIO
 from . import EnrichmentIO
+from . import SnapshotIO
 
 _FormatToIterator = { "obo" : OboIO.OboIterator,
                       "tsv" : GoaIO.TsvIterator}
@@ -97,6 +98,28 @@ def read(handle, file_format, **params):
         else:
             raise ValueError("Unknown format '%s'" % file_format)
 
+def read_snapshot(path, file_format, snapshot = None, verify_checksum = False, **params):
+    """
+    Read file in given format using its binary snapshot.
+    
+    Up to date snapshot is loaded through memory mapping, otherwise the file
+    is parsed and the snapshot is (re)written. Snapshot is stale when size,
+    modification time or (if verify_checksum is set) checksum of the file
+    changes, or when it was written with different reader parameters.
+    Ontologies are returned as FrozenOntologyGraph.
+    
+    Parameters:
+     - path - path of the file to read,
+     - file_format - lower case string describing the file format,
+         Formats:
+             - obo
+             - gaf
+     - snapshot - path of the snapshot file, by default path + ".snapshot",
+     - verify_checksum - check also checksum of the file,
+     - params - additional parameters passed to the reader
+    """
+    return SnapshotIO.read(path, file_format, snapshot, verify_checksum, **params)
+
 def parse(handle, file_format):
     """
     Iterate over a gene ontology file.
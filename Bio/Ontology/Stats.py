@@ -9,15 +9,26 @@ data.
 """
 from Bio._py3k import range
 
+import bisect
+import collections
+from array import array
 from math import log, exp
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 _g = 7
 _p = [0.99999999999980993, 676.5203681218851, -1259.1392167224028,
      771.32342877765313, -176.61502916214059, 12.507343278686905,
      -0.13857109526572012, 9.9843695780195716e-6, 1.5056327351493116e-7]
 
-""" Store logarithm of factorial of n for speedup:"""
-_lnf = {}  
+""" Store logarithm of factorial of n for speedup (contiguous, index is n):"""
+_lnf = array('d', [0.0])
+
+""" Factorials of bigger numbers are computed, but not stored:"""
+_LNF_MAX = 2 ** 22
 
 def lngamma(z):
     """
@@ -39,12 +50,11 @@ def lnfactorial(n):
     if n < 1: 
         return 0 
     
-    try:
-        return _lnf[n]
-    except KeyError:
-        r =  lngamma(n + 1)
-        _lnf[n] = r
-        return r
+    if n >= len(_lnf):
+        if n > _LNF_MAX:
+            return lngamma(n + 1)
+        _lnf.extend(lngamma(i + 1) for i in range(len(_lnf), n + 1))
+    return _lnf[n]
 
 
 def lncombination(n, k):
@@ -100,6 +110,149 @@ def hypergeometric_test(k, n, K, N):
 
     return one_tail if one_tail < 1.0 else 1.0
 
+class HypergeometricTable(object):
+    """
+    Precomputed hypergeometric distributions for a population of size N
+    containing K successes.
+
+    For every number of draws n the whole distribution is computed once,
+    from the stored log-factorials, together with its cumulative tails,
+    so every test afterwards costs O(1) (two tail test O(log n)).
+    Distributions for at most max_draws different n are kept. Values of k
+    outside of the support fall back to the functions computing the
+    probabilities term by term.
+
+    >>> table = HypergeometricTable(20, 100)
+    >>> table.test(3, 10) == hypergeometric_test(3, 10, 20, 100)
+    True
+    """
+
+    def __init__(self, K, N, max_draws = 16):
+        self.K = K
+        self.N = N
+        self.max_draws = max_draws
+        lnfactorial(N) # make sure all needed log-factorials are stored
+        self._dists = collections.OrderedDict()
+
+    def _lncombination(self, n, k):
+        if 0 <= k <= n <= _LNF_MAX:
+            return _lnf[n] - _lnf[k] - _lnf[n - k]
+        return lncombination(n, k)
+
+    def _get_dist(self, n):
+        """
+        Returns [lm, probs, tails, sorted_probs, sorted_sums] for n draws,
+        where probs[i - lm] is probability of i successes, tails[i - lm] is
+        probability of i or more successes and sorted_sums[j] is sum of
+        the j smallest probabilities. The last two are None until
+        _get_sorted is called.
+        """
+        try:
+            dist = self._dists.pop(n)
+        except KeyError:
+            K, N = self.K, self.N
+            lm = max(0, n + K - N)
+            um = min(n, K)
+            total = self._lncombination(N, n)
+            probs = [exp(self._lncombination(K, i) + self._lncombination(N - K, n - i) - total)
+                     for i in range(lm, um + 1)]
+            tails = [0.0] * (len(probs) + 1)
+            for i in range(len(probs) - 1, -1, -1):
+                tails[i] = tails[i + 1] + probs[i]
+            dist = [lm, probs, tails, None, None]
+            if len(self._dists) >= self.max_draws:
+                self._dists.popitem(last = False)
+        self._dists[n] = dist
+        return dist
+
+    def _get_sorted(self, n):
+        dist = self._get_dist(n)
+        if dist[3] is None:
+            sorted_probs = sorted(dist[1])
+            sorted_sums = [0.0]
+            for p in sorted_probs:
+                sorted_sums.append(sorted_sums[-1] + p)
+            dist[3:] = [sorted_probs, sorted_sums]
+        return dist
+
+    def probability(self, k, n):
+        """
+        Returns probability of k successes in n draws.
+        """
+        lm, probs = self._get_dist(n)[:2]
+        if lm <= k < lm + len(probs):
+            return probs[k - lm]
+        return hypergeometric_probability(k, n, self.K, self.N)
+
+    def test(self, k, n):
+        """
+        Returns the same value as hypergeometric_test(k, n, K, N).
+        """
+        lm, probs, tails = self._get_dist(n)[:3]
+        if not lm <= k < lm + len(probs):
+            return hypergeometric_test(k, n, self.K, self.N)
+        # probability of k is counted twice, just like in hypergeometric_test
+        one_tail = probs[k - lm] + tails[k - lm]
+        return one_tail if one_tail < 1.0 else 1.0
+
+    def two_tail_test(self, k, n):
+        """
+        Returns the same value as hypergeometric_two_tail_test(k, n, K, N).
+        """
+        lm, probs, _, sorted_probs, sorted_sums = self._get_sorted(n)
+        if not lm <= k < lm + len(probs):
+            return hypergeometric_two_tail_test(k, n, self.K, self.N)
+        if len(probs) == 1:
+            return 1.0
+        prob = probs[k - lm]
+        two_tail = sorted_sums[bisect.bisect_left(sorted_probs, prob + 1e-15)]
+        return two_tail if two_tail < 1.0 else 1.0
+
+
+class HypergeometricCache(object):
+    """
+    LRU-bounded collection of HypergeometricTable objects keyed on (N, K).
+
+    Enrichment finders keep one such cache and reuse it across runs.
+
+    >>> cache = HypergeometricCache()
+    >>> cache.test(3, 10, 20, 100) == hypergeometric_test(3, 10, 20, 100)
+    True
+    """
+
+    def __init__(self, max_tables = 1024, max_draws = 16):
+        self.max_tables = max_tables
+        self.max_draws = max_draws
+        self._tables = collections.OrderedDict()
+
+    def get_table(self, K, N):
+        """
+        Returns HypergeometricTable for population of size N containing
+        K successes.
+        """
+        key = (N, K)
+        try:
+            table = self._tables.pop(key)
+        except KeyError:
+            table = HypergeometricTable(K, N, self.max_draws)
+            if len(self._tables) >= self.max_tables:
+                self._tables.popitem(last = False)
+        self._tables[key] = table
+        return table
+
+    def test(self, k, n, K, N):
+        """
+        Cached version of hypergeometric_test.
+        """
+        return self.get_table(K, N).test(k, n)
+
+    def two_tail_test(self, k, n, K, N):
+        """
+        Cached version of hypergeometric_two_tail_test.
+        """
+        return self.get_table(K, N).two_tail_test(k, n)
+
+
 def bonferroni_correction(pvals):
     """
     Bonferroni correction.
@@ -176,6 +329,42 @@ def kolmogorov_smirnov_rank_test(gene_set, gene_list, adj_corr, plot=False):
     return (Dn, stat_plot)
 
 
+def kolmogorov_smirnov_rank_matrix(membership, perms, adj_corr):
+    """
+    Vectorized kolmogorov_smirnov_rank_test computing enrichment scores of
+    many gene sets over many permutations of a ranking at once (requires
+    NumPy).
+
+    Parameters
+    ----------
+    membership - boolean array of shape (sets, genes); membership[s, j] is
+        True if j-th gene of the ranking belongs to s-th gene set
+    perms - integer array of shape (permutations, genes); every row lists
+        positions of the ranking in permuted order
+    adj_corr - array of gene weights (already raised to the power of p)
+
+    Returns array of shape (sets, permutations) holding ES for every gene set
+    and permutation. Scores are equal to those computed by
+    kolmogorov_smirnov_rank_test for the permuted gene lists.
+    """
+    N = membership.shape[1]
+    Nh = membership.sum(axis=1)
+    miss_pen = numpy.where(Nh == N, 1., 1. / numpy.maximum(N - Nh, 1))
+
+    hits = membership[:, perms]
+    # cumsum adds elements sequentially, so the sums are the same as
+    # in the pure Python implementation (numpy.sum would be pairwise)
+    Nr = numpy.cumsum(numpy.where(hits, adj_corr, 0.), axis=2)[:, :, -1:]
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        steps = numpy.where(hits, adj_corr / Nr, -miss_pen[:, None, None])
+    cval = numpy.cumsum(steps, axis=2)
+    # first position of the maximal deviation from zero
+    pos = numpy.abs(cval).argmax(axis=2)
+    sets, perms_no = pos.shape
+    return cval[numpy.arange(sets)[:, None], numpy.arange(perms_no)[None, :],
+                pos]
+
+
 
 
 
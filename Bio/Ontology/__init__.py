@@ -12,9 +12,87 @@ from Bio._py3k import range, filter
 
 
 import collections
+import multiprocessing
 import random, math, bisect
 from . import Stats
 from . import IdResolver
+from Bio._utils import _get_pool
+
+""" Object shared with worker processes of the current pool:"""
+_shared = None
+
+def _init_worker(obj):
+    global _shared
+    _shared = obj
+
+def _call_shared(task):
+    method_name, args = task
+    return getattr(_shared, method_name)(*args)
+
+def _split(items, parts):
+    """
+    Splits list into given number of contiguous, almost equal chunks.
+    """
+    parts = max(1, min(parts, len(items)))
+    size, rest = divmod(len(items), parts)
+    chunks = []
+    start = 0
+    for i in range(parts):
+        stop = start + size + (1 if i < rest else 0)
+        chunks.append(items[start:stop])
+        start = stop
+    return chunks
+
+def _jobs_no(n_jobs):
+    return n_jobs if n_jobs is not None else multiprocessing.cpu_count()
+
+class _PermutationScorer(object):
+    """
+    Scores batches of permutations of a ranking for given gene sets
+    (shared with the worker processes of GseaEnrichmentFinder).
+    """
+    def __init__(self, terms_sets, gene_list, adj_corr, max_block):
+        self.terms_sets = terms_sets
+        self.gene_list = gene_list
+        self.adj_corr = adj_corr
+        self.max_block = max_block
+        numpy = Stats.numpy
+        if numpy is not None:
+            positions = collections.defaultdict(list)
+            for i, gene in enumerate(gene_list):
+                positions[gene].append(i)
+            self.membership = numpy.zeros((len(terms_sets), len(gene_list)),
+                                          dtype=bool)
+            for t, (_, gene_set) in enumerate(terms_sets):
+                for gene in gene_set:
+                    self.membership[t, positions.get(gene, [])] = True
+            self.weights = numpy.array(adj_corr, dtype=float)
+
+    def score(self, batch):
+        """
+        Returns list of scores of the permutations in the batch for every
+        gene set.
+        """
+        numpy = Stats.numpy
+        if numpy is None:
+            scores = [[] for _ in self.terms_sets]
+            for perm in batch:
+                perm_list = [self.gene_list[i] for i in perm]
+                for term_scores, (_, gene_set) in zip(scores, self.terms_sets):
+                    perm_es, _ = Stats.kolmogorov_smirnov_rank_test(gene_set,
+                                                                    perm_list, self.adj_corr)
+                    term_scores.append(perm_es)
+            return scores
+        perms = numpy.array(batch, dtype=numpy.intp)
+        terms_no = len(self.terms_sets)
+        scores = numpy.empty((terms_no, len(batch)))
+        # split terms so the score block never exceeds max_block cells
+        chunk = max(1, self.max_block // (len(batch) * max(len(self.gene_list), 1)))
+        for start in range(0, terms_no, chunk):
+            scores[start:start + chunk] = \
+                Stats.kolmogorov_smirnov_rank_matrix(self.membership[start:start + chunk],
+                                                     perms, self.weights)
+        return scores.tolist()
 
 class EnrichmentEntry(object):
     """
@@ -97,20 +175,54 @@ class BaseEnrichmentFinder(EnrichmentFinder):
         
         self.ontology_graph = ontology_graph
         self.annotations = annotations
-        self.resolver = resolver_generator(self.annotations.itervalues())
+        self.resolver = resolver_generator(self.annotations.values())
+        # hypergeometric distributions reused across runs
+        self._hypergeometric = Stats.HypergeometricCache()
     
 
+    def _map(self, method_name, args_list, n_jobs = 1):
+        """
+        Calls given method for every tuple of arguments and returns the list
+        of results. If n_jobs is not 1 calls are run in worker processes
+        sharing this finder.
+        """
+        if n_jobs == 1 or len(args_list) < 2:
+            return [getattr(self, method_name)(*args) for args in args_list]
+        pool = _get_pool(_jobs_no(n_jobs), self, _init_worker)
+        try:
+            return pool.map(_call_shared, [(method_name, args) for args in args_list])
+        finally:
+            pool.close()
+            pool.join()
+
+    def find_enrichment_many(self, gene_lists, n_jobs = None, **params):
+        """
+        Finds enrichment for every of given gene lists (or gene ranks)
+        in parallel. Returns list of Enrichment objects in the same order.
+        
+        Annotations and ontology graph are shared with the worker
+        processes once, not sent with every task. Results are the same
+        as of running find_enrichment one by one (for GSEA give a seed).
+        
+        Parameters
+        ----------
+        gene_lists - list of arguments for find_enrichment
+        n_jobs - number of worker processes, by default number of CPUs
+        params - additional parameters passed to find_enrichment
+        """
+        gene_lists = list(gene_lists)
+        return self._map("_find_enrichment_params",
+                         [(genes, params) for genes in gene_lists], n_jobs)
+
+    def _find_enrichment_params(self, genes, params):
+        return self.find_enrichment(genes, **params)
+
     def _find_terms_associations(self, gene_list):
         terms_assocs = collections.defaultdict(set)
         for gene in gene_list:                
             if gene in self.annotations:
-                enriched_terms = set()
-                for term in self.annotations[gene].associations:
-                    node = self.ontology_graph.get_node(term.term_id)
-                    if node != None:
-                        nid = node.data.id # because enrichments may use synonyms instead of ids
-                        enriched_terms.add(nid)
-                        enriched_terms |= self.ontology_graph.get_ancestors(nid)
+                enriched_terms = self.ontology_graph.get_closure(term.term_id for term
+                                                in self.annotations[gene].associations)
                 for t in enriched_terms:
                     terms_assocs[t].add(gene)
         return terms_assocs
@@ -219,7 +331,7 @@ class TermForTermEnrichmentFinder(BaseEnrichmentFinder):
         self.terms_to_population_genes = self._find_terms_associations(self.population)
 
         
-    def find_enrichment(self, gene_list, corrections = []):
+    def find_enrichment(self, gene_list, corrections = [], n_jobs = 1):
         """
         Finds enrichment of specified group of genes.
         
@@ -230,6 +342,8 @@ class TermForTermEnrichmentFinder(BaseEnrichmentFinder):
             Possible values are:
                 o "bonferroni" - Bonferroni correction,
                 o "bh_fdr" - Benjamin-Hochberg FDR correction.
+        n_jobs - number of processes computing p-values (None for number
+            of CPUs)
         """
         
         result = []
@@ -242,25 +356,32 @@ class TermForTermEnrichmentFinder(BaseEnrichmentFinder):
         
         study_size = len(resolved_list)
 
-        population_size = len(self.population)
         # Calculate enrichment for every term given the counts (term for term)
-        for term, study_set in terms_to_study_genes.items():
+        chunks = _split(list(terms_to_study_genes.items()), _jobs_no(n_jobs))
+        for entries in self._map("_get_entries", [(c, study_size) for c in chunks], n_jobs):
+            result += entries
+        # Calculate chosen corrections
+        BaseEnrichmentFinder._calculate_corrections(result, corrections)
+        
+        # check for warnings
+        if len(self.ontology_graph.cycles) > 0:
+            warnings.append("Graph contains cycles: " + str(self.ontology_graph.cycles))
+        return Enrichment("term_for_term", result, warnings, corrections)
+
+    def _get_entries(self, terms_study_sets, study_size):
+        result = []
+        population_size = len(self.population)
+        for term, study_set in terms_study_sets:
             study_hits = len(study_set)
             population_hits = len(self.terms_to_population_genes[term])
-            pval = Stats.hypergeometric_test(study_hits, study_size,
+            pval = self._hypergeometric.test(study_hits, study_size,
                                              population_hits, population_size)
 
             entry = EnrichmentEntry(term, self.ontology_graph.get_term(term).name, pval)
             entry.attrs = {"study_hits" : study_hits, 
                             "population_hits" : population_hits, }
             result.append(entry)
-        # Calculate chosen corrections
-        BaseEnrichmentFinder._calculate_corrections(result, corrections)
-        
-        # check for warnings
-        if len(self.ontology_graph.cycles) > 0:
-            warnings.append("Graph contains cycles: " + str(self.ontology_graph.cycles))
-        return Enrichment("term_for_term", result, warnings, corrections)
+        return result
 
 
 class ParentChildEnrichmentFinder(BaseEnrichmentFinder):
@@ -316,7 +437,7 @@ class ParentChildEnrichmentFinder(BaseEnrichmentFinder):
     def _count_op_items(self, set_list, set_op):
         return len(set_op(*set_list)) if len(set_list) > 0 else 0
         
-    def find_enrichment(self, gene_list, corrections = [], method = "union"):
+    def find_enrichment(self, gene_list, corrections = [], method = "union", n_jobs = 1):
         """
         Finds enrichment of specified group of genes. Method takes
         the parent-child relationship into account when computing p-value.
@@ -333,23 +454,38 @@ class ParentChildEnrichmentFinder(BaseEnrichmentFinder):
             Possible values are:
                 o "union",
                 o "intersection"
+        n_jobs - number of processes computing p-values (None for number
+            of CPUs)
         """
         
         result = []
         warnings = []
         
-        if method == "union":
-                set_op = set.union
-        elif method == "intersection":
-                set_op = set.intersection
-        else:
+        if method not in ("union", "intersection"):
                 raise ValueError("{0} is not correct method type.".format(method))
             
         resolved_list = self._resolve_ids(gene_list, warnings)
             
         terms_to_study_genes = self._find_terms_associations(resolved_list)
 
-        for term, study_set in terms_to_study_genes.items():
+        chunks = _split(list(terms_to_study_genes.keys()), _jobs_no(n_jobs))
+        args_list = [(c, terms_to_study_genes, method) for c in chunks]
+        for entries in self._map("_get_entries", args_list, n_jobs):
+            result += entries
+        
+        # Calculate chosen corrections
+        BaseEnrichmentFinder._calculate_corrections(result, corrections)
+        
+        # check for warnings
+        if len(self.ontology_graph.cycles) > 0:
+            warnings.append("Graph contains cycles: " + str(self.ontology_graph.cycles))
+        return Enrichment("parent_child_" + method, result, warnings, corrections)
+    
+    def _get_entries(self, terms, terms_to_study_genes, method):
+        result = []
+        set_op = set.union if method == "union" else set.intersection
+        for term in terms:
+            study_set = terms_to_study_genes[term]
             study_hits = len(study_set)
             population_hits = len(self.terms_to_population_genes[term])
             study_set_list = []
@@ -364,21 +500,14 @@ class ParentChildEnrichmentFinder(BaseEnrichmentFinder):
             population_parents_size = self._count_op_items(pop_set_list, set_op)
             
             if study_hits <= parents_study_size and population_hits <= population_parents_size:
-                pval = Stats.hypergeometric_test(study_hits, parents_study_size,
-                                             population_hits, population_parents_size)
+                pval = self._hypergeometric.test(study_hits, parents_study_size,
+                                                 population_hits, population_parents_size)
 
                 entry = EnrichmentEntry(term, self.ontology_graph.get_term(term).name, pval)
                 entry.attrs = {"study_hits" : study_hits, "parents_study_size": parents_study_size,
                             "population_hits" : population_hits, "population_parents_size" : population_parents_size}
                 result.append(entry)
-        
-        # Calculate chosen corrections
-        BaseEnrichmentFinder._calculate_corrections(result, corrections)
-        
-        # check for warnings
-        if len(self.ontology_graph.cycles) > 0:
-            warnings.append("Graph contains cycles: " + str(self.ontology_graph.cycles))
-        return Enrichment("parent_child_" + method, result, warnings, corrections)
+        return result
     
     
     def _parent_sizes(self, gene_list, method = "union"):
@@ -459,8 +588,8 @@ class ParentChildEnrichmentFinder(BaseEnrichmentFinder):
             population_parents_size = population_parents_sizes[term]
             
             if study_hits <= parents_study_size and population_hits <= population_parents_size:
-                pval = Stats.hypergeometric_test(study_hits, parents_study_size,
-                                             population_hits, population_parents_size)
+                pval = self._hypergeometric.test(study_hits, parents_study_size,
+                                                 population_hits, population_parents_size)
 
                 entry = EnrichmentEntry(term, self.ontology_graph.get_term(term).name, pval)
                 result.append(entry)
@@ -471,6 +600,134 @@ class ParentChildEnrichmentFinder(BaseEnrichmentFinder):
             warnings.append("Graph contains cycles: " + str(self.ontology_graph.cycles))
         return Enrichment("parent_child_" + method, result, warnings, [])
 
+    def _get_slices_results(self, gene_list, start, stop, population_parents_sizes,
+                            method, plot, incremental = True):
+        """
+        Finds ranked enrichment of slices gene_list[:start + 1] up to
+        gene_list[:stop]. Returns dictionary from term to list of p-values
+        (only the lowest one unless plot is set) and list of warnings.
+        """
+        if incremental:
+            return self._get_incremental_slices_results(gene_list, start, stop,
+                                                        population_parents_sizes,
+                                                        method, plot)
+        results = collections.defaultdict(list)
+        warnings = []
+        for i in range(start, stop):
+            slice_res = self._find_ranked_enrichment(gene_list[:i + 1],
+                                                     population_parents_sizes, method = method)
+            warnings += slice_res.warnings
+            if plot:
+                for e in slice_res.entries:
+                    results[e.id].append(e.p_value)
+            else:
+                for e in slice_res.entries:
+                    if results[e.id] != []:
+                        if e.p_value < results[e.id][0]:
+                            results[e.id] = [e.p_value]
+                    else:
+                        results[e.id] = [e.p_value]
+        return results, warnings
+
+    def _get_incremental_slices_results(self, gene_list, start, stop,
+                                        population_parents_sizes, method, plot):
+        """
+        Gives the same results as _get_slices_results, but genes are added
+        to the study set one by one. Adding a gene changes only the counts
+        of terms from its ancestors closure and parents sizes of their
+        children, so only p-values of these terms are recomputed.
+        """
+        if method not in ("union", "intersection"):
+            raise ValueError("{0} is not correct method type.".format(method))
+        
+        # every slice reports warnings from resolving all its genes
+        genes_warnings = []
+        resolved_list = []
+        for gene in gene_list[:stop]:
+            genes_warnings.append([])
+            resolved_list += self._resolve_ids([gene], genes_warnings[-1])
+        prefix_warnings = []
+        slice_warnings = []
+        if len(self.ontology_graph.cycles) > 0:
+            slice_warnings.append("Graph contains cycles: " + str(self.ontology_graph.cycles))
+        
+        closures = {}
+        for gene in resolved_list:
+            if gene in self.annotations and gene not in closures:
+                closures[gene] = self.ontology_graph.get_closure(term.term_id for term
+                                                in self.annotations[gene].associations)
+        # only terms from closures of the genes can ever be reported
+        universe = set().union(*closures.values())
+        children = collections.defaultdict(list)
+        parents_no = {}
+        for term in universe:
+            parents = self.ontology_graph.get_parents(term)
+            parents_no[term] = len(parents)
+            for parent in parents:
+                if parent in universe:
+                    children[parent].append(term)
+        
+        study_hits = collections.defaultdict(int)
+        parents_study_sizes = collections.defaultdict(int)
+        order = {}
+        p_values = {}
+        results = collections.defaultdict(list)
+        warnings = []
+        added = set()
+        for i, gene in enumerate(resolved_list):
+            prefix_warnings += genes_warnings[i]
+            changed = set()
+            if gene in closures and gene not in added:
+                added.add(gene)
+                closure = closures[gene]
+                changed.update(closure)
+                for term in closure:
+                    if term not in order:
+                        order[term] = len(order)
+                    study_hits[term] += 1
+                # the new gene belongs to union (intersection) of parents study
+                # sets of a term if it is annotated to any (every) of its parents
+                annotated_parents = collections.defaultdict(int)
+                for parent in closure:
+                    for term in children[parent]:
+                        annotated_parents[term] += 1
+                for term, count in annotated_parents.items():
+                    if method == "union" or count == parents_no[term]:
+                        parents_study_sizes[term] += 1
+                        changed.add(term)
+            if i < start:
+                continue
+            # terms are visited in order of their appearance, just like
+            # in the entries of _find_ranked_enrichment
+            if i == start:
+                changed = list(study_hits)
+            else:
+                changed = sorted((term for term in changed if term in order),
+                                 key = order.get)
+            
+            for term in changed:
+                hits = study_hits[term]
+                parents_study_size = parents_study_sizes[term]
+                population_hits = len(self.terms_to_population_genes[term])
+                population_parents_size = population_parents_sizes[term]
+                if hits <= parents_study_size and population_hits <= population_parents_size:
+                    p_values[term] = self._hypergeometric.test(hits, parents_study_size,
+                                                               population_hits, population_parents_size)
+                else:
+                    p_values.pop(term, None)
+            
+            warnings += prefix_warnings + slice_warnings
+            if plot:
+                for term in study_hits:
+                    if term in p_values:
+                        results[term].append(p_values[term])
+            else:
+                for term in changed:
+                    p_value = p_values.get(term)
+                    if p_value is not None and (term not in results or p_value < results[term][0]):
+                        results[term] = [p_value]
+        return results, warnings
+
 class GseaEnrichmentFinder(BaseEnrichmentFinder):
     """
     Utility for finding enriched group of terms given list of genes ranked
@@ -501,7 +758,15 @@ class GseaEnrichmentFinder(BaseEnrichmentFinder):
     >>> print(result)
     Enrichment found using GSEA method: 12 entries, 1 warnings.
     
+    If NumPy is installed, permutations are scored in batches for all
+    the terms at once, otherwise pure Python implementation is used.
+    Both give the same results for the same seed.
+    
     """
+    
+    # maximal number of cells (terms x permutations x genes) scored at once
+    _MAX_BLOCK = 2 ** 22
+    
     def __init__(self, annotations, ontology_graph,
                  resolver_generator = IdResolver.FirstOneResolver):
         """
@@ -516,16 +781,67 @@ class GseaEnrichmentFinder(BaseEnrichmentFinder):
         
         super(GseaEnrichmentFinder, self).__init__(annotations, ontology_graph,
                                                      resolver_generator)
-    def _get_perms(self, gene_list, perms_no):
-        perms = []
-        permutation = list(gene_list)
+    def _iter_perms(self, genes_no, perms_no, batch_size):
+        """
+        Yields batches of permutations of ranking positions. Permutations
+        are generated lazily so only one batch is kept in memory.
+        """
+        permutation = list(range(genes_no))
+        batch = []
         for _ in range(perms_no):
             random.shuffle(permutation)
-            perms.append(list(permutation))
-        return perms
+            batch.append(list(permutation))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _get_perms_scores(self, enriched_terms, gene_list, adj_corr,
+                          perms_no, batch_size, n_jobs = 1):
+        """
+        Computes enrichment scores of every term for every permutation
+        of the ranking. Returns dictionary from term to list of scores.
+        
+        Permutations are generated once, in this process, from the current
+        random state. With several processes the batches of permutations
+        are scored by workers sharing the terms, a few batches at a time.
+        """
+        terms_sets = list(enriched_terms.items())
+        scorer = _PermutationScorer(terms_sets, gene_list, adj_corr,
+                                    self._MAX_BLOCK)
+        perms_scores = dict((term, []) for term, _ in terms_sets)
+        batches = self._iter_perms(len(gene_list), perms_no, batch_size)
+        jobs = _jobs_no(n_jobs)
+        if jobs == 1 or perms_no <= batch_size:
+            results = (scorer.score(batch) for batch in batches)
+            self._add_perms_scores(perms_scores, terms_sets, results)
+            return perms_scores
+        pool = _get_pool(jobs, scorer, _init_worker)
+        try:
+            # only a few batches are generated ahead of the workers
+            window = []
+            for batch in batches:
+                window.append(("score", (batch,)))
+                if len(window) == 2 * jobs:
+                    self._add_perms_scores(perms_scores, terms_sets,
+                                           pool.map(_call_shared, window))
+                    window = []
+            self._add_perms_scores(perms_scores, terms_sets,
+                                   pool.map(_call_shared, window))
+        finally:
+            pool.close()
+            pool.join()
+        return perms_scores
+
+    def _add_perms_scores(self, perms_scores, terms_sets, results):
+        for scores in results:
+            for (term, _), term_scores in zip(terms_sets, scores):
+                perms_scores[term].extend(term_scores)
 
     def find_enrichment(self, gene_rank, perms_no = 1000,
-                        min_set_rank_intersection = 2,  corr_power = 1., plot=False, seed=None):
+                        min_set_rank_intersection = 2,  corr_power = 1., plot=False, seed=None,
+                        batch_size = 100, n_jobs = 1):
         """
         Finds enrichment using GSEA method.
         
@@ -541,6 +857,9 @@ class GseaEnrichmentFinder(BaseEnrichmentFinder):
         - plot - if True for every term will add plot (in form of list) 
 		of score depending on ranking (requires much more memory)
         - seed - seed for random methods generating permutations
+        - batch_size - number of permutations generated and scored at once
+        - n_jobs - number of processes scoring permutations (None for number
+          of CPUs)
         """
         
         sorted_gene_rank = sorted(gene_rank, key = lambda x: x[1], reverse = True)
@@ -556,10 +875,6 @@ class GseaEnrichmentFinder(BaseEnrichmentFinder):
         resolved_list = self._resolve_ids(gene_list, warnings)
         enriched_terms = self._find_enriched_terms(resolved_list, min_set_rank_intersection)
         
-        if seed:
-            random.seed(seed)
-        perms = self._get_perms(resolved_list, perms_no)
-        
         # Computing both: uncorrected and FDR corrected p-value
         all_pos_nes_perm = []
         all_neg_nes_perm = []
@@ -572,6 +887,11 @@ class GseaEnrichmentFinder(BaseEnrichmentFinder):
         else:
             adj_corr = [abs(x) for x in gene_corr]
 
+        if seed:
+            random.seed(seed)
+        perms_scores = self._get_perms_scores(enriched_terms, resolved_list, adj_corr,
+                                              perms_no, batch_size, n_jobs)
+
         for term, gene_set in enriched_terms.items():
             orig_es, orig_plot = Stats.kolmogorov_smirnov_rank_test(gene_set, resolved_list, adj_corr, plot)
             
@@ -579,9 +899,7 @@ class GseaEnrichmentFinder(BaseEnrichmentFinder):
             pos_nes_perm = []
             neg_nes_perm = []
             
-            for perm in perms: 
-                
-                perm_es, orig_plot2 = Stats.kolmogorov_smirnov_rank_test(gene_set, perm, adj_corr, plot)
+            for perm_es in perms_scores[term]:
                 if orig_es < 0:
                     pcount += int(orig_es >= perm_es)
                 else:
@@ -694,29 +1012,27 @@ class RankedParentChildEnrichmentFinder(BaseEnrichmentFinder):
         super(RankedParentChildEnrichmentFinder, self).__init__(annotations, ontology_graph,
                                                      resolver_generator)
     
-    def _get_half_results(self, resolved_list, ef, method, warnings, plot = False):
-        list_slice = []
+    def _get_half_results(self, resolved_list, ef, method, warnings, plot = False,
+                          n_jobs = 1, incremental = True):
         results = collections.defaultdict(list)
 
         parent_sizes = ef._parent_sizes(resolved_list, method = method)
-        for gene in resolved_list:
-            list_slice.append(gene)
-            slice_res = ef._find_ranked_enrichment(list_slice, parent_sizes, method = method)
-            warnings += slice_res.warnings
-            if plot:
-                for e in slice_res.entries:
-                    results[e.id].append(e.p_value)
-            else:
-                for e in slice_res.entries:
-                    if results[e.id] != []:
-                        if e.p_value < results[e.id][0]:
-                            results[e.id] = [e.p_value]
-                    else:
-                        results[e.id] = [e.p_value]
+        # every process computes results for its own range of slices
+        ranges = _split(list(range(len(resolved_list))), _jobs_no(n_jobs))
+        args_list = [(resolved_list, r[0], r[-1] + 1, parent_sizes, method, plot, incremental)
+                     for r in ranges if r]
+        for part, part_warnings in ef._map("_get_slices_results", args_list, n_jobs):
+            warnings += part_warnings
+            for oid, p_vals in part.items():
+                if plot:
+                    results[oid] += p_vals
+                elif results[oid] == [] or p_vals[0] < results[oid][0]:
+                    results[oid] = p_vals
         return results
     
     def find_enrichment(self, gene_rank, side = "+", corrections = [],
-                                     rank_as_population = False, method = "union", plot=False):
+                                     rank_as_population = False, method = "union", plot=False,
+                                     n_jobs = 1, incremental = True):
         """
         Finds enrichment by applying parent-child analysis to list slices.
         
@@ -735,6 +1051,11 @@ class RankedParentChildEnrichmentFinder(BaseEnrichmentFinder):
           o "intersection"
         - plot - if True for every term will add plot (in form of list) 
 		of ES depending on ranking (requires much more memory)
+        - n_jobs - number of processes analysing list slices (None for number
+          of CPUs)
+        - incremental - if True genes are added to the study set one by one
+          and only the terms affected by a new gene are updated, otherwise
+          every slice is analysed from scratch
           
         """
         
@@ -751,15 +1072,20 @@ class RankedParentChildEnrichmentFinder(BaseEnrichmentFinder):
         else:
             ef = ParentChildEnrichmentFinder(self.annotations, self.ontology_graph,
                                   resolver_generator = IdResolver.Resolver)
+        ef._hypergeometric = self._hypergeometric
         
         
         if side == "-":
-            all_results = self._get_half_results(resolved_list[::-1], ef, method, warnings, plot)
+            all_results = self._get_half_results(resolved_list[::-1], ef, method, warnings, plot,
+                                                 n_jobs, incremental)
         elif side == "+":
-            all_results = self._get_half_results(resolved_list, ef, method, warnings, plot)
+            all_results = self._get_half_results(resolved_list, ef, method, warnings, plot,
+                                                 n_jobs, incremental)
         elif side == "+/-":
-            minus_results = self._get_half_results(resolved_list[::-1], ef, method, warnings, plot)
-            all_results = self._get_half_results(resolved_list, ef, method, warnings, plot)
+            minus_results = self._get_half_results(resolved_list[::-1], ef, method, warnings, plot,
+                                                 n_jobs, incremental)
+            all_results = self._get_half_results(resolved_list, ef, method, warnings, plot,
+                                                 n_jobs, incremental)
             for k, v in minus_results.items():
                 all_results[k] += v
             del minus_results
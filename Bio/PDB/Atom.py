@@ -16,6 +16,17 @@ from Bio.Data import IUPACData
 
 
 class Atom(object):
+    # Using slots saves memory for large structures, while the __dict__ slot
+    # still allows other attributes to be added (it is created on demand)
+    __slots__ = ("level", "parent", "name", "fullname", "_coord", "_bfactor",
+                 "_occupancy", "altloc", "full_id", "id", "disordered_flag",
+                 "anisou_array", "siguij_array", "sigatm_array",
+                 "serial_number", "xtra", "element", "mass", "_store",
+                 "_index", "__dict__", "__weakref__")
+
+    # For atom sorting (protein backbone atoms first)
+    _sorting_keys = {'N': 0, 'CA': 1, 'C': 2, 'O': 3}
+
     def __init__(self, name, coord, bfactor, occupancy, altloc, fullname, serial_number,
                  element=None):
         """Create Atom object.
@@ -46,16 +57,23 @@ class Atom(object):
 
         :param element: atom element, e.g. "C" for Carbon, "HG" for mercury,
         :type element: uppercase string (or None if unknown)
+
+        The coordinates, B factor and occupancy can instead be held in the
+        arrays of a CoordinateStore (see the pack method of the Model class),
+        in which case the atom gives a view of its row of those arrays.
         """
         self.level = "A"
+        # Row of the coordinate store holding the coordinates etc, if packed
+        self._store = None
+        self._index = None
         # Reference to the residue
         self.parent = None
         # the atomic data
         self.name = name  # eg. CA, spaces are removed from atom name
         self.fullname = fullname  # e.g. " CA ", spaces included
-        self.coord = coord
-        self.bfactor = bfactor
-        self.occupancy = occupancy
+        self._coord = coord
+        self._bfactor = bfactor
+        self._occupancy = occupancy
         self.altloc = altloc
         self.full_id = None  # (structure id, model id, chain id, residue id, atom id)
         self.id = name  # id of atom is the atom name (e.g. "CA")
@@ -70,8 +88,83 @@ class Atom(object):
         self.element = self._assign_element(element)
         self.mass = self._assign_atom_mass()
 
-        # For atom sorting (protein backbone atoms first)
-        self._sorting_keys = {'N': 0, 'CA': 1, 'C': 2, 'O': 3}
+    # Coordinates, B factor and occupancy, which may be in a CoordinateStore
+
+    @property
+    def coord(self):
+        """Atomic coordinates, a numpy array of size 3.
+
+        If the atom is packed in a CoordinateStore, this is a view of its
+        row of the coordinate array, and setting it updates the array.
+        """
+        if self._store is None:
+            return self._coord
+        return self._store.coord[self._index]
+
+    @coord.setter
+    def coord(self, value):
+        if self._store is None:
+            self._coord = value
+        else:
+            self._store.coord[self._index] = value
+
+    @property
+    def bfactor(self):
+        """Isotropic B factor."""
+        if self._store is None:
+            return self._bfactor
+        return float(self._store.bfactor[self._index])
+
+    @bfactor.setter
+    def bfactor(self, value):
+        if self._store is None:
+            self._bfactor = value
+        else:
+            self._store.bfactor[self._index] = value
+
+    @property
+    def occupancy(self):
+        """Occupancy (0.0-1.0)."""
+        if self._store is None:
+            return self._occupancy
+        return float(self._store.occupancy[self._index])
+
+    @occupancy.setter
+    def occupancy(self, value):
+        if self._store is None:
+            self._occupancy = value
+        else:
+            self._store.occupancy[self._index] = value
+
+    def __getstate__(self):
+        """Return the attributes as a dictionary, for pickling and copying."""
+        state = {}
+        for name in self.__slots__:
+            if name not in ("__dict__", "__weakref__") and hasattr(self, name):
+                state[name] = getattr(self, name)
+        state.update(getattr(self, "__dict__", {}))
+        return state
+
+    def __setstate__(self, state):
+        """Restore the attributes, after unpickling or copying."""
+        # Not in the state of atoms pickled by older versions of Biopython
+        self._store = None
+        self._index = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def __copy__(self):
+        """Return a shallow copy, which is not part of a coordinate store."""
+        shallow = self.__class__.__new__(self.__class__)
+        shallow.__setstate__(self.__getstate__())
+        if self._store is not None:
+            # Setting the coordinates of the copy must not change this atom
+            shallow._store = None
+            shallow._index = None
+            shallow.coord = self.coord.copy()
+            shallow.bfactor = self.bfactor
+            shallow.occupancy = self.occupancy
+        return shallow
 
     # Sorting Methods
     # standard across different objects and allows direct comparison
@@ -420,6 +513,8 @@ class DisorderedAtom(DisorderedEntityWrapper):
         atom.flag_disorder()
         # set the residue parent of the added atom
         residue = self.get_parent()
+        if residue is not None:
+            residue._release_store()
         atom.set_parent(residue)
         altloc = atom.get_altloc()
         occupancy = atom.get_occupancy()
@@ -0,0 +1,201 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Contiguous arrays of the atomic data of a Model.
+
+A CoordinateStore holds the coordinates, B factors, occupancies and
+elements of all the atoms of a model in numpy arrays, with one row per
+atom. It is created by the pack method of the Model (or Structure)
+class, after which each Atom object gives a view of its own row:
+
+>>> from Bio.PDB.PDBParser import PDBParser
+>>> structure = PDBParser(QUIET=True).get_structure("1A8O", "PDB/1A8O.pdb")
+>>> store = structure[0].pack()
+>>> len(store)
+644
+>>> atom = structure[0]["A"][152]["CA"]
+>>> store.atoms[atom._index] is atom
+True
+>>> store.bfactor[atom._index] = 10.0
+>>> atom.get_bfactor()
+10.0
+
+Operations on the whole model, or on a selection of its atoms, can
+then be done on the arrays at once rather than atom by atom:
+
+>>> carbons = store.select(store.element == "C")
+>>> len(carbons)
+346
+>>> print("%0.2f" % store.rms(store.coord + 1.0))
+1.73
+"""
+
+import numpy
+
+
+def _model_atoms(model):
+    """Return a list of all atoms in a model (PRIVATE).
+
+    This includes every alternative location of disordered atoms and
+    residues.
+    """
+    atoms = []
+    for chain in model:
+        for residue in chain.get_unpacked_list():
+            atoms.extend(residue.get_unpacked_list())
+    return atoms
+
+
+class CoordinateStore(object):
+    """Coordinates, B factors, occupancies and elements of a model's atoms.
+
+    Attributes:
+     - atoms - list of the Atom objects, in the order of the rows
+     - coord - numpy array of the coordinates, shape (number of atoms, 3)
+     - bfactor - numpy array of the B factors
+     - occupancy - numpy array of the occupancies
+     - element - numpy array of the elements (strings, e.g. "C")
+
+    The rows are in the order of the atoms in the model (chain by chain,
+    residue by residue), with alternative locations of disordered atoms
+    in turn. The coordinate array has the same type as the coordinates of
+    the first atom, float32 for the structures from the parsers.
+
+    Don't create these objects directly, use the pack method of a Model.
+    """
+
+    def __init__(self, model):
+        """Initialize the class, packing the atoms of the model."""
+        atoms = _model_atoms(model)
+        self.atoms = atoms
+        if atoms:
+            dtype = numpy.asarray(atoms[0].get_coord()).dtype
+            if dtype.kind != "f":
+                dtype = numpy.float64
+        else:
+            dtype = numpy.float32
+        self.coord = numpy.empty((len(atoms), 3), dtype)
+        self.bfactor = numpy.empty(len(atoms), numpy.float64)
+        self.occupancy = numpy.empty(len(atoms), numpy.float64)
+        for i, atom in enumerate(atoms):
+            self.coord[i] = atom.get_coord()
+            # Missing values (None) become NaN
+            bfactor = atom.get_bfactor()
+            occupancy = atom.get_occupancy()
+            self.bfactor[i] = numpy.nan if bfactor is None else bfactor
+            self.occupancy[i] = numpy.nan if occupancy is None else occupancy
+        self.element = numpy.array([atom.element or "" for atom in atoms])
+        for i, atom in enumerate(atoms):
+            atom._store = self
+            atom._index = i
+            atom._coord = atom._bfactor = atom._occupancy = None
+
+    def __len__(self):
+        """Return the number of atoms."""
+        return len(self.atoms)
+
+    def __repr__(self):
+        """Return a string representation of the store."""
+        return "<CoordinateStore of %i atoms>" % len(self.atoms)
+
+    def release(self):
+        """Give each atom its own copy of its data, emptying the store.
+
+        Called by Model.unpack, which should be used instead.
+        """
+        coord = self.coord
+        bfactor = self.bfactor
+        occupancy = self.occupancy
+        for i, atom in enumerate(self.atoms):
+            if atom._store is self:
+                atom._store = None
+                atom._index = None
+                atom._coord = coord[i].copy()
+                atom._bfactor = float(bfactor[i])
+                atom._occupancy = float(occupancy[i])
+        self.atoms = []
+        self.coord = coord[:0]
+        self.bfactor = bfactor[:0]
+        self.occupancy = occupancy[:0]
+        self.element = self.element[:0]
+
+    def indices(self, atoms):
+        """Return a numpy array of the rows of the given atoms.
+
+        Raises a ValueError if any of the atoms are not in this store.
+        """
+        indices = numpy.empty(len(atoms), numpy.intp)
+        for i, atom in enumerate(atoms):
+            if atom._store is not self:
+                raise ValueError("%r is not in this coordinate store" % atom)
+            indices[i] = atom._index
+        return indices
+
+    def select(self, rows):
+        """Return a list of the atoms in the given rows.
+
+        The rows can be given as a boolean array (e.g. store.element == "C")
+        or as an array or list of row numbers.
+        """
+        rows = numpy.asarray(rows)
+        if rows.dtype == bool:
+            rows = numpy.flatnonzero(rows)
+        atoms = self.atoms
+        return [atoms[i] for i in rows]
+
+    def transform(self, rot, tran, rows=None):
+        """Apply rotation and translation to the coordinates.
+
+        Arguments:
+         - rot - right multiplying rotation matrix, 3x3 numpy array
+         - tran - translation vector, size 3 numpy array
+         - rows - optional, only transform these rows (as for select)
+
+        As with Atom.transform, the new coordinates are numpy.dot(coord,
+        rot) + tran.
+        """
+        if rows is None:
+            self.coord[:] = numpy.dot(self.coord, rot) + tran
+        else:
+            self.coord[rows] = numpy.dot(self.coord[rows], rot) + tran
+
+    def rms(self, coord, rows=None):
+        """Return the root mean square deviation from other coordinates.
+
+        Arguments:
+         - coord - numpy array of coordinates, the same shape as the rows
+           compared (no superposition is done)
+         - rows - optional, only compare these rows (as for select)
+        """
+        if rows is None:
+            diff = self.coord - coord
+        else:
+            diff = self.coord[rows] - coord
+        return float(numpy.sqrt((diff * diff).sum() / len(diff)))
+
+
+def _transform_atoms(atoms, rot, tran):
+    """Apply rotation and translation to a list of atoms (PRIVATE).
+
+    The atoms packed in a CoordinateStore are transformed with a single
+    operation per store, any others one by one.
+    """
+    rows = {}
+    stores = {}
+    for atom in atoms:
+        # Note a DisorderedAtom gives those of its selected atom
+        store = getattr(atom, "_store", None)
+        if store is None:
+            atom.transform(rot, tran)
+        else:
+            stores[id(store)] = store
+            rows.setdefault(id(store), []).append(atom._index)
+    for key, store in stores.items():
+        store.transform(rot, tran, numpy.array(rows[key], numpy.intp))
+
+
+# Run the doctests
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
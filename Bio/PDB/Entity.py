@@ -134,6 +134,20 @@ class Entity(object):
                 pass  # Atoms do not cache their full ids.
         self.full_id = self._generate_full_id()
 
+    def _release_store(self):
+        """Unpack the model containing this entity, if it is packed (PRIVATE).
+
+        Called before changing which atoms are in the model, as the arrays
+        of a CoordinateStore cannot grow or shrink (see Model.pack).
+        """
+        entity = self
+        while entity is not None:
+            if entity.level == "M":
+                if entity.store is not None:
+                    entity.unpack()
+                return
+            entity = entity.parent
+
     def _generate_full_id(self):
         """Generate full_id (PRIVATE).
 
@@ -199,6 +213,7 @@ class Entity(object):
 
     def detach_child(self, id):
         """Remove a child."""
+        self._release_store()
         child = self.child_dict[id]
         child.detach_parent()
         del self.child_dict[id]
@@ -210,6 +225,7 @@ class Entity(object):
         if self.has_id(entity_id):
             raise PDBConstructionException(
                 "%s defined twice" % str(entity_id))
+        self._release_store()
         entity.set_parent(self)
         self.child_list.append(entity)
         self.child_dict[entity_id] = entity
@@ -220,6 +236,7 @@ class Entity(object):
         if self.has_id(entity_id):
             raise PDBConstructionException(
                 "%s defined twice" % str(entity_id))
+        self._release_store()
         entity.set_parent(self)
         self.child_list[pos:pos] = [entity]
         self.child_dict[entity_id] = entity
@@ -294,6 +311,9 @@ class Entity(object):
         shallow.child_list = []
         shallow.child_dict = {}
         shallow.xtra = copy(self.xtra)
+        if shallow.level == "M":
+            # The copied atoms are not packed (see Model.pack)
+            shallow.store = None
 
         shallow.detach_parent()
 
@@ -342,6 +362,9 @@ class DisorderedEntityWrapper(object):
     # (NB: setitem was here before getitem, iter, len, sub)
     def __setitem__(self, id, child):
         """Add a child, associated with a certain id."""
+        if self.parent is not None:
+            # As for Entity.add, the new child's atoms can't join a packed model
+            self.parent._release_store()
         self.child_dict[id] = child
 
     def __contains__(self, id):
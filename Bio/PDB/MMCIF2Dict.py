@@ -110,5 +110,12 @@ class MMCIF2Dict(dict):
                     token_buffer.append(line)
                 yield "\n".join(token_buffer)
             else:
-                for token in self._splitline(line.strip()):
-                    yield token
+                line = line.strip()
+                if "'" in line or '"' in line or "#" in line or "\t" in line:
+                    for token in self._splitline(line):
+                        yield token
+                else:
+                    # Nothing quoted, so just split on the spaces
+                    for token in line.split(" "):
+                        if token:
+                            yield token
@@ -223,7 +223,8 @@ class MMCIFParser(object):
 class FastMMCIFParser(object):
     """Parse an MMCIF file and return a Structure object."""
 
-    def __init__(self, structure_builder=None, QUIET=False):
+    def __init__(self, structure_builder=None, QUIET=False, record_types=None,
+                 atom_names=None, chains=None, first_model=False):
         """Create a FastMMCIFParser object.
 
         The mmCIF parser calls a number of standard methods in an aggregated
@@ -240,6 +241,14 @@ class FastMMCIFParser(object):
          - QUIET - Evaluated as a Boolean. If true, warnings issued in constructing
            the SMCRA data will be suppressed. If false (DEFAULT), they will be shown.
            These warnings might be indicative of problems in the mmCIF file!
+         - record_types - optional, only use the atoms from these records,
+           "ATOM" and/or "HETATM"
+         - atom_names - optional, only use the atoms with these names
+           (e.g. ["CA", "CB"])
+         - chains - optional, only use the atoms in the chains with these
+           (author) identifiers (e.g. "AB" or ["A", "B"])
+         - first_model - Evaluated as a Boolean. If true, only the first
+           model is used (default false).
 
         """
         if structure_builder is not None:
@@ -250,6 +259,16 @@ class FastMMCIFParser(object):
         self.line_counter = 0
         self.build_structure = None
         self.QUIET = bool(QUIET)
+        if record_types is not None:
+            record_types = frozenset(record_types)
+        if atom_names is not None:
+            atom_names = frozenset(atom_names)
+        if chains is not None:
+            chains = frozenset(chains)
+        self.record_types = record_types
+        self.atom_names = atom_names
+        self.chains = chains
+        self.first_model = bool(first_model)
 
     # Public methods
 
@@ -301,11 +320,11 @@ class FastMMCIFParser(object):
         # Dumping the shlex module here since this particular
         # category should be rather straightforward.
         # Quite a performance boost..
-        _record_tbl = zip(*map(str.split, _records))
-        _anisob_tbl = zip(*map(str.split, _anisors))
-
-        mmcif_dict = dict(zip(_fields, _record_tbl))
-        mmcif_dict.update(dict(zip(_anisof, _anisob_tbl)))
+        mmcif_dict = _loop_columns(_fields, _records)
+        mmcif_dict.update(_loop_columns(_anisof, _anisors))
+        if self.record_types is not None or self.atom_names is not None \
+                or self.chains is not None or self.first_model:
+            self._select_rows(mmcif_dict)
 
         # Build structure object
         atom_id_list = mmcif_dict["_atom_site.label_atom_id"]
@@ -318,35 +337,45 @@ class FastMMCIFParser(object):
 
         chain_id_list = mmcif_dict["_atom_site.auth_asym_id"]
 
-        x_list = [float(x) for x in mmcif_dict["_atom_site.Cartn_x"]]
-        y_list = [float(x) for x in mmcif_dict["_atom_site.Cartn_y"]]
-        z_list = [float(x) for x in mmcif_dict["_atom_site.Cartn_z"]]
+        # Convert whole columns of numbers at once
+        coords = numpy.array([mmcif_dict["_atom_site.Cartn_x"],
+                              mmcif_dict["_atom_site.Cartn_y"],
+                              mmcif_dict["_atom_site.Cartn_z"]], float)
+        coords = coords.T.astype("f")
         alt_list = mmcif_dict["_atom_site.label_alt_id"]
         icode_list = mmcif_dict["_atom_site.pdbx_PDB_ins_code"]
-        b_factor_list = mmcif_dict["_atom_site.B_iso_or_equiv"]
-        occupancy_list = mmcif_dict["_atom_site.occupancy"]
+        try:
+            b_factor_list = numpy.array(mmcif_dict["_atom_site.B_iso_or_equiv"],
+                                        float).tolist()
+        except ValueError:
+            raise PDBConstructionException("Invalid or missing B factor")
+        try:
+            occupancy_list = numpy.array(mmcif_dict["_atom_site.occupancy"],
+                                         float).tolist()
+        except ValueError:
+            raise PDBConstructionException("Invalid or missing occupancy")
         fieldname_list = mmcif_dict["_atom_site.group_PDB"]
 
         try:
             serial_list = [int(n) for n in mmcif_dict["_atom_site.pdbx_PDB_model_num"]]
         except KeyError:
-            # No model number column
-            serial_list = None
+            # No model number column, so a single model
+            serial_list = [None] * len(atom_id_list)
         except ValueError:
             # Invalid model number (malformed file)
             raise PDBConstructionException("Invalid model number")
 
         try:
-            aniso_u11 = mmcif_dict["_atom_site.aniso_U[1][1]"]
-            aniso_u12 = mmcif_dict["_atom_site.aniso_U[1][2]"]
-            aniso_u13 = mmcif_dict["_atom_site.aniso_U[1][3]"]
-            aniso_u22 = mmcif_dict["_atom_site.aniso_U[2][2]"]
-            aniso_u23 = mmcif_dict["_atom_site.aniso_U[2][3]"]
-            aniso_u33 = mmcif_dict["_atom_site.aniso_U[3][3]"]
-            aniso_flag = 1
+            aniso = numpy.array([mmcif_dict["_atom_site.aniso_U[1][1]"],
+                                 mmcif_dict["_atom_site.aniso_U[1][2]"],
+                                 mmcif_dict["_atom_site.aniso_U[1][3]"],
+                                 mmcif_dict["_atom_site.aniso_U[2][2]"],
+                                 mmcif_dict["_atom_site.aniso_U[2][3]"],
+                                 mmcif_dict["_atom_site.aniso_U[3][3]"]], float)
+            anisou_list = list(aniso.T.astype("f"))
         except KeyError:
             # no anisotropic B factors
-            aniso_flag = 0
+            anisou_list = [None] * len(atom_id_list)
 
         # if auth_seq_id is present, we use this.
         # Otherwise label_seq_id is used.
@@ -354,6 +383,26 @@ class FastMMCIFParser(object):
             seq_id_list = mmcif_dict["_atom_site.auth_seq_id"]
         else:
             seq_id_list = mmcif_dict["_atom_site.label_seq_id"]
+        seq_id_list = [int(seq_id) for seq_id in seq_id_list]
+
+        altloc_list = [" " if altloc in _unassigned else altloc for altloc in alt_list]
+        icode_list = [" " if icode in _unassigned else icode for icode in icode_list]
+        # Remove occasional " from quoted atom names (e.g. xNA)
+        names = {}
+        for name in set(atom_id_list):
+            names[name] = name.strip('"')
+        name_list = [names[name] for name in atom_id_list]
+        hetatm_list = ["H" if fieldname == "HETATM" else " "
+                       for fieldname in fieldname_list]
+        if element_list is None:
+            element_list = [None] * len(atom_id_list)
+
+        # The blocks of atoms of each residue
+        keys = list(zip(serial_list, chain_id_list, hetatm_list, seq_id_list,
+                        icode_list, residue_id_list))
+        starts = [i for i in range(1, len(keys)) if keys[i] != keys[i - 1]]
+        if keys:
+            starts = [0] + starts + [len(keys)]
 
         # Now loop over atoms and build the structure
         current_chain_id = None
@@ -362,65 +411,30 @@ class FastMMCIFParser(object):
         structure_builder = self._structure_builder
         structure_builder.init_structure(structure_id)
         structure_builder.init_seg(" ")
+        init_atoms = getattr(structure_builder, "init_atoms", None)
 
         # Historically, Biopython PDB parser uses model_id to mean array index
         # so serial_id means the Model ID specified in the file
         current_model_id = -1
         current_serial_id = -1
-        for i in range(0, len(atom_id_list)):
+        for start, stop in zip(starts[:-1], starts[1:]):
 
             # set the line_counter for 'ATOM' lines only and not
             # as a global line counter found in the PDBParser()
             # this number should match the '_atom_site.id' index in the MMCIF
-            structure_builder.set_line_counter(i)
-
-            x = x_list[i]
-            y = y_list[i]
-            z = z_list[i]
-            resname = residue_id_list[i]
-            chainid = chain_id_list[i]
-            altloc = alt_list[i]
-            if altloc in _unassigned:
-                altloc = " "
-            int_resseq = int(seq_id_list[i])
-            icode = icode_list[i]
-            if icode in _unassigned:
-                icode = " "
-            name = atom_id_list[i].strip('"')  # Remove occasional " from quoted atom names (e.g. xNA)
-
-            # occupancy & B factor
-            try:
-                tempfactor = float(b_factor_list[i])
-            except ValueError:
-                raise PDBConstructionException("Invalid or missing B factor")
-
-            try:
-                occupancy = float(occupancy_list[i])
-            except ValueError:
-                raise PDBConstructionException("Invalid or missing occupancy")
-
-            fieldname = fieldname_list[i]
-            if fieldname == "HETATM":
-                hetatm_flag = "H"
-            else:
-                hetatm_flag = " "
+            structure_builder.set_line_counter(start)
 
+            serial_id, chainid, hetatm_flag, int_resseq, icode, resname = keys[start]
             resseq = (hetatm_flag, int_resseq, icode)
 
-            if serial_list is not None:
-                # model column exists; use it
-                serial_id = serial_list[i]
-                if current_serial_id != serial_id:
-                    # if serial changes, update it and start new model
-                    current_serial_id = serial_id
-                    current_model_id += 1
-                    structure_builder.init_model(current_model_id, current_serial_id)
-                    current_chain_id = None
-                    current_residue_id = None
-                    current_resname = None
-            else:
-                # no explicit model column; initialize single model
-                structure_builder.init_model(current_model_id)
+            if current_serial_id != serial_id:
+                # if serial changes, update it and start new model
+                current_serial_id = serial_id
+                current_model_id += 1
+                structure_builder.init_model(current_model_id, current_serial_id)
+                current_chain_id = None
+                current_residue_id = None
+                current_resname = None
 
             if current_chain_id != chainid:
                 current_chain_id = chainid
@@ -433,13 +447,70 @@ class FastMMCIFParser(object):
                 current_resname = resname
                 structure_builder.init_residue(resname, hetatm_flag, int_resseq, icode)
 
-            coord = numpy.array((x, y, z), 'f')
-            element = element_list[i] if element_list else None
-            structure_builder.init_atom(name, coord, tempfactor, occupancy, altloc,
-                name, element=element)
-            if aniso_flag == 1:
-                u = (aniso_u11[i], aniso_u12[i], aniso_u13[i],
-                    aniso_u22[i], aniso_u23[i], aniso_u33[i])
-                mapped_anisou = [float(_) for _ in u]
-                anisou_array = numpy.array(mapped_anisou, 'f')
-                structure_builder.set_anisou(anisou_array)
+            names = name_list[start:stop]
+            if init_atoms is not None and init_atoms(
+                    names, coords[start:stop], b_factor_list[start:stop],
+                    occupancy_list[start:stop], altloc_list[start:stop], names,
+                    [None] * (stop - start), element_list[start:stop],
+                    anisou_list[start:stop]):
+                continue
+            for i in range(start, stop):
+                structure_builder.set_line_counter(i)
+                structure_builder.init_atom(name_list[i], coords[i], b_factor_list[i],
+                                            occupancy_list[i], altloc_list[i],
+                                            name_list[i], element=element_list[i])
+                if anisou_list[i] is not None:
+                    structure_builder.set_anisou(anisou_list[i])
+
+    def _select_rows(self, mmcif_dict):
+        """Remove the atoms which are not selected from the columns (PRIVATE)."""
+        count = len(mmcif_dict["_atom_site.label_atom_id"])
+        selected = numpy.ones(count, bool)
+        if self.record_types is not None:
+            selected &= _isin(mmcif_dict["_atom_site.group_PDB"],
+                              self.record_types)
+        if self.atom_names is not None:
+            # Allowing for quoted atom names (e.g. "O5'")
+            names = set()
+            for name in set(mmcif_dict["_atom_site.label_atom_id"]):
+                if name.strip('"') in self.atom_names:
+                    names.add(name)
+            selected &= _isin(mmcif_dict["_atom_site.label_atom_id"], names)
+        if self.chains is not None:
+            selected &= _isin(mmcif_dict["_atom_site.auth_asym_id"],
+                              self.chains)
+        if self.first_model and count \
+                and "_atom_site.pdbx_PDB_model_num" in mmcif_dict:
+            models = mmcif_dict["_atom_site.pdbx_PDB_model_num"]
+            selected &= _isin(models, (models[0],))
+        rows = numpy.flatnonzero(selected).tolist()
+        for key, column in mmcif_dict.items():
+            if key.startswith("_atom_site."):
+                mmcif_dict[key] = [column[i] for i in rows]
+
+
+def _isin(column, values):
+    """Return a boolean array, true where the column has one of the values (PRIVATE)."""
+    return numpy.fromiter((value in values for value in column), bool,
+                          len(column))
+
+
+def _loop_columns(fields, records):
+    """Return a dictionary of the columns of a loop, keyed by field (PRIVATE).
+
+    Arguments:
+     - fields - list of the field names (e.g. "_atom_site.id")
+     - records - list of the lines with the values (without any quoted
+       values containing spaces)
+
+    The values are split in one go, and assigned to the fields in turn,
+    which also allows for rows split over several lines.
+    """
+    if not fields:
+        return {}
+    values = " ".join(records).split()
+    if len(values) % len(fields):
+        # Rows with missing values, just use those each row has
+        return dict(zip(fields, zip(*map(str.split, records))))
+    step = len(fields)
+    return dict((field, values[i::step]) for i, field in enumerate(fields))
@@ -14,8 +14,14 @@ class Model(Entity):
     In a structure derived from an X-ray crystallography experiment,
     only a single model will be present (with some exceptions). NMR
     structures normally contain many different models.
+
+    The coordinates, B factors, occupancies and elements of the atoms in a
+    model can be packed into contiguous arrays, see the pack method.
     """
 
+    # CoordinateStore holding the atomic data, if packed
+    store = None
+
     def __init__(self, id, serial_num=None):
         """Initialize.
 
@@ -48,3 +54,57 @@ class Model(Entity):
         for r in self.get_residues():
             for a in r:
                 yield a
+
+    def pack(self):
+        """Move the atomic data into contiguous arrays, returns a CoordinateStore.
+
+        The coordinates, B factors, occupancies and elements of all the atoms
+        in the model (including all the alternative locations of disordered
+        atoms and residues) are held in the numpy arrays of a CoordinateStore
+        (the store attribute of the model), and each Atom object then gives
+        a view of its row of these arrays. This saves memory for large
+        structures, and allows operations on the whole model (or a selection
+        of atoms) to be done on the arrays at once:
+
+        >>> from Bio.PDB.PDBParser import PDBParser
+        >>> structure = PDBParser(QUIET=True).get_structure("1A8O", "PDB/1A8O.pdb")
+        >>> model = structure[0]
+        >>> store = model.pack()
+        >>> store.coord.shape
+        (644, 3)
+        >>> atom = model["A"][152]["CA"]
+        >>> store.coord[atom._index, 0] = 1.5
+        >>> print(atom.coord[0])
+        1.5
+
+        Adding atoms to, or removing atoms from, the model unpacks it again.
+        """
+        from Bio.PDB.CoordinateStore import CoordinateStore
+        if self.store is None:
+            self.store = CoordinateStore(self)
+        return self.store
+
+    def unpack(self):
+        """Give each atom its own copy of its data again (see the pack method)."""
+        store = self.store
+        if store is not None:
+            self.store = None
+            store.release()
+
+    def transform(self, rot, tran):
+        """Apply rotation and translation to the atomic coordinates.
+
+        See Entity.transform for details. If the model is packed, all the
+        coordinates are transformed at once (including those of every
+        alternative location of disordered atoms).
+        """
+        if self.store is None:
+            Entity.transform(self, rot, tran)
+        else:
+            self.store.transform(rot, tran)
+
+
+# Run the doctests
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
@@ -3,18 +3,193 @@
 # license.  Please see the LICENSE file that should have been included
 # as part of this package.
 
-"""Fast atom neighbor lookup using a KD tree (implemented in C++)."""
+"""Fast atom neighbor lookup using a KD tree (implemented in C++).
+
+Searches for all the atom pairs within a distance (and for the atoms near
+many points at once) are done on a grid of cubic cells, with numpy arrays
+of atom indices and distances as the results. These can be reduced to
+contacts between residues or chains using an integer group id per atom.
+"""
 
 from __future__ import print_function
 
+import multiprocessing
+
 import numpy
 
+from Bio._utils import _get_pool
 from Bio.KDTree import KDTree
 
 from Bio.PDB.PDBExceptions import PDBException
 from Bio.PDB.Selection import unfold_entities, entity_levels, uniqueify
 
 
+# Offsets to the neighboring cells of a cell, each pair of neighboring
+# cells being visited once from the "lower" cell (plus the cell itself)
+_half_offsets = [(0, 0, 0)] + [(dx, dy, dz)
+                               for dx in (-1, 0, 1)
+                               for dy in (-1, 0, 1)
+                               for dz in (-1, 0, 1)
+                               if (dx, dy, dz) > (0, 0, 0)]
+_all_offsets = [(dx, dy, dz)
+                for dx in (-1, 0, 1)
+                for dy in (-1, 0, 1)
+                for dz in (-1, 0, 1)]
+
+# Maximum number of candidate pairs checked at once (limits memory use)
+_chunk_pairs = 1 << 21
+
+
+class _CellGrid(object):
+    """Points sorted into cubic cells of a given size (PRIVATE).
+
+    Attributes:
+     - coords - coordinates of the points, sorted by cell
+     - order - original index of each of the sorted points
+     - cells - integer coordinates of each occupied cell, shape (n, 3)
+     - starts, counts - first sorted point and number of points per cell
+
+    """
+
+    def __init__(self, coords, cell_size):
+        self.cell_size = cell_size
+        # The cells are made slightly larger, so that rounding cannot put
+        # points which are just within this distance two cells apart
+        self.width = cell_size * 1.001
+        self.origin = coords.min(axis=0)
+        points = self.cell_of(coords)
+        self.dims = points.max(axis=0) + 1
+        keys = self._keys(points)
+        self.order = numpy.argsort(keys, kind="mergesort")
+        keys = keys[self.order]
+        self.coords = coords[self.order]
+        first = numpy.ones(len(keys), bool)
+        first[1:] = keys[1:] != keys[:-1]
+        self.starts = numpy.flatnonzero(first)
+        self.counts = numpy.diff(numpy.append(self.starts, len(keys)))
+        self.keys = keys[self.starts]
+        self.cells = points[self.order[self.starts]]
+
+    def _keys(self, cells):
+        """Return the linear index of each cell (PRIVATE)."""
+        dims = self.dims
+        return (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+
+    def find(self, cells):
+        """Return the occupied cell number of each cell, or -1."""
+        found = numpy.full(len(cells), -1, numpy.intp)
+        inside = ((cells >= 0) & (cells < self.dims)).all(axis=1)
+        keys = self._keys(cells[inside])
+        index = numpy.searchsorted(self.keys, keys)
+        index[index == len(self.keys)] = 0
+        found[numpy.flatnonzero(inside)] = numpy.where(self.keys[index] == keys, index, -1)
+        return found
+
+    def cell_of(self, coords):
+        """Return the integer coordinates of the cells of some points."""
+        return numpy.floor((coords - self.origin) / self.width).astype(numpy.int64)
+
+
+def _expand(starts_a, counts_a, starts_b, counts_b):
+    """Return the index arrays of all pairs of points in pairs of ranges (PRIVATE).
+
+    Each pair of ranges (e.g. the points in two cells) is given by the
+    start and number of points in each range.
+    """
+    sizes = counts_a * counts_b
+    pair = numpy.repeat(numpy.arange(len(sizes)), sizes)
+    local = numpy.arange(len(pair)) - numpy.repeat(numpy.cumsum(sizes) - sizes, sizes)
+    counts_b = counts_b[pair]
+    return starts_a[pair] + local // counts_b, starts_b[pair] + local % counts_b
+
+
+def _chunks(sizes, limit):
+    """Split a list of sizes into ranges with a total size up to the limit (PRIVATE).
+
+    Returns a list of (start, stop) tuples, where a single item larger
+    than the limit has a range of its own.
+    """
+    ranges = []
+    start = 0
+    total = 0
+    for i, size in enumerate(sizes):
+        if total + size > limit and i > start:
+            ranges.append((start, i))
+            start = i
+            total = 0
+        total += size
+    if start < len(sizes):
+        ranges.append((start, len(sizes)))
+    return ranges
+
+
+def _pair_tasks(grid):
+    """Return the tasks finding all the pairs of points of a grid (PRIVATE).
+
+    Each task is a tuple of an offset and a range of occupied cells, whose
+    pairs with the neighboring cell at that offset are to be checked.
+    """
+    tasks = []
+    counts = grid.counts
+    for offset in _half_offsets:
+        if offset == (0, 0, 0):
+            sizes = counts * counts
+        else:
+            found = grid.find(grid.cells + offset)
+            sizes = numpy.where(found >= 0, counts * counts[found], 0)
+        for start, stop in _chunks(sizes.tolist(), _chunk_pairs):
+            if sizes[start:stop].any():
+                tasks.append((offset, start, stop))
+    return tasks
+
+
+def _grid_pairs(grid, radius, task):
+    """Return the pairs of sorted points within radius for a task (PRIVATE).
+
+    Returns the indices of the points in the grid (the first lower than
+    the second), and the squared distances.
+    """
+    offset, start, stop = task
+    starts = grid.starts[start:stop]
+    counts = grid.counts[start:stop]
+    if offset == (0, 0, 0):
+        first, second = _expand(starts, counts, starts, counts)
+        keep = first < second
+        first = first[keep]
+        second = second[keep]
+    else:
+        found = grid.find(grid.cells[start:stop] + offset)
+        cells = numpy.flatnonzero(found >= 0)
+        found = found[cells]
+        first, second = _expand(starts[cells], counts[cells],
+                                grid.starts[found], grid.counts[found])
+    diff = grid.coords[first] - grid.coords[second]
+    distances = (diff * diff).sum(axis=1)
+    keep = distances <= numpy.asarray(radius, grid.coords.dtype) ** 2
+    first = first[keep]
+    second = second[keep]
+    swap = first > second
+    first[swap], second[swap] = second[swap], first[swap]
+    return first, second, distances[keep]
+
+
+# The grid and radius searched by worker processes of the current pool
+# (set before forking, or by the initializer)
+_shared_grid = None
+
+
+def _init_pair_worker(grid):
+    """Set the grid and radius searched in a new worker (PRIVATE)."""
+    global _shared_grid
+    _shared_grid = grid
+
+
+def _pair_task(task):
+    """Return the pairs of points within radius for a task (PRIVATE)."""
+    grid, radius = _shared_grid
+    return _grid_pairs(grid, radius, task)
+
+
 class NeighborSearch(object):
     """Class for neighbor searching.
 
@@ -47,26 +222,19 @@ class NeighborSearch(object):
         assert(self.coords.shape[1] == 3)
         self.kdt = KDTree(3, bucket_size)
         self.kdt.set_coords(self.coords)
+        self._grid = None
+        self._groups = {}
 
     # Private
 
-    def _get_unique_parent_pairs(self, pair_list):
-        # translate a list of (entity, entity) tuples to
-        # a list of (parent entity, parent entity) tuples,
-        # thereby removing duplicate (parent entity, parent entity)
-        # pairs.
-        # o pair_list - a list of (entity, entity) tuples
-        parent_pair_list = []
-        for (e1, e2) in pair_list:
-            p1 = e1.get_parent()
-            p2 = e2.get_parent()
-            if p1 == p2:
-                continue
-            elif p1 < p2:
-                parent_pair_list.append((p1, p2))
-            else:
-                parent_pair_list.append((p2, p1))
-        return uniqueify(parent_pair_list)
+    def _cell_grid(self, cell_size):
+        """Return the atoms sorted into cells of the given size (PRIVATE).
+
+        The grid of the last size used is kept, for repeated searches.
+        """
+        if self._grid is None or self._grid.cell_size != cell_size:
+            self._grid = _CellGrid(self.coords, cell_size)
+        return self._grid
 
     # Public
 
@@ -112,22 +280,194 @@ class NeighborSearch(object):
         """
         if level not in entity_levels:
             raise PDBException("%s: Unknown level" % level)
-        self.kdt.all_search(radius)
-        indices = self.kdt.all_get_indices()
-        atom_list = self.atom_list
-        atom_pair_list = []
-        for i1, i2 in indices:
-            a1 = atom_list[i1]
-            a2 = atom_list[i2]
-            atom_pair_list.append((a1, a2))
         if level == "A":
             # return atoms
+            self.kdt.all_search(radius)
+            indices = self.kdt.all_get_indices()
+            atom_list = self.atom_list
+            atom_pair_list = []
+            for i1, i2 in indices:
+                a1 = atom_list[i1]
+                a2 = atom_list[i2]
+                atom_pair_list.append((a1, a2))
             return atom_pair_list
-        next_level_pair_list = atom_pair_list
-        for l in ["R", "C", "M", "S"]:
-            next_level_pair_list = self._get_unique_parent_pairs(next_level_pair_list)
-            if level == l:
-                return next_level_pair_list
+        # Reduce the atom pairs to pairs of entities using their ids, so
+        # only the unique pairs of entities are looked at here
+        first, second, distances = self.search_contacts(radius, level)
+        entities = self.group_ids(level)[1]
+        entity_pair_list = []
+        for i, j in zip(first.tolist(), second.tolist()):
+            e1 = entities[i]
+            e2 = entities[j]
+            if e1 == e2:
+                # e.g. chains with the same ids in different structures
+                continue
+            elif e1 < e2:
+                entity_pair_list.append((e1, e2))
+            else:
+                entity_pair_list.append((e2, e1))
+        return uniqueify(entity_pair_list)
+
+    def search_pairs(self, radius, n_jobs=1):
+        """Return all the pairs of atoms within radius of each other.
+
+        Arguments:
+         - radius - float
+         - n_jobs - number of processes to use (default 1), or None for
+           one per CPU
+
+        Unlike search_all, this gives numpy arrays rather than lists of
+        atoms: the indices of the two atoms of each pair in the atom list
+        (the first lower than the second), and the distance between them.
+        The pairs are sorted by the first and then the second index.
+
+        The search is done on a grid of cells, the size of the radius, so
+        only the atoms in neighboring cells are compared. Using several
+        processes, the cells are split between them.
+        """
+        if radius <= 0:
+            raise ValueError("Radius must be positive")
+        if n_jobs is None:
+            n_jobs = multiprocessing.cpu_count()
+        grid = self._cell_grid(radius)
+        tasks = _pair_tasks(grid)
+        if n_jobs > 1 and len(tasks) > 1:
+            pool = _get_pool(min(n_jobs, len(tasks)), (grid, radius),
+                             _init_pair_worker)
+            try:
+                results = pool.map(_pair_task, tasks)
+                pool.close()
+            finally:
+                pool.terminate()
+                pool.join()
+        else:
+            results = [_grid_pairs(grid, radius, task) for task in tasks]
+        if results:
+            first, second, distances = [numpy.concatenate(arrays)
+                                        for arrays in zip(*results)]
+        else:
+            first = second = numpy.zeros(0, numpy.intp)
+            distances = numpy.zeros(0, grid.coords.dtype)
+        # Back to indices in the atom list, the first being the lower
+        first = grid.order[first]
+        second = grid.order[second]
+        swap = first > second
+        first[swap], second[swap] = second[swap], first[swap]
+        order = numpy.lexsort((second, first))
+        return first[order], second[order], numpy.sqrt(distances[order])
+
+    def search_centers(self, centers, radius):
+        """Return the atoms within radius of each of several points.
+
+        Arguments:
+         - centers - Numeric array of the points, shape (number of points, 3)
+         - radius - float
+
+        This gives the same atoms as calling search for each point in
+        turn, but as numpy arrays: the index of the point, the index of
+        the atom in the atom list, and the distance between them, sorted
+        by point and then by atom.
+        """
+        if radius <= 0:
+            raise ValueError("Radius must be positive")
+        centers = numpy.asarray(centers, self.coords.dtype).reshape(-1, 3)
+        grid = self._cell_grid(radius)
+        cells = grid.cell_of(centers)
+        points = numpy.arange(len(centers))
+        ones = numpy.ones(len(centers), numpy.intp)
+        results = []
+        for offset in _all_offsets:
+            found = grid.find(cells + offset)
+            near = numpy.flatnonzero(found >= 0)
+            found = found[near]
+            point, atom = _expand(points[near], ones[near],
+                                  grid.starts[found], grid.counts[found])
+            diff = centers[point] - grid.coords[atom]
+            distances = (diff * diff).sum(axis=1)
+            keep = distances <= numpy.asarray(radius, distances.dtype) ** 2
+            results.append((point[keep], grid.order[atom[keep]], distances[keep]))
+        point, atom, distances = [numpy.concatenate(arrays) for arrays in zip(*results)]
+        order = numpy.lexsort((atom, point))
+        return point[order], atom[order], numpy.sqrt(distances[order])
+
+    def group_ids(self, level):
+        """Return the residue, chain, model or structure of each atom.
+
+        Arguments:
+         - level - char (A, R, C, M, S)
+
+        Returns a numpy array with an integer group id for each atom in
+        the atom list, and the list of the entities (e.g. Residue objects
+        for level R) in the order of these ids, which is the order they
+        are first found in the atom list. For level A, each atom is its
+        own group.
+        """
+        if level not in entity_levels:
+            raise PDBException("%s: Unknown level" % level)
+        try:
+            return self._groups[level]
+        except KeyError:
+            pass
+        if level == "A":
+            ids = numpy.arange(len(self.atom_list))
+            entities = self.atom_list
+        else:
+            # Each level from the one below, so entities are looked up
+            # once per entity rather than once per atom
+            below = entity_levels[entity_levels.index(level) - 1]
+            below_ids, below_entities = self.group_ids(below)
+            index = {}
+            entities = []
+            parent_ids = numpy.empty(len(below_entities), numpy.intp)
+            for i, entity in enumerate(below_entities):
+                parent = entity.get_parent()
+                number = index.get(id(parent))
+                if number is None:
+                    number = index[id(parent)] = len(entities)
+                    entities.append(parent)
+                parent_ids[i] = number
+            ids = parent_ids[below_ids]
+        self._groups[level] = (ids, entities)
+        return ids, entities
+
+    def search_contacts(self, radius, level="R", n_jobs=1):
+        """Return the pairs of entities with atoms within radius of each other.
+
+        Arguments:
+         - radius - float
+         - level - char (A, R, C, M, S), default R for residues
+         - n_jobs - number of processes to use (default 1), or None for
+           one per CPU
+
+        Returns numpy arrays of the group ids (see group_ids) of the two
+        entities in each pair, the first being lower than the second, and
+        the shortest distance between their atoms, sorted by the ids.
+        Pairs of atoms in the same entity are not included. For example,
+        the residues in contact are:
+
+            first, second, distances = ns.search_contacts(4.0, "R")
+            residues = ns.group_ids("R")[1]
+            pairs = [(residues[i], residues[j]) for i, j in zip(first, second)]
+
+        """
+        ids, entities = self.group_ids(level)
+        first, second, distances = self.search_pairs(radius, n_jobs)
+        first = ids[first]
+        second = ids[second]
+        keep = first != second
+        first = first[keep]
+        second = second[keep]
+        distances = distances[keep]
+        swap = first > second
+        first[swap], second[swap] = second[swap], first[swap]
+        # Sorted by pair with the shortest distance first, keep that one
+        order = numpy.lexsort((distances, second, first))
+        first = first[order]
+        second = second[order]
+        distances = distances[order]
+        unique = numpy.ones(len(first), bool)
+        unique[1:] = (first[1:] != first[:-1]) | (second[1:] != second[:-1])
+        return first[unique], second[unique], distances[unique]
 
 
 if __name__ == "__main__":
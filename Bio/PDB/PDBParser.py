@@ -28,6 +28,37 @@ from Bio.PDB.parse_pdb_header import _parse_pdb_header_list
 # If PDB spec says "COLUMNS 18-20" this means line[17:20]
 
 
+def _char_array(lines, width=80):
+    """Return a 2D numpy array of the characters of the lines (PRIVATE).
+
+    Each row holds the first width characters of a line (without the
+    newline), padded with null characters. Columns of fixed width fields
+    can then be taken with the _field function, where (as for numpy
+    strings) any trailing nulls are dropped, giving the same strings as
+    slicing the (shorter) lines.
+    """
+    text = "".join(line.rstrip("\n")[:width].ljust(width, "\0")
+                   for line in lines)
+    if not isinstance(text, bytes):
+        try:
+            # numpy converts byte strings to numbers much faster
+            text = text.encode("ascii")
+        except UnicodeEncodeError:
+            text = text.encode("utf-32-le")
+            return numpy.frombuffer(text, "<U1").reshape(len(lines), width)
+    return numpy.frombuffer(text, "S1").reshape(len(lines), width)
+
+
+def _field(chars, start, end):
+    """Return the strings in the given columns as a numpy array (PRIVATE).
+
+    Depending on the array of characters these are byte strings or
+    unicode strings, use astype(str) to get (native) strings.
+    """
+    column = numpy.ascontiguousarray(chars[:, start:end])
+    return column.view("%s%i" % (column.dtype.str[:2], end - start)).ravel()
+
+
 class PDBParser(object):
     """Parse a PDB file and return a Structure object."""
 
@@ -292,3 +323,327 @@ class PDBParser(object):
         else:
             # exceptions are fatal - raise again with new message (including line nr)
             raise PDBConstructionException(message)
+
+
+class FastPDBParser(PDBParser):
+    """Parse a PDB file and return a Structure object, quickly.
+
+    This gives the same Structure objects as the PDBParser class (which
+    it is based on, including the handling of the header), but reads the
+    coordinate section of the file column by column into numpy arrays,
+    and adds the atoms of each residue together.
+
+    Files with records this approach does not cover (SIGATM and SIGUIJ
+    records, or invalid values in the coordinate, occupancy, B factor or
+    residue number fields) are parsed as by the PDBParser, so the same
+    warnings and exceptions are given.
+
+    When only part of each structure is needed, e.g. to scan many files,
+    the atoms can be restricted to the selected record types, atom names
+    and chains, or to the first model, and the header can be skipped:
+
+    >>> parser = FastPDBParser(QUIET=True, atom_names=["CA"], parse_header=False)
+    >>> structure = parser.get_structure("1LCD", "PDB/1LCD.pdb")
+    >>> len(structure), len(list(structure.get_atoms()))
+    (3, 153)
+    >>> parser = FastPDBParser(QUIET=True, atom_names=["CA"], first_model=True)
+    >>> structure = parser.get_structure("1LCD", "PDB/1LCD.pdb")
+    >>> len(structure), len(list(structure.get_atoms()))
+    (1, 51)
+    """
+
+    def __init__(self, PERMISSIVE=True, get_header=False,
+                 structure_builder=None, QUIET=False, record_types=None,
+                 atom_names=None, chains=None, first_model=False,
+                 parse_header=True):
+        """Create a FastPDBParser object.
+
+        Arguments are as for the PDBParser, plus:
+         - record_types - optional, only use the atoms from these records,
+           "ATOM" and/or "HETATM"
+         - atom_names - optional, only use the atoms with these names
+           (without spaces, e.g. ["CA", "CB"])
+         - chains - optional, only use the atoms in the chains with
+           these identifiers (e.g. "AB" or ["A", "B"])
+         - first_model - Evaluated as a Boolean. If true, only the first
+           model is used (default false).
+         - parse_header - Evaluated as a Boolean. If false, the header is
+           not parsed and the structure gets an empty header dictionary
+           (default true).
+
+        """
+        PDBParser.__init__(self, PERMISSIVE, get_header, structure_builder,
+                           QUIET)
+        if record_types is not None:
+            record_types = frozenset("%-6s" % record_type
+                                     for record_type in record_types)
+        if atom_names is not None:
+            atom_names = frozenset(atom_names)
+        if chains is not None:
+            chains = frozenset(chains)
+        self.record_types = record_types
+        self.atom_names = atom_names
+        self.chains = chains
+        self.first_model = bool(first_model)
+        self.parse_header = bool(parse_header)
+
+    # Private methods
+
+    def _get_header(self, header_coords_trailer):
+        """Get the header of the PDB file, return the rest (PRIVATE)."""
+        if self.parse_header:
+            return PDBParser._get_header(self, header_coords_trailer)
+        i = 0
+        for i, line in enumerate(header_coords_trailer):
+            record_type = line[0:6]
+            if record_type == "ATOM  " or record_type == "HETATM" or record_type == "MODEL ":
+                break
+        self.line_counter = i
+        return {}, header_coords_trailer[i:]
+
+    def _select_lines(self, coords_trailer):
+        """Remove the records of the atoms which are not selected (PRIVATE).
+
+        Returns a copy of the lines where the ATOM and HETATM records not
+        matching the selection, and any ANISOU, SIGUIJ and SIGATM records
+        following them, are replaced by empty lines (so that the line
+        numbers in any warnings are unchanged). If only using the first
+        model, everything else up to the END or CONECT records is removed.
+        """
+        record_types = self.record_types
+        atom_names = self.atom_names
+        chains = self.chains
+        lines = list(coords_trailer)
+        selected = True
+        models_ended = False
+        for i, line in enumerate(lines):
+            record_type = line[0:6]
+            if record_type == "END   " or record_type == "CONECT":
+                break
+            elif models_ended:
+                lines[i] = ""
+            elif record_type == "ATOM  " or record_type == "HETATM":
+                selected = (record_types is None or record_type in record_types) \
+                    and (chains is None or line[21:22] in chains) \
+                    and (atom_names is None or line[12:16].strip() in atom_names)
+                if not selected:
+                    lines[i] = ""
+            elif record_type == "ANISOU" or record_type == "SIGUIJ" \
+                    or record_type == "SIGATM":
+                if not selected:
+                    lines[i] = ""
+            elif record_type == "ENDMDL":
+                models_ended = self.first_model
+        return lines
+
+    def _parse_coordinates(self, coords_trailer):
+        """Parse the atomic data in the PDB file (PRIVATE)."""
+        if self.record_types is not None or self.atom_names is not None \
+                or self.chains is not None or self.first_model:
+            coords_trailer = self._select_lines(coords_trailer)
+        atom_lines = []
+        line_numbers = []  # line number of each atom
+        anisou_lines = []
+        anisou_atoms = []  # atom each ANISOU record belongs to
+        events = []  # (atom number, line number, MODEL or ENDMDL line)
+        end = len(coords_trailer)
+        for i, line in enumerate(coords_trailer):
+            record_type = line[0:6]
+            if record_type == "ATOM  " or record_type == "HETATM":
+                atom_lines.append(line)
+                line_numbers.append(i)
+            elif record_type == "ANISOU":
+                if not atom_lines:
+                    return PDBParser._parse_coordinates(self, coords_trailer)
+                anisou_lines.append(line)
+                anisou_atoms.append(len(atom_lines) - 1)
+            elif record_type == "MODEL " or record_type == "ENDMDL":
+                events.append((len(atom_lines), i, line))
+            elif record_type == "END   " or record_type == "CONECT":
+                end = i
+                break
+            elif record_type == "SIGUIJ" or record_type == "SIGATM":
+                return PDBParser._parse_coordinates(self, coords_trailer)
+        try:
+            columns = self._atom_columns(atom_lines, anisou_lines, anisou_atoms,
+                                         [event[0] for event in events])
+        except ValueError:
+            # Let the PDBParser give the warnings or exceptions
+            return PDBParser._parse_coordinates(self, coords_trailer)
+        (names, fullnames, altlocs, resnames, chainids, segids, resseqs,
+         icodes, hetero_flags, serial_numbers, coords, occupancies,
+         bfactors, elements, anisous, starts) = columns
+        first_line = self.line_counter + 1
+        structure_builder = self.structure_builder
+        init_atoms = getattr(structure_builder, "init_atoms", None)
+        event_index = 0
+        current_model_id = 0
+        # Flag we have an open model
+        model_open = 0
+        current_chain_id = None
+        current_segid = None
+        current_residue_id = None
+        current_resname = None
+        # The last (empty) block is for any MODEL or ENDMDL records at the end
+        for start, stop in zip(starts, starts[1:] + [len(atom_lines)]):
+            # The MODEL and ENDMDL records before this block of atoms
+            while event_index < len(events) and events[event_index][0] <= start:
+                atom_number, i, line = events[event_index]
+                event_index += 1
+                structure_builder.set_line_counter(first_line + i)
+                if line[0:6] == "MODEL ":
+                    try:
+                        serial_num = int(line[10:14])
+                    except Exception:
+                        self._handle_PDB_exception("Invalid or missing model serial number",
+                                                   first_line + i)
+                        serial_num = 0
+                    structure_builder.init_model(current_model_id, serial_num)
+                    current_model_id += 1
+                    model_open = 1
+                else:
+                    model_open = 0
+                current_chain_id = None
+                current_residue_id = None
+            if start == stop:
+                continue
+            global_line_counter = first_line + line_numbers[start]
+            structure_builder.set_line_counter(global_line_counter)
+            # Initialize the Model - there was no explicit MODEL record
+            if not model_open:
+                structure_builder.init_model(current_model_id)
+                current_model_id += 1
+                model_open = 1
+            resname = resnames[start]
+            chainid = chainids[start]
+            segid = segids[start]
+            hetero_flag = hetero_flags[start]
+            resseq = resseqs[start]
+            icode = icodes[start]
+            residue_id = (hetero_flag, resseq, icode)
+            if current_segid != segid:
+                current_segid = segid
+                structure_builder.init_seg(current_segid)
+            if current_chain_id != chainid:
+                current_chain_id = chainid
+                structure_builder.init_chain(current_chain_id)
+                current_residue_id = residue_id
+                current_resname = resname
+                try:
+                    structure_builder.init_residue(resname, hetero_flag, resseq, icode)
+                except PDBConstructionException as message:
+                    self._handle_PDB_exception(message, global_line_counter)
+            elif current_residue_id != residue_id or current_resname != resname:
+                current_residue_id = residue_id
+                current_resname = resname
+                try:
+                    structure_builder.init_residue(resname, hetero_flag, resseq, icode)
+                except PDBConstructionException as message:
+                    self._handle_PDB_exception(message, global_line_counter)
+            if init_atoms is not None and init_atoms(
+                    names[start:stop], coords[start:stop], bfactors[start:stop],
+                    occupancies[start:stop], altlocs[start:stop],
+                    fullnames[start:stop], serial_numbers[start:stop],
+                    elements[start:stop], anisous[start:stop]):
+                continue
+            for j in range(start, stop):
+                global_line_counter = first_line + line_numbers[j]
+                structure_builder.set_line_counter(global_line_counter)
+                try:
+                    structure_builder.init_atom(names[j], coords[j], bfactors[j],
+                                                occupancies[j], altlocs[j],
+                                                fullnames[j], serial_numbers[j],
+                                                elements[j])
+                except PDBConstructionException as message:
+                    self._handle_PDB_exception(message, global_line_counter)
+                if anisous[j] is not None:
+                    structure_builder.set_anisou(anisous[j])
+        self.line_counter += end
+        return coords_trailer[end:]
+
+    def _atom_columns(self, atom_lines, anisou_lines, anisou_atoms, breaks):
+        """Read the fields of the ATOM, HETATM and ANISOU records (PRIVATE).
+
+        Returns a tuple of lists and arrays with an entry per atom (see
+        the _parse_coordinates method), and a list of the first atom of
+        each block of atoms with the same segment, chain and residue, also
+        starting new blocks at the given atoms (breaks, where models start
+        or end). Raises a ValueError for any invalid numbers.
+        """
+        count = len(atom_lines)
+        chars = _char_array(atom_lines)
+        coords = numpy.empty((count, 3), "f")
+        for i, start in enumerate((30, 38, 46)):
+            coords[:, i] = _field(chars, start, start + 8).astype(float)
+        occupancies = _field(chars, 54, 60).astype(float)
+        bfactors = _field(chars, 60, 66).astype(float).tolist()
+        resseqs = _field(chars, 22, 26).astype(int)
+        if (occupancies < 0).any():
+            # This uses fixed text so the warning occurs once only:
+            warnings.warn("Negative occupancy in one or more atoms", PDBConstructionWarning)
+        try:
+            serial_numbers = _field(chars, 6, 11).astype(int).tolist()
+        except ValueError:
+            serial_numbers = []
+            for value in _field(chars, 6, 11).astype(str).tolist():
+                try:
+                    serial_numbers.append(int(value))
+                except Exception:
+                    serial_numbers.append(0)
+        # Fields with few different values are converted once per value
+        names = {}
+        fullnames = _field(chars, 12, 16).astype(str).tolist()
+        for fullname in set(fullnames):
+            # get rid of whitespace in atom names
+            split_list = fullname.split()
+            if len(split_list) != 1:
+                # atom name has internal spaces, e.g. " N B ", so
+                # we do not strip spaces
+                names[fullname] = fullname
+            else:
+                # atom name is like " CA ", so we can strip spaces
+                names[fullname] = split_list[0]
+        names = [names[fullname] for fullname in fullnames]
+        elements = {}
+        element_fields = _field(chars, 76, 78).astype(str).tolist()
+        for element in set(element_fields):
+            elements[element] = element.strip().upper()
+        elements = [elements[element] for element in element_fields]
+        record_types = _field(chars, 0, 6).astype(str)
+        resname_array = _field(chars, 17, 20).astype(str)
+        waters = (resname_array == "HOH") | (resname_array == "WAT")
+        hetero_flags = numpy.where(record_types == "HETATM",
+                                   numpy.where(waters, "W", "H"), " ")
+        anisous = [None] * count
+        if anisou_lines:
+            anisou_chars = _char_array(anisou_lines)
+            anisou_array = numpy.empty((len(anisou_lines), 6), "f")
+            for i, (start, end) in enumerate(((28, 35), (35, 42), (43, 49),
+                                              (49, 56), (56, 63), (63, 70))):
+                anisou_array[:, i] = _field(anisou_chars, start, end).astype(float)
+            # U's are scaled by 10^4
+            anisou_array = (anisou_array / 10000.0).astype("f")
+            for atom_number, anisou in zip(anisou_atoms, anisou_array):
+                anisous[atom_number] = anisou
+        # The blocks of atoms from the same residue
+        altlocs = _field(chars, 16, 17).astype(str)
+        chainids = _field(chars, 21, 22).astype(str)
+        icodes = _field(chars, 26, 27).astype(str)
+        segids = _field(chars, 72, 76).astype(str)
+        changes = numpy.zeros(count, bool)
+        for column in (resname_array, chainids, segids, resseqs, icodes, hetero_flags):
+            changes[1:] |= column[1:] != column[:-1]
+        starts = set(numpy.flatnonzero(changes).tolist())
+        starts.update(breaks)
+        starts.update((0, count))
+        starts = sorted(starts)
+        return (names, fullnames, altlocs.tolist(), resname_array.tolist(),
+                chainids.tolist(), segids.tolist(), resseqs.tolist(),
+                icodes.tolist(), hetero_flags.tolist(), serial_numbers, coords,
+                occupancies.tolist(), bfactors, elements, anisous, starts)
+
+
+# Run the doctests
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
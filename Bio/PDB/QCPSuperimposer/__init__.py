@@ -8,11 +8,42 @@ QCPSuperimposer finds the best rotation and translation to put
 two point sets on top of each other (minimizing the RMSD). This is
 eg. useful to superimpose crystal structures. QCP stands for
 Quaternion Characteristic Polynomial, which is used in the algorithm.
+
+For ensembles of structures (e.g. NMR models or docking poses) with the
+same number of atoms, the superimpose_all and rmsd_matrix functions take
+a stack of coordinate sets as a numpy array of shape (M, N, 3), and use
+the same method on all the pairs of sets at once:
+
+>>> import numpy
+>>> from Bio.PDB import PDBParser
+>>> from Bio.PDB.QCPSuperimposer import rmsd_matrix, superimpose_all
+>>> structure = PDBParser(QUIET=True).get_structure("1LCD", "PDB/1LCD.pdb")
+>>> stack = numpy.array([[atom.get_coord() for atom in model.get_atoms()
+...                       if atom.get_id() == "CA"] for model in structure])
+>>> stack.shape
+(3, 51, 3)
+>>> for row in rmsd_matrix(stack):
+...     print(" ".join("%0.2f" % value for value in row))
+...
+0.00 0.79 1.13
+0.79 0.00 0.91
+1.13 0.91 0.00
+>>> rms, rot, tran = superimpose_all(stack[0], stack)
+>>> print(" ".join("%0.2f" % value for value in rms))
+0.00 0.79 1.13
+>>> moved = numpy.dot(stack[1], rot[1]) + tran[1]
+>>> print("%0.2f" % numpy.sqrt(((moved - stack[0]) ** 2).sum(axis=1).mean()))
+0.79
 """
 
 from __future__ import print_function
 
+import multiprocessing
+
+import numpy
 from numpy import dot, sqrt, array, matrix, inner, zeros
+
+from Bio._utils import _get_pool
 from .qcprotmodule import FastCalcRMSDAndRotation
 
 
@@ -136,3 +167,269 @@ class QCPSuperimposer(object):
         if self.rms is None:
             raise Exception("Nothing superimposed yet.")
         return self.rms
+
+
+# Vectorized versions of the QCP method, as in FastCalcRMSDAndRotation,
+# working on arrays of the inner products of many pairs of coordinate sets
+
+def _qcp_eigenvalues(A, E0):
+    """Return the largest eigenvalue of the key matrix of each pair (PRIVATE).
+
+    Arguments:
+     - A - array of the 3x3 inner product matrices of the (centered)
+       coordinates of each pair, shape (..., 3, 3)
+     - E0 - array of half the sums of squares of the coordinates of each pair
+
+    The roots of the characteristic polynomials are found by Newton's
+    method, starting from E0, for all pairs at once.
+    """
+    Sxx, Sxy, Sxz = A[..., 0, 0], A[..., 0, 1], A[..., 0, 2]
+    Syx, Syy, Syz = A[..., 1, 0], A[..., 1, 1], A[..., 1, 2]
+    Szx, Szy, Szz = A[..., 2, 0], A[..., 2, 1], A[..., 2, 2]
+    Sxx2, Syy2, Szz2 = Sxx * Sxx, Syy * Syy, Szz * Szz
+    Sxy2, Syz2, Sxz2 = Sxy * Sxy, Syz * Syz, Sxz * Sxz
+    Syx2, Szy2, Szx2 = Syx * Syx, Szy * Szy, Szx * Szx
+    SyzSzymSyySzz2 = 2.0 * (Syz * Szy - Syy * Szz)
+    Sxx2Syy2Szz2Syz2Szy2 = Syy2 + Szz2 - Sxx2 + Syz2 + Szy2
+    C2 = -2.0 * (Sxx2 + Syy2 + Szz2 + Sxy2 + Syx2 + Sxz2 + Szx2 + Syz2 + Szy2)
+    C1 = 8.0 * (Sxx * Syz * Szy + Syy * Szx * Sxz + Szz * Sxy * Syx -
+                Sxx * Syy * Szz - Syz * Szx * Sxy - Szy * Syx * Sxz)
+    SxzpSzx = Sxz + Szx
+    SyzpSzy = Syz + Szy
+    SxypSyx = Sxy + Syx
+    SyzmSzy = Syz - Szy
+    SxzmSzx = Sxz - Szx
+    SxymSyx = Sxy - Syx
+    SxxpSyy = Sxx + Syy
+    SxxmSyy = Sxx - Syy
+    Sxy2Sxz2Syx2Szx2 = Sxy2 + Sxz2 - Syx2 - Szx2
+    C0 = (Sxy2Sxz2Syx2Szx2 * Sxy2Sxz2Syx2Szx2 +
+          (Sxx2Syy2Szz2Syz2Szy2 + SyzSzymSyySzz2) *
+          (Sxx2Syy2Szz2Syz2Szy2 - SyzSzymSyySzz2) +
+          (-SxzpSzx * SyzmSzy + SxymSyx * (SxxmSyy - Szz)) *
+          (-SxzmSzx * SyzpSzy + SxymSyx * (SxxmSyy + Szz)) +
+          (-SxzpSzx * SyzpSzy - SxypSyx * (SxxpSyy - Szz)) *
+          (-SxzmSzx * SyzmSzy - SxypSyx * (SxxpSyy + Szz)) +
+          (SxypSyx * SyzpSzy + SxzpSzx * (SxxmSyy + Szz)) *
+          (-SxymSyx * SyzmSzy + SxzpSzx * (SxxpSyy + Szz)) +
+          (SxypSyx * SyzmSzy + SxzmSzx * (SxxmSyy - Szz)) *
+          (-SxymSyx * SyzpSzy + SxzmSzx * (SxxpSyy - Szz)))
+    eigenvalues = numpy.array(E0, float)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        for i in range(50):
+            x2 = eigenvalues * eigenvalues
+            b = (x2 + C2) * eigenvalues
+            a = b + C1
+            delta = (a * eigenvalues + C0) / (2.0 * x2 * eigenvalues + b + a)
+            # e.g. all the coordinates at the centroid
+            delta[~numpy.isfinite(delta)] = 0.0
+            eigenvalues -= delta
+            if (numpy.abs(delta) < numpy.abs(1e-11 * eigenvalues)).all():
+                break
+    return eigenvalues
+
+
+def _qcp_rotations(A, eigenvalues):
+    """Return the rotation matrices for the pairs (PRIVATE).
+
+    The quaternion of each rotation is the eigenvector of the largest
+    eigenvalue, found from the adjoint of the key matrix minus the
+    eigenvalue. The matrices are as from FastCalcRMSDAndRotation, right
+    multiplying for the coordinates of the first set of each pair onto
+    the second, with the identity matrix where the rotation is undefined.
+    """
+    Sxx, Sxy, Sxz = A[..., 0, 0], A[..., 0, 1], A[..., 0, 2]
+    Syx, Syy, Syz = A[..., 1, 0], A[..., 1, 1], A[..., 1, 2]
+    Szx, Szy, Szz = A[..., 2, 0], A[..., 2, 1], A[..., 2, 2]
+    a11 = Sxx + Syy + Szz - eigenvalues
+    a12 = a21 = Syz - Szy
+    a13 = a31 = Szx - Sxz
+    a14 = a41 = Sxy - Syx
+    a22 = Sxx - Syy - Szz - eigenvalues
+    a23 = a32 = Sxy + Syx
+    a24 = a42 = Sxz + Szx
+    a33 = Syy - Sxx - Szz - eigenvalues
+    a34 = a43 = Syz + Szy
+    a44 = Szz - Sxx - Syy - eigenvalues
+    a3344_4334 = a33 * a44 - a43 * a34
+    a3244_4234 = a32 * a44 - a42 * a34
+    a3243_4233 = a32 * a43 - a42 * a33
+    a3143_4133 = a31 * a43 - a41 * a33
+    a3144_4134 = a31 * a44 - a41 * a34
+    a3142_4132 = a31 * a42 - a41 * a32
+    a1324_1423 = a13 * a24 - a14 * a23
+    a1224_1422 = a12 * a24 - a14 * a22
+    a1223_1322 = a12 * a23 - a13 * a22
+    a1124_1421 = a11 * a24 - a14 * a21
+    a1123_1321 = a11 * a23 - a13 * a21
+    a1122_1221 = a11 * a22 - a12 * a21
+    # Each column of the adjoint in turn, where the previous ones are
+    # too close to zero
+    columns = [
+        (a22 * a3344_4334 - a23 * a3244_4234 + a24 * a3243_4233,
+         -a21 * a3344_4334 + a23 * a3144_4134 - a24 * a3143_4133,
+         a21 * a3244_4234 - a22 * a3144_4134 + a24 * a3142_4132,
+         -a21 * a3243_4233 + a22 * a3143_4133 - a23 * a3142_4132),
+        (a12 * a3344_4334 - a13 * a3244_4234 + a14 * a3243_4233,
+         -a11 * a3344_4334 + a13 * a3144_4134 - a14 * a3143_4133,
+         a11 * a3244_4234 - a12 * a3144_4134 + a14 * a3142_4132,
+         -a11 * a3243_4233 + a12 * a3143_4133 - a13 * a3142_4132),
+        (a42 * a1324_1423 - a43 * a1224_1422 + a44 * a1223_1322,
+         -a41 * a1324_1423 + a43 * a1124_1421 - a44 * a1123_1321,
+         a41 * a1224_1422 - a42 * a1124_1421 + a44 * a1122_1221,
+         -a41 * a1223_1322 + a42 * a1123_1321 - a43 * a1122_1221),
+        (a32 * a1324_1423 - a33 * a1224_1422 + a34 * a1223_1322,
+         -a31 * a1324_1423 + a33 * a1124_1421 - a34 * a1123_1321,
+         a31 * a1224_1422 - a32 * a1124_1421 + a34 * a1122_1221,
+         -a31 * a1223_1322 + a32 * a1123_1321 - a33 * a1122_1221)]
+    q = numpy.zeros(numpy.shape(eigenvalues) + (4,))
+    q[..., 0] = 1.0  # no rotation
+    found = numpy.zeros(numpy.shape(eigenvalues), bool)
+    for column in columns:
+        column = numpy.stack(column, axis=-1)
+        qsqr = (column * column).sum(axis=-1)
+        use = ~found & (qsqr >= 1e-6)
+        q[use] = column[use] / numpy.sqrt(qsqr[use])[..., numpy.newaxis]
+        found |= use
+    q1, q2, q3, q4 = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    a2, x2, y2, z2 = q1 * q1, q2 * q2, q3 * q3, q4 * q4
+    xy, az, zx = q2 * q3, q1 * q4, q4 * q2
+    ay, yz, ax = q1 * q3, q3 * q4, q1 * q2
+    rot = numpy.empty(numpy.shape(eigenvalues) + (3, 3))
+    rot[..., 0, 0] = a2 + x2 - y2 - z2
+    rot[..., 0, 1] = 2 * (xy + az)
+    rot[..., 0, 2] = 2 * (zx - ay)
+    rot[..., 1, 0] = 2 * (xy - az)
+    rot[..., 1, 1] = a2 - x2 + y2 - z2
+    rot[..., 1, 2] = 2 * (yz + ax)
+    rot[..., 2, 0] = 2 * (zx + ay)
+    rot[..., 2, 1] = 2 * (yz - ax)
+    rot[..., 2, 2] = a2 - x2 - y2 + z2
+    return rot
+
+
+def _centered(coords):
+    """Return a stack of coordinate sets centered on their centroids (PRIVATE).
+
+    Returns the centered coordinates, shape (M, N, 3), and the centroids.
+    """
+    coords = numpy.asarray(coords, float)
+    if coords.ndim != 3 or coords.shape[2] != 3:
+        raise ValueError("Coordinates should have the shape (M, N, 3)")
+    centroids = coords.mean(axis=1)
+    return coords - centroids[:, numpy.newaxis, :], centroids
+
+
+def superimpose_all(reference_coords, coords):
+    """Superimpose each of a stack of coordinate sets on a reference.
+
+    Arguments:
+     - reference_coords - the reference coordinates, an Nx3 array, or
+       an MxNx3 array of a reference for each of the coordinate sets
+     - coords - the coordinate sets to put on top of the reference(s),
+       an MxNx3 array
+
+    Returns the RMSD after superposition for each coordinate set (an
+    array of length M, as given by the get_rms method of a
+    QCPSuperimposer for each set in turn), the right multiplying
+    rotation matrices (Mx3x3) and the translations (Mx3). So the set i
+    is superimposed by numpy.dot(coords[i], rot[i]) + tran[i], as for
+    the rotation and translation from an SVDSuperimposer.
+    """
+    coords, centroids = _centered(coords)
+    reference_coords = numpy.asarray(reference_coords, float)
+    if reference_coords.ndim == 2:
+        reference_coords = reference_coords[numpy.newaxis]
+    reference_coords, reference_centroids = _centered(reference_coords)
+    if reference_coords.shape[1:] != coords.shape[1:] or \
+            len(reference_coords) not in (1, len(coords)):
+        raise ValueError("Coordinate number/dimension mismatch.")
+    # The inner products as in QCPSuperimposer._inner_product
+    A = numpy.einsum("mni,mnj->mij", coords, reference_coords)
+    E0 = ((coords * coords).sum(axis=(1, 2)) +
+          (reference_coords * reference_coords).sum(axis=(1, 2))) / 2
+    eigenvalues = _qcp_eigenvalues(A, E0)
+    rms = numpy.sqrt(numpy.abs(2.0 * (E0 - eigenvalues) / coords.shape[1]))
+    rot = _qcp_rotations(A, eigenvalues)
+    tran = reference_centroids - numpy.einsum("mi,mij->mj", centroids, rot)
+    return rms, rot, tran
+
+
+def _rmsd_rows(centered, sums, start, stop):
+    """Return the rows of the RMSD matrix from start to stop (PRIVATE)."""
+    count, length = centered.shape[:2]
+    # All the inner product matrices in one matrix product, from the
+    # coordinates as a (3M)xN matrix
+    flat = centered.transpose(0, 2, 1).reshape(3 * count, length)
+    A = numpy.dot(flat[3 * start:3 * stop], flat.T)
+    A = A.reshape(stop - start, 3, count, 3).transpose(0, 2, 1, 3)
+    E0 = (sums[start:stop, numpy.newaxis] + sums[numpy.newaxis, :]) / 2
+    eigenvalues = _qcp_eigenvalues(A, E0)
+    return numpy.sqrt(numpy.abs(2.0 * (E0 - eigenvalues) / length))
+
+
+# The centered coordinates used by worker processes of the current pool
+# (set before forking, or by the initializer)
+_shared = None
+
+
+def _init_worker(obj):
+    """Set the centered coordinates used in a new worker (PRIVATE)."""
+    global _shared
+    _shared = obj
+
+
+def _rmsd_rows_task(task):
+    """Return some rows of the RMSD matrix in a worker (PRIVATE)."""
+    centered, sums = _shared
+    start, stop = task
+    return _rmsd_rows(centered, sums, start, stop)
+
+
+def rmsd_matrix(coords, n_jobs=1, block_size=256):
+    """Return the RMSDs after superposition of all pairs of coordinate sets.
+
+    Arguments:
+     - coords - a stack of coordinate sets, an MxNx3 array
+     - n_jobs - number of processes to use (default 1), or None for one
+       per CPU
+     - block_size - number of rows of the matrix calculated at once,
+       which limits the memory used
+
+    Returns a symmetric MxM array, where the entry (i, j) is the RMSD
+    of the sets i and j superimposed (as given by the get_rms method of
+    a QCPSuperimposer), without calculating the rotations. Using several
+    processes, the blocks of rows are shared between them.
+    """
+    centered = _centered(coords)[0]
+    sums = (centered * centered).sum(axis=(1, 2))
+    count = len(centered)
+    tasks = [(start, min(start + block_size, count))
+             for start in range(0, count, block_size)]
+    if n_jobs is None:
+        n_jobs = multiprocessing.cpu_count()
+    if n_jobs > 1 and len(tasks) > 1:
+        pool = _get_pool(min(n_jobs, len(tasks)), (centered, sums),
+                         _init_worker)
+        try:
+            blocks = pool.map(_rmsd_rows_task, tasks)
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+    else:
+        blocks = [_rmsd_rows(centered, sums, start, stop)
+                  for start, stop in tasks]
+    if not blocks:
+        return numpy.zeros((0, 0))
+    matrix = numpy.concatenate(blocks)
+    # Make the matrix exactly symmetric, with zeros on the diagonal
+    matrix = (matrix + matrix.T) / 2
+    numpy.fill_diagonal(matrix, 0.0)
+    return matrix
+
+
+# Run the doctests
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
@@ -0,0 +1,289 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Scan many PDB and mmCIF files, e.g. a local copy of the PDB archive.
+
+The scan_structures function walks a directory tree (or a list of files),
+parses each PDB or mmCIF file (optionally gzip compressed, as in the PDB
+archive) and calls a function of your own on each structure, giving its
+results in turn. The files can be handled by several worker processes:
+
+>>> from Bio.PDB.Scan import scan_structures
+>>> def count_residues(structure):
+...     return len(list(structure[0].get_residues()))
+...
+>>> for filename, count in scan_structures(["PDB/1A8O.pdb", "PDB/2BEG.cif"],
+...                                        count_residues, n_jobs=2):
+...     print("%s %i" % (filename, count))
+...
+PDB/1A8O.pdb 158
+PDB/2BEG.cif 130
+
+Only what is needed should be parsed. Using the options of the fast
+parsers (FastPDBParser and FastMMCIFParser) the atoms can be restricted
+by record type, atom name and chain, or to the first model:
+
+>>> def count_atoms(structure):
+...     return len(list(structure.get_atoms()))
+...
+>>> for filename, count in scan_structures(["PDB/1LCD.pdb", "PDB/1LCD.cif"],
+...                                        count_atoms, atom_names=["CA"],
+...                                        first_model=True):
+...     print("%s %i" % (filename, count))
+...
+PDB/1LCD.pdb 51
+PDB/1LCD.cif 51
+
+With header_only the coordinates are not parsed at all, and the function
+is given the header dictionary instead (from parse_pdb_header for PDB
+files, or from MMCIF2Dict without the atom_site tables for mmCIF files).
+"""
+
+import gzip
+import multiprocessing
+import os
+
+from Bio._py3k import basestring
+from Bio._py3k import _binary_to_string_handle
+from Bio._utils import _get_pool
+
+from Bio.PDB.PDBParser import FastPDBParser
+from Bio.PDB.MMCIFParser import FastMMCIFParser
+from Bio.PDB.MMCIF2Dict import MMCIF2Dict
+from Bio.PDB.parse_pdb_header import parse_pdb_header
+
+
+# File extensions (before any .gz) of each format
+_extensions = {".pdb": "pdb", ".ent": "pdb", ".cif": "mmcif"}
+
+
+def structure_format(filename):
+    """Return the format of a structure file from its name, or None.
+
+    This is "pdb" for files ending .pdb or .ent, and "mmcif" for files
+    ending .cif, with or without a further .gz extension:
+
+    >>> structure_format("pdb1a8o.ent.gz")
+    'pdb'
+    >>> structure_format("1A8O.cif")
+    'mmcif'
+    >>> print(structure_format("1A8O.mmtf"))
+    None
+    """
+    name = filename.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    return _extensions.get(os.path.splitext(name)[1])
+
+
+def structure_files(directory):
+    """Return a sorted list of the PDB and mmCIF files in a directory tree.
+
+    The files are recognised by their names, see structure_format.
+    """
+    filenames = []
+    for path, dirnames, names in os.walk(directory):
+        for name in names:
+            if structure_format(name) is not None:
+                filenames.append(os.path.join(path, name))
+    filenames.sort()
+    return filenames
+
+
+def open_structure_file(filename):
+    """Open a (possibly gzip compressed) structure file in text mode."""
+    if filename.lower().endswith(".gz"):
+        return _binary_to_string_handle(gzip.open(filename, "rb"))
+    return open(filename)
+
+
+def _structure_id(filename):
+    """Return a structure id from a file name (PRIVATE).
+
+    This removes the directory and extensions, and the "pdb" prefix used
+    for files in the PDB archive (e.g. pdb1a8o.ent.gz gives 1a8o).
+    """
+    name = os.path.basename(filename)
+    if name.lower().endswith(".gz"):
+        name = name[:-3]
+    name = os.path.splitext(name)[0]
+    if name.startswith("pdb") and len(name) == 7:
+        name = name[3:]
+    return name
+
+
+def _mmcif_header_lines(handle):
+    """Yield the lines of an mmCIF file without the atom_site tables (PRIVATE)."""
+    skipping = False
+    loop_line = None
+    for line in handle:
+        if line.startswith(("_atom_site.", "_atom_site_anisotrop.")):
+            # The field names of the table, or a single atom (without loop_)
+            skipping = skipping or loop_line is not None
+            loop_line = None
+            continue
+        if skipping:
+            if not line.startswith(("#", "_", "loop_", "data_")):
+                continue
+            skipping = False
+        if loop_line is not None:
+            yield loop_line
+            loop_line = None
+        if line.startswith("loop_"):
+            # Held back until we know if the loop is an atom_site table
+            loop_line = line
+        else:
+            yield line
+    if loop_line is not None:
+        yield loop_line
+
+
+def read_header(filename, format=None):
+    """Return the header of a PDB or mmCIF file as a dictionary.
+
+    Arguments:
+     - filename - name of the (possibly gzip compressed) file
+     - format - "pdb" or "mmcif", by default this is taken from the file
+       name (see structure_format)
+
+    For PDB files this is the dictionary from parse_pdb_header, which
+    stops reading at the first atom, and for mmCIF files the dictionary
+    from MMCIF2Dict without the atom_site and atom_site_anisotrop tables
+    (which are skipped rather than split into values):
+
+    >>> print(read_header("PDB/1A8O.pdb")["resolution"])
+    1.7
+    >>> header = read_header("PDB/1A8O.cif")
+    >>> print(header["_refine.ls_d_res_high"])
+    1.70
+    >>> "_atom_site.Cartn_x" in header
+    False
+    """
+    if format is None:
+        format = structure_format(filename)
+    with open_structure_file(filename) as handle:
+        if format == "pdb":
+            return parse_pdb_header(handle)
+        elif format == "mmcif":
+            return MMCIF2Dict(_mmcif_header_lines(handle))
+    raise ValueError("Unknown structure file format %r" % format)
+
+
+def read_structure(filename, format=None, structure_id=None, QUIET=True,
+                   parse_header=True, **kwargs):
+    """Parse a PDB or mmCIF file and return a Structure object.
+
+    Arguments:
+     - filename - name of the (possibly gzip compressed) file
+     - format - "pdb" or "mmcif", by default this is taken from the file
+       name (see structure_format)
+     - structure_id - the id of the structure, by default this is taken
+       from the file name (e.g. 1a8o for pdb1a8o.ent.gz)
+     - QUIET - Evaluated as a Boolean. If true (default), warnings from
+       constructing the structure are suppressed.
+     - parse_header - Evaluated as a Boolean. If false, the header of PDB
+       files is not parsed (default true). The FastMMCIFParser used for
+       mmCIF files only reads the atom_site tables in any case.
+
+    Any further keyword arguments are passed on to the parser, either
+    FastPDBParser or FastMMCIFParser, e.g. to select atoms:
+
+    >>> structure = read_structure("PDB/1A8O.pdb", atom_names=["CA"])
+    >>> print("%s %i" % (structure.id, len(list(structure.get_atoms()))))
+    1A8O 70
+    """
+    if format is None:
+        format = structure_format(filename)
+    if structure_id is None:
+        structure_id = _structure_id(filename)
+    if format == "pdb":
+        parser = FastPDBParser(QUIET=QUIET, parse_header=parse_header,
+                               **kwargs)
+    elif format == "mmcif":
+        parser = FastMMCIFParser(QUIET=QUIET, **kwargs)
+    else:
+        raise ValueError("Unknown structure file format %r" % format)
+    with open_structure_file(filename) as handle:
+        return parser.get_structure(structure_id, handle)
+
+
+# The function and options used by worker processes scanning files
+# (set before forking, or by the initializer)
+_scan_args = None
+
+
+def _init_scan_worker(args):
+    """Set the arguments used by _scan_file in a new worker (PRIVATE)."""
+    global _scan_args
+    _scan_args = args
+
+
+def _scan_file(filename, args=None):
+    """Return the file name and result of the function for a file (PRIVATE).
+
+    Called in a worker process using the arguments of the pool (unless
+    given), which are the function, header_only and parser options.
+    """
+    function, header_only, format, kwargs = args or _scan_args
+    if header_only:
+        data = read_header(filename, format)
+    else:
+        data = read_structure(filename, format, **kwargs)
+    return filename, function(data)
+
+
+def scan_structures(source, function, header_only=False, format=None,
+                    n_jobs=1, chunksize=1, **kwargs):
+    """Apply a function to each structure in a directory or list of files.
+
+    Arguments:
+     - source - a directory, which is searched (including subdirectories)
+       for PDB and mmCIF files (see structure_files), or a list of files
+     - function - called with each Structure object (or header dictionary)
+     - header_only - Evaluated as a Boolean. If true, only the headers are
+       parsed, and the function is called with the header dictionaries
+       (see read_header) instead of the structures (default false).
+     - format - "pdb" or "mmcif", by default this is taken from each file
+       name (see structure_format)
+     - n_jobs - number of worker processes (default 1, in this process),
+       or None for one per CPU
+     - chunksize - number of files given to a worker process at a time
+
+    Any further keyword arguments are passed on to the parsers, see
+    read_structure.
+
+    This is an iterator, giving a tuple of the file name and the result of
+    the function for each file, in the order of the files. Only one
+    structure per process is held in memory at a time. With several
+    processes the results must be picklable, and so must the function
+    where the workers cannot be forked (e.g. on Windows), otherwise the
+    files are parsed in this process.
+    """
+    if isinstance(source, basestring):
+        filenames = structure_files(source)
+    else:
+        filenames = list(source)
+    args = (function, bool(header_only), format, kwargs)
+    if n_jobs is None:
+        n_jobs = multiprocessing.cpu_count()
+    if n_jobs > 1 and len(filenames) > 1:
+        pool = _get_pool(min(n_jobs, len(filenames)), args,
+                         _init_scan_worker, check_pickle=True)
+        if pool is not None:
+            try:
+                for result in pool.imap(_scan_file, filenames, chunksize):
+                    yield result
+                pool.close()
+            finally:
+                pool.terminate()
+                pool.join()
+            return
+    for filename in filenames:
+        yield _scan_file(filename, args)
+
+
+# Run the doctests
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
@@ -37,3 +37,13 @@ class Structure(Entity):
         for r in self.get_residues():
             for a in r:
                 yield a
+
+    def pack(self):
+        """Pack the atomic data of each model into arrays (see Model.pack)."""
+        for m in self.get_models():
+            m.pack()
+
+    def unpack(self):
+        """Unpack the atomic data of each model (see Model.pack)."""
+        for m in self.get_models():
+            m.unpack()
@@ -243,6 +243,54 @@ class StructureBuilder(object):
             # The atom is not disordered
             residue.add(self.atom)
 
+    def init_atoms(self, names, coords, b_factors, occupancies, altlocs,
+                   fullnames, serial_numbers, elements, anisous=None):
+        """Create several new Atom objects in the current residue at once.
+
+        Arguments are lists (or arrays) with an entry per atom, as for the
+        arguments of init_atom, plus optionally:
+
+         - anisous - anisotropic B factor of each atom (or None)
+
+        This is used by the fast parsers, which give the atoms of a residue
+        together. It only handles the simple case of a new residue without
+        any disordered or duplicate atoms (or a subclass overriding init_atom),
+        and returns False without adding any atoms otherwise, in which case
+        init_atom should be called for each atom in turn. Returns True if the
+        atoms were added.
+        """
+        residue = self.residue
+        if residue is None or residue.is_disordered() or len(residue) \
+                or type(self).init_atom != StructureBuilder.init_atom:
+            return False
+        if len(set(names)) != len(names):
+            return False
+        for altloc in altlocs:
+            if altloc != " ":
+                return False
+        residue_full_id = residue.get_full_id()
+        child_list = residue.child_list
+        child_dict = residue.child_dict
+        atom = None
+        for name, coord, b_factor, occupancy, altloc, fullname, \
+                serial_number, element in zip(names, coords, b_factors,
+                                              occupancies, altlocs, fullnames,
+                                              serial_numbers, elements):
+            atom = Atom(name, coord, b_factor, occupancy, altloc, fullname,
+                        serial_number, element)
+            # As in residue.add(atom), but the residue is known to be new
+            atom.parent = residue
+            atom.full_id = residue_full_id + ((name, altloc),)
+            child_list.append(atom)
+            child_dict[name] = atom
+        if anisous is not None:
+            for atom, anisou_array in zip(child_list, anisous):
+                if anisou_array is not None:
+                    atom.set_anisou(anisou_array)
+        if atom is not None:
+            self.atom = atom
+        return True
+
     def set_anisou(self, anisou_array):
         """Set anisotropic B factor of current Atom."""
         self.atom.set_anisou(anisou_array)
@@ -11,6 +11,7 @@ import numpy
 
 from Bio.SVDSuperimposer import SVDSuperimposer
 from Bio.PDB.PDBExceptions import PDBException
+from Bio.PDB.CoordinateStore import _transform_atoms
 
 
 class Superimposer(object):
@@ -33,12 +34,8 @@ class Superimposer(object):
         """
         if not len(fixed) == len(moving):
             raise PDBException("Fixed and moving atom lists differ in size")
-        length = len(fixed)
-        fixed_coord = numpy.zeros((length, 3))
-        moving_coord = numpy.zeros((length, 3))
-        for i in range(0, length):
-            fixed_coord[i] = fixed[i].get_coord()
-            moving_coord[i] = moving[i].get_coord()
+        fixed_coord = numpy.array([a.get_coord() for a in fixed], "d")
+        moving_coord = numpy.array([a.get_coord() for a in moving], "d")
         sup = SVDSuperimposer()
         sup.set(fixed_coord, moving_coord)
         sup.run()
@@ -46,11 +43,13 @@ class Superimposer(object):
         self.rotran = sup.get_rotran()
 
     def apply(self, atom_list):
-        """Rotate/translate a list of atoms."""
+        """Rotate/translate a list of atoms.
+
+        Atoms in packed models (see Model.pack) are transformed together.
+        """
         if self.rotran is None:
             raise PDBException("No transformation has been calculated yet")
         rot, tran = self.rotran
         rot = rot.astype('f')
         tran = tran.astype('f')
-        for atom in atom_list:
-            atom.transform(rot, tran)
+        _transform_atoms(atom_list, rot, tran)
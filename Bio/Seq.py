@@ -25,9 +25,11 @@ import string  # for maketrans only
 import array
 import sys
 import warnings
+import weakref
 
 from Bio._py3k import range
 from Bio._py3k import basestring
+from Bio._py3k import _bytes_to_string
 
 from Bio import BiopythonWarning
 from Bio import Alphabet
@@ -61,8 +63,160 @@ def _maketrans(complement_mapping):
         return string.maketrans(before, after)
 
 
+def _maketrans_bytes(complement_mapping):
+    """Make a bytes translation table (PRIVATE).
+
+    As _maketrans, but the table is for use with the translate method of
+    bytes and bytearray objects, as used for Seq objects with bytes data.
+
+    For internal use only.
+    """
+    before = ''.join(complement_mapping.keys())
+    after = ''.join(complement_mapping.values())
+    before += before.lower()
+    after += after.lower()
+    if sys.version_info[0] == 3:
+        return bytes.maketrans(before.encode("ascii"), after.encode("ascii"))
+    else:
+        return string.maketrans(before, after)
+
+
+# Number of letters of a byte buffer copied at a time by the functions
+# below, so searching a Seq object holding a buffer never copies it all
+_BLOCK_SIZE = 1 << 20
+
+
+def _search_bytes(seq, sub):
+    """Return sub as bytes for searching the byte buffer of seq, or None (PRIVATE).
+
+    Returns None unless seq holds its letters in a byte buffer and sub is
+    a non-empty ASCII string, in which case the string methods should be
+    used instead (empty strings and default white space are left to them
+    to give exactly the same results).
+    """
+    if not seq._has_buffer() or not isinstance(sub, basestring) or not sub:
+        return None
+    try:
+        return sub.encode("ascii")
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return None
+
+
+def _search_range(length, start, end):
+    """Return start and end of a search as the string methods use them (PRIVATE)."""
+    if start < 0:
+        start = max(start + length, 0)
+    if end < 0:
+        end = max(end + length, 0)
+    return start, min(end, length)
+
+
+def _buffer_iter_find(data, sub, start, end):
+    """Yield positions of non-overlapping matches in a byte buffer (PRIVATE).
+
+    As for the find method of a string, the matches are found from the
+    left, one block of the buffer at a time.
+    """
+    size = len(sub)
+    pos = start
+    while pos + size <= end:
+        block = data[pos:min(pos + _BLOCK_SIZE + size - 1, end)].tobytes()
+        next_pos = pos + _BLOCK_SIZE
+        i = block.find(sub)
+        while i >= 0:
+            yield pos + i
+            next_pos = max(next_pos, pos + i + size)
+            i = block.find(sub, i + size)
+        pos = next_pos
+
+
+def _buffer_iter_rfind(data, sub, start, end):
+    """Yield positions of non-overlapping matches from the right (PRIVATE).
+
+    As for the rfind method of a string, searching one block at a time.
+    """
+    size = len(sub)
+    stop = end
+    while stop - size >= start:
+        begin = max(stop - _BLOCK_SIZE - size + 1, start)
+        block = data[begin:stop].tobytes()
+        next_stop = begin + size - 1
+        i = block.rfind(sub)
+        while i >= 0:
+            yield begin + i
+            next_stop = min(next_stop, begin + i)
+            i = block.rfind(sub, 0, i)
+        stop = next_stop
+
+
+def _buffer_count(data, sub, start, end, overlap=False):
+    """Count the matches in a byte buffer one block at a time (PRIVATE)."""
+    size = len(sub)
+    if not overlap and any(sub[:i] == sub[-i:] for i in range(1, size)):
+        # Matches may overlap, so the blocks can't be counted separately
+        return sum(1 for i in _buffer_iter_find(data, sub, start, end))
+    count = 0
+    for pos in range(start, end - size + 1, _BLOCK_SIZE):
+        # Each block holds the matches starting in the next _BLOCK_SIZE letters
+        block = data[pos:min(pos + _BLOCK_SIZE + size - 1, end)].tobytes()
+        if not overlap:
+            count += block.count(sub)
+            continue
+        i = block.find(sub)
+        while i >= 0:
+            count += 1
+            i = block.find(sub, i + 1)
+    return count
+
+
+def _buffer_compare(data, other):
+    """Compare a byte buffer with a string or buffer, like cmp (PRIVATE).
+
+    Compares one block at a time, returning a negative number, zero or a
+    positive number, or None if the other string is not ASCII.
+    """
+    length = len(data)
+    other_length = len(other)
+    for pos in range(0, min(length, other_length), _BLOCK_SIZE):
+        block = data[pos:pos + _BLOCK_SIZE].tobytes()
+        other_block = other[pos:pos + _BLOCK_SIZE]
+        if isinstance(other_block, memoryview):
+            other_block = other_block.tobytes()
+        elif not isinstance(other_block, bytes):
+            try:
+                other_block = other_block.encode("ascii")
+            except UnicodeEncodeError:
+                return None
+        if block != other_block:
+            return -1 if block < other_block else 1
+    return (length > other_length) - (length < other_length)
+
+
+def _buffer_strip(data, chars, left=True, right=True):
+    """Return the start and end of a byte buffer without the chars at its ends (PRIVATE)."""
+    start = 0
+    end = len(data)
+    if left:
+        while start < end:
+            block = data[start:start + _BLOCK_SIZE].tobytes()
+            stripped = len(block) - len(block.lstrip(chars))
+            start += stripped
+            if stripped < len(block):
+                break
+    if right:
+        while end > start:
+            block = data[max(end - _BLOCK_SIZE, start):end].tobytes()
+            stripped = len(block) - len(block.rstrip(chars))
+            end -= stripped
+            if stripped < len(block):
+                break
+    return start, end
+
+
 _dna_complement_table = _maketrans(ambiguous_dna_complement)
 _rna_complement_table = _maketrans(ambiguous_rna_complement)
+_dna_complement_bytes = _maketrans_bytes(ambiguous_dna_complement)
+_rna_complement_bytes = _maketrans_bytes(ambiguous_rna_complement)
 
 
 class Seq(object):
@@ -84,13 +238,34 @@ class Seq(object):
     The Seq object also provides some biological methods, such as complement,
     reverse_complement, transcribe, back_transcribe and translate (which are
     not applicable to sequences with a protein alphabet).
+
+    The sequence data is normally held as a string, but can also be held
+    as one byte per letter in a bytes, bytearray or memoryview object (or
+    anything else supporting the buffer protocol, such as a memory mapped
+    file). In that case slicing returns a new Seq object sharing the same
+    buffer rather than copying the letters, complement and
+    reverse_complement work directly on the bytes, and methods such as
+    count, find, split and comparisons search the bytes a block at a time
+    rather than converting the whole sequence to a string. This is
+    intended for very long sequences such as whole chromosomes:
+
+    >>> from Bio.Alphabet import generic_dna
+    >>> my_dna = Seq(b"GATCGATGGGCCTATATAGGATCGAAAATCGC", generic_dna)
+    >>> my_dna
+    Seq('GATCGATGGGCCTATATAGGATCGAAAATCGC', DNAAlphabet())
+    >>> my_dna[4:12].reverse_complement()
+    Seq('GGCCCATC', DNAAlphabet())
+
+    Note the Seq object does not take a copy of the data, so if you give
+    it a bytearray (or a writable memory mapped file), changes made to
+    that buffer will be seen by the Seq object and any slices of it.
     """
 
     def __init__(self, data, alphabet=Alphabet.generic_alphabet):
         """Create a Seq object.
 
         Arguments:
-         - seq - Sequence, required (string)
+         - seq - Sequence, required (string, or bytes like object)
          - alphabet - Optional argument, an Alphabet object from
            Bio.Alphabet
 
@@ -111,11 +286,23 @@ class Seq(object):
         >>> my_seq.alphabet
         IUPACProtein()
         """
-        # Enforce string storage
-        if not isinstance(data, basestring):
+        # Enforce string or byte buffer storage
+        if isinstance(data, basestring):
+            self._data = data
+        elif isinstance(data, Seq):
             raise TypeError("The sequence data given to a Seq object should "
                             "be a string (not another Seq object etc)")
-        self._data = data
+        else:
+            try:
+                data = memoryview(data)
+            except TypeError:
+                raise TypeError("The sequence data given to a Seq object should "
+                                "be a string (not another Seq object etc)")
+            if data.ndim != 1 or data.itemsize != 1:
+                raise TypeError("The sequence data given to a Seq object "
+                                "should use one byte per letter")
+            # Keeping a memoryview means slices share the buffer
+            self._data = data
         self.alphabet = alphabet  # Seq API requirement
 
     def __repr__(self):
@@ -125,12 +312,12 @@ class Seq(object):
             # there is a stop codon at the end of a sequence.
             # Note total length is 54+3+3=60
             return "{0}('{1}...{2}', {3!r})".format(self.__class__.__name__,
-                                                    str(self)[:54],
-                                                    str(self)[-3:],
+                                                    str(self[:54]),
+                                                    str(self[-3:]),
                                                     self.alphabet)
         else:
             return '{0}({1!r}, {2!r})'.format(self.__class__.__name__,
-                                              self._data,
+                                              str(self),
                                               self.alphabet)
 
     def __str__(self):
@@ -141,8 +328,43 @@ class Seq(object):
         which need to be backwards compatible with old Biopython, you
         should continue to use my_seq.tostring() rather than str(my_seq).
         """
+        if isinstance(self._data, memoryview):
+            return _bytes_to_string(self._data.tobytes())
         return self._data
 
+    def __bytes__(self):
+        """Return the full sequence as a bytes object, use bytes(my_seq).
+
+        >>> bytes(Seq("ACGT")) == b"ACGT"
+        True
+        """
+        if isinstance(self._data, memoryview):
+            return self._data.tobytes()
+        return self._data.encode("ascii")
+
+    def _has_buffer(self):
+        """Check if the letters are held in a byte buffer (PRIVATE)."""
+        return isinstance(getattr(self, "_data", None), memoryview)
+
+    def __getstate__(self):
+        """Return the state for pickling and copying (PRIVATE).
+
+        A memoryview cannot be pickled, so the letters are given as bytes.
+        """
+        state = self.__dict__.copy()
+        # String hashes differ between processes
+        state.pop("_hash", None)
+        if self._has_buffer():
+            state["_data"] = self._data.tobytes()
+        return state
+
+    def __setstate__(self, state):
+        """Restore the state after unpickling or copying (PRIVATE)."""
+        self.__dict__.update(state)
+        data = self.__dict__.get("_data")
+        if data is not None and not isinstance(data, basestring):
+            self._data = memoryview(data)
+
     def __hash__(self):
         """Hash for comparison.
 
@@ -156,6 +378,13 @@ class Seq(object):
                       "or my_dict[id(my_seq)] if you want the old behaviour, "
                       "or use hash(str(my_seq)) or my_dict[str(my_seq)] for "
                       "the new string hashing behaviour.", BiopythonWarning)
+        if self._has_buffer() and self._data.readonly:
+            # Only hash the letters of a read only buffer once
+            try:
+                return self._hash
+            except AttributeError:
+                self._hash = hash(str(self))
+                return self._hash
         return hash(str(self))
 
     def __eq__(self, other):
@@ -199,6 +428,9 @@ class Seq(object):
                 warnings.warn("Incompatible alphabets {0!r} and {1!r}".format(
                               self.alphabet, other.alphabet),
                               BiopythonWarning)
+        order = self._compare_buffer(other)
+        if order is not None:
+            return order == 0
         return str(self) == str(other)
 
     def __ne__(self, other):
@@ -206,6 +438,21 @@ class Seq(object):
         # Require this method for Python 2 but not needed on Python 3
         return not self == other
 
+    def _compare_buffer(self, other):
+        """Compare the letters of a byte buffer with other, like cmp (PRIVATE).
+
+        Returns None unless this object holds a byte buffer and other is
+        a string or Seq object, in which case str(self) should be used.
+        """
+        if not self._has_buffer():
+            return None
+        if isinstance(other, Seq) and hasattr(other, "_data"):
+            # Not an UnknownSeq
+            other = other._data
+        elif not isinstance(other, basestring):
+            return None
+        return _buffer_compare(self._data, other)
+
     def __lt__(self, other):
         """Implement the less-than operand."""
         if hasattr(other, "alphabet"):
@@ -214,6 +461,9 @@ class Seq(object):
                 warnings.warn("Incompatible alphabets {0!r} and {1!r}".format(
                               self.alphabet, other.alphabet),
                               BiopythonWarning)
+        order = self._compare_buffer(other)
+        if order is not None:
+            return order < 0
         return str(self) < str(other)
 
     def __le__(self, other):
@@ -224,6 +474,9 @@ class Seq(object):
                 warnings.warn("Incompatible alphabets {0!r} and {1!r}".format(
                               self.alphabet, other.alphabet),
                               BiopythonWarning)
+        order = self._compare_buffer(other)
+        if order is not None:
+            return order <= 0
         return str(self) <= str(other)
 
     def __len__(self):
@@ -242,9 +495,14 @@ class Seq(object):
         # See http://docs.python.org/ref/sequence-methods.html
         if isinstance(index, int):
             # Return a single letter as a string
-            return self._data[index]
+            letter = self._data[index]
+            if isinstance(letter, int):
+                # From a memoryview under Python 3
+                letter = chr(letter)
+            return letter
         else:
             # Return the (sub)sequence as another Seq object
+            # (for a memoryview this shares the buffer, without copying)
             return Seq(self._data[index], self.alphabet)
 
     def __add__(self, other):
@@ -306,6 +564,11 @@ class Seq(object):
                         self.alphabet, other.alphabet))
             # They should be the same sequence type (or one of them is generic)
             a = Alphabet._consensus_alphabet([self.alphabet, other.alphabet])
+            if self._has_buffer() \
+                    and isinstance(other, Seq) and other._has_buffer():
+                # Keep the result as bytes
+                return self.__class__(self._data.tobytes() +
+                                      other._data.tobytes(), a)
             return self.__class__(str(self) + str(other), a)
         elif isinstance(other, basestring):
             # other is a plain string - use the current alphabet
@@ -439,6 +702,10 @@ class Seq(object):
         """
         # If it has one, check the alphabet:
         sub_str = self._get_seq_str_and_check_alphabet(sub)
+        sub_bytes = _search_bytes(self, sub_str)
+        if sub_bytes is not None:
+            start, end = _search_range(len(self), start, end)
+            return _buffer_count(self._data, sub_bytes, start, end)
         return str(self).count(sub_str, start, end)
 
     def count_overlap(self, sub, start=0, end=sys.maxsize):
@@ -492,6 +759,10 @@ class Seq(object):
         count() method is much for efficient.
         """
         sub_str = self._get_seq_str_and_check_alphabet(sub)
+        sub_bytes = _search_bytes(self, sub_str)
+        if sub_bytes is not None:
+            start, end = _search_range(len(self), start, end)
+            return _buffer_count(self._data, sub_bytes, start, end, True)
         self_str = str(self)
         overlap_count = 0
         while True:
@@ -530,6 +801,8 @@ class Seq(object):
         """
         # If it has one, check the alphabet:
         sub_str = self._get_seq_str_and_check_alphabet(char)
+        if _search_bytes(self, sub_str) is not None:
+            return self.find(sub_str) >= 0
         return sub_str in str(self)
 
     def find(self, sub, start=0, end=sys.maxsize):
@@ -556,6 +829,12 @@ class Seq(object):
         """
         # If it has one, check the alphabet:
         sub_str = self._get_seq_str_and_check_alphabet(sub)
+        sub_bytes = _search_bytes(self, sub_str)
+        if sub_bytes is not None:
+            start, end = _search_range(len(self), start, end)
+            for pos in _buffer_iter_find(self._data, sub_bytes, start, end):
+                return pos
+            return -1
         return str(self).find(sub_str, start, end)
 
     def rfind(self, sub, start=0, end=sys.maxsize):
@@ -582,6 +861,12 @@ class Seq(object):
         """
         # If it has one, check the alphabet:
         sub_str = self._get_seq_str_and_check_alphabet(sub)
+        sub_bytes = _search_bytes(self, sub_str)
+        if sub_bytes is not None:
+            start, end = _search_range(len(self), start, end)
+            for pos in _buffer_iter_rfind(self._data, sub_bytes, start, end):
+                return pos
+            return -1
         return str(self).rfind(sub_str, start, end)
 
     def startswith(self, prefix, start=0, end=sys.maxsize):
@@ -610,10 +895,15 @@ class Seq(object):
         if isinstance(prefix, tuple):
             prefix_strs = tuple(self._get_seq_str_and_check_alphabet(p)
                                 for p in prefix)
-            return str(self).startswith(prefix_strs, start, end)
         else:
-            prefix_str = self._get_seq_str_and_check_alphabet(prefix)
-            return str(self).startswith(prefix_str, start, end)
+            prefix_strs = (self._get_seq_str_and_check_alphabet(prefix),)
+        prefix_bytes = [_search_bytes(self, p) for p in prefix_strs]
+        if prefix_bytes and None not in prefix_bytes:
+            start, end = _search_range(len(self), start, end)
+            return any(len(p) <= end - start and
+                       self._data[start:start + len(p)].tobytes() == p
+                       for p in prefix_bytes)
+        return str(self).startswith(prefix_strs, start, end)
 
     def endswith(self, suffix, start=0, end=sys.maxsize):
         """Return True if the Seq ends with the given suffix, False otherwise.
@@ -641,10 +931,15 @@ class Seq(object):
         if isinstance(suffix, tuple):
             suffix_strs = tuple(self._get_seq_str_and_check_alphabet(p)
                                 for p in suffix)
-            return str(self).endswith(suffix_strs, start, end)
         else:
-            suffix_str = self._get_seq_str_and_check_alphabet(suffix)
-            return str(self).endswith(suffix_str, start, end)
+            suffix_strs = (self._get_seq_str_and_check_alphabet(suffix),)
+        suffix_bytes = [_search_bytes(self, p) for p in suffix_strs]
+        if suffix_bytes and None not in suffix_bytes:
+            start, end = _search_range(len(self), start, end)
+            return any(len(p) <= end - start and
+                       self._data[end - len(p):end].tobytes() == p
+                       for p in suffix_bytes)
+        return str(self).endswith(suffix_strs, start, end)
 
     def split(self, sep=None, maxsplit=-1):
         """Split method, like that of a python string.
@@ -688,6 +983,18 @@ class Seq(object):
         sep_str = self._get_seq_str_and_check_alphabet(sep)
         # TODO - If the sep is the defined stop symbol, or gap char,
         # should we adjust the alphabet?
+        sep_bytes = _search_bytes(self, sep_str)
+        if sep_bytes is not None:
+            # The parts share the buffer
+            parts = []
+            start = 0
+            for pos in _buffer_iter_find(self._data, sep_bytes, 0, len(self)):
+                if len(parts) == maxsplit:
+                    break
+                parts.append(self[start:pos])
+                start = pos + len(sep_bytes)
+            parts.append(self[start:])
+            return parts
         return [Seq(part, self.alphabet)
                 for part in str(self).split(sep_str, maxsplit)]
 
@@ -711,6 +1018,19 @@ class Seq(object):
         """
         # If it has one, check the alphabet:
         sep_str = self._get_seq_str_and_check_alphabet(sep)
+        sep_bytes = _search_bytes(self, sep_str)
+        if sep_bytes is not None:
+            # The parts share the buffer
+            parts = []
+            end = len(self)
+            for pos in _buffer_iter_rfind(self._data, sep_bytes, 0, end):
+                if len(parts) == maxsplit:
+                    break
+                parts.append(self[pos + len(sep_bytes):end])
+                end = pos
+            parts.append(self[:end])
+            parts.reverse()
+            return parts
         return [Seq(part, self.alphabet)
                 for part in str(self).rsplit(sep_str, maxsplit)]
 
@@ -729,6 +1049,10 @@ class Seq(object):
         """
         # If it has one, check the alphabet:
         strip_str = self._get_seq_str_and_check_alphabet(chars)
+        strip_bytes = _search_bytes(self, strip_str)
+        if strip_bytes is not None:
+            start, end = _buffer_strip(self._data, strip_bytes, True, True)
+            return self[start:end]
         return Seq(str(self).strip(strip_str), self.alphabet)
 
     def lstrip(self, chars=None):
@@ -746,6 +1070,10 @@ class Seq(object):
         """
         # If it has one, check the alphabet:
         strip_str = self._get_seq_str_and_check_alphabet(chars)
+        strip_bytes = _search_bytes(self, strip_str)
+        if strip_bytes is not None:
+            start, end = _buffer_strip(self._data, strip_bytes, True, False)
+            return self[start:end]
         return Seq(str(self).lstrip(strip_str), self.alphabet)
 
     def rstrip(self, chars=None):
@@ -771,6 +1099,10 @@ class Seq(object):
         """
         # If it has one, check the alphabet:
         strip_str = self._get_seq_str_and_check_alphabet(chars)
+        strip_bytes = _search_bytes(self, strip_str)
+        if strip_bytes is not None:
+            start, end = _buffer_strip(self._data, strip_bytes, False, True)
+            return self[start:end]
         return Seq(str(self).rstrip(strip_str), self.alphabet)
 
     def upper(self):
@@ -788,6 +1120,8 @@ class Seq(object):
 
         This will adjust the alphabet if required. See also the lower method.
         """
+        if self._has_buffer():
+            return Seq(self._data.tobytes().upper(), self.alphabet._upper())
         return Seq(str(self).upper(), self.alphabet._upper())
 
     def lower(self):
@@ -809,6 +1143,8 @@ class Seq(object):
 
         See also the upper method.
         """
+        if self._has_buffer():
+            return Seq(self._data.tobytes().lower(), self.alphabet._lower())
         return Seq(str(self).lower(), self.alphabet._lower())
 
     def complement(self):
@@ -843,24 +1179,40 @@ class Seq(object):
            ...
         ValueError: Proteins do not have complements!
         """
+        return Seq(self._complement_data(), self.alphabet)
+
+    def _complement_data(self):
+        """Return the complement as a string, or bytes for bytes data (PRIVATE)."""
         base = Alphabet._get_base_alphabet(self.alphabet)
         if isinstance(base, Alphabet.ProteinAlphabet):
             raise ValueError("Proteins do not have complements!")
+        if self._has_buffer():
+            # Work on the bytes, without decoding them to a string
+            data = self._data.tobytes()
+            dna_table = _dna_complement_bytes
+            rna_table = _rna_complement_bytes
+            has_u = b"U" in data or b"u" in data
+            has_t = b"T" in data or b"t" in data
+        else:
+            data = str(self)
+            dna_table = _dna_complement_table
+            rna_table = _rna_complement_table
+            has_u = "U" in data or "u" in data
+            has_t = "T" in data or "t" in data
         if isinstance(base, Alphabet.DNAAlphabet):
-            ttable = _dna_complement_table
+            ttable = dna_table
         elif isinstance(base, Alphabet.RNAAlphabet):
-            ttable = _rna_complement_table
-        elif ('U' in self._data or 'u' in self._data) \
-                and ('T' in self._data or 't' in self._data):
+            ttable = rna_table
+        elif has_u and has_t:
             # TODO - Handle this cleanly?
             raise ValueError("Mixed RNA/DNA found")
-        elif 'U' in self._data or 'u' in self._data:
-            ttable = _rna_complement_table
+        elif has_u:
+            ttable = rna_table
         else:
-            ttable = _dna_complement_table
+            ttable = dna_table
         # Much faster on really long sequences than the previous loop based
         # one. Thanks to Michael Palmer, University of Waterloo.
-        return Seq(str(self).translate(ttable), self.alphabet)
+        return data.translate(ttable)
 
     def reverse_complement(self):
         """Return the reverse complement sequence by creating a new Seq object.
@@ -895,7 +1247,7 @@ class Seq(object):
         ValueError: Proteins do not have complements!
         """
         # Use -1 stride/step to reverse the complement
-        return self.complement()[::-1]
+        return Seq(self._complement_data()[::-1], self.alphabet)
 
     def transcribe(self):
         """Return the RNA sequence from a DNA sequence by creating a new Seq object.
@@ -929,6 +1281,9 @@ class Seq(object):
             alphabet = IUPAC.ambiguous_rna
         else:
             alphabet = Alphabet.generic_rna
+        if self._has_buffer():
+            return Seq(self._data.tobytes().replace(b"T", b"U").replace(b"t", b"u"),
+                       alphabet)
         return Seq(str(self).replace('T', 'U').replace('t', 'u'), alphabet)
 
     def back_transcribe(self):
@@ -964,6 +1319,9 @@ class Seq(object):
             alphabet = IUPAC.ambiguous_dna
         else:
             alphabet = Alphabet.generic_dna
+        if self._has_buffer():
+            return Seq(self._data.tobytes().replace(b"U", b"T").replace(b"u", b"t"),
+                       alphabet)
         return Seq(str(self).replace("U", "T").replace("u", "t"), alphabet)
 
     def translate(self, table="Standard", stop_symbol="*", to_stop=False,
@@ -2312,6 +2670,118 @@ def back_transcribe(rna):
         return rna.replace('U', 'T').replace('u', 't')
 
 
+# Markers used by _CodonLookup for stop codons and possible stop codons,
+# replaced with the requested symbols once a sequence is translated.
+_STOP_MARKER = "\x00"
+_POS_STOP_MARKER = "\x01"
+
+
+class _CodonLookup(dict):
+    """Dictionary of translated codons for a CodonTable (PRIVATE).
+
+    Maps upper case codons to the amino acid letter, _STOP_MARKER for stop
+    codons, _POS_STOP_MARKER for ambiguous codons which might be a stop
+    codon (e.g. TAN or NNN), or the gap character for a gap codon. It also
+    maps pairs of codons (six letters) to two characters, which halves the
+    number of lookups needed to translate a sequence.
+
+    The unambiguous DNA and RNA codons (and pairs of them) are translated
+    in advance. Other codons are translated using the same rules as
+    _translate_str the first time they are looked up. Invalid codons
+    raise a KeyError.
+
+    For internal use only, see _get_codon_lookup.
+    """
+
+    def __init__(self, table, gap=None):
+        """Translate the unambiguous codons (and pairs of them)."""
+        dict.__init__(self)
+        self.table = table
+        self.gap = gap
+        if table.nucleotide_alphabet.letters is not None:
+            self.valid_letters = set(table.nucleotide_alphabet.letters.upper())
+        else:
+            # Assume the worst case, ambiguous DNA or RNA:
+            self.valid_letters = set(IUPAC.ambiguous_dna.letters.upper() +
+                                     IUPAC.ambiguous_rna.letters.upper())
+        for letters in ("TCAG", "UCAG"):
+            codons = []
+            for c1 in letters:
+                for c2 in letters:
+                    for c3 in letters:
+                        try:
+                            self[c1 + c2 + c3]
+                        except KeyError:
+                            continue
+                        codons.append(c1 + c2 + c3)
+            for codon in codons:
+                for codon2 in codons:
+                    self[codon + codon2] = self[codon] + self[codon2]
+
+    def __missing__(self, codon):
+        """Translate a codon (or a pair of codons) not seen before."""
+        if len(codon) == 6:
+            amino = self[codon[:3]] + self[codon[3:]]
+            self[codon] = amino
+            return amino
+        table = self.table
+        try:
+            amino = table.forward_table[codon]
+        except (KeyError, CodonTable.TranslationError):
+            if codon in table.stop_codons:
+                amino = _STOP_MARKER
+            elif self.valid_letters.issuperset(set(codon)):
+                # Possible stop codon (e.g. NNN or TAN)
+                amino = _POS_STOP_MARKER
+            elif self.gap is not None and codon == self.gap * 3:
+                # Gapped translation
+                amino = self.gap
+            else:
+                raise KeyError(codon)
+        self[codon] = amino
+        return amino
+
+
+# Codon lookups for each CodonTable, and gap character
+_codon_lookups = weakref.WeakKeyDictionary()
+
+
+def _get_codon_lookup(table, gap=None):
+    """Return the cached _CodonLookup for a CodonTable and gap (PRIVATE)."""
+    try:
+        lookups = _codon_lookups[table]
+    except KeyError:
+        lookups = _codon_lookups[table] = {}
+    try:
+        return lookups[gap]
+    except KeyError:
+        lookup = lookups[gap] = _CodonLookup(table, gap)
+        return lookup
+
+
+def _translate_codons(sequence, table, gap=None):
+    """Translate the whole codons of an upper case string (PRIVATE).
+
+    Returns a string using _STOP_MARKER and _POS_STOP_MARKER for stop
+    codons and possible stop codons, and raises a KeyError if there is
+    an invalid codon. Any partial codon at the end is ignored.
+
+    >>> from Bio.Data import CodonTable
+    >>> table = CodonTable.ambiguous_dna_by_id[1]
+    >>> _translate_codons("ATGGCCTAANNNGC", table)
+    'MA\\x00\\x01'
+    """
+    lookup = _get_codon_lookup(table, gap)
+    n = len(sequence)
+    if n % 6 >= 3:
+        last = lookup[sequence[n - n % 6:n - n % 3]]
+    else:
+        last = ""
+    # Take the sequence six letters (two codons) at a time
+    pairs = map("".join, zip(*[iter(sequence[:n - n % 6])] * 6))
+    return "".join(map(lookup.__getitem__, pairs)) + last
+
+
 def _translate_str(sequence, table, stop_symbol="*", to_stop=False,
                    cds=False, pos_stop="X", gap=None):
     """Translate nucleotide string into a protein string (PRIVATE).
@@ -2429,6 +2899,23 @@ def _translate_str(sequence, table, stop_symbol="*", to_stop=False,
             raise ValueError("Gap character should be a single character "
                              "string.")
 
+    try:
+        protein = _translate_codons(sequence[:n - n % 3], table, gap)
+    except KeyError:
+        # Invalid codon, use the loop below to report it
+        pass
+    else:
+        if _STOP_MARKER in protein:
+            if cds:
+                raise CodonTable.TranslationError(
+                    "Extra in frame stop codon found.")
+            if to_stop:
+                protein = protein[:protein.index(_STOP_MARKER)]
+            protein = protein.replace(_STOP_MARKER, stop_symbol)
+        if _POS_STOP_MARKER in protein:
+            protein = protein.replace(_POS_STOP_MARKER, pos_stop)
+        return "".join(amino_acids) + protein
+
     for i in range(0, n - n % 3, 3):
         codon = sequence[i:i + 3]
         try:
@@ -2553,19 +3040,88 @@ def translate(sequence, table="Standard", stop_symbol="*", to_stop=False,
         return sequence.toseq().translate(table, stop_symbol, to_stop, cds)
     else:
         # Assume its a string, return a string
-        try:
-            codon_table = CodonTable.ambiguous_generic_by_id[int(table)]
-        except ValueError:
-            codon_table = CodonTable.ambiguous_generic_by_name[table]
-        except (AttributeError, TypeError):
-            if isinstance(table, CodonTable.CodonTable):
-                codon_table = table
-            else:
-                raise ValueError('Bad table argument')
+        codon_table = _get_codon_table(table)
         return _translate_str(sequence, codon_table, stop_symbol, to_stop, cds,
                               gap=gap)
 
 
+def _get_codon_table(table):
+    """Return the CodonTable for translating strings (PRIVATE).
+
+    The table can be a name, an NCBI identifier or a CodonTable object,
+    as for the translate function.
+    """
+    try:
+        return CodonTable.ambiguous_generic_by_id[int(table)]
+    except ValueError:
+        return CodonTable.ambiguous_generic_by_name[table]
+    except (AttributeError, TypeError):
+        if isinstance(table, CodonTable.CodonTable):
+            return table
+        else:
+            raise ValueError('Bad table argument')
+
+
+def translate_many(sequences, table="Standard", stop_symbol="*",
+                   to_stop=False, cds=False, gap=None):
+    """Translate many nucleotide sequences, returning an iterator.
+
+    This takes an iterable of sequences (strings, Seq or MutableSeq
+    objects), and gives their translations as strings, in order. The
+    other arguments are as for the translate function, and apply to all
+    the sequences. The codon table is only looked up once, so this is
+    quicker than calling translate for each sequence in turn:
+
+    >>> from Bio.Seq import translate_many
+    >>> list(translate_many(["ATGGCCATTGTA", "ATGTTTTAGGGG"], to_stop=True))
+    ['MAIV', 'MF']
+
+    As the translations are returned one at a time, this can be used on
+    a whole transcriptome (e.g. the sequences of the records from
+    Bio.SeqIO.parse) without holding all the proteins in memory.
+    """
+    codon_table = _get_codon_table(table)
+    for sequence in sequences:
+        yield _translate_str(str(sequence), codon_table, stop_symbol,
+                             to_stop, cds, gap=gap)
+
+
+def translate_six_frames(sequence, table="Standard", stop_symbol="*",
+                         gap=None):
+    """Translate all six reading frames of a nucleotide sequence.
+
+    Returns a list of six strings, the translations of the three forward
+    frames (starting at the first, second and third letter), then of the
+    three frames of the reverse complement (also starting at its first,
+    second and third letter). Any partial codon at the end of a frame is
+    ignored. The sequence can be a string, Seq or MutableSeq, and the
+    other arguments are as for the translate function.
+
+    >>> from Bio.Seq import translate_six_frames
+    >>> for frame in translate_six_frames("AUGGCCAUUGUAAUGGGCCGCUGA"):
+    ...     print(frame)
+    ...
+    MAIVMGR*
+    WPL*WAA
+    GHCNGPL
+    SAAHYNGH
+    QRPITMA
+    SGPLQWP
+
+    The codon table is only looked up once, and the reverse complement
+    only calculated once, for all six frames.
+    """
+    codon_table = _get_codon_table(table)
+    sequence = str(sequence)
+    answer = []
+    for strand in (sequence, reverse_complement(sequence)):
+        for frame in range(3):
+            length = 3 * max(0, (len(strand) - frame) // 3)
+            answer.append(_translate_str(strand[frame:frame + length],
+                                         codon_table, stop_symbol, gap=gap))
+    return answer
+
+
 def reverse_complement(sequence):
     """Return the reverse complement sequence of a nucleotide string.
 
@@ -21,6 +21,7 @@ Base class to hold a Feature
 
 Classes:
  - SeqFeature
+ - FeatureIndex - Interval index for location queries on a list of features.
 
 Hold information about a Reference
 ----------------------------------
@@ -53,6 +54,7 @@ Classes:
 
 from __future__ import print_function
 
+from bisect import bisect_left, bisect_right
 from collections import OrderedDict
 
 from Bio._py3k import _is_int_or_long
@@ -1406,6 +1408,228 @@ class CompoundLocation(object):
         return f_seq
 
 
+class FeatureIndex(object):
+    """Interval index over the locations of a list of SeqFeature objects.
+
+    The features are indexed by the span of their location (from the
+    start of the first part to the end of the last part), using an
+    implicit augmented interval tree over the spans sorted by start.
+    Queries take logarithmic time plus the number of features found,
+    rather than checking every feature in turn.
+
+    >>> from Bio.SeqFeature import SeqFeature, FeatureLocation
+    >>> features = [SeqFeature(FeatureLocation(0, 1000), type="source"),
+    ...             SeqFeature(FeatureLocation(10, 100), type="gene"),
+    ...             SeqFeature(FeatureLocation(50, 60), type="misc_feature"),
+    ...             SeqFeature(FeatureLocation(10, 20) + FeatureLocation(90, 100),
+    ...                        type="CDS"),
+    ...             SeqFeature(FeatureLocation(400, 500), type="gene")]
+    >>> index = FeatureIndex(features)
+    >>> len(index)
+    5
+
+    Features overlapping a region (given using Python counting, like a
+    slice) are returned in the order of the original list. The parts of
+    compound locations are checked, so the CDS above does not overlap
+    its intron:
+
+    >>> [f.type for f in index.overlapping(55, 95)]
+    ['source', 'gene', 'misc_feature', 'CDS']
+    >>> [f.type for f in index.overlapping(30, 80)]
+    ['source', 'gene', 'misc_feature']
+
+    Features lying completely within a region, which is how slicing a
+    SeqRecord selects the features to keep:
+
+    >>> [f.type for f in index.contained(0, 100)]
+    ['gene', 'misc_feature', 'CDS']
+
+    The features nearest to a position or region, with the number of
+    bases separating their spans from it (zero if they overlap):
+
+    >>> index = FeatureIndex(features[1:])
+    >>> distance, nearest = index.nearest(300)
+    >>> print("%i %s" % (distance, [f.location.nofuzzy_start for f in nearest]))
+    99 [400]
+    >>> distance, nearest = index.nearest(95, 98)
+    >>> print("%i %s" % (distance, [f.type for f in nearest]))
+    0 ['gene', 'CDS']
+
+    Features without a location (or with an unknown start or end), and
+    those located on another sequence (with ref or ref_db set), are not
+    indexed. The index is a snapshot: it does not follow later changes
+    to the list of features or to their locations. The SeqRecord
+    feature_index property rebuilds it when features are added to or
+    removed from the record.
+    """
+
+    def __init__(self, features):
+        """Index the given list of SeqFeature objects."""
+        self._features = list(features)
+        self._remote = []
+        spans = []
+        for i, feature in enumerate(self._features):
+            location = feature.location
+            if location is None:
+                continue
+            if feature.ref or feature.ref_db:
+                self._remote.append(feature)
+                continue
+            start = location.nofuzzy_start
+            end = location.nofuzzy_end
+            if start is None or end is None:
+                continue
+            spans.append((start, end, i))
+        spans.sort()
+        self._starts = [span[0] for span in spans]
+        self._ends = [span[1] for span in spans]
+        self._order = [span[2] for span in spans]
+        self._compound = set(i for i in self._order
+                             if len(self._features[i].location.parts) > 1)
+        by_end = sorted(range(len(spans)), key=self._ends.__getitem__)
+        self._sorted_ends = [self._ends[j] for j in by_end]
+        self._by_end = by_end
+        self._build()
+
+    def __len__(self):
+        """Return the number of indexed features."""
+        return len(self._starts)
+
+    def _build(self):
+        """Compute the maximum end of each implicit subtree (PRIVATE).
+
+        Node i of the tree is at level k when the lowest k bits of i are
+        all one and bit k is zero, so the leaves are at the even indices.
+        """
+        n = len(self._starts)
+        ends = self._ends
+        max_ends = list(ends)
+        self._max_ends = max_ends
+        if not n:
+            self._max_level = -1
+            return
+        last_i = (n - 1) & ~1
+        last = ends[last_i]
+        k = 1
+        while 1 << k <= n:
+            x = 1 << (k - 1)
+            for i in range((x << 1) - 1, n, x << 2):
+                right = max_ends[i + x] if i + x < n else last
+                max_ends[i] = max(ends[i], max_ends[i - x], right)
+            # Move to the parent of the last node in the tree
+            if (last_i >> k) & 1:
+                last_i -= x
+            else:
+                last_i += x
+            if last_i < n and max_ends[last_i] > last:
+                last = max_ends[last_i]
+            k += 1
+        self._max_level = k - 1
+
+    def _query(self, start, end):
+        """Return sorted positions of spans overlapping start:end (PRIVATE)."""
+        starts = self._starts
+        ends = self._ends
+        max_ends = self._max_ends
+        n = len(starts)
+        found = []
+        if not n:
+            return found
+        level = self._max_level
+        stack = [(level, (1 << level) - 1, False)]
+        while stack:
+            k, x, left_done = stack.pop()
+            if k <= 3:
+                # Small subtree, a linear scan is quicker
+                i = x >> k << k
+                last = min(i + (1 << (k + 1)) - 1, n)
+                while i < last and starts[i] < end:
+                    if start < ends[i]:
+                        found.append(i)
+                    i += 1
+            elif not left_done:
+                stack.append((k, x, True))
+                y = x - (1 << (k - 1))
+                if y >= n or max_ends[y] > start:
+                    stack.append((k - 1, y, False))
+            elif x < n and starts[x] < end:
+                if start < ends[x]:
+                    found.append(x)
+                stack.append((k - 1, x + (1 << (k - 1)), False))
+        return found
+
+    def _select(self, indices):
+        """Return the features at the given positions of the list (PRIVATE)."""
+        features = self._features
+        return [features[i] for i in sorted(set(indices))]
+
+    def overlapping(self, start, end):
+        """Return a list of the features overlapping the region start:end.
+
+        The region uses Python counting, like a slice. For compound
+        locations at least one of the parts must overlap the region.
+        """
+        features = self._features
+        found = []
+        for i in self._query(start, end):
+            i = self._order[i]
+            if i in self._compound and not any(
+                    part.nofuzzy_start < end and start < part.nofuzzy_end
+                    for part in features[i].location.parts):
+                continue
+            found.append(i)
+        return self._select(found)
+
+    def contained(self, start, end):
+        """Return a list of the features whose span lies within start:end.
+
+        Zero length features at either end of the region are included.
+        """
+        # Spans are integers, so widening the query by one base finds
+        # the spans touching the region as well as those overlapping it.
+        starts = self._starts
+        ends = self._ends
+        return self._select(self._order[i]
+                            for i in self._query(start - 1, end + 1)
+                            if start <= starts[i] and ends[i] <= end)
+
+    def nearest(self, start, end=None):
+        """Return the distance to and a list of the features nearest a region.
+
+        The region is start:end in Python counting, or the single base at
+        start if end is omitted. Distances are the number of bases
+        separating the span of a feature from the region, zero if they
+        overlap; all the features at the smallest distance are returned.
+        Returns (None, []) if there are no indexed features.
+        """
+        if end is None:
+            end = start + 1
+        found = self._query(start, end)
+        best = 0 if found else None
+        # Spans ending before the region (the last ones to end)
+        sorted_ends = self._sorted_ends
+        j = bisect_right(sorted_ends, start)
+        if j:
+            distance = start - sorted_ends[j - 1]
+            if best is None or distance < best:
+                best = distance
+                found = []
+            if distance == best:
+                found.extend(self._by_end[k] for k in
+                             range(bisect_left(sorted_ends, sorted_ends[j - 1]), j))
+        # Spans starting after the region (the first ones to start)
+        starts = self._starts
+        i = bisect_left(starts, end)
+        if i < len(starts):
+            distance = starts[i] - end
+            if best is None or distance < best:
+                best = distance
+                found = []
+            if distance == best:
+                found.extend(range(i, bisect_right(starts, starts[i])))
+        return best, self._select(self._order[i] for i in found)
+
+
 class AbstractPosition(object):
     """Abstract base class representing a position."""
 
@@ -53,7 +53,7 @@ from Bio._py3k import basestring
 # However, all the writing code is in this file.
 
 
-def GenBankIterator(handle):
+def GenBankIterator(handle, lazy_features=False, feature_types=None):
     """Break up a Genbank file into SeqRecord objects.
 
     Every section from the LOCUS line to the terminating // becomes
@@ -62,6 +62,14 @@ def GenBankIterator(handle):
     Note that for genomes or chromosomes, there is typically only
     one record.
 
+    Arguments:
+     - handle - input file
+     - lazy_features - if True, return Bio.GenBank.LazyFeatureSeqRecord
+       objects which only parse the feature table when the features are
+       first used (much faster if you don't need them all)
+     - feature_types - optional list of feature keys (e.g. ["CDS"]), any
+       other features are ignored
+
     This gets called internally by Bio.SeqIO for the GenBank file format:
 
     >>> from Bio import SeqIO
@@ -90,10 +98,12 @@ def GenBankIterator(handle):
 
     """
     # This calls a generator function:
-    return GenBankScanner(debug=0).parse_records(handle)
+    return GenBankScanner(debug=0).parse_records(handle,
+                                                 lazy_features=lazy_features,
+                                                 feature_types=feature_types)
 
 
-def EmblIterator(handle):
+def EmblIterator(handle, lazy_features=False, feature_types=None):
     """Break up an EMBL file into SeqRecord objects.
 
     Every section from the LOCUS line to the terminating // becomes
@@ -102,6 +112,8 @@ def EmblIterator(handle):
     Note that for genomes or chromosomes, there is typically only
     one record.
 
+    The optional arguments are as for the GenBankIterator.
+
     This gets called internally by Bio.SeqIO for the EMBL file format:
 
     >>> from Bio import SeqIO
@@ -136,10 +148,12 @@ def EmblIterator(handle):
 
     """
     # This calls a generator function:
-    return EmblScanner(debug=0).parse_records(handle)
+    return EmblScanner(debug=0).parse_records(handle,
+                                              lazy_features=lazy_features,
+                                              feature_types=feature_types)
 
 
-def ImgtIterator(handle):
+def ImgtIterator(handle, lazy_features=False, feature_types=None):
     """Break up an IMGT file into SeqRecord objects.
 
     Every section from the LOCUS line to the terminating // becomes
@@ -147,9 +161,13 @@ def ImgtIterator(handle):
 
     Note that for genomes or chromosomes, there is typically only
     one record.
+
+    The optional arguments are as for the GenBankIterator.
     """
     # This calls a generator function:
-    return _ImgtScanner(debug=0).parse_records(handle)
+    return _ImgtScanner(debug=0).parse_records(handle,
+                                               lazy_features=lazy_features,
+                                               feature_types=feature_types)
 
 
 def GenBankCdsFeatureIterator(handle, alphabet=Alphabet.generic_protein):
@@ -537,7 +537,7 @@ def write(sequences, handle, format):
     return count
 
 
-def parse(handle, format, alphabet=None):
+def parse(handle, format, alphabet=None, **kwargs):
     r"""Turn a sequence file into an iterator returning SeqRecords.
 
     Arguments:
@@ -548,6 +548,10 @@ def parse(handle, format, alphabet=None):
        cannot be automatically inferred from the file itself
        (e.g. format="fasta" or "tab")
 
+    Any additional keyword arguments are passed to the format specific
+    parser, e.g. lazy_features and feature_types for "genbank", "embl" and
+    "imgt" (see Bio.SeqIO.InsdcIO.GenBankIterator).
+
     Typical usage, opening a file to read in, and looping over the record(s):
 
     >>> from Bio import SeqIO
@@ -619,12 +623,15 @@ def parse(handle, format, alphabet=None):
         if format in _FormatToIterator:
             iterator_generator = _FormatToIterator[format]
             if alphabet is None:
-                i = iterator_generator(fp)
+                i = iterator_generator(fp, **kwargs)
             else:
                 try:
-                    i = iterator_generator(fp, alphabet=alphabet)
+                    i = iterator_generator(fp, alphabet=alphabet, **kwargs)
                 except TypeError:
-                    i = _force_alphabet(iterator_generator(fp), alphabet)
+                    i = _force_alphabet(iterator_generator(fp, **kwargs), alphabet)
+        elif kwargs:
+            raise TypeError("Unexpected arguments for format '%s': %s"
+                            % (format, ", ".join(sorted(kwargs))))
         elif format in AlignIO._FormatToIterator:
             # Use Bio.AlignIO to read in the alignments
             i = (r for alignment in AlignIO.parse(fp, format,
@@ -652,7 +659,7 @@ def _force_alphabet(record_iterator, alphabet):
                              % (alphabet, record.seq.alphabet))
 
 
-def read(handle, format, alphabet=None):
+def read(handle, format, alphabet=None, **kwargs):
     """Turn a sequence file into a single SeqRecord.
 
     Arguments:
@@ -662,6 +669,7 @@ def read(handle, format, alphabet=None):
      - alphabet - optional Alphabet object, useful when the sequence type
        cannot be automatically inferred from the file itself
        (e.g. format="fasta" or "tab")
+     - kwargs   - any additional format specific options (see parse)
 
     This function is for use parsing sequence files containing
     exactly one record.  For example, reading a GenBank file:
@@ -696,7 +704,7 @@ def read(handle, format, alphabet=None):
     Use the Bio.SeqIO.parse(handle, format) function if you want
     to read multiple records from the handle.
     """
-    iterator = parse(handle, format, alphabet)
+    iterator = parse(handle, format, alphabet, **kwargs)
     try:
         first = next(iterator)
     except StopIteration:
@@ -774,7 +782,8 @@ def to_dict(sequences, key_function=None):
     return d
 
 
-def index(filename, format, alphabet=None, key_function=None):
+def index(filename, format, alphabet=None, key_function=None, use_mmap=False,
+          cache_size=0):
     """Indexes a sequence file and returns a dictionary like object.
 
     Arguments:
@@ -786,6 +795,10 @@ def index(filename, format, alphabet=None, key_function=None):
      - key_function - Optional callback function which when given a
        SeqRecord identifier string should return a unique key for the
        dictionary.
+     - use_mmap - Optional, memory map the file to speed up indexing
+       (see below).
+     - cache_size - Optional, number of recently used records to keep in
+       memory (see below).
 
     This indexing function will return a dictionary like object, giving the
     SeqRecord objects as values:
@@ -821,6 +834,38 @@ def index(filename, format, alphabet=None, key_function=None):
     true Python dictionary, for example values() is not defined since this
     would require loading all of the records into memory at once.
 
+    For uncompressed FASTA, FASTQ and similar simple formats ("ace", "phd",
+    "pir", "qual") you can ask for the file to be memory mapped. Record
+    boundaries are then found by searching the whole file at once, which
+    is much faster for large files, and get_raw returns a memoryview of
+    the file rather than a copy of the bytes:
+
+    >>> records = SeqIO.index("Quality/example.fastq", "fastq", use_mmap=True)
+    >>> raw = records.get_raw("EAS54_6_R1_2_1_540_792")
+    >>> print(bytes(raw).decode().split()[1])
+    TTGGCAGGCCAAGGCCGATGGATCA
+    >>> del raw  # release the memoryview before closing the file
+    >>> records.close()
+
+    For other formats, or BGZF compressed files, use_mmap is ignored.
+
+    If you will be looking up the same records repeatedly, you can ask for
+    up to cache_size of the most recently used records to be kept, rather
+    than parsed again each time. The same SeqRecord object is then returned
+    each time, so should not be modified. To get many records at once, use
+    the get_many method (or get_raw_many), which reads them in the order
+    they are in the file rather than seeking back and forth:
+
+    >>> records = SeqIO.index("Quality/example.fastq", "fastq", cache_size=100)
+    >>> records["EAS54_6_R1_2_1_413_324"] is records["EAS54_6_R1_2_1_413_324"]
+    True
+    >>> for record in records.get_many(["EAS54_6_R1_2_1_540_792",
+    ...                                 "EAS54_6_R1_2_1_413_324"]):
+    ...     print(record.id)
+    EAS54_6_R1_2_1_540_792
+    EAS54_6_R1_2_1_413_324
+    >>> records.close()
+
     When you call the index function, it will scan through the file, noting
     the location of each record. When you access a particular record via the
     dictionary methods, the code will jump to the appropriate part of the
@@ -899,19 +944,26 @@ def index(filename, format, alphabet=None, key_function=None):
 
     # Map the file format to a sequence iterator:
     from ._index import _FormatToRandomAccess  # Lazy import
+    from ._index import _FormatToMmapRandomAccess
     from Bio.File import _IndexedSeqFileDict
     try:
         proxy_class = _FormatToRandomAccess[format]
     except KeyError:
         raise ValueError("Unsupported format %r" % format)
+    if use_mmap:
+        proxy_class = _FormatToMmapRandomAccess.get(format, proxy_class)
     repr = "SeqIO.index(%r, %r, alphabet=%r, key_function=%r)" \
         % (filename, format, alphabet, key_function)
+    if use_mmap:
+        repr = repr[:-1] + ", use_mmap=True)"
+    if cache_size:
+        repr = repr[:-1] + ", cache_size=%r)" % cache_size
     return _IndexedSeqFileDict(proxy_class(filename, format, alphabet),
-                               key_function, repr, "SeqRecord")
+                               key_function, repr, "SeqRecord", cache_size)
 
 
 def index_db(index_filename, filenames=None, format=None, alphabet=None,
-             key_function=None):
+             key_function=None, use_mmap=False, n_jobs=1, cache_size=0):
     """Index several sequence files and return a dictionary like object.
 
     The index is stored in an SQLite database rather than in memory (as in the
@@ -930,6 +982,12 @@ def index_db(index_filename, filenames=None, format=None, alphabet=None,
      - key_function - Optional callback function which when given a
        SeqRecord identifier string should return a unique
        key for the dictionary.
+     - use_mmap - Optional, memory map uncompressed files of simple formats
+       like FASTA or FASTQ (see Bio.SeqIO.index for details).
+     - n_jobs - Optional, number of processes used to scan the files when
+       building the index (default 1, None for one per CPU).
+     - cache_size - Optional, number of recently used records to keep in
+       memory (see Bio.SeqIO.index for details).
 
     This indexing function will return a dictionary like object, giving the
     SeqRecord objects as values:
@@ -954,6 +1012,23 @@ def index_db(index_filename, filenames=None, format=None, alphabet=None,
 
     In this example the two files contain 85 and 10 records respectively.
 
+    When indexing many files, they can be scanned in parallel by worker
+    processes using the n_jobs argument, while the main process writes
+    the keys and offsets to the database. The index is the same as with
+    a single process. If the worker processes cannot be started with
+    your key function (on platforms without fork, it must be possible to
+    pickle it) the files are scanned one by one instead.
+
+    The size, modified time and a checksum of each file are recorded in the
+    index, and checked when it is loaded again, with a warning if any files
+    have changed. The update method then brings the index up to date,
+    adding any records appended to a file, and scanning any other changed
+    files again. Use the stale_files method to list the changed files.
+
+    As with Bio.SeqIO.index, the get_many and get_raw_many methods look up
+    many records at once. Here the keys are also found in the database
+    together, rather than one query for each key.
+
     BGZF compressed files are supported, and detected automatically. Ordinary
     GZIP compressed files are not supported.
 
@@ -978,23 +1053,34 @@ def index_db(index_filename, filenames=None, format=None, alphabet=None,
     if alphabet is not None and not (isinstance(alphabet, Alphabet) or
                                      isinstance(alphabet, AlphabetEncoder)):
         raise ValueError("Invalid alphabet, %r" % alphabet)
+    if n_jobs is not None and n_jobs < 1:
+        raise ValueError("Need at least one process, not n_jobs=%r" % n_jobs)
 
     # Map the file format to a sequence iterator:
     from ._index import _FormatToRandomAccess  # Lazy import
+    from ._index import _FormatToMmapRandomAccess
     from Bio.File import _SQLiteManySeqFilesDict
     repr = ("SeqIO.index_db(%r, filenames=%r, format=%r, alphabet=%r, key_function=%r)"
             % (index_filename, filenames, format, alphabet, key_function))
+    if use_mmap:
+        repr = repr[:-1] + ", use_mmap=True)"
+    if cache_size:
+        repr = repr[:-1] + ", cache_size=%r)" % cache_size
 
     def proxy_factory(format, filename=None):
         """Given a filename returns proxy object, else boolean if format OK."""
         if filename:
-            return _FormatToRandomAccess[format](filename, format, alphabet)
+            proxy_class = _FormatToRandomAccess[format]
+            if use_mmap:
+                proxy_class = _FormatToMmapRandomAccess.get(format, proxy_class)
+            return proxy_class(filename, format, alphabet)
         else:
             return format in _FormatToRandomAccess
 
     return _SQLiteManySeqFilesDict(index_filename, filenames,
                                    proxy_factory, format,
-                                   key_function, repr)
+                                   key_function, repr, n_jobs=n_jobs,
+                                   cache_size=cache_size)
 
 
 def convert(in_file, in_format, out_file, out_format, alphabet=None):
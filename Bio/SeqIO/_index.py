@@ -28,6 +28,7 @@ re-indexing the file for use another time.
 
 from __future__ import print_function
 
+import mmap
 import re
 from io import BytesIO
 from Bio._py3k import StringIO
@@ -36,6 +37,7 @@ from Bio._py3k import _bytes_to_string
 from Bio import SeqIO
 from Bio import Alphabet
 from Bio.File import _IndexedSeqFileProxy, _open_for_random_access
+from Bio.bgzf import BgzfReader
 
 
 class SeqFileRandomAccess(_IndexedSeqFileProxy):
@@ -191,10 +193,14 @@ class SequentialSeqFileRandomAccess(SeqFileRandomAccess):
 
     def __iter__(self):
         """Return (id, offset, length) tuples."""
+        return self.iter_from(0)
+
+    def iter_from(self, offset):
+        """Return (id, offset, length) tuples for records from offset."""
         marker_offset = len(self._marker)
         marker_re = self._marker_re
         handle = self._handle
-        handle.seek(0)
+        handle.seek(offset)
         # Skip any header before first record
         while True:
             start_offset = handle.tell()
@@ -242,9 +248,9 @@ class SequentialSeqFileRandomAccess(SeqFileRandomAccess):
 class GenBankRandomAccess(SequentialSeqFileRandomAccess):
     """Indexed dictionary like access to a GenBank file."""
 
-    def __iter__(self):
+    def iter_from(self, offset):
         handle = self._handle
-        handle.seek(0)
+        handle.seek(offset)
         marker_re = self._marker_re
         accession_marker = b"ACCESSION "
         version_marker = b"VERSION "
@@ -298,9 +304,9 @@ class GenBankRandomAccess(SequentialSeqFileRandomAccess):
 class EmblRandomAccess(SequentialSeqFileRandomAccess):
     """Indexed dictionary like access to an EMBL file."""
 
-    def __iter__(self):
+    def iter_from(self, offset):
         handle = self._handle
-        handle.seek(0)
+        handle.seek(offset)
         marker_re = self._marker_re
         semi_char = b";"
         sv_marker = b"SV "
@@ -359,9 +365,9 @@ class EmblRandomAccess(SequentialSeqFileRandomAccess):
 class SwissRandomAccess(SequentialSeqFileRandomAccess):
     """Random access to a SwissProt file."""
 
-    def __iter__(self):
+    def iter_from(self, offset):
         handle = self._handle
-        handle.seek(0)
+        handle.seek(offset)
         marker_re = self._marker_re
         # Skip any header before first record
         while True:
@@ -392,9 +398,9 @@ class SwissRandomAccess(SequentialSeqFileRandomAccess):
 class UniprotRandomAccess(SequentialSeqFileRandomAccess):
     """Random access to a UniProt XML file."""
 
-    def __iter__(self):
+    def iter_from(self, offset):
         handle = self._handle
-        handle.seek(0)
+        handle.seek(offset)
         marker_re = self._marker_re
         start_acc_marker = b"<accession>"
         end_acc_marker = b"</accession>"
@@ -530,8 +536,13 @@ class TabRandomAccess(SeqFileRandomAccess):
     """Random access to a simple tabbed file."""
 
     def __iter__(self):
+        """Return (id, offset, length) tuples."""
+        return self.iter_from(0)
+
+    def iter_from(self, offset):
+        """Return (id, offset, length) tuples for records from offset."""
         handle = self._handle
-        handle.seek(0)
+        handle.seek(offset)
         tab_char = b"\t"
         while True:
             start_offset = handle.tell()
@@ -568,8 +579,13 @@ class FastqRandomAccess(SeqFileRandomAccess):
     """
 
     def __iter__(self):
+        """Return (id, offset, length) tuples."""
+        return self.iter_from(0)
+
+    def iter_from(self, offset):
+        """Return (id, offset, length) tuples for records from offset."""
         handle = self._handle
-        handle.seek(0)
+        handle.seek(offset)
         id = None
         start_offset = handle.tell()
         line = handle.readline()
@@ -664,6 +680,224 @@ class FastqRandomAccess(SeqFileRandomAccess):
         return data
 
 
+##########################
+# Memory mapped indexers #
+##########################
+# For uncompressed files the record boundaries can be found by searching
+# the whole file as one buffer, rather than with readline/tell calls for
+# every line, and get_raw can return a memoryview without copying.
+
+def _mmap_handle(proxy):
+    """Replace the handle of a random access proxy with a memory map (PRIVATE).
+
+    Returns the mmap object, or None if the file cannot be mapped (e.g.
+    it is BGZF compressed or empty) in which case the proxy is unchanged.
+    The mmap object acts as a read only handle, so the other code using
+    the proxy's handle still works.
+    """
+    handle = proxy._handle
+    if isinstance(handle, BgzfReader):
+        return None
+    try:
+        data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, EnvironmentError):
+        # e.g. an empty file can't be mapped
+        return None
+    handle.close()
+    proxy._handle = data
+    return data
+
+
+def _memoryview_slice(data, start, end):
+    """Return data[start:end] without copying, if possible (PRIVATE)."""
+    try:
+        return memoryview(data)[start:end]
+    except TypeError:
+        # Python 2 mmap objects don't support memoryview
+        return data[start:end]
+
+
+class MmapSequentialSeqFileRandomAccess(SequentialSeqFileRandomAccess):
+    """Memory mapped random access to a simple sequential file (e.g. FASTA).
+
+    Falls back on the SequentialSeqFileRandomAccess methods for BGZF files.
+    The get_raw method returns a memoryview of the file, which must be
+    released before the file is closed.
+    """
+
+    def __init__(self, filename, format, alphabet):
+        """Initialize the class."""
+        SequentialSeqFileRandomAccess.__init__(self, filename, format, alphabet)
+        self._data = _mmap_handle(self)
+        # Markers are regular expressions (see "pir"), but most are plain
+        # strings which can be found much faster than by a regex search
+        self._marker_line_re = re.compile(b"^" + self._marker, re.MULTILINE)
+        if not re.search(b"[][.^$*+?{}()|\\\\]", self._marker):
+            self._new_line_marker = b"\n" + self._marker
+        else:
+            self._new_line_marker = None
+
+    def _next_start(self, offset):
+        """Return start of the first record after offset, or -1 (PRIVATE)."""
+        if self._new_line_marker is None:
+            match = self._marker_line_re.search(self._data, offset + 1)
+            return -1 if match is None else match.start()
+        i = self._data.find(self._new_line_marker, offset)
+        return -1 if i == -1 else i + 1
+
+    def iter_from(self, offset):
+        """Return (id, offset, length) tuples for records from offset."""
+        data = self._data
+        if data is None:
+            for values in SequentialSeqFileRandomAccess.iter_from(self, offset):
+                yield values
+            return
+        marker_offset = len(self._marker)
+        size = len(data)
+        # Skip any header before first record
+        if self._marker_line_re.match(data, offset):
+            start_offset = offset
+        else:
+            start_offset = self._next_start(offset)
+        while start_offset != -1:
+            line_end = data.find(b"\n", start_offset)
+            if line_end == -1:
+                line_end = size
+            # Here we can assume the record.id is the first word after the
+            # marker, as in SequentialSeqFileRandomAccess
+            id = data[start_offset + marker_offset:line_end].strip().split(None, 1)[0]
+            next_start = self._next_start(start_offset)
+            end_offset = size if next_start == -1 else next_start
+            yield _bytes_to_string(id), start_offset, end_offset - start_offset
+            start_offset = next_start
+
+    def _end_offset(self, offset):
+        next_start = self._next_start(offset)
+        return len(self._data) if next_start == -1 else next_start
+
+    def get(self, offset):
+        """Return SeqRecord."""
+        if self._data is None:
+            return SequentialSeqFileRandomAccess.get(self, offset)
+        raw = self._data[offset:self._end_offset(offset)]
+        return self._parse(StringIO(_bytes_to_string(raw)))
+
+    def get_raw(self, offset):
+        """Return the raw record from the file as a memoryview."""
+        if self._data is None:
+            return SequentialSeqFileRandomAccess.get_raw(self, offset)
+        return _memoryview_slice(self._data, offset, self._end_offset(offset))
+
+
+class MmapFastqRandomAccess(FastqRandomAccess):
+    """Memory mapped random access to a FASTQ file (any supported variant).
+
+    Falls back on the FastqRandomAccess methods for BGZF files. The
+    get_raw method returns a memoryview of the file, which must be
+    released before the file is closed.
+    """
+
+    def __init__(self, filename, format, alphabet):
+        """Initialize the class."""
+        FastqRandomAccess.__init__(self, filename, format, alphabet)
+        self._data = _mmap_handle(self)
+
+    # The usual four line record followed by another record or the end of
+    # file, anything else is left to the line by line scan. Groups are the
+    # id (first word of the title), sequence and quality lines.
+    _simple_record_re = re.compile(b"@[^\\S\n]*(\\S+)[^\n]*\n([^\n]*)\n"
+                                   b"\\+[^\n]*\n([^\n]*)\n(?=@|\\Z)")
+
+    def _scan(self, offset):
+        """Return id and end offset of the record starting at offset (PRIVATE).
+
+        Applies the same checks as FastqRandomAccess, but searches for the
+        line ends in the buffer.
+        """
+        data = self._data
+        size = len(data)
+        match = self._simple_record_re.match(data, offset)
+        if match is not None:
+            id, seq, qual = match.groups()
+            seq_len = len(seq.strip())
+            if seq_len and seq[0:1] != b"+" and seq_len == len(qual.strip()):
+                return id, match.end()
+        find = data.find
+        pos = find(b"\n", offset) + 1 or size
+        line = data[offset:pos]
+        if line[0:1] != b"@":
+            raise ValueError("Problem with FASTQ @ line:\n%r" % line)
+        id = line[1:].rstrip().split(None, 1)[0]
+        # Find the seq line(s)
+        seq_len = 0
+        while True:
+            if pos == size:
+                raise ValueError("Premature end of file in seq section")
+            end = find(b"\n", pos) + 1 or size
+            if data[pos:pos + 1] == b"+":
+                pos = end
+                break
+            seq_len += len(data[pos:end].strip())
+            pos = end
+        # Find the qual line(s)
+        qual_len = 0
+        while seq_len != qual_len:
+            if pos == size:
+                raise ValueError("Problem with quality section")
+            end = find(b"\n", pos) + 1 or size
+            qual_len += len(data[pos:end].strip())
+            pos = end
+        if seq_len == 0:
+            # Special case, quality line should be just "\n"
+            end = find(b"\n", pos) + 1 or size
+            if data[pos:end].strip():
+                raise ValueError("Expected blank quality line, not %r" % data[pos:end])
+            pos = end
+        # Should be end of record...
+        if pos < size and data[pos:pos + 1] != b"@":
+            raise ValueError("Problem with line %r"
+                             % data[pos:find(b"\n", pos) + 1 or size])
+        return id, pos
+
+    def iter_from(self, offset):
+        """Return (id, offset, length) tuples for records from offset."""
+        data = self._data
+        if data is None:
+            for values in FastqRandomAccess.iter_from(self, offset):
+                yield values
+            return
+        size = len(data)
+        match_simple = self._simple_record_re.match
+        start_offset = offset
+        while start_offset < size:
+            # Inlined fast path of _scan
+            match = match_simple(data, start_offset)
+            if match is not None:
+                id, seq, qual = match.groups()
+                seq_len = len(seq.strip())
+                if seq_len and seq[0:1] != b"+" and seq_len == len(qual.strip()):
+                    end_offset = match.end()
+                    yield _bytes_to_string(id), start_offset, end_offset - start_offset
+                    start_offset = end_offset
+                    continue
+            id, end_offset = self._scan(start_offset)
+            yield _bytes_to_string(id), start_offset, end_offset - start_offset
+            start_offset = end_offset
+
+    def get(self, offset):
+        """Return SeqRecord."""
+        if self._data is None:
+            return FastqRandomAccess.get(self, offset)
+        raw = self._data[offset:self._scan(offset)[1]]
+        return self._parse(StringIO(_bytes_to_string(raw)))
+
+    def get_raw(self, offset):
+        """Return the raw record from the file as a memoryview."""
+        if self._data is None:
+            return FastqRandomAccess.get_raw(self, offset)
+        return _memoryview_slice(self._data, offset, self._scan(offset)[1])
+
+
 ###############################################################################
 
 _FormatToRandomAccess = {"ace": SequentialSeqFileRandomAccess,
@@ -686,3 +920,15 @@ _FormatToRandomAccess = {"ace": SequentialSeqFileRandomAccess,
                          "qual": SequentialSeqFileRandomAccess,
                          "uniprot-xml": UniprotRandomAccess,
                          }
+
+# Used instead of the above when memory mapping is requested
+_FormatToMmapRandomAccess = {"ace": MmapSequentialSeqFileRandomAccess,
+                             "fasta": MmapSequentialSeqFileRandomAccess,
+                             "fastq": MmapFastqRandomAccess,
+                             "fastq-sanger": MmapFastqRandomAccess,
+                             "fastq-solexa": MmapFastqRandomAccess,
+                             "fastq-illumina": MmapFastqRandomAccess,
+                             "phd": MmapSequentialSeqFileRandomAccess,
+                             "pir": MmapSequentialSeqFileRandomAccess,
+                             "qual": MmapSequentialSeqFileRandomAccess,
+                             }
@@ -11,6 +11,8 @@
 
 from Bio._py3k import basestring
 
+from Bio.SeqFeature import FeatureIndex
+
 # NEEDS TO BE SYNCH WITH THE REST OF BIOPYTHON AND BIOPERL
 # In particular, the SeqRecord and BioSQL.BioSeq.DBSeqRecord classes
 # need to be in sync (this is the BioSQL "Database SeqRecord", see
@@ -90,6 +92,16 @@ class _RestrictedDict(dict):
             self[key] = value
 
 
+def _same_features(old, new):
+    """Check in constant time if a list of features looks unchanged (PRIVATE).
+
+    Compares the lengths and the first and last features of the lists.
+    """
+    if len(old) != len(new):
+        return False
+    return not new or (old[0] is new[0] and old[-1] is new[-1])
+
+
 class SeqRecord(object):
     """A SeqRecord object holds a sequence and information about it.
 
@@ -320,6 +332,46 @@ class SeqRecord(object):
                    fset=_set_seq,
                    doc="The sequence itself, as a Seq or MutableSeq object.")
 
+    @property
+    def feature_index(self):
+        """Interval index of the features, for location queries (read only).
+
+        This is a FeatureIndex built from the features list the first
+        time it is used, and rebuilt after the list is modified or
+        replaced. For example, using a GenBank file:
+
+        >>> from Bio import SeqIO
+        >>> record = SeqIO.read("GenBank/NC_005816.gb", "genbank")
+        >>> for f in record.feature_index.overlapping(2900, 3000):
+        ...     print("%s %s" % (f.type, f.qualifiers.get("locus_tag")))
+        source None
+        gene ['YP_pPCP03']
+        CDS ['YP_pPCP03']
+        misc_feature ['YP_pPCP03']
+
+        Checking the list for changes takes constant time, so features
+        added to or removed from the list are noticed, as are changes to
+        its first and last entries, but not other features replaced in
+        place or the location of a feature already in the list being
+        changed. In those cases replace the list (for example with
+        ``record.features = record.features[:]``) to update the index.
+        Slicing the record does not use this index, but checks each feature.
+        """
+        features = self.features
+        # Kept with the list it was built from, to notice a new list
+        index = getattr(self, "_feature_index", None)
+        if index is None or index[0] is not features \
+                or not _same_features(index[1]._features, features):
+            index = (features, FeatureIndex(features))
+            self._feature_index = index
+        return index[1]
+
+    def __getstate__(self):
+        """Return the state for pickling, without the feature index (PRIVATE)."""
+        state = self.__dict__.copy()
+        state.pop("_feature_index", None)
+        return state
+
     def __getitem__(self, index):
         """Return a sub-sequence or an individual letter.
 
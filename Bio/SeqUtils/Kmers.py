@@ -0,0 +1,649 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""K-mer counting, minimizers and MinHash sketches for nucleotide sequences.
+
+K-mers (words of length k) are encoded using two bits per base (A=0, C=1,
+G=2, T=3), so a k-mer of up to 31 bases fits in a single integer. The
+codes are calculated with a rolling update as we move along a sequence,
+rather than slicing out each k-mer as a string:
+
+>>> from Bio.SeqUtils.Kmers import kmer_codes, decode_kmer
+>>> codes = list(kmer_codes("ACGTTNGGA", 3, canonical=False))
+>>> codes
+[6, 27, 47, 40]
+>>> [decode_kmer(code, 3) for code in codes]
+['ACG', 'CGT', 'GTT', 'GGA']
+
+Lower case letters are treated as upper case, and any k-mer including
+other letters (such as N) is skipped. By default k-mers are canonical,
+meaning the smaller code of the k-mer and its reverse complement is used,
+so that both strands of a sequence give the same k-mers:
+
+>>> [decode_kmer(code, 3) for code in kmer_codes("ACGTTNGGA", 3)]
+['ACG', 'ACG', 'AAC', 'GGA']
+
+The KmerCounts class counts k-mers using arrays rather than a Python
+dictionary, and the MinHashSketch class keeps a small, fixed size sample
+of the k-mers of a sequence, which can be used to estimate the Jaccard
+similarity or containment of two sequences. Both can be built directly
+from a FASTA or FASTQ file, reading one record at a time:
+
+>>> from Bio.SeqUtils.Kmers import count_kmers
+>>> counts = count_kmers("Fasta/f002", 5, "fasta")
+>>> counts.most_common(3)
+[('AAAGG', 12), ('TGAAA', 10), ('TTAAA', 10)]
+"""
+
+from __future__ import print_function
+
+import heapq
+import re
+import sys
+from array import array
+from collections import deque
+
+from Bio._py3k import basestring
+from Bio._py3k import range
+from Bio._py3k import zip
+
+from Bio.File import as_handle
+from Bio.SeqRecord import SeqRecord
+
+
+if sys.version_info[0] == 3:
+    _to_digits = str.maketrans("ACGTacgt0123", "01230123NNNN")
+    _complement_digits = str.maketrans("0123", "3210")
+else:
+    import string
+    _to_digits = string.maketrans("ACGTacgt0123", "01230123NNNN")
+    _complement_digits = string.maketrans("0123", "3210")
+
+_runs = re.compile("[0-3]+")
+_not_digits = re.compile("[^0-3]")
+
+# Largest k for which the codes fit in an unsigned 64 bit array
+MAX_K = 31
+
+# Largest k for which KmerCounts uses a plain array indexed by the code
+_DENSE_K = 10
+
+_MASK64 = (1 << 64) - 1
+
+# Array type used for the (up to 63 bit) keys of the KmerCounts hash table.
+# Python 2 arrays have no "Q" type, but "L" is 64 bits on most platforms,
+# otherwise (e.g. Python 2 on Windows) a list is used.
+try:
+    array("Q")
+    _KEY_TYPECODE = "Q"
+except ValueError:
+    _KEY_TYPECODE = "L" if array("L").itemsize >= 8 else None
+
+
+def encode_kmer(kmer):
+    """Return the two bit code of a k-mer (string of A, C, G and T).
+
+    >>> encode_kmer("ACGT")
+    27
+    """
+    digits = kmer.upper().translate(_to_digits)
+    if not digits or _not_digits.search(digits):
+        raise ValueError("K-mer %r should only use the letters A, C, G and T"
+                         % kmer)
+    return int(digits, 4)
+
+
+def decode_kmer(code, k):
+    """Return the k-mer (string) for a two bit code.
+
+    >>> decode_kmer(27, 4)
+    'ACGT'
+    """
+    letters = []
+    for i in range(k):
+        letters.append("ACGT"[code & 3])
+        code >>= 2
+    return "".join(reversed(letters))
+
+
+def canonical_kmer(kmer):
+    """Return the smaller of a k-mer and its reverse complement.
+
+    >>> canonical_kmer("TTGCA")
+    'TGCAA'
+    """
+    k = len(kmer)
+    code = encode_kmer(kmer)
+    return decode_kmer(min(code, _reverse_code(code, k)), k)
+
+
+def _reverse_code(code, k):
+    """Return the code of the reverse complement of a k-mer code (PRIVATE)."""
+    answer = 0
+    for i in range(k):
+        answer = (answer << 2) | (3 - (code & 3))
+        code >>= 2
+    return answer
+
+
+def _check_k(k):
+    """Raise a ValueError if k is not a valid k-mer length (PRIVATE)."""
+    if not 0 < k <= MAX_K:
+        raise ValueError("k should be between 1 and %i, not %r" % (MAX_K, k))
+
+
+def _run_codes(run, k, canonical):
+    """Yield the codes of the k-mers of a run of digits 0 to 3 (PRIVATE)."""
+    mask = (1 << 2 * k) - 1
+    shift = 2 * (k - 1)
+    # Start with the first k - 1 bases, the loop adds one base at a time
+    code = int(run[:k - 1] or "0", 4)
+    if not canonical:
+        for digit in map(int, run[k - 1:]):
+            code = ((code << 2) | digit) & mask
+            yield code
+        return
+    reverse = int(run[:k - 1][::-1].translate(_complement_digits) or "0", 4) << 2
+    for digit in map(int, run[k - 1:]):
+        code = ((code << 2) | digit) & mask
+        reverse = (reverse >> 2) | ((3 - digit) << shift)
+        if code < reverse:
+            yield code
+        else:
+            yield reverse
+
+
+def _code_runs(seq, k):
+    """Yield the start and digits of each run of at least k bases (PRIVATE)."""
+    digits = str(seq).translate(_to_digits)
+    for match in _runs.finditer(digits):
+        if match.end() - match.start() >= k:
+            yield match.start(), match.group()
+
+
+def kmer_codes(seq, k, canonical=True):
+    """Iterate over the codes of the k-mers in a sequence.
+
+    Arguments:
+     - seq - a nucleotide sequence (string, Seq or MutableSeq)
+     - k - the k-mer length, an integer from 1 to 31
+     - canonical - use the smaller code of each k-mer and its reverse
+       complement (default True)
+
+    K-mers including letters other than A, C, G and T (in upper or lower
+    case) are skipped.
+    """
+    _check_k(k)
+    for start, run in _code_runs(seq, k):
+        for code in _run_codes(run, k, canonical):
+            yield code
+
+
+def _hash_code(code):
+    """Return a 64 bit hash of a k-mer code (PRIVATE).
+
+    This is the finalizer of the MurmurHash3 algorithm, which mixes the
+    bits so that the order of the hashes is unrelated to the k-mers.
+    """
+    code = ((code ^ (code >> 33)) * 0xff51afd7ed558ccd) & _MASK64
+    code = ((code ^ (code >> 33)) * 0xc4ceb9fe1a85ec53) & _MASK64
+    return code ^ (code >> 33)
+
+
+def minimizers(seq, k, w, canonical=True):
+    """Return the (w, k)-minimizers of a sequence.
+
+    Arguments:
+     - seq - a nucleotide sequence (string, Seq or MutableSeq)
+     - k - the k-mer length, an integer from 1 to 31
+     - w - the number of consecutive k-mers in each window
+     - canonical - use canonical k-mers (default True)
+
+    For each window of w consecutive k-mers, the k-mer with the smallest
+    hash is selected (the leftmost, if there is a tie). Returns a list of
+    the distinct selected k-mers, as tuples of their start position in
+    the sequence and their code. Windows do not span letters other than
+    A, C, G and T.
+
+    >>> from Bio.SeqUtils.Kmers import minimizers
+    >>> from Bio.SeqUtils.Kmers import decode_kmer
+    >>> for start, code in minimizers("ACGTTGCATGTCGCATGATGCATGAGAGCT", 5, 4):
+    ...     print("%i %s" % (start, decode_kmer(code, 5)))
+    ...
+    3 TGCAA
+    7 ATGTC
+    8 CGACA
+    9 GCGAC
+    10 TCGCA
+    13 CATGA
+    16 GATGC
+    17 ATGCA
+    18 ATGCA
+    22 TCTCA
+    24 AGAGC
+
+    The k-mers at 17 and 18 are both selected, as they are different
+    k-mers (ATGCA and TGCAT) with the same canonical form.
+    """
+    _check_k(k)
+    if w < 1:
+        raise ValueError("w should be a positive integer, not %r" % w)
+    answer = []
+    for start, run in _code_runs(seq, k):
+        # Increasing hashes of the k-mers which could still be selected,
+        # as tuples of (hash, position, code)
+        window = deque()
+        last = None
+        for i, code in enumerate(_run_codes(run, k, canonical)):
+            value = _hash_code(code)
+            while window and window[-1][0] > value:
+                window.pop()
+            window.append((value, i, code))
+            if window[0][1] <= i - w:
+                window.popleft()
+            if i >= w - 1 and window[0][1] != last:
+                last = window[0][1]
+                answer.append((start + last, window[0][2]))
+        if window and last is None:
+            # Run shorter than a whole window, use what we have
+            answer.append((start + window[0][1], window[0][2]))
+    return answer
+
+
+class KmerCounts(object):
+    """Counts of the k-mers in one or more nucleotide sequences.
+
+    The counts are held in arrays, using a hash table with open addressing
+    for the codes of the k-mers. This needs far less memory than a Python
+    dictionary of k-mer strings. For k of 10 or less, the counts are simply
+    held in an array with an entry for every possible k-mer.
+
+    >>> from Bio.SeqUtils.Kmers import KmerCounts
+    >>> counts = KmerCounts(3, canonical=False)
+    >>> counts.add("ACGTACGTNACG")
+    >>> len(counts)
+    4
+    >>> counts.total
+    7
+    >>> counts["ACG"]
+    3
+    >>> counts["AAA"]
+    0
+    >>> sorted(counts.items())
+    [('ACG', 3), ('CGT', 2), ('GTA', 1), ('TAC', 1)]
+
+    Sequences can also be added using the update method, which takes an
+    iterable of sequences or SeqRecord objects. Using canonical k-mers
+    (the default), a k-mer and its reverse complement are counted
+    together, under whichever of the two comes first alphabetically.
+    """
+
+    def __init__(self, k, canonical=True):
+        """Create an empty set of counts for k-mers of length k."""
+        _check_k(k)
+        self.k = k
+        self.canonical = canonical
+        self.total = 0
+        self._size = 0
+        if k <= _DENSE_K:
+            self._keys = None
+            self._counts = array("L", [0]) * (4 ** k)
+        else:
+            self._allocate(1 << 16)
+
+    def _allocate(self, capacity):
+        """Create an empty hash table with the given number of slots (PRIVATE)."""
+        # Keys are the code plus one, so zero marks an empty slot
+        if _KEY_TYPECODE is None:
+            self._keys = [0] * capacity
+        else:
+            self._keys = array(_KEY_TYPECODE, [0]) * capacity
+        self._counts = array("L", [0]) * capacity
+        self._bits = capacity.bit_length() - 1
+        self._size = 0
+
+    def _slot(self, code):
+        """Return the slot holding (or which should hold) a code (PRIVATE)."""
+        keys = self._keys
+        key = code + 1
+        mask = len(keys) - 1
+        # Fibonacci hashing, using the top bits of the product
+        slot = ((code * 0x9e3779b97f4a7c15) & _MASK64) >> (64 - self._bits)
+        while keys[slot] and keys[slot] != key:
+            slot = (slot + 1) & mask
+        return slot
+
+    def _grow(self):
+        """Double the size of the hash table (PRIVATE)."""
+        keys = self._keys
+        counts = self._counts
+        self._allocate(2 * len(keys))
+        size = 0
+        for key, count in zip(keys, counts):
+            if key:
+                slot = self._slot(key - 1)
+                self._keys[slot] = key
+                self._counts[slot] = count
+                size += 1
+        self._size = size
+
+    def add_codes(self, codes):
+        """Count the k-mers with the given codes (an iterable of integers)."""
+        counts = self._counts
+        total = 0
+        if self._keys is None:
+            for code in codes:
+                counts[code] += 1
+                total += 1
+            self.total += total
+            return
+        keys = self._keys
+        mask = len(keys) - 1
+        shift = 64 - self._bits
+        limit = len(keys) // 2
+        for code in codes:
+            # As in the _slot method, but inline for speed
+            key = code + 1
+            slot = ((code * 0x9e3779b97f4a7c15) & _MASK64) >> shift
+            while keys[slot] and keys[slot] != key:
+                slot = (slot + 1) & mask
+            if keys[slot]:
+                counts[slot] += 1
+            else:
+                keys[slot] = key
+                counts[slot] = 1
+                self._size += 1
+                if self._size > limit:
+                    self._grow()
+                    keys = self._keys
+                    counts = self._counts
+                    mask = len(keys) - 1
+                    shift = 64 - self._bits
+                    limit = len(keys) // 2
+            total += 1
+        self.total += total
+
+    def add(self, sequence):
+        """Count the k-mers of a sequence (string, Seq, MutableSeq or SeqRecord)."""
+        if isinstance(sequence, SeqRecord):
+            sequence = sequence.seq
+        self.add_codes(kmer_codes(sequence, self.k, self.canonical))
+
+    def update(self, sequences):
+        """Count the k-mers of each of the sequences or SeqRecord objects."""
+        for sequence in sequences:
+            self.add(sequence)
+
+    def _code(self, kmer):
+        """Return the code of a k-mer string, canonical if needed (PRIVATE)."""
+        if len(kmer) != self.k:
+            raise ValueError("Expected a k-mer of length %i, not %r"
+                             % (self.k, kmer))
+        code = encode_kmer(kmer)
+        if self.canonical:
+            code = min(code, _reverse_code(code, self.k))
+        return code
+
+    def __getitem__(self, kmer):
+        """Return the count of a k-mer (given as a string), zero if not seen."""
+        code = self._code(kmer)
+        # Using int as arrays give long integers on Python 2
+        if self._keys is None:
+            return int(self._counts[code])
+        slot = self._slot(code)
+        if self._keys[slot]:
+            return int(self._counts[slot])
+        return 0
+
+    def __contains__(self, kmer):
+        """Check if the k-mer (given as a string) has been seen."""
+        return self[kmer] > 0
+
+    def __len__(self):
+        """Return the number of distinct k-mers seen."""
+        if self._keys is None:
+            return len(self._counts) - self._counts.count(0)
+        return self._size
+
+    def codes(self):
+        """Iterate over the codes and counts of the k-mers seen.
+
+        The k-mers are given in no particular order.
+        """
+        if self._keys is None:
+            for code, count in enumerate(self._counts):
+                if count:
+                    yield code, int(count)
+        else:
+            for key, count in zip(self._keys, self._counts):
+                if key:
+                    yield int(key - 1), int(count)
+
+    def items(self):
+        """Iterate over the k-mers (as strings) and counts seen.
+
+        The k-mers are given in no particular order.
+        """
+        k = self.k
+        for code, count in self.codes():
+            yield decode_kmer(code, k), count
+
+    def most_common(self, n=None):
+        """Return a list of the n most common k-mers and their counts.
+
+        The list is sorted by decreasing count, then alphabetically. If n
+        is omitted, all the k-mers seen are returned.
+        """
+        if n is None:
+            found = sorted(self.codes(), key=lambda item: (-item[1], item[0]))
+        else:
+            found = heapq.nsmallest(n, self.codes(),
+                                    key=lambda item: (-item[1], item[0]))
+        return [(decode_kmer(code, self.k), count) for code, count in found]
+
+
+class MinHashSketch(object):
+    """MinHash (bottom sketch) of the k-mers of one or more sequences.
+
+    The sketch keeps the smallest hashes of the distinct k-mers seen, up
+    to the given size. This is enough to estimate the Jaccard similarity
+    of the k-mers of two sequences, or how much of one is contained in
+    the other, using a fixed amount of memory however long they are:
+
+    >>> from Bio.SeqUtils.Kmers import MinHashSketch
+    >>> first = MinHashSketch(5, size=50)
+    >>> first.add("ACGTTGCATGTCGCATGATGCATGAGAGCTAGGCTAGCTAGGATCCA")
+    >>> second = MinHashSketch(5, size=50)
+    >>> second.add("ACGTTGCATGTCGCATGATGCATGAGAG")
+    >>> len(first), len(second)
+    (31, 19)
+    >>> print("%0.2f" % first.jaccard(second))
+    0.61
+    >>> print("%0.2f" % second.containment(first))
+    1.00
+
+    Sketches must use the same k-mer length (and the same choice of
+    canonical k-mers) to be compared. The estimates are most accurate
+    with larger sketches, typically a few thousand hashes.
+    """
+
+    def __init__(self, k, size=1000, canonical=True):
+        """Create an empty sketch for k-mers of length k."""
+        _check_k(k)
+        if size < 1:
+            raise ValueError("Sketch size should be a positive integer")
+        self.k = k
+        self.size = size
+        self.canonical = canonical
+        self._heap = []  # negated hashes, so the largest is first
+        self._hashes = set()
+
+    def add_codes(self, codes):
+        """Add the k-mers with the given codes (an iterable of integers)."""
+        heap = self._heap
+        hashes = self._hashes
+        size = self.size
+        for code in codes:
+            value = _hash_code(code)
+            if value in hashes:
+                continue
+            if len(heap) < size:
+                heapq.heappush(heap, -value)
+                hashes.add(value)
+            elif value < -heap[0]:
+                hashes.discard(-heapq.heapreplace(heap, -value))
+                hashes.add(value)
+
+    def add(self, sequence):
+        """Add the k-mers of a sequence (string, Seq, MutableSeq or SeqRecord)."""
+        if isinstance(sequence, SeqRecord):
+            sequence = sequence.seq
+        self.add_codes(kmer_codes(sequence, self.k, self.canonical))
+
+    def update(self, sequences):
+        """Add the k-mers of each of the sequences or SeqRecord objects."""
+        for sequence in sequences:
+            self.add(sequence)
+
+    def __len__(self):
+        """Return the number of hashes in the sketch."""
+        return len(self._hashes)
+
+    @property
+    def hashes(self):
+        """Sorted list of the hashes in the sketch (read only)."""
+        return sorted(self._hashes)
+
+    def _check_compatible(self, other):
+        """Raise a ValueError if the sketches cannot be compared (PRIVATE)."""
+        if self.k != other.k or self.canonical != other.canonical:
+            raise ValueError("Sketches use different k-mers, k=%i%s and k=%i%s"
+                             % (self.k, " canonical" * self.canonical,
+                                other.k, " canonical" * other.canonical))
+
+    def jaccard(self, other):
+        """Estimate the Jaccard similarity of the k-mers of two sketches.
+
+        This is the number of k-mers found in both divided by the number
+        found in either, estimated from the smallest hashes of the union
+        of the two sketches. Returns a float between 0 and 1.
+        """
+        self._check_compatible(other)
+        size = min(self.size, other.size)
+        union = heapq.nsmallest(size, self._hashes | other._hashes)
+        if not union:
+            return 0.0
+        both = self._hashes & other._hashes
+        return sum(1 for value in union if value in both) / float(len(union))
+
+    def containment(self, other):
+        """Estimate the fraction of the k-mers of this sketch found in another.
+
+        Returns a float between 0 and 1, the containment of this sketch's
+        sequences in the other sketch's sequences.
+        """
+        self._check_compatible(other)
+        mine = self._hashes
+        if len(other) >= other.size:
+            # Only hashes below the largest one in the other sketch can be
+            # compared, as any larger ones have been discarded from it
+            largest = -other._heap[0]
+            mine = [value for value in mine if value <= largest]
+        if not mine:
+            return 0.0
+        hashes = other._hashes
+        return sum(1 for value in mine if value in hashes) / float(len(mine))
+
+
+def _read_sequences(source, format=None):
+    """Yield the identifier and sequence of each record (PRIVATE).
+
+    Arguments:
+     - source - a filename or handle if the format is given, otherwise an
+       iterable of sequences (strings, Seq, MutableSeq) or SeqRecords
+     - format - a Bio.SeqIO file format name, or None
+
+    FASTA and FASTQ files are read without building SeqRecord objects.
+    Identifiers are None for sequences given without a SeqRecord.
+    Raises a TypeError for a string or handle without a format.
+    """
+    if format is None:
+        if isinstance(source, basestring) or hasattr(source, "read"):
+            raise TypeError("A format is needed to read a file, expected "
+                            "an iterable of sequences without it")
+        for sequence in source:
+            if isinstance(sequence, SeqRecord):
+                yield sequence.id, sequence.seq
+            else:
+                yield None, sequence
+    elif format == "fasta":
+        from Bio.SeqIO.FastaIO import SimpleFastaParser
+        with as_handle(source) as handle:
+            for title, sequence in SimpleFastaParser(handle):
+                yield title.split(None, 1)[0], sequence
+    elif format in ("fastq", "fastq-sanger", "fastq-solexa", "fastq-illumina"):
+        from Bio.SeqIO.QualityIO import FastqGeneralIterator
+        with as_handle(source) as handle:
+            for title, sequence, quality in FastqGeneralIterator(handle):
+                yield title.split(None, 1)[0], sequence
+    else:
+        from Bio import SeqIO
+        for record in SeqIO.parse(source, format):
+            yield record.id, record.seq
+
+
+def count_kmers(source, k, format=None, canonical=True):
+    """Count the k-mers of all the sequences in a file or iterable.
+
+    Arguments:
+     - source - a filename or handle if the format is given, otherwise an
+       iterable of sequences (strings, Seq, MutableSeq) or SeqRecords
+     - k - the k-mer length, an integer from 1 to 31
+     - format - a Bio.SeqIO file format name (optional)
+     - canonical - use canonical k-mers (default True)
+
+    Returns a KmerCounts object. Only one record is held in memory at a
+    time, and FASTA and FASTQ files are read without building SeqRecord
+    objects.
+    """
+    counts = KmerCounts(k, canonical)
+    for name, sequence in _read_sequences(source, format):
+        counts.add_codes(kmer_codes(sequence, k, canonical))
+    return counts
+
+
+def sketch_records(source, k, size=1000, format=None, canonical=True):
+    """Build a MinHash sketch for each sequence in a file or iterable.
+
+    Arguments:
+     - source - a filename or handle if the format is given, otherwise an
+       iterable of sequences (strings, Seq, MutableSeq) or SeqRecords
+     - k - the k-mer length, an integer from 1 to 31
+     - size - the number of hashes to keep in each sketch (default 1000)
+     - format - a Bio.SeqIO file format name (optional)
+     - canonical - use canonical k-mers (default True)
+
+    This is an iterator, giving a tuple of the identifier (None for
+    sequences given without a SeqRecord) and MinHashSketch for each
+    sequence in turn:
+
+    >>> from Bio.SeqUtils.Kmers import sketch_records
+    >>> sketches = dict(sketch_records("Fasta/f002", 11, 100, "fasta"))
+    >>> for name in sorted(sketches):
+    ...     print("%s %i" % (name, len(sketches[name])))
+    ...
+    gi|1348912|gb|G26680|G26680 100
+    gi|1348917|gb|G26685|G26685 100
+    gi|1592936|gb|G29385|G29385 100
+    """
+    for name, sequence in _read_sequences(source, format):
+        sketch = MinHashSketch(k, size, canonical)
+        sketch.add_codes(kmer_codes(sequence, k, canonical))
+        yield name, sketch
+
+
+# Run the doctests
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
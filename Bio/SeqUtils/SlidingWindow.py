@@ -0,0 +1,320 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Statistics for sliding windows along (long) nucleotide sequences.
+
+The functions here calculate GC content, GC skew, Local Composition
+Complexity (LCC) and k-mer entropy for windows along a sequence. The
+counts for each window are updated from those of the previous window,
+using the letters which left and entered the window, rather than being
+recounted from a new slice of the sequence. This makes small steps
+(down to a single base) practical on whole chromosomes.
+
+Each function returns the values as an array of floats (from the Python
+array module), one per window. The windows start at 0, step, 2*step etc,
+and only windows of the full size are included. The step defaults to the
+window size, giving non-overlapping windows:
+
+>>> from Bio.SeqUtils.SlidingWindow import gc_content, gc_skew
+>>> gc_content("GGGGAAAACCCCAATT", 4)
+array('d', [100.0, 0.0, 100.0, 0.0])
+>>> gc_content("GGGGAAAACCCCAATT", 8, step=4)
+array('d', [50.0, 50.0, 50.0])
+>>> gc_skew("GGGCCATTCC", 5, step=1)
+array('d', [0.2, 0.0, -0.3333333333333333, -1.0, -1.0, -1.0])
+
+Letters are counted regardless of case. As in the GC function, the
+ambiguous nucleotide S (G or C) counts towards the GC content, while
+other ambiguous letters are just part of the window length.
+
+To work through all the records in a file, see the window_stats function.
+"""
+
+from __future__ import print_function
+
+import math
+from array import array
+from itertools import islice
+
+from Bio._py3k import range
+from Bio._py3k import zip
+
+from Bio.SeqRecord import SeqRecord
+
+
+def _letter_counts(seq, window, step, letters, partial=False):
+    """Yield the start, end and letter counts for each window (PRIVATE).
+
+    Arguments:
+     - seq - a string (or object which can be turned into one)
+     - window - window size, integer
+     - step - distance between the start of each window, integer
+     - letters - upper case letters to count (regardless of case)
+     - partial - include the windows at the end of the sequence which
+       are shorter than the window size?
+
+    The counts are given as a list, in the order of the letters. The same
+    list is updated and given again for each window, so copy it if you
+    need to keep it.
+    """
+    if window < 1:
+        raise ValueError("Window size must be a positive integer")
+    if step < 1:
+        raise ValueError("Step must be a positive integer")
+    seq = str(seq)
+    length = len(seq)
+    counts = [0] * len(letters)
+    if step == 1 and window > 1:
+        # Move along one letter at a time, looking at the letter leaving
+        # and the letter entering the window
+        index = {}
+        for i, letter in enumerate(letters):
+            index[letter] = i
+            index[letter.lower()] = i
+        get = index.get
+        end = min(window, length)
+        for i, letter in enumerate(letters):
+            counts[i] = seq.count(letter, 0, end) + \
+                seq.count(letter.lower(), 0, end)
+        if length >= window or (partial and length):
+            yield 0, end, counts
+        start = 0
+        for start, (old, new) in enumerate(zip(seq, islice(seq, window, None)), 1):
+            if old != new:
+                i = get(old)
+                if i is not None:
+                    counts[i] -= 1
+                i = get(new)
+                if i is not None:
+                    counts[i] += 1
+            yield start, start + window, counts
+        if partial:
+            # The windows at the end, which shrink by a letter each time
+            for start in range(start + 1, length):
+                i = get(seq[start - 1])
+                if i is not None:
+                    counts[i] -= 1
+                yield start, length, counts
+        return
+    if partial:
+        starts = range(0, length, step)
+    else:
+        starts = range(0, length - window + 1, step)
+    previous = None
+    for start in starts:
+        end = min(start + window, length)
+        if previous is None or step >= window:
+            # Count the whole window
+            for i, letter in enumerate(letters):
+                counts[i] = seq.count(letter, start, end) + \
+                    seq.count(letter.lower(), start, end)
+        else:
+            # Count the letters which left and entered the window
+            for i, letter in enumerate(letters):
+                lower = letter.lower()
+                counts[i] += seq.count(letter, previous, end) + \
+                    seq.count(lower, previous, end) - \
+                    seq.count(letter, start - step, start) - \
+                    seq.count(lower, start - step, start)
+        previous = end
+        yield start, end, counts
+
+
+def _entropy_terms(size):
+    """Return a list of p*log2(p) for p = 0/size, 1/size, ..., 1 (PRIVATE)."""
+    terms = [0.0]
+    for count in range(1, size + 1):
+        p = count / float(size)
+        terms.append(p * math.log(p, 2))
+    return terms
+
+
+def _stats(seq, window, step, names):
+    """Calculate the named letter based statistics for each window (PRIVATE).
+
+    Returns a dictionary of arrays, keyed by the names, which can be any
+    of "gc", "gc_skew" and "lcc".
+    """
+    if step is None:
+        step = window
+    results = dict((name, array("d")) for name in names)
+    gc = results.get("gc")
+    skew = results.get("gc_skew")
+    complexity = results.get("lcc")
+    if complexity is not None:
+        terms = _entropy_terms(window)
+    for start, end, counts in _letter_counts(seq, window, step, "ACGTS"):
+        a, c, g, t, s = counts
+        if gc is not None:
+            gc.append((g + c + s) * 100.0 / window)
+        if skew is not None:
+            if g + c:
+                skew.append((g - c) / float(g + c))
+            else:
+                skew.append(0.0)
+        if complexity is not None:
+            complexity.append(-(terms[a] + terms[c] + terms[g] + terms[t]))
+    return results
+
+
+def gc_content(seq, window=100, step=None):
+    """Calculate the G+C content (percentage) of windows along a sequence.
+
+    Arguments:
+     - seq - a nucleotide sequence (a string, Seq or MutableSeq object)
+     - window - window size, integer (default 100)
+     - step - distance between the start of each window, integer
+       (defaults to the window size)
+
+    Returns an array of floats between 0 and 100. This is the same as
+    applying the GC function to each window.
+    """
+    return _stats(seq, window, step, ["gc"])["gc"]
+
+
+def gc_skew(seq, window=100, step=None):
+    """Calculate the GC skew (G-C)/(G+C) of windows along a sequence.
+
+    Arguments:
+     - seq - a nucleotide sequence (a string, Seq or MutableSeq object)
+     - window - window size, integer (default 100)
+     - step - distance between the start of each window, integer
+       (defaults to the window size)
+
+    Returns an array of floats between -1 and 1, using 0 for windows
+    without any G or C. Unlike the older GC_skew function, any shorter
+    window at the end of the sequence is not included.
+    """
+    return _stats(seq, window, step, ["gc_skew"])["gc_skew"]
+
+
+def lcc(seq, window, step=None):
+    """Calculate the Local Composition Complexity (LCC) of windows.
+
+    Arguments:
+     - seq - an unambiguous DNA sequence (a string, Seq or MutableSeq)
+     - window - window size, integer
+     - step - distance between the start of each window, integer
+       (defaults to the window size)
+
+    Returns an array of floats, the same as applying lcc_simp from
+    Bio.SeqUtils.lcc to each window (including lower case letters).
+
+    >>> from Bio.SeqUtils.SlidingWindow import lcc
+    >>> print(["%0.2f" % value for value in lcc("ACGTACGTAAAAAACC", 8)])
+    ['2.00', '0.81']
+    """
+    return _stats(seq, window, step, ["lcc"])["lcc"]
+
+
+def kmer_entropy(seq, window, k=2, step=None):
+    """Calculate the Shannon entropy (in bits) of the k-mers in each window.
+
+    Arguments:
+     - seq - a nucleotide sequence (a string, Seq or MutableSeq object)
+     - window - window size, integer (at least k)
+     - k - length of the k-mers (words), integer (default 2)
+     - step - distance between the start of each window, integer
+       (defaults to the window size)
+
+    The overlapping k-mers lying within each window are counted (ignoring
+    case), and the entropy of their frequencies is returned for each
+    window as an array of floats. Low values indicate repetitive sequence:
+
+    >>> from Bio.SeqUtils.SlidingWindow import kmer_entropy
+    >>> print(["%0.2f" % value for value in kmer_entropy("ATATATATACGTTGCA", 8)])
+    ['0.99', '2.81']
+    """
+    if k < 1:
+        raise ValueError("k must be a positive integer")
+    if window < k:
+        raise ValueError("Window size must be at least k")
+    if step is None:
+        step = window
+    if step < 1:
+        raise ValueError("Step must be a positive integer")
+    seq = str(seq)
+    words = window - k + 1  # number of k-mers in each window
+    # Using sum(c * log2(c)) over the k-mer counts c, which can be updated
+    # as the counts change, the entropy is log2(words) - sum / words
+    terms = [0.0] + [count * math.log(count, 2)
+                     for count in range(1, words + 1)]
+    log_words = math.log(words, 2)
+    values = array("d")
+    counts = {}
+    total = 0.0
+    first = 0  # start of the first k-mer in the current window
+    last = 0  # start of the first k-mer not in the current window
+    for start in range(0, len(seq) - window + 1, step):
+        if step >= words:
+            counts = {}
+            total = 0.0
+            first = last = start
+        else:
+            # Remove the k-mers which left the window
+            for i in range(first, start):
+                word = seq[i:i + k].upper()
+                count = counts[word]
+                total += terms[count - 1] - terms[count]
+                counts[word] = count - 1
+            first = start
+        # Add the k-mers which entered the window
+        for i in range(last, start + words):
+            word = seq[i:i + k].upper()
+            count = counts.get(word, 0)
+            total += terms[count + 1] - terms[count]
+            counts[word] = count + 1
+        last = start + words
+        values.append(log_words - total / words)
+    return values
+
+
+def window_stats(sequences, window, step=None,
+                 stats=("gc", "gc_skew", "lcc"), k=2):
+    """Calculate statistics for sliding windows along many sequences.
+
+    Arguments:
+     - sequences - an iterable of sequences (strings, Seq or MutableSeq
+       objects) or SeqRecord objects, e.g. from Bio.SeqIO.parse
+     - window - window size, integer
+     - step - distance between the start of each window, integer
+       (defaults to the window size)
+     - stats - names of the statistics to calculate, any of "gc",
+       "gc_skew", "lcc" and "entropy" (the k-mer entropy)
+     - k - length of the k-mers for the entropy, integer (default 2)
+
+    This is an iterator, giving a tuple for each sequence in turn: the
+    identifier (for SeqRecord objects, otherwise None) and a dictionary
+    of arrays of values keyed by the names of the statistics. Only one
+    sequence is held in memory at a time. The GC content, GC skew and
+    LCC are calculated together in a single pass along the sequence:
+
+    >>> from Bio.SeqUtils.SlidingWindow import window_stats
+    >>> for name, values in window_stats(["GGGGAAAACCCC"], 6):
+    ...     print("%s %s %s" % (name, list(values["gc"]), list(values["gc_skew"])))
+    ...
+    None [66.66666666666667, 66.66666666666667] [1.0, -1.0]
+    """
+    names = []
+    for name in stats:
+        if name not in ("gc", "gc_skew", "lcc", "entropy"):
+            raise ValueError("Unknown statistic %r" % name)
+        if name != "entropy":
+            names.append(name)
+    for sequence in sequences:
+        if isinstance(sequence, SeqRecord):
+            name = sequence.id
+            sequence = sequence.seq
+        else:
+            name = None
+        results = _stats(sequence, window, step, names)
+        if "entropy" in stats:
+            results["entropy"] = kmer_entropy(sequence, window, k, step)
+        yield name, results
+
+
+# Run the doctests
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
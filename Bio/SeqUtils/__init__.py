@@ -98,13 +98,14 @@ def GC_skew(seq, window=100):
     Returns 0 for windows without any G/C by handling zero division errors.
 
     Does NOT look at any ambiguous nucleotides.
+
+    See also Bio.SeqUtils.SlidingWindow for overlapping windows.
     """
+    from Bio.SeqUtils.SlidingWindow import _letter_counts
     # 8/19/03: Iddo: added lowercase
     values = []
-    for i in range(0, len(seq), window):
-        s = seq[i: i + window]
-        g = s.count('G') + s.count('g')
-        c = s.count('C') + s.count('c')
+    for start, end, (g, c) in _letter_counts(seq, window, window, "GC",
+                                             partial=True):
         try:
             skew = (g - c) / float(g + c)
         except ZeroDivisionError:
@@ -477,16 +478,15 @@ def six_frame_translations(seq, genetic_code=1):
     <BLANKLINE>
 
     """  # noqa for pep8 W291 trailing whitespace
-    from Bio.Seq import reverse_complement, translate
+    from Bio.Seq import reverse_complement, translate_six_frames
     anti = reverse_complement(seq)
     comp = anti[::-1]
     length = len(seq)
     frames = {}
+    translations = translate_six_frames(seq, genetic_code)
     for i in range(0, 3):
-        fragment_length = 3 * ((length - i) // 3)
-        frames[i + 1] = translate(seq[i:i + fragment_length], genetic_code)
-        frames[-(i + 1)] = translate(anti[i:i + fragment_length],
-                                     genetic_code)[::-1]
+        frames[i + 1] = translations[i]
+        frames[-(i + 1)] = translations[i + 3][::-1]
 
     # create header
     if length > 20:
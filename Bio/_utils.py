@@ -9,7 +9,10 @@
 
 from __future__ import print_function
 
+import multiprocessing
 import os
+import pickle
+import sys
 
 
 def iterlen(items):
@@ -98,6 +101,42 @@ def find_test_dir(start_dir=None):
                      os.path.abspath(start_dir))
 
 
+def _get_pool(n_jobs, obj, initializer, check_pickle=False):
+    """Return a process pool whose workers share an object (PRIVATE).
+
+    Arguments:
+     - n_jobs - number of worker processes.
+     - obj - object used by the workers, held in a module global.
+     - initializer - function setting that module global to its argument.
+     - check_pickle - if the object can't be pickled, return None.
+
+    Where possible the workers are forked, inheriting the module global
+    (which is only set here while forking), otherwise the object is
+    pickled once per worker (not per task) and given to the initializer.
+    This fails for a nested function or a lambda, so with check_pickle
+    None is returned instead and the caller should do the work itself.
+    """
+    if hasattr(multiprocessing, "get_all_start_methods"):
+        forked = "fork" in multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("fork" if forked else None)
+    else:
+        # Python 2
+        forked = sys.platform != "win32"
+        ctx = multiprocessing
+    if forked:
+        initializer(obj)
+        try:
+            return ctx.Pool(n_jobs)
+        finally:
+            initializer(None)
+    if check_pickle:
+        try:
+            pickle.dumps(obj)
+        except Exception:
+            return None
+    return ctx.Pool(n_jobs, initializer, (obj,))
+
+
 def run_doctest(target_dir=None, *args, **kwargs):
     """Run doctest for the importing module."""
     import doctest
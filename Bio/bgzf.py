@@ -225,6 +225,7 @@ from __future__ import print_function
 import sys
 import zlib
 import struct
+from collections import deque, OrderedDict
 
 from Bio._py3k import _as_bytes, _as_string
 from Bio._py3k import open as _open
@@ -391,15 +392,21 @@ def BgzfBlocks(handle):
     data_start = 0
     while True:
         start_offset = handle.tell()
-        # This may raise StopIteration which is perfect here
-        block_length, data = _load_bgzf_block(handle)
+        try:
+            block_length, data = _load_bgzf_block(handle)
+        except StopIteration:
+            return
         data_len = len(data)
         yield start_offset, block_length, data_start, data_len
         data_start += data_len
 
 
-def _load_bgzf_block(handle, text_mode=False):
-    """Load the next BGZF block of compressed data (PRIVATE)."""
+def _read_bgzf_block(handle):
+    """Read the next BGZF block without decompressing it (PRIVATE).
+
+    Returns the block size, the raw deflate data, the expected CRC and
+    the expected length of the decompressed data.
+    """
     magic = handle.read(4)
     if not magic:
         # End of file
@@ -426,10 +433,21 @@ def _load_bgzf_block(handle, text_mode=False):
     assert block_size is not None, "Missing BC, this isn't a BGZF file!"
     # Now comes the compressed data, CRC, and length of uncompressed data.
     deflate_size = block_size - 1 - extra_len - 19
-    d = zlib.decompressobj(-15)  # Negative window size means no headers
-    data = d.decompress(handle.read(deflate_size)) + d.flush()
+    raw_data = handle.read(deflate_size)
     expected_crc = handle.read(4)
     expected_size = struct.unpack("<I", handle.read(4))[0]
+    return block_size, raw_data, expected_crc, expected_size
+
+
+def _decompress_bgzf_block(block_size, raw_data, expected_crc, expected_size,
+                           text_mode=False):
+    """Decompress and check data of a BGZF block (PRIVATE).
+
+    Takes the values returned by _read_bgzf_block. As zlib releases the
+    GIL, this can be run on several threads at once.
+    """
+    d = zlib.decompressobj(-15)  # Negative window size means no headers
+    data = d.decompress(raw_data) + d.flush()
     assert expected_size == len(data), \
         "Decompressed to %i, not %i" % (len(data), expected_size)
     # Should cope with a mix of Python platforms...
@@ -446,6 +464,56 @@ def _load_bgzf_block(handle, text_mode=False):
         return block_size, data
 
 
+def _load_bgzf_block(handle, text_mode=False):
+    """Load the next BGZF block of compressed data (PRIVATE)."""
+    return _decompress_bgzf_block(*_read_bgzf_block(handle), text_mode=text_mode)
+
+
+def _compress_bgzf_block(block, compresslevel=6):
+    """Return provided data as a single BGZF compressed block (PRIVATE).
+
+    As zlib releases the GIL, this can be run on several threads at once.
+    """
+    assert len(block) <= 65536
+    # Giving a negative window bits means no gzip/zlib headers,
+    # -15 used in samtools
+    c = zlib.compressobj(compresslevel,
+                         zlib.DEFLATED,
+                         -15,
+                         zlib.DEF_MEM_LEVEL,
+                         0)
+    compressed = c.compress(block) + c.flush()
+    del c
+    assert len(compressed) < 65536, \
+        "TODO - Didn't compress enough, try less data in this block"
+    bsize = struct.pack("<H", len(compressed) + 25)  # includes -1
+    crc = struct.pack("<I", zlib.crc32(block) & 0xffffffff)
+    uncompressed_length = struct.pack("<I", len(block))
+    # Fixed 16 bytes,
+    # gzip magic bytes (4) mod time (4),
+    # gzip flag (1), os (1), extra length which is six (2),
+    # sub field which is BC (2), sub field length of two (2),
+    # Variable data,
+    # 2 bytes: block length as BC sub field (2)
+    # X bytes: the data
+    # 8 bytes: crc (4), uncompressed data length (4)
+    return _bgzf_header + bsize + compressed + crc + uncompressed_length
+
+
+def _thread_pool(threads):
+    """Return number of threads and their pool, None for one thread (PRIVATE)."""
+    if threads is None:
+        import multiprocessing
+        threads = multiprocessing.cpu_count()
+    if threads < 1:
+        raise ValueError("Use threads with a minimum of 1")
+    if threads == 1:
+        return threads, None
+    # Available on both Python 2 and 3, unlike concurrent.futures
+    from multiprocessing.pool import ThreadPool
+    return threads, ThreadPool(threads)
+
+
 class BgzfReader(object):
     r"""BGZF reader, acts like a read only handle but seek/tell differ.
 
@@ -513,14 +581,27 @@ class BgzfReader(object):
     block can be up to 64kb, the default cache could take up to 6MB of
     RAM. The cache is not important for reading through the file in one
     pass, but is important for improving performance of random access.
+
+    Reading through large files can be made faster with the threads
+    argument (None means one thread per CPU). While you consume a block,
+    the next readahead blocks (by default two per thread) are decompressed
+    in the background, and virtual offsets behave exactly as before:
+
+    >>> with BgzfReader("SamBam/ex1.bam", "rb", threads=2) as handle:
+    ...     data = handle.read(65540)
+    ...     print(handle.tell())
+    1195311108
     """
 
-    def __init__(self, filename=None, mode="r", fileobj=None, max_cache=100):
+    def __init__(self, filename=None, mode="r", fileobj=None, max_cache=100,
+                 threads=1, readahead=None):
         """Initialize the class."""
         # TODO - Assuming we can seek, check for 28 bytes EOF empty block
         # and if missing warn about possible truncation (as in samtools)?
         if max_cache < 1:
             raise ValueError("Use max_cache with a minimum of 1")
+        if readahead is not None and readahead < 1:
+            raise ValueError("Use readahead with a minimum of 1")
         # Must open the BGZF file in binary mode, but we may want to
         # treat the contents as either text or binary (unicode or
         # bytes under Python 3)
@@ -542,6 +623,11 @@ class BgzfReader(object):
         self._buffers = {}
         self._block_start_offset = None
         self._block_raw_length = None
+        threads, self._pool = _thread_pool(threads)
+        self.readahead = readahead or 2 * threads
+        # Blocks being decompressed in the background, keyed on start offset
+        self._pending = OrderedDict()
+        self._readahead_offset = None
         self._load_block(handle.tell())
 
     def _load_block(self, start_offset=None):
@@ -564,24 +650,61 @@ class BgzfReader(object):
             # TODO - Implemente LRU cache removal?
             self._buffers.popitem()
         # Now load the block
-        handle = self._handle
-        if start_offset is not None:
-            handle.seek(start_offset)
-        self._block_start_offset = handle.tell()
-        try:
-            block_size, self._buffer = _load_bgzf_block(handle, self._text)
-        except StopIteration:
-            # EOF
-            block_size = 0
-            if self._text:
-                self._buffer = ""
-            else:
-                self._buffer = b""
+        if self._pool is not None and start_offset in self._readahead(start_offset):
+            block_size, self._buffer = self._pending.pop(start_offset).get()
+            self._block_start_offset = start_offset
+            self._fill_readahead()
+        else:
+            handle = self._handle
+            if start_offset is not None:
+                handle.seek(start_offset)
+            self._block_start_offset = handle.tell()
+            try:
+                block_size, self._buffer = _load_bgzf_block(handle, self._text)
+            except StopIteration:
+                # EOF
+                block_size = 0
+                if self._text:
+                    self._buffer = ""
+                else:
+                    self._buffer = b""
         self._within_block_offset = 0
         self._block_raw_length = block_size
         # Finally save the block in our cache,
         self._buffers[self._block_start_offset] = self._buffer, block_size
 
+    def _readahead(self, start_offset):
+        """Return blocks read ahead, making sure it starts at given offset (PRIVATE)."""
+        pending = self._pending
+        if start_offset in pending:
+            # Skip any blocks we have jumped over
+            while next(iter(pending)) != start_offset:
+                pending.popitem(last=False)
+        else:
+            # Not reading sequentially, blocks read ahead are of no use
+            pending.clear()
+            self._readahead_offset = start_offset
+            self._fill_readahead()
+        return pending
+
+    def _fill_readahead(self):
+        """Start decompressing blocks following the last one read ahead (PRIVATE)."""
+        if self._readahead_offset is None:
+            return
+        handle = self._handle
+        handle.seek(self._readahead_offset)
+        while len(self._pending) < self.readahead:
+            try:
+                raw_block = _read_bgzf_block(handle)
+            except Exception:
+                # EOF, or a damaged block - leave reporting any error to
+                # _load_block in case this part of the file is ever needed
+                self._readahead_offset = None
+                return
+            self._pending[self._readahead_offset] = self._pool.apply_async(
+                _decompress_bgzf_block, raw_block, {"text_mode": self._text})
+            self._readahead_offset += raw_block[0]
+
     def tell(self):
         """Return a 64-bit unsigned BGZF virtual offset."""
         if 0 < self._within_block_offset and \
@@ -697,6 +820,10 @@ class BgzfReader(object):
 
     def close(self):
         """Close BGZF file."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+            self._pending = None
         self._handle.close()
         self._buffer = None
         self._block_start_offset = None
@@ -724,9 +851,15 @@ class BgzfReader(object):
 
 
 class BgzfWriter(object):
-    """Define a BGZFWriter object."""
+    """Define a BGZFWriter object.
 
-    def __init__(self, filename=None, mode="w", fileobj=None, compresslevel=6):
+    With the threads argument (None means one thread per CPU) blocks
+    are compressed in parallel and written out in order. Asking for
+    tell() waits for all the blocks started so far to be written.
+    """
+
+    def __init__(self, filename=None, mode="w", fileobj=None, compresslevel=6,
+                 threads=1):
         """Initilize the class."""
         if fileobj:
             assert filename is None
@@ -742,42 +875,26 @@ class BgzfWriter(object):
         self._handle = handle
         self._buffer = b""
         self.compresslevel = compresslevel
+        threads, self._pool = _thread_pool(threads)
+        # Blocks being compressed in the background, in file order
+        self._pending = deque()
+        self._max_pending = 2 * threads
 
     def _write_block(self, block):
         """Write provided data to file as a single BGZF compressed block (PRIVATE)."""
         # print("Saving %i bytes" % len(block))
-        start_offset = self._handle.tell()
-        assert len(block) <= 65536
-        # Giving a negative window bits means no gzip/zlib headers,
-        # -15 used in samtools
-        c = zlib.compressobj(self.compresslevel,
-                             zlib.DEFLATED,
-                             -15,
-                             zlib.DEF_MEM_LEVEL,
-                             0)
-        compressed = c.compress(block) + c.flush()
-        del c
-        assert len(compressed) < 65536, \
-            "TODO - Didn't compress enough, try less data in this block"
-        crc = zlib.crc32(block)
-        # Should cope with a mix of Python platforms...
-        if crc < 0:
-            crc = struct.pack("<i", crc)
-        else:
-            crc = struct.pack("<I", crc)
-        bsize = struct.pack("<H", len(compressed) + 25)  # includes -1
-        crc = struct.pack("<I", zlib.crc32(block) & 0xffffffff)
-        uncompressed_length = struct.pack("<I", len(block))
-        # Fixed 16 bytes,
-        # gzip magic bytes (4) mod time (4),
-        # gzip flag (1), os (1), extra length which is six (2),
-        # sub field which is BC (2), sub field length of two (2),
-        # Variable data,
-        # 2 bytes: block length as BC sub field (2)
-        # X bytes: the data
-        # 8 bytes: crc (4), uncompressed data length (4)
-        data = _bgzf_header + bsize + compressed + crc + uncompressed_length
-        self._handle.write(data)
+        if self._pool is None:
+            self._handle.write(_compress_bgzf_block(block, self.compresslevel))
+            return
+        self._pending.append(self._pool.apply_async(_compress_bgzf_block,
+                                                    (block, self.compresslevel)))
+        while len(self._pending) > self._max_pending:
+            self._handle.write(self._pending.popleft().get())
+
+    def _write_pending(self):
+        """Wait for all the blocks being compressed and write them (PRIVATE)."""
+        while self._pending:
+            self._handle.write(self._pending.popleft().get())
 
     def write(self, data):
         """Write method for the class."""
@@ -803,6 +920,7 @@ class BgzfWriter(object):
             self._buffer = self._buffer[65535:]
         self._write_block(self._buffer)
         self._buffer = b""
+        self._write_pending()
         self._handle.flush()
 
     def close(self):
@@ -815,12 +933,17 @@ class BgzfWriter(object):
         """
         if self._buffer:
             self.flush()
+        self._write_pending()
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
         self._handle.write(_bgzf_eof)
         self._handle.flush()
         self._handle.close()
 
     def tell(self):
         """Return a BGZF 64-bit virtual offset."""
+        self._write_pending()
         return make_virtual_offset(self._handle.tell(), len(self._buffer))
 
     def seekable(self):
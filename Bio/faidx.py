@@ -0,0 +1,390 @@
+#!/usr/bin/env python
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+r"""Random access to regions of FASTA files using samtools faidx indexes.
+
+Bio.SeqIO.index gives you whole SeqRecord objects, so getting a short
+region of a chromosome means parsing the whole chromosome. The faidx
+index used by samtools (a tab separated ``.fai`` file next to the FASTA
+file) records for every sequence its length, the offset of its first
+base and the number of bases and bytes per line. Provided all lines of
+a sequence (except the last) have the same length, any region can then
+be read with a single seek and read, after which the new lines are
+simply removed.
+
+>>> from Bio import faidx
+>>> fasta = faidx.IndexedFasta("GenBank/NC_005816.fna", write_index=False)
+>>> len(fasta)
+1
+>>> name = "gi|45478711|ref|NC_005816.1|"
+>>> seq = fasta[name]
+>>> len(seq)
+9609
+>>> print(seq[68:75])
+CCTGATT
+>>> print(fasta.fetch(name, 68, 75))
+CCTGATT
+>>> fasta.close()
+
+BGZF compressed FASTA files (made with bgzip, or Bio.bgzf) are also
+supported. As in samtools the offsets in the ``.fai`` index refer to the
+decompressed data, and a ``.gzi`` index listing the BGZF blocks is used
+to translate them into BGZF virtual offsets.
+
+Missing indexes are built (and by default saved next to the FASTA file)
+when the file is opened. Any existing index files are assumed to be up
+to date.
+"""
+
+from __future__ import print_function
+
+import bisect
+import struct
+import warnings
+from collections import namedtuple
+
+from Bio import BiopythonWarning
+from Bio import bgzf
+from Bio._py3k import _bytes_to_string
+from Bio.File import _open_for_random_access
+from Bio.Seq import Seq
+from Bio.Alphabet import generic_alphabet
+
+
+class FaidxEntry(namedtuple("FaidxEntry", ["name", "length", "offset",
+                                         "line_bases", "line_width"])):
+    """Entry of a .fai index, one per sequence.
+
+    Fields are the sequence name (first word of the title line), its length,
+    the (decompressed) offset of its first base, and the number of bases and
+    of bytes (including the new line characters) per line.
+    """
+
+    __slots__ = ()
+
+
+def build_index(handle):
+    """Scan a FASTA file and return a list of FaidxEntry objects.
+
+    Expects a handle in binary mode, which may be a Bio.bgzf.BgzfReader
+    in which case the offsets refer to the decompressed data. Raises a
+    ValueError if the lines of a sequence are not all the same length
+    (except for the last line), as such files can't be indexed.
+    """
+    entries = []
+    names = set()
+    name = None
+    pos = 0
+    for line in handle:
+        if line[0:1] == b">":
+            if name is not None:
+                entries.append(FaidxEntry(name, length, offset, line_bases, line_width))
+            try:
+                name = _bytes_to_string(line[1:].split(None, 1)[0])
+            except IndexError:
+                raise ValueError("Empty FASTA title line at offset %i" % pos)
+            if name in names:
+                raise ValueError("Duplicate sequence name %r" % name)
+            names.add(name)
+            offset = pos + len(line)
+            length = 0
+            line_bases = line_width = 0
+            last_line = False
+        elif name is None:
+            if line.strip():
+                raise ValueError("FASTA file should start with '>', not %r" % line)
+        else:
+            bases = len(line.rstrip(b"\r\n"))
+            if last_line and bases:
+                raise ValueError("Different line length in sequence %r" % name)
+            if not line_width:
+                line_bases, line_width = bases, len(line)
+            elif bases > line_bases or (bases == line_bases and
+                                        len(line) > line_width):
+                raise ValueError("Different line length in sequence %r" % name)
+            if bases < line_bases or len(line) < line_width or not bases:
+                # Only the last line may be shorter (or blank)
+                last_line = True
+            length += bases
+        pos += len(line)
+    if name is not None:
+        entries.append(FaidxEntry(name, length, offset, line_bases, line_width))
+    return entries
+
+
+def write_index(entries, handle):
+    """Write FaidxEntry objects to a handle in .fai format."""
+    for entry in entries:
+        handle.write("%s\t%i\t%i\t%i\t%i\n" % entry)
+
+
+def read_index(handle):
+    """Read a .fai index, returning a list of FaidxEntry objects."""
+    entries = []
+    for line in handle:
+        if not line.strip():
+            continue
+        parts = line.rstrip("\r\n").split("\t")
+        if len(parts) < 5:
+            raise ValueError("Expected at least five columns in .fai line %r" % line)
+        # FASTQ indexes have a sixth column (offset of the qualities)
+        entries.append(FaidxEntry(parts[0], *[int(x) for x in parts[1:5]]))
+    return entries
+
+
+def build_gzi(handle):
+    """Return the (compressed offset, decompressed offset) pairs of BGZF blocks.
+
+    Expects a handle to a BGZF file in binary mode (not decompressed).
+    As in samtools, the first block (which starts at zero in both files)
+    is not included.
+    """
+    return [(start, data_start)
+            for start, raw_len, data_start, data_len in bgzf.BgzfBlocks(handle)
+            if start]
+
+
+def write_gzi(blocks, handle):
+    """Write (compressed offset, decompressed offset) pairs in .gzi format."""
+    handle.write(struct.pack("<Q", len(blocks)))
+    for block in blocks:
+        handle.write(struct.pack("<QQ", *block))
+
+
+def read_gzi(handle):
+    """Read a .gzi index, returning a list of (compressed, decompressed) offsets."""
+    count, = struct.unpack("<Q", handle.read(8))
+    data = handle.read(16 * count)
+    if len(data) != 16 * count:
+        raise ValueError("Truncated .gzi file, expected %i blocks" % count)
+    values = struct.unpack("<%iQ" % (2 * count), data)
+    return list(zip(values[0::2], values[1::2]))
+
+
+class LazyFastaSeq(object):
+    """Sequence in an indexed FASTA file, read from the file when sliced.
+
+    Slicing returns a Seq object, and needs just a single seek and read:
+
+    >>> from Bio import faidx
+    >>> fasta = faidx.IndexedFasta("GenBank/NC_005816.fna", write_index=False)
+    >>> seq = fasta["gi|45478711|ref|NC_005816.1|"]
+    >>> seq
+    LazyFastaSeq('gi|45478711|ref|NC_005816.1|', length=9609)
+    >>> seq[-5:]
+    Seq('CCCTG', Alphabet())
+    >>> seq[0]
+    'T'
+    >>> fasta.close()
+
+    Use str(seq) or seq[:] to load the whole sequence.
+    """
+
+    def __init__(self, fasta, entry, alphabet=generic_alphabet):
+        """Initialize the class (called by IndexedFasta)."""
+        self._fasta = fasta
+        self._entry = entry
+        self.alphabet = alphabet
+
+    @property
+    def name(self):
+        """Name of the sequence in the FASTA file."""
+        return self._entry.name
+
+    def __len__(self):
+        """Return the length of the sequence."""
+        return self._entry.length
+
+    def __repr__(self):
+        """Return a (truncated) representation of the sequence."""
+        return "%s(%r, length=%i)" % (self.__class__.__name__,
+                                      self._entry.name, self._entry.length)
+
+    def __str__(self):
+        """Return the whole sequence as a string."""
+        return self._fasta._fetch(self._entry, 0, self._entry.length)
+
+    def __getitem__(self, index):
+        """Return a single letter as a string, or a slice as a Seq object."""
+        length = self._entry.length
+        if not isinstance(index, slice):
+            if index < 0:
+                index += length
+            if not 0 <= index < length:
+                raise IndexError("sequence index out of range")
+            return self._fasta._fetch(self._entry, index, index + 1)
+        start, stop, step = index.indices(length)
+        if step == 1:
+            return Seq(self._fasta._fetch(self._entry, start, stop), self.alphabet)
+        # Read the enclosing region, then take every step-th letter
+        if step > 0:
+            data = self._fasta._fetch(self._entry, start, max(start, stop))
+            return Seq(data[::step], self.alphabet)
+        data = self._fasta._fetch(self._entry, min(stop + 1, start + 1), start + 1)
+        return Seq(data[::step], self.alphabet)
+
+
+class IndexedFasta(object):
+    """Read only dictionary of the sequences in a FASTA file, using a faidx index.
+
+    Arguments:
+     - filename - the FASTA file, plain or BGZF compressed
+     - alphabet - optional Alphabet for the sequences
+     - index_filename - the .fai index, by default filename + ".fai"
+     - gzi_filename - the .gzi index of a BGZF file, by default
+       filename + ".gzi"
+     - write_index - save any missing index files (default True)
+
+    The values are LazyFastaSeq objects which only read the file when
+    sliced. The fetch method gives a region of a sequence directly.
+    """
+
+    def __init__(self, filename, alphabet=generic_alphabet, index_filename=None,
+                 gzi_filename=None, write_index=True):
+        """Initialize the class."""
+        self._filename = filename
+        self.alphabet = alphabet
+        if index_filename is None:
+            index_filename = filename + ".fai"
+        if gzi_filename is None:
+            gzi_filename = filename + ".gzi"
+        self._handle = _open_for_random_access(filename)
+        self._bgzf = isinstance(self._handle, bgzf.BgzfReader)
+        try:
+            if self._bgzf:
+                self._load_gzi(gzi_filename, write_index)
+            self._entries = self._load_index(index_filename, write_index)
+        except Exception:
+            self._handle.close()
+            raise
+        self._index = dict((entry.name, entry) for entry in self._entries)
+
+    def _load_index(self, index_filename, save):
+        """Read the .fai index, building it if missing (PRIVATE)."""
+        try:
+            with open(index_filename) as handle:
+                return read_index(handle)
+        except IOError:
+            pass
+        self._handle.seek(0)
+        entries = build_index(self._handle)
+        if save:
+            try:
+                with open(index_filename, "w") as handle:
+                    write_index(entries, handle)
+            except IOError as err:
+                warnings.warn("Could not save FASTA index %s: %s"
+                              % (index_filename, err), BiopythonWarning)
+        return entries
+
+    def _load_gzi(self, gzi_filename, save):
+        """Read the .gzi index of a BGZF file, building it if missing (PRIVATE)."""
+        try:
+            with open(gzi_filename, "rb") as handle:
+                blocks = read_gzi(handle)
+        except IOError:
+            with open(self._filename, "rb") as handle:
+                blocks = build_gzi(handle)
+            if save:
+                try:
+                    with open(gzi_filename, "wb") as handle:
+                        write_gzi(blocks, handle)
+                except IOError as err:
+                    warnings.warn("Could not save BGZF index %s: %s"
+                                  % (gzi_filename, err), BiopythonWarning)
+        blocks.insert(0, (0, 0))
+        self._block_starts = [start for start, data_start in blocks]
+        self._block_data_starts = [data_start for start, data_start in blocks]
+
+    def _seek(self, offset):
+        """Seek to an offset in the (decompressed) file (PRIVATE)."""
+        if not self._bgzf:
+            self._handle.seek(offset)
+            return
+        i = bisect.bisect_right(self._block_data_starts, offset) - 1
+        self._handle.seek(bgzf.make_virtual_offset(self._block_starts[i],
+                                                   offset - self._block_data_starts[i]))
+
+    def _fetch(self, entry, start, end):
+        """Return bases start to end (zero based, end excluded) as a string (PRIVATE)."""
+        start = max(0, start)
+        end = min(end, entry.length)
+        if start >= end:
+            return ""
+        line_bases, line_width = entry.line_bases, entry.line_width
+        first = entry.offset + (start // line_bases) * line_width + start % line_bases
+        last = entry.offset + ((end - 1) // line_bases) * line_width + (end - 1) % line_bases
+        self._seek(first)
+        data = self._handle.read(last + 1 - first)
+        if not isinstance(data, bytes):
+            data = data.encode("latin-1")
+        # New lines are at known places, but removing them is simpler
+        data = data.replace(b"\n", b"").replace(b"\r", b"")
+        if len(data) != end - start:
+            raise ValueError("Sequence %r in %s does not match its index (stale .fai file?)"
+                             % (entry.name, self._filename))
+        return _bytes_to_string(data)
+
+    def fetch(self, name, start=0, end=None):
+        """Return region of a sequence as a Seq object.
+
+        Coordinates are zero based and end is excluded, as in Python slices.
+        """
+        seq = self[name]
+        if end is None:
+            end = len(seq)
+        return seq[start:end]
+
+    def entries(self):
+        """Return the FaidxEntry objects of all the sequences, in file order."""
+        return list(self._entries)
+
+    def __getitem__(self, name):
+        """Return a LazyFastaSeq for the named sequence."""
+        return LazyFastaSeq(self, self._index[name], self.alphabet)
+
+    def get(self, name, default=None):
+        """Return the LazyFastaSeq for a name, or the default if missing."""
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __contains__(self, name):
+        """Return True if the FASTA file has a sequence with this name."""
+        return name in self._index
+
+    def __len__(self):
+        """Return the number of sequences."""
+        return len(self._entries)
+
+    def __iter__(self):
+        """Iterate over the sequence names, in file order."""
+        return (entry.name for entry in self._entries)
+
+    def keys(self):
+        """Return the sequence names, in file order."""
+        return [entry.name for entry in self._entries]
+
+    def __repr__(self):
+        """Return a string representation of the object."""
+        return "IndexedFasta(%r)" % self._filename
+
+    def close(self):
+        """Close the FASTA file."""
+        self._handle.close()
+
+    def __enter__(self):
+        """Return the object for use in a with statement."""
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Close the file at the end of a with statement."""
+        self.close()
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
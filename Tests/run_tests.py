@@ -102,6 +102,7 @@ DOCTEST_MODULES = [
     "Bio.codonalign.codonseq",
     "Bio.Blast.Applications",
     "Bio.Emboss.Applications",
+    "Bio.faidx",
     "Bio.GenBank",
     "Bio.Graphics.GenomeDiagram._Colors",
     "Bio.KEGG.Compound",
@@ -143,6 +144,8 @@ DOCTEST_MODULES = [
     "Bio.SeqUtils.CheckSum",
     "Bio.SeqUtils.MeltingTemp",
     "Bio.SeqUtils.ProtParam",
+    "Bio.SeqUtils.Kmers",
+    "Bio.SeqUtils.SlidingWindow",
     "Bio.Sequencing.Applications._Novoalign",
     "Bio.Sequencing.Applications._bwa",
     "Bio.Sequencing.Applications._samtools",
@@ -156,7 +159,12 @@ if numpy:
     DOCTEST_MODULES.extend([
         "Bio.Affy.CelFile",
         "Bio.MaxEntropy",
+        "Bio.PDB.CoordinateStore",
+        "Bio.PDB.Model",
+        "Bio.PDB.PDBParser",
         "Bio.PDB.Polypeptide",
+        "Bio.PDB.QCPSuperimposer",
+        "Bio.PDB.Scan",
         "Bio.PDB.Selection",
         "Bio.SeqIO.PdbIO",
         "Bio.Statistics.lowess",
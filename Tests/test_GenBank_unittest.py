@@ -354,6 +354,70 @@ class LineOneTests(unittest.TestCase):
                              "Wrong division %r not %r from %r" % (d, div, line))
 
 
+class LazyFeatureTests(unittest.TestCase):
+    """Lazy feature parsing and feature type filtering tests."""
+
+    def compare_features(self, old, new):
+        self.assertEqual(len(old), len(new))
+        for f1, f2 in zip(old, new):
+            self.assertEqual(f1.type, f2.type)
+            self.assertEqual(str(f1.location), str(f2.location))
+            self.assertEqual(f1.qualifiers, f2.qualifiers)
+
+    def check_file(self, filename, fmt):
+        eager = list(SeqIO.parse(filename, fmt))
+        lazy = list(SeqIO.parse(filename, fmt, lazy_features=True))
+        self.assertEqual(len(eager), len(lazy))
+        for old, new in zip(eager, lazy):
+            self.assertTrue(isinstance(new, GenBank.LazyFeatureSeqRecord))
+            self.assertFalse(new.features_parsed)
+            self.assertEqual(old.id, new.id)
+            self.assertEqual(str(old.seq), str(new.seq))
+            self.assertEqual(old.annotations, new.annotations)
+            self.compare_features(old.features, new.features)
+            self.assertTrue(new.features_parsed)
+        types = ["CDS", "gene"]
+        for lazy_features in (False, True):
+            filtered = SeqIO.parse(filename, fmt, lazy_features=lazy_features,
+                                   feature_types=types)
+            for old, new in zip(eager, filtered):
+                self.compare_features([f for f in old.features
+                                       if f.type in types], new.features)
+
+    def test_genbank_files(self):
+        """Lazy features of GenBank files match the eagerly parsed ones."""
+        for name in ["NC_005816.gb", "cor6_6.gb", "arab1.gb", "one_of.gb",
+                     "origin_line.gb", "NC_000932.gb"]:
+            self.check_file(path.join("GenBank", name), "genbank")
+
+    def test_embl_files(self):
+        """Lazy features of EMBL and IMGT files match the eagerly parsed ones."""
+        for name in ["TRBG361.embl", "AE017046.embl", "location_wrap.embl"]:
+            self.check_file(path.join("EMBL", name), "embl")
+        self.check_file(path.join("EMBL", "hla_3260_sample.imgt"), "imgt")
+
+    def test_no_features(self):
+        """Records without a feature table."""
+        old = SeqRecord(Seq("ACGT", generic_dna), id="example",
+                        name="example", description="no features")
+        new = SeqIO.read(StringIO(old.format("gb")), "gb", lazy_features=True)
+        self.assertEqual([], new.features)
+
+    def test_set_features(self):
+        """Assigning features replaces the unparsed feature table."""
+        record = SeqIO.read(path.join("GenBank", "NC_005816.gb"), "gb",
+                            lazy_features=True)
+        record.features = []
+        self.assertTrue(record.features_parsed)
+        self.assertEqual([], record.features)
+
+    def test_unexpected_arguments(self):
+        """Formats without lazy features reject the new arguments."""
+        self.assertRaises(TypeError, SeqIO.read,
+                          path.join("GenBank", "NC_005816.fna"), "fasta",
+                          lazy_features=True)
+
+
 class OutputTests(unittest.TestCase):
     """GenBank output tests."""
 
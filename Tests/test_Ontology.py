@@ -39,6 +39,36 @@ class EnrichmentFinderTest(unittest.TestCase):
         en = self.ef.find_enrichment(genes)
         self.assertEqual(24, len(en.filter_p_val(0.9).entries))
 
+    def test_frozen_graph(self):
+        genes = ['FBgn0043467', 'FBgn0010339', 'FBgn0070057', 'FBgn0070052']
+        frozen = self.go_graph.freeze()
+        for ef, efz in [(self.ef, TermForTermEnrichmentFinder(self.assocs, frozen)),
+                        (ParentChildEnrichmentFinder(self.assocs, self.go_graph),
+                         ParentChildEnrichmentFinder(self.assocs, frozen))]:
+            en = ef.find_enrichment(genes, ['bh_fdr'])
+            enz = efz.find_enrichment(genes, ['bh_fdr'])
+            self.assertEqual(sorted(en.entries, key = lambda x: x.id),
+                             sorted(enz.entries, key = lambda x: x.id))
+        self.assertEqual(self.go_graph.get_ancestors('GO:0005737'),
+                         frozen.get_ancestors('GO:0005737'))
+        self.assertEqual(sorted(self.go_graph.get_induced_subgraph(['GO:0005737', 'GO:0005622']).nodes),
+                         sorted(frozen.get_induced_subgraph(['GO:0005737', 'GO:0005622']).nodes))
+
+    def test_parallel(self):
+        genes = ['FBgn0043467', 'FBgn0010339', 'FBgn0070057', 'FBgn0070052']
+        self.assertEqual(self.ef.find_enrichment(genes, ['bh_fdr']),
+                         self.ef.find_enrichment(genes, ['bh_fdr'], n_jobs = 2))
+        ef = ParentChildEnrichmentFinder(self.assocs, self.go_graph)
+        self.assertEqual(ef.find_enrichment(genes, [], 'intersection'),
+                         ef.find_enrichment(genes, [], 'intersection', n_jobs = 2))
+
+    def test_find_enrichment_many(self):
+        gene_lists = [['FBgn0043467', 'FBgn0010339'], ['FBgn0070057', 'FBgn0070052'],
+                      ['FBgn0010340', 'FBgn0026615', 'FBgn0043467']]
+        results = self.ef.find_enrichment_many(gene_lists, 2, corrections = ['bonferroni'])
+        self.assertEqual([self.ef.find_enrichment(x, ['bonferroni']) for x in gene_lists],
+                         results)
+
 class RankedEnrichmentFinderTest(unittest.TestCase):
     
     def setUp(self):
@@ -56,6 +86,37 @@ class RankedEnrichmentFinderTest(unittest.TestCase):
         ef = GseaEnrichmentFinder(self.assocs_iter, self.go_graph)
         en = ef.find_enrichment(gene_rank, 10, 2)
         self.assertEqual(6, len(en.entries))
+
+    def test_gsea_seed(self):
+        gene_rank = [('FBgn0043467', 0.1), ('FBgn0010339', 0.7), ('FBgn0070057', 0.4), ('FBgn0070052', 0.9)]
+        ef = GseaEnrichmentFinder(self.assocs_iter, self.go_graph)
+        en1 = ef.find_enrichment(gene_rank, 100, 2, seed = 3)
+        en2 = ef.find_enrichment(gene_rank, 100, 2, seed = 3, batch_size = 7)
+        self.assertEqual(en1, en2)
+        en3 = ef.find_enrichment(gene_rank, 100, 2, seed = 3, n_jobs = 2)
+        self.assertEqual(en1, en3)
+
+    def test_ranked_parent_child_parallel(self):
+        gene_rank = [('FBgn0043467', 0.1), ('FBgn0010339', 0.7), ('FBgn0070057', 0.4), ('FBgn0070052', 0.9)]
+        ef = RankedParentChildEnrichmentFinder(self.assocs_iter, self.go_graph)
+        ref = ef.find_enrichment(gene_rank, "+/-", [], False, "union", True)
+        res = ef.find_enrichment(gene_rank, "+/-", [], False, "union", True, n_jobs = 2)
+        self.assertEqual(ref.warnings, res.warnings)
+        self.assertEqual(sorted((e.id, e.p_value, e.attrs) for e in ref.entries),
+                         sorted((e.id, e.p_value, e.attrs) for e in res.entries))
+
+    def test_ranked_parent_child_incremental(self):
+        gene_rank = [('FBgn0043467', 0.1), ('FBgn0010339', 0.7), ('FBgn0070057', 0.4),
+                     ('FBgn0070052', 0.9), ('FBgn0043467', -0.2), ('18-wheeler', 0.3)]
+        ef = RankedParentChildEnrichmentFinder(self.assocs_iter, self.go_graph)
+        for method in ("union", "intersection"):
+            for plot in (False, True):
+                res = ef.find_enrichment(gene_rank, "+/-", [], False, method, plot)
+                ref = ef.find_enrichment(gene_rank, "+/-", [], False, method, plot,
+                                         incremental = False)
+                self.assertEqual(ref.warnings, res.warnings)
+                self.assertEqual(sorted((e.id, e.p_value, e.attrs) for e in ref.entries),
+                                 sorted((e.id, e.p_value, e.attrs) for e in res.entries))
         
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity = 2)
@@ -4,7 +4,7 @@
 # as part of this package.
 
 import unittest
-from Bio.Ontology.IO.GoaIO import GafReader, InSqlAssoc, GAF20FIELDS, TsvIterator
+from Bio.Ontology.IO.GoaIO import GafReader, GafIterator, InSqlAssoc, GAF20FIELDS, TsvIterator, _to_goa
 from Bio.Ontology.Data import TermAssociation, GeneAnnotation
 
 
@@ -99,6 +99,44 @@ class GoaIOTest(unittest.TestCase):
             objs = GafReader(f).read()
             self.assertEqual(to, objs)
 
+    def test_filters(self):
+        with open('Ontology/ga_test.fb', 'r') as f:
+            objs = GafReader(f, exclude_evidence = ["IEA", "ND"], aspects = ["P", "F"]).read()
+        with open('Ontology/ga_test.fb', 'r') as f:
+            full = GafReader(f).read()
+        expected = {}
+        for gene, annotation in full.items():
+            assocs = [a for a in annotation.associations
+                      if a.attrs['Evidence'] not in ("IEA", "ND") and a.attrs['Aspect'] in "PF"]
+            if assocs:
+                expected[gene] = GeneAnnotation(gene, assocs, annotation.attrs)
+        self.assertEqual(expected, objs)
+
+    def test_compact(self):
+        with open('Ontology/GoaIO/correct20.fb', 'r') as f:
+            full = GafReader(f).read()
+        with open('Ontology/GoaIO/correct20.fb', 'r') as f:
+            compact = GafReader(f, assoc_format = "compact").read()
+        self.assertEqual(sorted(full.keys()), sorted(compact.keys()))
+        for gene, annotation in full.items():
+            self.assertTrue(gene in compact)
+            self.assertEqual(annotation.attrs, compact[gene].attrs)
+            self.assertEqual([a.term_id for a in annotation.associations],
+                             compact.get_terms(gene))
+            for a, b in zip(annotation.associations, compact[gene].associations):
+                self.assertEqual(a.attrs['Evidence'], b.attrs['Evidence'])
+                self.assertEqual(a.attrs['Qualifier'], b.attrs['Qualifier'])
+
+    def test_in_mem_sql_batches(self):
+        with open('Ontology/ga_test.fb', 'r') as f:
+            full = GafReader(f).read()
+        with open('Ontology/ga_test.fb', 'r') as f:
+            it = GafIterator(f)
+            sql = InSqlAssoc(it.fields, [1, 4], lambda x: _to_goa(x, it.version))
+            sql.add_rows(it, batch_size = 7)
+        for gene in full:
+            self.assertEqual(full[gene], sql[gene])
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity = 2)
     unittest.main(testRunner=runner)
\ No newline at end of file
@@ -22,6 +22,26 @@ class GraphTest(unittest.TestCase):
         expected =  [[2, 9], [2, 5, 3]]
         self.assertEqual(expected, g.cycles)
         
+    def test_freeze(self):
+        edges = [(1,2), (2,3), (3,4), (3,5), (5,2), (5,6), (6,8), (6,7), (2,9), (9,2), (10, 10)]
+        g = DiGraph(edges)
+        fg = g.freeze()
+        succ = {}
+        for u, v in edges:
+            succ.setdefault(u, set()).add(v)
+        for n in g.nodes:
+            reachable = set()
+            stack = list(succ.get(n, []))
+            while stack:
+                x = stack.pop()
+                if x not in reachable:
+                    reachable.add(x)
+                    stack.extend(succ.get(x, []))
+            self.assertEqual(reachable, fg.get_reachable(n))
+        self.assertEqual(set([3, 9]), fg.get_successors(2))
+        self.assertEqual(sorted((u, v, None) for u, v in edges), sorted(fg.iter_edges()))
+        self.assertEqual([[10], [2, 3, 5, 9]], sorted(sorted(c) for c in fg.cycles)[::-1])
+        
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity = 2)
@@ -0,0 +1,97 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import Bio.Ontology.IO as OntoIO
+from Bio.Ontology.IO import SnapshotIO
+from Bio.Ontology.Data import FrozenOntologyGraph
+
+
+class SnapshotIOTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.obo = os.path.join(self.tmp_dir, "go_test.obo")
+        self.gaf = os.path.join(self.tmp_dir, "ga_test.fb")
+        shutil.copy("Ontology/go_test.obo", self.obo)
+        shutil.copy("Ontology/ga_test.fb", self.gaf)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_graph_snapshot(self):
+        graph = OntoIO.read(self.obo, "obo")
+        snap = OntoIO.read_snapshot(self.obo, "obo")
+        self.assertTrue(os.path.exists(self.obo + ".snapshot"))
+        self.assertTrue(isinstance(snap, FrozenOntologyGraph))
+        snap = OntoIO.read_snapshot(self.obo, "obo")
+        for label in graph.nodes:
+            self.assertEqual(graph.get_ancestors(label), snap.get_ancestors(label))
+            self.assertEqual(graph.get_parents(label), snap.get_parents(label))
+            self.assertEqual(graph.get_term(label).name, snap.get_term(label).name)
+        self.assertEqual(sorted(graph.synonyms), sorted(snap.synonyms))
+        copy = pickle.loads(pickle.dumps(snap))
+        self.assertEqual(snap.get_ancestors("GO:0005737"), copy.get_ancestors("GO:0005737"))
+
+    def test_annotations_snapshot(self):
+        assocs = OntoIO.read(self.gaf, "gaf")
+        OntoIO.read_snapshot(self.gaf, "gaf")
+        snap = OntoIO.read_snapshot(self.gaf, "gaf")
+        self.assertEqual(len(assocs), len(snap))
+        self.assertEqual(sorted(assocs.keys()), sorted(snap.keys()))
+        for k, v in assocs.items():
+            self.assertEqual(v, snap[k])
+        self.assertFalse("unknown" in snap)
+
+    def test_invalidation(self):
+        snapshot = self.obo + ".snapshot"
+        OntoIO.read_snapshot(self.obo, "obo")
+        self.assertTrue(SnapshotIO.load_snapshot(snapshot, self.obo, True) is not None)
+        with open(self.obo, "a") as f:
+            f.write("\n[Term]\nid: GO:9999999\nname: new term\n")
+        self.assertTrue(SnapshotIO.load_snapshot(snapshot, self.obo) is None)
+        graph = OntoIO.read_snapshot(self.obo, "obo")
+        self.assertEqual("new term", graph.get_term("GO:9999999").name)
+        self.assertTrue(SnapshotIO.load_snapshot(snapshot, self.obo) is not None)
+        with open(snapshot, "r+b") as f:
+            f.write(b"garbage")
+        self.assertTrue(SnapshotIO.load_snapshot(snapshot, self.obo) is None)
+
+    def test_params(self):
+        excluded = OntoIO.read_snapshot(self.gaf, "gaf", exclude_evidence = ["IMP"])
+        snap = OntoIO.read_snapshot(self.gaf, "gaf")
+        self.assertEqual(len(OntoIO.read(self.gaf, "gaf")), len(snap))
+        self.assertNotEqual(len(excluded), len(snap))
+        snapshot = self.gaf + ".snapshot"
+        self.assertTrue(SnapshotIO.load_snapshot(snapshot, self.gaf, params = {}) is not None)
+        self.assertTrue(SnapshotIO.load_snapshot(snapshot, self.gaf,
+                                                 params = {"exclude_evidence" : ["IMP"]}) is None)
+
+    def test_corrupt(self):
+        snapshot = self.gaf + ".snapshot"
+        OntoIO.read_snapshot(self.gaf, "gaf")
+        with open(snapshot, "rb") as f:
+            data = f.read()
+        header_end = len(SnapshotIO._MAGIC) + SnapshotIO._HEADER_LEN.size
+        # truncated in the header length, the header and the sections,
+        # and a corrupt header
+        for broken in (data[:header_end - 2], data[:header_end + 10],
+                       data[:-10], data[:header_end] + b"\xff" * 20 + data[header_end + 20:]):
+            with open(snapshot, "wb") as f:
+                f.write(broken)
+            self.assertTrue(SnapshotIO.load_snapshot(snapshot) is None)
+        # a new snapshot is written in place of the broken one
+        snap = OntoIO.read_snapshot(self.gaf, "gaf")
+        self.assertEqual(len(OntoIO.read(self.gaf, "gaf")), len(snap))
+        self.assertTrue(SnapshotIO.load_snapshot(snapshot, self.gaf) is not None)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity = 2)
+    unittest.main(testRunner=runner)
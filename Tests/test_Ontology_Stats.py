@@ -5,10 +5,16 @@
 
 from Bio._py3k import range
 
+import random
 import unittest
 from math import *
 from Bio.Ontology.Stats import *
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 class StatisticalFunctionsTest(unittest.TestCase):
     
     def test_lnfactorial(self):
@@ -24,6 +30,19 @@ class StatisticalFunctionsTest(unittest.TestCase):
                 s += exp(lncombination(n, k))
             self.assertEqual(pow(2, n), round(s))
     
+    def test_hypergeometric_cache(self):
+        cache = HypergeometricCache(max_tables = 3, max_draws = 2)
+        for N in (1, 10, 57):
+            for K in range(N + 1):
+                for n in range(N + 1):
+                    for k in range(max(0, n + K - N), min(n, K) + 1):
+                        self.assertAlmostEqual(hypergeometric_test(k, n, K, N),
+                                               cache.test(k, n, K, N), 14)
+                        self.assertAlmostEqual(hypergeometric_two_tail_test(k, n, K, N),
+                                               cache.two_tail_test(k, n, K, N), 14)
+        self.assertEqual(3, len(cache._tables))
+        self.assertEqual(2, len(cache.get_table(57, 57)._dists))
+    
     def test_bonferroni_correction(self):
         expected = [0.5, 0.01, 1.0, 0.2, 0.001]
         computed = bonferroni_correction([0.1, 0.002, 0.3, 0.04, 0.0002])
@@ -51,6 +70,28 @@ class StatisticalFunctionsTest(unittest.TestCase):
             0.5714285714285716, 0.42857142857142877, 0.2857142857142859,
             0.14285714285714307, 0], 15)
         
+    @unittest.skipIf(numpy is None, "NumPy not installed")
+    def test_kolmogorov_smirnov_rank_matrix(self):
+        rnd = random.Random(7)
+        genes_list = ['G%d' % i for i in range(30)]
+        gene_corr = sorted((abs(rnd.uniform(-1, 1)) for _ in genes_list), reverse = True)
+        gene_sets = [set(rnd.sample(genes_list, k)) for k in (1, 3, 10, 29, 30)]
+        perms = []
+        for _ in range(20):
+            perm = list(range(len(genes_list)))
+            rnd.shuffle(perm)
+            perms.append(perm)
+        membership = numpy.array([[g in s for g in genes_list] for s in gene_sets])
+        
+        computed = kolmogorov_smirnov_rank_matrix(membership, numpy.array(perms),
+                                                  numpy.array(gene_corr))
+        
+        for i, gene_set in enumerate(gene_sets):
+            for j, perm in enumerate(perms):
+                expected, _ = kolmogorov_smirnov_rank_test(gene_set,
+                                        [genes_list[x] for x in perm], gene_corr)
+                self.assertEqual(expected, computed[i, j])
+        
     def _almostAssertLists(self, la, lb, places):
         self.assertEqual(len(la), len(lb), msg = "List not equal.")
         for i in range(len(la)):
@@ -12,8 +12,9 @@
 """Unit tests for the Bio.PDB module."""
 from __future__ import print_function
 
-from copy import deepcopy
+from copy import copy, deepcopy
 import os
+import pickle
 import sys
 import tempfile
 import unittest
@@ -35,6 +36,8 @@ from Bio import BiopythonWarning
 from Bio.Seq import Seq
 from Bio.Alphabet import generic_protein
 from Bio.PDB import PDBParser, PPBuilder, CaPPBuilder, PDBIO, Select, MMCIFParser, MMCIFIO
+from Bio.PDB import FastPDBParser
+from Bio.PDB.StructureBuilder import StructureBuilder
 from Bio.PDB.MMCIF2Dict import MMCIF2Dict
 from Bio.PDB import HSExposureCA, HSExposureCB, ExposureCN
 from Bio.PDB.PDBExceptions import PDBConstructionException, PDBConstructionWarning
@@ -1500,6 +1503,110 @@ class PDBParserTests(unittest.TestCase):
                         self.assertEqual(r.get_resname(), p.get_resname())
 
 
+class FastPDBParserTests(unittest.TestCase):
+    """Compare the FastPDBParser with the PDBParser."""
+
+    def parse(self, parser_class, filename, permissive=True):
+        """Return the atomic data, header, warnings or exception."""
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always", PDBConstructionWarning)
+            parser = parser_class(PERMISSIVE=permissive)
+            try:
+                structure = parser.get_structure("example", filename)
+            except Exception as err:
+                # e.g. PDBConstructionException
+                return repr(err), [str(x.message) for x in w]
+        data = []
+        for model in structure:
+            data.append((model.get_full_id(), model.serial_num))
+            for chain in model:
+                for residue in chain.get_unpacked_list():
+                    data.append((residue.get_full_id(), residue.resname,
+                                 residue.segid, residue.is_disordered()))
+                    for atom in residue.get_unpacked_list():
+                        anisou = atom.get_anisou()
+                        if anisou is not None:
+                            anisou = anisou.tolist()
+                        data.append((atom.get_full_id(), atom.get_fullname(),
+                                     atom.get_coord().tolist(),
+                                     atom.get_coord().dtype,
+                                     atom.get_bfactor(), atom.get_occupancy(),
+                                     atom.get_serial_number(), atom.element,
+                                     atom.is_disordered(), anisou))
+                data.append([atom.get_full_id() for atom in chain.get_atoms()])
+        return (data, structure.header, parser.get_trailer(),
+                [str(x.message) for x in w])
+
+    def compare(self, filename=None, data=None):
+        for permissive in (True, False):
+            results = []
+            for parser_class in (PDBParser, FastPDBParser):
+                if data is not None:
+                    filename = StringIO(data)
+                results.append(self.parse(parser_class, filename, permissive))
+            self.assertEqual(results[0], results[1])
+
+    def test_files(self):
+        """Parse the PDB files as the PDBParser does."""
+        for filename in ["PDB/1A8O.pdb", "PDB/a_structure.pdb", "PDB/2BEG.pdb",
+                         "PDB/1LCD.pdb", "PDB/occupancy.pdb", "PDB/ions.pdb"]:
+            self.compare(filename)
+
+    def test_records(self):
+        """Parse MODEL, ANISOU, SIGATM and invalid records."""
+        atom = "ATOM      9  N   ASP A 152      21.554  34.953  27.691  1.00 19.26           N\n"
+        anisou = "ANISOU    9  N   ASP A 152     2406   1892   1614    198    519   -328       N\n"
+        sigatm = "SIGATM    9  N   ASP A 152       0.012   0.009   0.010  0.00  0.21           N\n"
+        other = atom.replace("  N   ASP", "  CA  ASP").replace("21.554", "22.554")
+        for data in [atom + anisou + other + anisou,
+                     "MODEL        1\n" + atom + "ENDMDL\nMODEL        2\n" + atom + "ENDMDL\n",
+                     atom + "ENDMDL\n" + atom + "MODEL\n",
+                     atom + "TER\n" + atom.replace(" A 152", " A 153") + "END\n" + atom,
+                     atom + sigatm + other,
+                     atom.replace("34.953", "34.ish"),
+                     atom.replace(" 152 ", "     ")]:
+            self.compare(data=data)
+        # Short lines, as a segid would be found in columns 73 to 76
+        self.compare(data=atom[:66] + "\n" + other[:72] + "\n")
+
+    def test_structure_builder(self):
+        """Use a structure builder which overrides init_atom."""
+        class CountingBuilder(StructureBuilder):
+            count = 0
+
+            def init_atom(self, *args, **kwargs):
+                self.count += 1
+                StructureBuilder.init_atom(self, *args, **kwargs)
+
+        builder = CountingBuilder()
+        structure = FastPDBParser(structure_builder=builder, QUIET=True).get_structure(
+            "example", "PDB/1A8O.pdb")
+        self.assertEqual(len(list(structure.get_atoms())), builder.count)
+
+    def test_selection(self):
+        """Select atoms by record type, name and chain, or the first model."""
+        full = PDBParser(QUIET=True).get_structure("example", "PDB/1LCD.pdb")
+        for options, keep in [
+                ({"atom_names": ["CA", "P"]}, lambda atom: atom.get_id() in ("CA", "P")),
+                ({"chains": "AC"}, lambda atom: atom.get_full_id()[2] in "AC"),
+                ({"record_types": ["HETATM"]}, lambda atom: atom.get_full_id()[3][0] != " "),
+                ({"first_model": True}, lambda atom: atom.get_full_id()[1] == 0),
+                ({"record_types": ["ATOM"], "chains": ["B"], "first_model": True},
+                 lambda atom: atom.get_full_id()[1] == 0 and
+                 atom.get_full_id()[2] == "B" and atom.get_full_id()[3][0] == " ")]:
+            structure = FastPDBParser(QUIET=True, **options).get_structure(
+                "example", "PDB/1LCD.pdb")
+            # Chains are in the order of their first selected atom
+            expected = sorted((atom.get_full_id(), atom.get_coord().tolist())
+                              for atom in full.get_atoms() if keep(atom))
+            self.assertEqual(expected, sorted((atom.get_full_id(), atom.get_coord().tolist())
+                                              for atom in structure.get_atoms()))
+            self.assertEqual(full.header, structure.header)
+        structure = FastPDBParser(parse_header=False).get_structure("example", "PDB/1A8O.pdb")
+        self.assertEqual({}, structure.header)
+        self.assertEqual(644, len(list(structure.get_atoms())))
+
+
 class CopyTests(unittest.TestCase):
 
     def setUp(self):
@@ -1525,6 +1632,161 @@ class CopyTests(unittest.TestCase):
             self.assertFalse(e.get_list()[0] is ee.get_list()[0])
 
 
+class CoordinateStoreTests(unittest.TestCase):
+
+    def setUp(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", PDBConstructionWarning)
+            self.s = PDBParser(PERMISSIVE=True).get_structure(
+                'X', "PDB/a_structure.pdb")
+        # The second model has disordered atoms and residues
+        self.m = self.s[1]
+
+    def all_atoms(self, model):
+        """All atoms in a model, including alternative locations."""
+        atoms = []
+        for chain in model:
+            for residue in chain.get_unpacked_list():
+                atoms.extend(residue.get_unpacked_list())
+        return atoms
+
+    def atom_data(self, model):
+        return [(a.get_full_id(), a.get_altloc(), tuple(a.get_coord()),
+                 a.get_bfactor(), a.get_occupancy())
+                for a in self.all_atoms(model)]
+
+    def test_pack_unpack(self):
+        """Pack a structure, use the views and unpack it again."""
+        before = self.atom_data(self.m)
+        store = self.m.pack()
+        self.s.pack()
+        self.assertIs(store, self.m.store)
+        atoms = self.all_atoms(self.m)
+        self.assertEqual(len(atoms), len(store))
+        self.assertTrue(any(a.is_disordered() for a in self.m.get_atoms()))
+        self.assertEqual(before, self.atom_data(self.m))
+        atom = atoms[5]
+        store.coord[5] = (1.0, 2.0, 3.0)
+        store.bfactor[5] = 4.5
+        self.assertEqual([1.0, 2.0, 3.0], list(atom.get_coord()))
+        self.assertEqual(4.5, atom.get_bfactor())
+        atom.set_occupancy(0.25)
+        self.assertEqual(0.25, store.occupancy[5])
+        atom.coord = numpy.array((3.0, 2.0, 1.0), "f")
+        self.assertEqual([3.0, 2.0, 1.0], list(store.coord[5]))
+        self.assertEqual(list(store.indices([atoms[7], atom])), [7, 5])
+        self.assertEqual(store.select([7, 5]), [atoms[7], atom])
+        carbons = store.select(store.element == "C")
+        self.assertEqual(carbons, [a for a in atoms if a.element == "C"])
+        changed = self.atom_data(self.m)
+        self.s.unpack()
+        self.assertIsNone(self.m.store)
+        self.assertEqual(0, len(store))
+        self.assertEqual(changed, self.atom_data(self.m))
+        self.assertIsNone(atom._store)
+        self.assertRaises(ValueError, store.indices, [atom])
+
+    def test_transform(self):
+        """Transform a packed model as an unpacked one."""
+        rotation = rotmat(Vector(1, 3, 5), Vector(1, 0, 0))
+        translation = numpy.array((2.4, 0, 1), 'f')
+        other = deepcopy(self.m)
+        self.m.pack()
+        self.m.transform(rotation, translation)
+        for atom in self.all_atoms(other):
+            atom.transform(rotation, translation)
+        for a, b in zip(self.all_atoms(self.m), self.all_atoms(other)):
+            self.assertTrue(numpy.allclose(a.get_coord(), b.get_coord(), atol=1e-4))
+        # The rms to itself, and after moving all atoms by one unit
+        store = self.m.store
+        self.assertEqual(0.0, store.rms(store.coord))
+        moved = store.coord + numpy.array((1.0, 0.0, 0.0))
+        self.assertAlmostEqual(1.0, store.rms(moved), places=5)
+        self.assertAlmostEqual(1.0, store.rms(moved[:3], rows=[0, 1, 2]), places=5)
+
+    def test_copy(self):
+        """Copy and pickle a packed structure."""
+        self.s.pack()
+        for copied in (deepcopy(self.s),
+                       pickle.loads(pickle.dumps(self.s, protocol=2))):
+            self.assertEqual(self.atom_data(self.m), self.atom_data(copied[1]))
+            copied_atoms = self.all_atoms(copied[1])
+            copied_atoms[0].set_coord(numpy.array((9.0, 9.0, 9.0), "f"))
+            self.assertNotEqual([9.0, 9.0, 9.0],
+                                list(self.all_atoms(self.m)[0].get_coord()))
+        # Entity.copy does not support disordered entities, use model 0
+        copied = self.s[0].copy()
+        self.assertIsNone(copied.store)
+        original = self.s[0].store.coord.copy()
+        copied_coord = [a.get_coord() for a in copied.get_atoms()]
+        self.assertTrue(numpy.array_equal(original, copied_coord))
+        copied.transform(numpy.identity(3), numpy.array((1.0, 0, 0), "f"))
+        self.assertTrue(numpy.array_equal(original, self.s[0].store.coord))
+        atom = self.all_atoms(self.m)[0]
+        atom_copy = atom.copy()
+        self.assertIsNone(atom_copy._store)
+        self.assertEqual(list(atom.get_coord()), list(atom_copy.get_coord()))
+        # A shallow copy has its own coordinates, B factor and occupancy
+        before = list(atom.get_coord())
+        atom_copy = copy(atom)
+        self.assertIsNone(atom_copy._store)
+        self.assertEqual(atom.get_bfactor(), atom_copy.get_bfactor())
+        atom_copy.coord = numpy.array((1.0, 2.0, 3.0), "f")
+        atom_copy.set_bfactor(99.0)
+        self.assertEqual(before, list(atom.get_coord()))
+        self.assertNotEqual(99.0, atom.get_bfactor())
+
+    def test_edit_unpacks(self):
+        """Adding or removing atoms unpacks the model."""
+        store = self.m.pack()
+        residue = self.m.get_list()[0].get_list()[0]
+        atom = residue.get_list()[0]
+        coord = list(atom.get_coord())
+        residue.detach_child(atom.get_id())
+        self.assertIsNone(self.m.store)
+        self.assertIsNone(atom._store)
+        self.assertEqual(coord, list(atom.get_coord()))
+        self.assertEqual(0, len(store))
+        store = self.m.pack()
+        residue.add(atom)
+        self.assertIsNone(self.m.store)
+        self.assertIn(atom.get_id(), residue)
+
+    def test_disordered_add_unpacks(self):
+        """Adding an alternative residue unpacks the model."""
+        chain = self.m.get_list()[0]
+        disordered = [r for r in chain if r.is_disordered() == 2][0]
+        resname = disordered.get_resname()
+        new_residue = deepcopy(disordered.disordered_get(resname))
+        new_residue.resname = "NEW"
+        self.m.pack()
+        disordered.disordered_add(new_residue)
+        self.assertIsNone(self.m.store)
+        # So the atoms of the new residue are transformed with the model
+        atom = new_residue.get_list()[0]
+        coord = atom.get_coord() + 1
+        self.m.pack()
+        self.m.transform(numpy.identity(3, "f"), numpy.array((1, 1, 1), "f"))
+        self.assertTrue(numpy.allclose(coord, atom.get_coord()))
+
+    def test_superimposer(self):
+        """Apply a superposition to packed atoms."""
+        from Bio.PDB import Superimposer
+        fixed = deepcopy(self.m)
+        rotation = rotmat(Vector(1, 3, 5), Vector(1, 0, 0))
+        translation = numpy.array((2.4, 0, 1), 'f')
+        self.m.pack()
+        self.m.transform(rotation, translation)
+        fixed_atoms = list(fixed.get_atoms())
+        moving_atoms = list(self.m.get_atoms())
+        sup = Superimposer()
+        sup.set_atoms(fixed_atoms, moving_atoms)
+        self.assertAlmostEqual(0.0, sup.rms, places=3)
+        sup.apply(self.all_atoms(self.m))
+        for a, b in zip(self.all_atoms(self.m), self.all_atoms(fixed)):
+            self.assertTrue(numpy.allclose(a.get_coord(), b.get_coord(), atol=1e-3))
+
+
 def eprint(*args, **kwargs):
     """Helper function that prints to stderr."""
     print(*args, file=sys.stderr, **kwargs)
@@ -12,6 +12,7 @@
 import unittest
 
 try:
+    import numpy
     from numpy import array
     from numpy.random import random
 except ImportError:
@@ -26,6 +27,7 @@ except ImportError:
     raise MissingExternalDependencyError(
         "C module in Bio.KDTree not compiled")
 
+from Bio.PDB import PDBParser
 from Bio.PDB.NeighborSearch import NeighborSearch
 
 
@@ -56,6 +58,78 @@ class NeighborTest(unittest.TestCase):
         self.assertEqual([], ns.search(x, 5.0, "S"))
 
 
+class ContactTest(unittest.TestCase):
+    def setUp(self):
+        structure = PDBParser(QUIET=True).get_structure("example", "PDB/1LCD.pdb")
+        # Several models, so that there are pairs of atoms far apart
+        self.atoms = list(structure.get_atoms())
+        self.ns = NeighborSearch(self.atoms)
+
+    def kdtree_pairs(self, radius):
+        """Return the pairs of atom indices found with the KD tree."""
+        self.ns.kdt.all_search(radius)
+        return sorted(tuple(sorted(pair)) for pair in
+                      self.ns.kdt.all_get_indices().tolist())
+
+    def test_search_pairs(self):
+        """Find the same atom pairs as the KD tree."""
+        coords = self.ns.coords
+        for radius in (1.0, 3.5):
+            first, second, distances = self.ns.search_pairs(radius)
+            self.assertEqual(self.kdtree_pairs(radius),
+                             list(zip(first.tolist(), second.tolist())))
+            self.assertTrue(numpy.allclose(
+                distances, numpy.sqrt(((coords[first] - coords[second]) ** 2).sum(axis=1))))
+            for n_jobs in (1, 2):
+                pairs = self.ns.search_pairs(radius, n_jobs)
+                for expected, found in zip((first, second, distances), pairs):
+                    self.assertTrue((expected == found).all())
+        self.assertRaises(ValueError, self.ns.search_pairs, 0.0)
+
+    def test_search_centers(self):
+        """Find the same atoms near each point as the search method."""
+        centers = self.ns.coords[::40] + 0.5
+        centers = numpy.vstack([centers, [[250.0, 250.0, 250.0]]])
+        points, atoms, distances = self.ns.search_centers(centers, 5.0)
+        for i, center in enumerate(centers):
+            expected = sorted(id(atom) for atom in self.ns.search(center, 5.0))
+            found = sorted(id(self.atoms[j]) for j in atoms[points == i])
+            self.assertEqual(expected, found)
+        self.assertEqual(0, (points == len(centers) - 1).sum())
+        self.assertTrue((distances <= 5.0).all())
+
+    def test_contacts(self):
+        """Reduce the atom pairs to residues and chains using group ids."""
+        for level in "RCM":
+            ids, entities = self.ns.group_ids(level)
+            self.assertEqual(len(self.atoms), len(ids))
+            for atom, i in zip(self.atoms, ids.tolist()):
+                parent = atom
+                for step in range("ARCM".index(level)):
+                    parent = parent.get_parent()
+                self.assertIs(parent, entities[i])
+            first, second, distances = self.ns.search_contacts(3.0, level)
+            self.assertTrue((first < second).all())
+            # The same pairs as using the atom pairs from the KD tree
+            atom_pairs = numpy.array(self.kdtree_pairs(3.0))
+            atom_distances = numpy.sqrt(((self.ns.coords[atom_pairs[:, 0]] -
+                                          self.ns.coords[atom_pairs[:, 1]]) ** 2).sum(axis=1))
+            expected = {}
+            for (i, j), distance in zip(ids[atom_pairs].tolist(), atom_distances.tolist()):
+                pair = (min(i, j), max(i, j))
+                if i != j:
+                    expected[pair] = min(expected.get(pair, distance), distance)
+            self.assertEqual(sorted(expected), list(zip(first.tolist(), second.tolist())))
+            self.assertTrue(numpy.allclose([expected[pair] for pair in sorted(expected)],
+                                           distances))
+            pairs = set(frozenset((id(e1), id(e2)))
+                        for e1, e2 in self.ns.search_all(3.0, level))
+            self.assertEqual(set(frozenset((id(entities[i]), id(entities[j])))
+                                 for i, j in expected), pairs)
+        # A single structure
+        self.assertEqual([], self.ns.search_all(3.0, "S"))
+
+
 if __name__ == '__main__':
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
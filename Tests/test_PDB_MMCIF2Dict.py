@@ -107,6 +107,17 @@ class MMCIF2dictTests(unittest.TestCase):
         self.assertEqual(mmcif_dict["_test_key_value"], "foo")
         self.assertEqual(mmcif_dict["_test_loop"], list("abcdefg"))
 
+    def test_whitespace(self):
+        """Values may be separated by several spaces or tabs."""
+        mmcif_dict = MMCIF2Dict(io.StringIO(textwrap.dedent(u"""\
+            data_whitespace_test
+            loop_
+            _test_loop
+            a   b\tc  'd e'
+              f\t\tg
+        """)))
+        self.assertEqual(mmcif_dict["_test_loop"], ["a", "b", "c", "d e", "f", "g"])
+
     def test_loop_keyword_case_insensitive(self):
         """Comments may begin outside of column 1."""
         test_data = u"""\
@@ -13,6 +13,8 @@ import tempfile
 import unittest
 import warnings
 
+from Bio._py3k import StringIO
+
 try:
     import numpy
     from numpy import dot  # Missing on old PyPy's micronumpy
@@ -205,6 +207,57 @@ class ParseReal(unittest.TestCase):
         structure = parser.get_structure("example", open("PDB/1A8O.cif"))
         self.assertEqual(len(structure), 1)
 
+    def test_fast_rows(self):
+        """Test FastMMCIFParser with rows split over lines, and one model."""
+        data = """data_test
+loop_
+_atom_site.group_PDB
+_atom_site.type_symbol
+_atom_site.label_atom_id
+_atom_site.label_alt_id
+_atom_site.label_comp_id
+_atom_site.auth_asym_id
+_atom_site.auth_seq_id
+_atom_site.pdbx_PDB_ins_code
+_atom_site.Cartn_x
+_atom_site.Cartn_y
+_atom_site.Cartn_z
+_atom_site.occupancy
+_atom_site.B_iso_or_equiv
+ATOM N N . ASP A 152 ? 21.554 34.953 27.691 1.00 19.26
+ATOM C CA . ASP A 152 ?
+  22.554 34.953 27.691 1.00 19.26
+HETATM O O . HOH A 1 ? 1.0 2.0 3.0 0.50 9.00
+#
+"""
+        structure = FastMMCIFParser(QUIET=True).get_structure("example", StringIO(data))
+        self.assertEqual(len(structure), 1)
+        residues = list(structure[0]["A"])
+        self.assertEqual([r.get_id() for r in residues],
+                         [(" ", 152, " "), ("H_HOH", 1, " ")])
+        self.assertTrue(numpy.allclose(residues[0]["CA"].get_coord(), [22.554, 34.953, 27.691]))
+        self.assertEqual(residues[1]["O"].get_occupancy(), 0.5)
+
+    def test_fast_selection(self):
+        """Test FastMMCIFParser selecting atoms by record type, name and chain."""
+        full = FastMMCIFParser(QUIET=True).get_structure("example", "PDB/1LCD.cif")
+        for options, keep in [
+                ({"atom_names": ["CA", "P", "O5'"]},
+                 lambda atom: atom.get_id() in ("CA", "P", "O5'")),
+                ({"chains": "AC", "record_types": ["HETATM"]},
+                 lambda atom: atom.get_full_id()[2] in "AC" and atom.get_full_id()[3][0] != " "),
+                ({"first_model": True, "chains": ["B"]},
+                 lambda atom: atom.get_full_id()[1] == 0 and atom.get_full_id()[2] == "B")]:
+            structure = FastMMCIFParser(QUIET=True, **options).get_structure("example", "PDB/1LCD.cif")
+            # Chains are in the order of their first selected atom
+            expected = sorted((atom.get_full_id(), atom.get_coord().tolist())
+                              for atom in full.get_atoms() if keep(atom))
+            self.assertTrue(expected)
+            self.assertEqual(expected, sorted((atom.get_full_id(), atom.get_coord().tolist())
+                                              for atom in structure.get_atoms()))
+        structure = FastMMCIFParser(QUIET=True, chains="X").get_structure("example", "PDB/1LCD.cif")
+        self.assertEqual(0, len(structure))
+
     def test_point_mutations_main(self):
         """Test if MMCIFParser parse point mutations correctly."""
         self._run_point_mutation_tests(MMCIFParser(QUIET=True))
@@ -0,0 +1,103 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for Bio.PDB.Scan (scanning directories of structure files).
+
+See also the doctests in Scan.py which are called via run_tests.py
+"""
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.PDB.")
+
+from Bio.PDB import parse_pdb_header
+from Bio.PDB.MMCIF2Dict import MMCIF2Dict
+from Bio.PDB.Scan import scan_structures, structure_files
+from Bio.PDB.Scan import read_header, read_structure
+
+
+def atom_data(structure):
+    """Return the full ids and coordinates of the atoms as a list."""
+    return [(atom.get_full_id(), atom.get_coord().tolist())
+            for atom in structure.get_atoms()]
+
+
+def count_atoms(structure):
+    return len(list(structure.get_atoms()))
+
+
+class ScanTests(unittest.TestCase):
+    def setUp(self):
+        # A copy of some test files, compressed as in the PDB archive
+        self.directory = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.directory, "a8"))
+        self.files = {}
+        for name, filename in [("1A8O.pdb", "a8/pdb1a8o.ent.gz"),
+                               ("1A8O.cif", "a8/1a8o.cif.gz"),
+                               ("1LCD.cif", "1LCD.cif"),
+                               ("1A8O.mmtf", "1A8O.mmtf")]:
+            path = os.path.join(self.directory, filename)
+            with open(os.path.join("PDB", name), "rb") as handle:
+                data = handle.read()
+            if filename.endswith(".gz"):
+                with gzip.open(path, "wb") as handle:
+                    handle.write(data)
+            else:
+                with open(path, "wb") as handle:
+                    handle.write(data)
+            self.files[filename] = path
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_structure_files(self):
+        self.assertEqual([self.files["1LCD.cif"], self.files["a8/1a8o.cif.gz"],
+                          self.files["a8/pdb1a8o.ent.gz"]],
+                         structure_files(self.directory))
+
+    def test_read_structure(self):
+        structure = read_structure(self.files["a8/pdb1a8o.ent.gz"])
+        self.assertEqual("1a8o", structure.id)
+        self.assertEqual(atom_data(read_structure("PDB/1A8O.pdb", structure_id="1a8o")),
+                         atom_data(structure))
+        structure = read_structure(self.files["a8/1a8o.cif.gz"], atom_names=["CA"])
+        self.assertEqual(70, count_atoms(structure))
+        self.assertRaises(ValueError, read_structure, self.files["1A8O.mmtf"])
+
+    def test_read_header(self):
+        self.assertEqual(parse_pdb_header("PDB/1A8O.pdb"),
+                         read_header(self.files["a8/pdb1a8o.ent.gz"]))
+        for filename in ["PDB/1A8O.cif", "PDB/1LCD.cif", "PDB/4ZHL.cif"]:
+            expected = dict((key, value) for key, value in MMCIF2Dict(filename).items()
+                            if not key.startswith(("_atom_site.", "_atom_site_anisotrop.")))
+            self.assertEqual(expected, dict(read_header(filename)))
+        self.assertRaises(ValueError, read_header, self.files["1A8O.mmtf"])
+
+    def test_scan(self):
+        expected = [(self.files["1LCD.cif"], 51),
+                    (self.files["a8/1a8o.cif.gz"], 70),
+                    (self.files["a8/pdb1a8o.ent.gz"], 70)]
+        for n_jobs in (1, 2):
+            self.assertEqual(expected, list(scan_structures(
+                self.directory, count_atoms, n_jobs=n_jobs,
+                atom_names=["CA"], first_model=True)))
+        # Using a lambda, which can only be used by forked workers
+        resolutions = list(scan_structures(
+            [self.files["a8/pdb1a8o.ent.gz"], "PDB/2BEG.pdb"],
+            lambda header: header["resolution"], header_only=True, n_jobs=2))
+        self.assertEqual([(self.files["a8/pdb1a8o.ent.gz"], 1.7), ("PDB/2BEG.pdb", None)],
+                         resolutions)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
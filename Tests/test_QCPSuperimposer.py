@@ -10,6 +10,7 @@ try:
     from numpy import dot  # missing in old PyPy's micronumpy
     from numpy import around
     from numpy import array_equal
+    import numpy
 except ImportError:
     from Bio import MissingPythonDependencyError
     raise MissingPythonDependencyError(
@@ -17,11 +18,14 @@ except ImportError:
 
 try:
     from Bio.PDB.QCPSuperimposer import QCPSuperimposer
+    from Bio.PDB.QCPSuperimposer import rmsd_matrix, superimpose_all
 except ImportError:
     from Bio import MissingExternalDependencyError
     raise MissingExternalDependencyError(
         "C module in Bio.QCPSuperimposer not compiled")
 
+from Bio.SVDSuperimposer import SVDSuperimposer
+
 
 class QCPSuperimposerTest(unittest.TestCase):
 
@@ -173,6 +177,89 @@ class QCPSuperimposerTest(unittest.TestCase):
             array_equal(around(y_on_x2, decimals=3), around(y_x_solution, decimals=3)))
 
 
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        # Random rotations and noise of one set of coordinates
+        rng = numpy.random.RandomState(0)
+        base = rng.uniform(-10, 10, (20, 3))
+        stack = []
+        for i in range(12):
+            q = rng.normal(size=4)
+            q /= numpy.sqrt((q * q).sum())
+            a, b, c, d = q
+            rot = array([[a * a + b * b - c * c - d * d, 2 * (b * c - a * d), 2 * (b * d + a * c)],
+                         [2 * (b * c + a * d), a * a - b * b + c * c - d * d, 2 * (c * d - a * b)],
+                         [2 * (b * d - a * c), 2 * (c * d + a * b), a * a - b * b - c * c + d * d]])
+            stack.append(dot(base + rng.normal(scale=i * 0.1, size=base.shape), rot) +
+                         rng.uniform(-20, 20, 3))
+        self.stack = array(stack)
+        self.sup = QCPSuperimposer()
+
+    def test_superimpose_all(self):
+        reference = self.stack[0]
+        rms, rot, tran = superimpose_all(reference, self.stack)
+        self.assertEqual((12,), rms.shape)
+        self.assertEqual((12, 3, 3), rot.shape)
+        self.assertEqual((12, 3), tran.shape)
+        svd = SVDSuperimposer()
+        for i, coords in enumerate(self.stack):
+            self.sup.set(reference, coords)
+            self.sup.run()
+            self.assertAlmostEqual(self.sup.get_rms(), rms[i], places=5)
+            svd.set(reference, coords)
+            svd.run()
+            svd_rot, svd_tran = svd.get_rotran()
+            self.assertTrue(numpy.allclose(svd_rot, rot[i], atol=1e-6))
+            self.assertTrue(numpy.allclose(svd_tran, tran[i], atol=1e-5))
+            moved = dot(coords, rot[i]) + tran[i]
+            self.assertAlmostEqual(svd.get_rms(), numpy.sqrt(
+                ((moved - reference) ** 2).sum(axis=1).mean()), places=5)
+        self.assertAlmostEqual(0.0, rms[0], places=5)
+        # A reference per coordinate set
+        rms2, rot2, tran2 = superimpose_all(self.stack[::-1], self.stack)
+        self.sup.set(self.stack[-1], self.stack[0])
+        self.sup.run()
+        self.assertAlmostEqual(self.sup.get_rms(), rms2[0], places=5)
+        self.assertRaises(ValueError, superimpose_all, reference[:5], self.stack)
+
+    def test_superimpose_all_old(self):
+        # The example of the QCPSuperimposerTest class
+        x = array([[51.65, -1.90, 50.07],
+                   [50.40, -1.23, 50.65],
+                   [50.68, -0.04, 51.54],
+                   [50.22, -0.02, 52.85]])
+        y = array([[51.30, -2.99, 46.54],
+                   [51.09, -1.88, 47.58],
+                   [52.36, -1.20, 48.03],
+                   [52.71, -1.18, 49.38]])
+        rms, rot, tran = superimpose_all(x, array([y]))
+        self.assertEqual(0.003, float('%.3f' % rms[0]))
+        # The QCPSuperimposer class gives the transpose of this rotation
+        calc_rot = array([[0.68304939, 0.53664482, 0.49543503],
+                          [-0.5227742, 0.83293151, -0.18147239],
+                          [-0.51004967, -0.13504605, 0.84947743]])
+        self.assertTrue(
+            array_equal(around(rot[0], decimals=3), around(calc_rot, decimals=3)))
+        self.assertTrue(
+            array_equal(around(dot(y, rot[0]) + tran[0], decimals=2), around(x, decimals=2)))
+
+    def test_rmsd_matrix(self):
+        matrix = rmsd_matrix(self.stack)
+        self.assertEqual((12, 12), matrix.shape)
+        self.assertTrue(array_equal(matrix, matrix.T))
+        self.assertTrue(array_equal(numpy.zeros(12), matrix.diagonal()))
+        for i in range(12):
+            for j in range(i):
+                self.sup.set(self.stack[i], self.stack[j])
+                self.sup.run()
+                self.assertAlmostEqual(self.sup.get_rms(), matrix[i, j], places=5)
+        self.assertTrue(numpy.allclose(matrix, rmsd_matrix(self.stack, block_size=5)))
+        self.assertTrue(numpy.allclose(matrix, rmsd_matrix(self.stack, n_jobs=2, block_size=5)))
+        self.assertEqual((0, 0), rmsd_matrix(numpy.zeros((0, 5, 3))).shape)
+        self.assertRaises(ValueError, rmsd_matrix, self.stack[0])
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
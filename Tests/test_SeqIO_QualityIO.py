@@ -777,6 +777,83 @@ class TestSFF(unittest.TestCase):
                 self.assertRaises(ValueError, SeqIO.write, record, h, "sff")
 
 
+class TestFastqBatches(unittest.TestCase):
+    """Test the batched FASTQ parser and writer."""
+
+    def check_batches(self, filename, variant, chunk_sizes=(1, 5, 64, 4194304)):
+        expected = list(SeqIO.parse(filename, variant))
+        with open(filename, "rb") as handle:
+            data = handle.read()
+        for chunk_size in chunk_sizes:
+            batches = list(QualityIO.FastqBatchIterator(BytesIO(data), variant,
+                                                        batch_size=2,
+                                                        chunk_size=chunk_size))
+            for batch in batches:
+                self.assertTrue(0 < len(batch) <= 2)
+                self.assertEqual(len(batch.offsets), len(batch) + 1)
+                self.assertEqual(batch.offsets[-1], len(batch.sequences))
+            records = [record for batch in batches for record in batch]
+            compare_records(expected, records)
+            self.assertEqual([r.description for r in expected],
+                             [r.description for r in records])
+
+    def test_sanger(self):
+        for name in ("example", "example_dos", "tricky", "sanger_93",
+                     "wrapping_original_sanger", "misc_dna_original_sanger",
+                     "zero_length"):
+            self.check_batches("Quality/%s.fastq" % name, "fastq")
+
+    def test_illumina(self):
+        self.check_batches("Quality/illumina_faked.fastq", "fastq-illumina")
+
+    def test_text_handle(self):
+        with open("Quality/example.fastq") as handle:
+            batch, = list(QualityIO.FastqBatchIterator(handle))
+        self.assertEqual(batch.titles[2], "EAS54_6_R1_2_1_443_348")
+        self.assertEqual(batch.get_sequence(2), "GTTGCTTCTGGCGTGGGTGGGGGGG")
+
+    def test_errors(self):
+        for name in ("diff_ids", "no_qual", "long_qual", "short_qual",
+                     "double_seq", "double_qual", "tabs", "spaces",
+                     "trunc_in_title", "trunc_in_seq", "trunc_in_plus",
+                     "trunc_in_qual", "trunc_at_seq", "trunc_at_plus",
+                     "trunc_at_qual", "qual_del", "qual_space", "qual_null"):
+            for chunk_size in (7, 4194304):
+                with open("Quality/error_%s.fastq" % name, "rb") as handle:
+                    batches = QualityIO.FastqBatchIterator(handle, chunk_size=chunk_size)
+                    self.assertRaises(ValueError, list, batches)
+        # Scores of 63 or more are invalid in Illumina FASTQ files
+        with open("Quality/sanger_93.fastq", "rb") as handle:
+            batches = QualityIO.FastqBatchIterator(handle, "fastq-illumina")
+            self.assertRaises(ValueError, list, batches)
+        self.assertRaises(ValueError, QualityIO.FastqBatchWriter,
+                          BytesIO(), "fastq-solexa")
+
+    def test_write(self):
+        with open("Quality/tricky.fastq", "rb") as handle:
+            batches = list(QualityIO.FastqBatchIterator(handle, batch_size=3))
+        handle = StringIO()
+        self.assertEqual(4, QualityIO.FastqBatchWriter(handle).write_batches(batches))
+        expected = "".join(record.format("fastq") for record in
+                           SeqIO.parse("Quality/tricky.fastq", "fastq"))
+        self.assertEqual(handle.getvalue(), expected)
+        handle = BytesIO()
+        QualityIO.FastqBatchWriter(handle).write_batches(batches)
+        self.assertEqual(handle.getvalue().decode(), expected)
+
+    def test_write_truncation(self):
+        with open("Quality/sanger_93.fastq", "rb") as handle:
+            batch, = list(QualityIO.FastqBatchIterator(handle))
+        handle = StringIO()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            QualityIO.FastqBatchWriter(handle, "fastq-illumina").write_batch(batch)
+        self.assertEqual([w.category for w in caught], [BiopythonWarning])
+        handle.seek(0)
+        record = SeqIO.read(handle, "fastq-illumina")
+        self.assertEqual(max(record.letter_annotations["phred_quality"]), 62)
+
+
 class NonFastqTests(unittest.TestCase):
 
     def check_wrong_format(self, filename):
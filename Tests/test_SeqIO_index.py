@@ -32,12 +32,12 @@ except NameError:
 
 from Bio.SeqRecord import SeqRecord
 from Bio import SeqIO
-from Bio.SeqIO._index import _FormatToRandomAccess
+from Bio.SeqIO._index import _FormatToRandomAccess, _FormatToMmapRandomAccess
 from Bio.Alphabet import generic_protein, generic_nucleotide, generic_dna
 
 from seq_tests_common import compare_record
 
-from Bio import BiopythonParserWarning
+from Bio import BiopythonParserWarning, BiopythonWarning
 from Bio import MissingPythonDependencyError
 try:
     from test_bgzf import _have_bug17666
@@ -295,6 +295,248 @@ if sqlite3:
                        expt_sff_files)
 
 
+    class ParallelIndexTest(unittest.TestCase):
+        """Check index built using several processes, and updating it."""
+
+        files = ["GenBank/NC_000932.faa", "GenBank/NC_005816.faa",
+                 "GenBank/NC_005816.ffn", "SwissProt/multi_ex.fasta"]
+
+        def setUp(self):
+            h, self.index_tmp = tempfile.mkstemp("_idx.tmp")
+            os.close(h)
+            os.remove(self.index_tmp)
+            self.temp_files = []
+
+        def tearDown(self):
+            for filename in [self.index_tmp] + self.temp_files:
+                if os.path.isfile(filename):
+                    os.remove(filename)
+
+        def copy(self, filename):
+            h, temp = tempfile.mkstemp(suffix=".fasta")
+            with open(filename, "rb") as handle:
+                os.write(h, handle.read())
+            os.close(h)
+            self.temp_files.append(temp)
+            return temp
+
+        def rows(self, index):
+            return index._con.execute(
+                "SELECT key, file_number, offset, length FROM offset_data;").fetchall()
+
+        def test_parallel(self):
+            """Same index with several processes as with one."""
+            serial = SeqIO.index_db(":memory:", self.files, "fasta")
+            parallel = SeqIO.index_db(self.index_tmp, self.files, "fasta",
+                                      key_function=add_prefix, n_jobs=2)
+            self.assertEqual(len(serial), len(parallel))
+            self.assertEqual([("id_" + row[0],) + row[1:] for row in self.rows(serial)],
+                             self.rows(parallel))
+            for key in serial:
+                self.assertEqual(serial.get_raw(key), parallel.get_raw("id_" + key))
+            serial.close()
+            parallel._con.close()
+            parallel.close()
+            reloaded = SeqIO.index_db(self.index_tmp, key_function=add_prefix)
+            self.assertEqual(len(serial), len(reloaded))
+            reloaded._con.close()
+            reloaded.close()
+
+        def test_parallel_duplicates(self):
+            """Duplicate keys across files with several processes."""
+            self.assertRaises(ValueError, SeqIO.index_db, ":memory:",
+                              ["Fasta/dups.fasta", "Fasta/f002"], "fasta",
+                              n_jobs=2)
+            self.assertRaises(ValueError, SeqIO.index_db, ":memory:",
+                              self.files, "fasta", n_jobs=0)
+
+        def test_rebuild(self):
+            """Rescan only files which have changed."""
+            first = self.copy("GenBank/NC_005816.faa")
+            second = self.copy("Fasta/f002")
+            d = SeqIO.index_db(self.index_tmp, [first, second], "fasta")
+            self.assertEqual(13, len(d))
+            self.assertEqual([], d.rebuild())
+            # Replace the second file, moving its modified time as well
+            with open(second, "w") as handle:
+                handle.write(">new\nACGT\n>other\nGGG\n")
+            mtime = os.path.getmtime(second) + 10
+            os.utime(second, (mtime, mtime))
+            self.assertEqual([second], d.rebuild())
+            self.assertEqual(12, len(d))
+            self.assertEqual("ACGT", str(d["new"].seq))
+            self.assertNotIn("gi|1348912|gb|G26680|G26680", d)
+            self.assertEqual([], d.rebuild())
+            # A duplicate key leaves the index unchanged
+            with open(second, "a") as handle:
+                handle.write(">%s\nACGT\n" % list(d)[0])
+            self.assertRaises(ValueError, d.rebuild)
+            self.assertEqual(12, len(d))
+            self.assertIn("new", d)
+            d._con.close()
+            d.close()
+
+        def check_update(self, filename, format, extra, use_mmap=False):
+            temp = self.copy(filename)
+            d = SeqIO.index_db(self.index_tmp, temp, format, use_mmap=use_mmap)
+            if isinstance(extra, bytes):
+                data = extra
+            else:
+                with open(extra[0], "rb") as handle:
+                    data = handle.read()
+            with open(temp, "ab") as handle:
+                handle.write(data)
+            self.assertEqual([temp], d.stale_files())
+            self.assertEqual([temp], d.update())
+            self.assertEqual([], d.stale_files())
+            self.assertEqual([], d.update())
+            expected = SeqIO.index_db(":memory:", temp, format)
+            self.assertEqual(sorted(self.rows(expected)), sorted(self.rows(d)))
+            self.assertEqual(len(expected), len(d))
+            for key in expected:
+                self.assertEqual(expected.get_raw(key), bytes(d.get_raw(key)))
+            expected.close()
+            d._con.close()
+            d.close()
+
+        def test_update_appended(self):
+            """Add records appended to the indexed files."""
+            self.check_update("Fasta/f002", "fasta", ["GenBank/NC_005816.faa"])
+            os.remove(self.index_tmp)
+            self.check_update("Fasta/f002", "fasta", ["GenBank/NC_005816.faa"], True)
+            os.remove(self.index_tmp)
+            self.check_update("GenBank/cor6_6.gb", "gb", ["GenBank/NC_005816.gb"])
+            os.remove(self.index_tmp)
+            self.check_update("Quality/example.fastq", "fastq", ["Quality/tricky.fastq"], True)
+            os.remove(self.index_tmp)
+            self.check_update("GenBank/NC_005816.tsv", "tab", b"extra\tACGT\n")
+            os.remove(self.index_tmp)
+            self.check_update("Phd/phd1", "phd", ["Phd/phd2"])
+            os.remove(self.index_tmp)
+            # This uses the default iter_from method
+            self.check_update("IntelliGenetics/VIF_mase-pro.txt", "ig",
+                              b";comment\nextra\nACDEF1\n")
+
+        def test_update_continued(self):
+            """Update the last record when continued by appended data."""
+            # The appended data is more sequence for the last record
+            self.check_update("Fasta/f002", "fasta", b"ACGTACGT\n")
+            os.remove(self.index_tmp)
+            self.check_update("Fasta/f002", "fasta", b"ACGTACGT\n>extra\nAC\n", True)
+
+        def test_stale(self):
+            """Warn on loading an index of changed files."""
+            first = self.copy("GenBank/NC_005816.faa")
+            second = self.copy("Fasta/f002")
+            d = SeqIO.index_db(self.index_tmp, [first, second], "fasta")
+            d._con.close()
+            d.close()
+            # Only the modified time has changed
+            mtime = os.path.getmtime(first) + 10
+            os.utime(first, (mtime, mtime))
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", BiopythonWarning)
+                d = SeqIO.index_db(self.index_tmp)
+            self.assertEqual([], d.stale_files())
+            # Nothing to rescan, but the new modified time is recorded
+            self.assertEqual([], d.update())
+            self.assertEqual([], d._changed_files())
+            d._con.close()
+            d.close()
+            # Edit the start of the second file
+            with open(second, "rb") as handle:
+                data = handle.read()
+            with open(second, "wb") as handle:
+                handle.write(b">renamed" + data[data.index(b" "):])
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always", BiopythonWarning)
+                d = SeqIO.index_db(self.index_tmp)
+            self.assertEqual(1, len(caught))
+            self.assertEqual([second], d.stale_files())
+            self.assertEqual([second], d.update())
+            self.assertIn("renamed", d)
+            self.assertNotIn("gi|1348912|gb|G26680|G26680", d)
+            d._con.close()
+            d.close()
+
+
+class ManyRecordsTests(unittest.TestCase):
+    """Check the record cache, and the get_many and get_raw_many methods."""
+
+    def check_many(self, d, keys):
+        records = d.get_many(keys)
+        self.assertEqual(len(keys), len(records))
+        for key, record in zip(keys, records):
+            self.assertEqual(key, record.id)
+            self.assertEqual(str(d[key].seq), str(record.seq))
+        raws = d.get_raw_many(keys)
+        self.assertEqual([bytes(d.get_raw(key)) for key in keys],
+                         [bytes(raw) for raw in raws])
+        del raws
+        self.assertEqual([], d.get_many([]))
+        self.assertRaises(KeyError, d.get_many, keys[:1] + ["missing"])
+        self.assertRaises(KeyError, d.get_raw_many, ["missing"] + keys[:1])
+
+    def test_index(self):
+        d = SeqIO.index("GenBank/NC_000932.faa", "fasta")
+        keys = list(d)[::-3] + list(d)[:2]
+        self.check_many(d, keys)
+        d.close()
+
+    def test_index_mmap(self):
+        d = SeqIO.index("Quality/tricky.fastq", "fastq", use_mmap=True)
+        keys = sorted(d)
+        self.check_many(d, keys)
+        d.close()
+
+    if sqlite3:
+        def test_index_db(self):
+            h, filename = tempfile.mkstemp(suffix=".fasta")
+            # Enough records for several queries
+            os.write(h, "".join(">seq%i\nACGT\n" % i for i in range(1200)).encode("ascii"))
+            os.close(h)
+            try:
+                d = SeqIO.index_db(":memory:", [filename, "GenBank/NC_005816.faa"],
+                                   "fasta")
+                keys = list(d)[::-1]
+                self.check_many(d, keys)
+                self.check_many(d, keys[:3] + keys[:3])
+                d.close()
+            finally:
+                os.remove(filename)
+
+    def test_cache(self):
+        d = SeqIO.index("GenBank/NC_005816.faa", "fasta", cache_size=3)
+        keys = list(d)
+        first = d[keys[0]]
+        self.assertIs(first, d[keys[0]])
+        d[keys[1]]
+        d[keys[2]]
+        d[keys[0]]
+        # Least recently used is now keys[1], which is discarded
+        d[keys[3]]
+        self.assertIs(first, d[keys[0]])
+        self.assertEqual(3, len(d._cache))
+        self.assertNotIn(keys[1], d._cache._records)
+        records = d.get_many(keys)
+        self.assertIs(first, records[0])
+        self.assertEqual(keys, [record.id for record in records])
+        self.assertIn("cache_size=3", repr(d))
+        d.close()
+
+    if sqlite3:
+        def test_cache_index_db(self):
+            d = SeqIO.index_db(":memory:", "GenBank/NC_005816.faa", "fasta",
+                               cache_size=2)
+            keys = list(d)
+            self.assertIs(d[keys[0]], d[keys[0]])
+            records = d.get_many(keys[:4])
+            self.assertIs(records[3], d[keys[3]])
+            self.assertIsNot(records[0], d[keys[0]])
+            self.assertEqual(2, len(d._cache))
+            d.close()
+
+
 class IndexDictTests(unittest.TestCase):
     """Cunning unit test where methods are added at run time."""
 
@@ -590,6 +832,27 @@ class IndexDictTests(unittest.TestCase):
         rec_dict.close()
         del rec_dict
 
+    def mmap_check(self, filename, format, alphabet, comp):
+        """Check memory mapped index gives the same records and raw data."""
+        rec_dict = SeqIO.index(filename, format, alphabet)
+        mmap_dict = SeqIO.index(filename, format, alphabet, use_mmap=True)
+        self.assertEqual(list(rec_dict), list(mmap_dict))
+        for key in rec_dict:
+            self.assertEqual(True, compare_record(rec_dict[key], mmap_dict[key]))
+            raw = mmap_dict.get_raw(key)
+            if not comp and sys.version_info[0] >= 3:
+                # Zero copy slice of the file
+                self.assertTrue(isinstance(raw, memoryview))
+            self.assertEqual(rec_dict.get_raw(key), bytes(raw))
+            del raw
+        rec_dict.close()
+        mmap_dict.close()
+        if sqlite3:
+            rec_dict = SeqIO.index_db(":memory:", filename, format, alphabet,
+                                      use_mmap=True)
+            self.assertEqual(sorted(mmap_dict), sorted(rec_dict))
+            rec_dict.close()
+
     if sqlite3:
         def test_duplicates_index_db(self):
             """Index file with duplicate identifiers with Bio.SeqIO.index_db()"""
@@ -702,6 +965,16 @@ for filename1, format, alphabet in tests:
                 funct(filename2, format, alphabet, comp))
         del funct
 
+        if format in _FormatToMmapRandomAccess:
+            def funct(fn, fmt, alpha, c):
+                f = lambda x: x.mmap_check(fn, fmt, alpha, c)
+                f.__doc__ = "Index %s file %s with mmap" % (fmt, fn)
+                return f
+            setattr(IndexDictTests, "test_%s_%s_mmap"
+                        % (format, filename2.replace("/", "_").replace(".", "_")),
+                    funct(filename2, format, alphabet, comp))
+            del funct
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -14,7 +14,7 @@ from Bio import SeqIO
 from Bio.Alphabet import generic_dna, generic_protein
 from Bio.Seq import Seq, MutableSeq
 from Bio.SeqRecord import SeqRecord
-from Bio.SeqFeature import SeqFeature, FeatureLocation, ExactPosition
+from Bio.SeqFeature import SeqFeature, FeatureLocation, ExactPosition, FeatureIndex
 from Bio.SeqFeature import WithinPosition, BeforePosition, AfterPosition, OneOfPosition
 
 
@@ -206,6 +206,63 @@ Seq('ABCDEFGHIJKLMNOPQRSTUVWZYX', ProteinAlphabet())"""
         self.assertEqual(len(rec[5:2]), 0)
         self.assertEqual(len(rec[5:2][2:-2]), 0)
 
+    def test_feature_index(self):
+        """Location queries using the feature index"""
+        rec = self.record
+        f0, f1, f2, f3 = rec.features
+        index = rec.feature_index
+        self.assertEqual(len(index), 4)
+        self.assertIs(index, rec.feature_index)
+        self.assertEqual(index.overlapping(10, 12), [f0])
+        self.assertEqual(index.overlapping(9, 13), [f0, f1, f2])
+        self.assertEqual(index.contained(0, 22), [f1, f2])
+        self.assertEqual(index.nearest(11), (0, [f0, f2]))
+        self.assertEqual(index.nearest(10, 11), (0, [f0, f1]))
+        self.assertEqual(FeatureIndex([f1, f3]).nearest(12), (2, [f1]))
+        self.assertEqual(FeatureIndex([]).nearest(12), (None, []))
+
+    def test_feature_index_rebuilt(self):
+        """Feature index follows changes to the features list"""
+        rec = self.record
+        index = rec.feature_index
+        f4 = SeqFeature(FeatureLocation(11, 12))
+        rec.features.append(f4)
+        self.assertIsNot(index, rec.feature_index)
+        self.assertEqual(rec.feature_index.overlapping(10, 12), [rec.features[0], f4])
+        rec.features = rec.features[:1]
+        self.assertEqual(len(rec.feature_index), 1)
+        self.assertEqual(len(rec[10:12].features), 0)
+        rec.features.append(f4)
+        self.assertEqual(len(rec[10:12].features), 1)
+        # Replacing the last feature in place is noticed
+        index = rec.feature_index
+        rec.features[-1] = SeqFeature(FeatureLocation(2, 3))
+        self.assertIsNot(index, rec.feature_index)
+        self.assertIn(rec.features[-1], rec.feature_index.overlapping(2, 3))
+
+    def test_slice_after_feature_changes(self):
+        """Slicing follows features changed in place"""
+        rec = self.record
+        rec.feature_index
+        rec.features[1] = SeqFeature(FeatureLocation(20, 21), type="new")
+        rec.features[2].location = FeatureLocation(22, 23)
+        self.assertEqual([f.type for f in rec[20:24].features],
+                         ["new", rec.features[2].type])
+
+    def test_slice_features(self):
+        """Slicing keeps the features within the slice"""
+        seq = Seq("ACGT" * 250, generic_dna)
+        features = [SeqFeature(FeatureLocation(i, i + 50 + i % 7), type="gene")
+                    for i in range(0, 900, 13)]
+        features.append(SeqFeature(FeatureLocation(10, 20) + FeatureLocation(40, 60)))
+        rec = SeqRecord(seq, id="Test", features=features)
+        for start, stop in [(0, 100), (13, 70), (5, 995), (500, 600), (700, 700)]:
+            expected = [f for f in features if start <= f.location.nofuzzy_start
+                        and f.location.nofuzzy_end <= stop]
+            sub = rec[start:stop]
+            self.assertEqual([f.location.nofuzzy_start + start for f in sub.features],
+                             [f.location.nofuzzy_start for f in expected])
+
     def test_add_simple(self):
         """Simple addition"""
         rec = self.record + self.record
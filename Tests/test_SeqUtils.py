@@ -12,6 +12,7 @@ from Bio.Seq import Seq, MutableSeq
 from Bio.SeqRecord import SeqRecord
 from Bio.SeqUtils import GC, seq1, seq3, GC_skew
 from Bio.SeqUtils.lcc import lcc_simp, lcc_mult
+from Bio.SeqUtils import SlidingWindow
 from Bio.SeqUtils.CheckSum import crc32, crc64, gcg, seguid
 from Bio.SeqUtils.CodonUsage import CodonAdaptationIndex
 
@@ -143,6 +144,44 @@ class SeqUtilsTests(unittest.TestCase):
     def test_GC_skew(self):
         seq = "A" * 50
         self.assertEqual(GC_skew(seq)[0], 0)
+        seq = "GGGCCATTCcgatgcgAT"
+        self.assertEqual(GC_skew(seq, 5), [0.2, -1.0, 1 / 3.0, 1.0])
+        self.assertEqual(GC_skew(Seq(seq), 5), [0.2, -1.0, 1 / 3.0, 1.0])
+
+    def test_sliding_window_gc(self):
+        seq = "ACGGGCTACCGTATAGGCAAGAGATGATGCCCsn"
+        for window, step in [(8, 1), (8, 3), (8, 8), (5, 11), (40, 1)]:
+            starts = range(0, len(seq) - window + 1, step)
+            self.assertEqual(list(SlidingWindow.gc_content(seq, window, step)),
+                             [GC(seq[i:i + window]) for i in starts])
+            skew = SlidingWindow.gc_skew(Seq(seq), window, step)
+            self.assertEqual(len(skew), len(starts))
+            for value, i in zip(skew, starts):
+                self.assertAlmostEqual(value, GC_skew(seq[i:i + window], window)[0])
+
+    def test_sliding_window_lcc(self):
+        seq = "ACGGGCTACCGTATAGGCAAGAGATGATGCCC"
+        values = SlidingWindow.lcc(seq, 20, step=1)
+        self.assertEqual(len(values), len(seq) - 19)
+        for value, i in zip(values, range(len(seq))):
+            self.assertAlmostEqual(value, lcc_simp(seq[i:i + 20]))
+        self.assertEqual(["%0.2f" % v for v in values], windowed_LCC(seq).split(", ")[1:])
+
+    def test_sliding_window_entropy(self):
+        values = SlidingWindow.kmer_entropy("AAAAAAAAACGTACGTAC", 6, k=1, step=3)
+        self.assertEqual(["%0.2f" % v for v in values], ["0.00", "0.00", "1.79", "1.92", "1.92"])
+        self.assertEqual(list(SlidingWindow.kmer_entropy("ACGT", 5)), [])
+        self.assertRaises(ValueError, SlidingWindow.kmer_entropy, "ACGT", 2, k=3)
+
+    def test_window_stats(self):
+        records = [SeqRecord(Seq("ACGGGCTACCGTATAG"), id="one"), "GGCAAGAGATGATGCCC"]
+        results = list(SlidingWindow.window_stats(records, 8, stats=["gc", "entropy"]))
+        self.assertEqual(["one", None], [name for name, values in results])
+        self.assertEqual(sorted(results[0][1]), ["entropy", "gc"])
+        self.assertEqual(list(results[0][1]["gc"]), [62.5, 50.0])
+        self.assertEqual(list(results[1][1]["gc"]), [62.5, 50.0])
+        with self.assertRaises(ValueError):
+            list(SlidingWindow.window_stats(records, 8, stats=["at"]))
 
     def test_seq1_seq3(self):
         s3 = "MetAlaTyrtrpcysthrLYSLEUILEGlYPrOGlNaSnaLapRoTyRLySSeRHisTrpLysThr"
@@ -0,0 +1,186 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for Bio.SeqUtils.Kmers (k-mer counting and MinHash sketches).
+
+See also the doctests in Kmers.py which are called via run_tests.py
+"""
+
+import random
+import unittest
+from collections import Counter
+
+from Bio import SeqIO
+from Bio.Seq import Seq, reverse_complement
+from Bio.SeqRecord import SeqRecord
+from Bio.SeqUtils import Kmers
+
+
+def simple_kmers(seq, k, canonical=True):
+    """Count the k-mers of a sequence using strings and a dictionary."""
+    seq = str(seq).upper()
+    counts = Counter()
+    for i in range(len(seq) - k + 1):
+        kmer = seq[i:i + k]
+        if set(kmer).issubset("ACGT"):
+            if canonical:
+                kmer = min(kmer, reverse_complement(kmer))
+            counts[kmer] += 1
+    return counts
+
+
+class KmerCodeTests(unittest.TestCase):
+    def test_encode_decode(self):
+        for kmer in ["A", "T", "ACGT", "TTTTTTTTTTTTTTTTTTTTTTTTTTTTTTT"]:
+            code = Kmers.encode_kmer(kmer)
+            self.assertEqual(kmer, Kmers.decode_kmer(code, len(kmer)))
+        self.assertEqual(0, Kmers.encode_kmer("aaa"))
+        self.assertRaises(ValueError, Kmers.encode_kmer, "ACNT")
+        self.assertRaises(ValueError, Kmers.encode_kmer, "")
+
+    def test_canonical(self):
+        self.assertEqual("AAC", Kmers.canonical_kmer("GTT"))
+        self.assertEqual("AAC", Kmers.canonical_kmer("AAC"))
+        self.assertEqual("ACGT", Kmers.canonical_kmer("ACGT"))
+
+    def test_codes(self):
+        rng = random.Random(0)
+        seq = "".join(rng.choice("ACGTacgtN") for i in range(500))
+        for k in [1, 2, 7, 31]:
+            for canonical in [True, False]:
+                expected = simple_kmers(seq, k, canonical)
+                codes = Counter(Kmers.kmer_codes(Seq(seq), k, canonical))
+                self.assertEqual(expected, Counter(dict(
+                    (Kmers.decode_kmer(code, k), count) for code, count in codes.items())))
+        self.assertRaises(ValueError, list, Kmers.kmer_codes(seq, 32))
+        self.assertRaises(ValueError, list, Kmers.kmer_codes(seq, 0))
+
+    def test_minimizers(self):
+        seq = "ACGTTGCATGTCGCATGATGCATGAGAGCTNNACGTTG"
+        found = Kmers.minimizers(seq, 5, 4)
+        positions = [start for start, code in found]
+        self.assertEqual(positions, sorted(set(positions)))
+        for start, code in found:
+            kmer = Kmers.canonical_kmer(seq[start:start + 5])
+            self.assertEqual(kmer, Kmers.decode_kmer(code, 5))
+        # The run after the Ns is shorter than a window, but still used
+        self.assertGreaterEqual(positions[-1], 32)
+        self.assertEqual([], Kmers.minimizers("ACGNNNACG", 4, 2))
+
+
+class KmerCountsTests(unittest.TestCase):
+    def check_counts(self, k, seqs):
+        counts = Kmers.KmerCounts(k)
+        counts.update(seqs)
+        expected = Counter()
+        for seq in seqs:
+            if isinstance(seq, SeqRecord):
+                seq = seq.seq
+            expected.update(simple_kmers(seq, k))
+        self.assertEqual(len(expected), len(counts))
+        self.assertEqual(sum(expected.values()), counts.total)
+        self.assertEqual(dict(expected), dict(counts.items()))
+        for kmer in list(expected)[:50]:
+            self.assertEqual(expected[kmer], counts[kmer])
+            self.assertEqual(expected[kmer], counts[reverse_complement(kmer)])
+            self.assertIn(kmer, counts)
+        return counts
+
+    def test_dense(self):
+        counts = self.check_counts(4, ["ACGTACGTTTGCAN", Seq("acgtNNGGGA")])
+        self.assertEqual(0, counts["CCCC"])
+        self.assertEqual([("ACGT", 3)], counts.most_common(1))
+
+    def test_hash_table(self):
+        rng = random.Random(1)
+        seqs = ["".join(rng.choice("ACGT") for i in range(20000))
+                for j in range(3)]
+        # Enough k-mers to make the hash table grow
+        counts = self.check_counts(15, seqs + [SeqRecord(Seq(seqs[0]), id="dup")])
+        self.assertEqual(0, counts["A" * 15])
+        self.assertRaises(ValueError, counts.__getitem__, "ACGT")
+
+    def test_list_keys(self):
+        # As used where arrays have no 64 bit type, e.g. Python 2 on Windows
+        typecode = Kmers._KEY_TYPECODE
+        Kmers._KEY_TYPECODE = None
+        try:
+            counts = self.check_counts(13, ["ACGTACGTTTGCANACGTTTGCAGGATTACA" * 3])
+        finally:
+            Kmers._KEY_TYPECODE = typecode
+        self.assertTrue(isinstance(counts._keys, list))
+
+    def test_count_fasta(self):
+        counts = Kmers.count_kmers("Fasta/f002", 11, "fasta")
+        expected = Counter()
+        for record in SeqIO.parse("Fasta/f002", "fasta"):
+            expected.update(simple_kmers(record.seq, 11))
+        self.assertEqual(dict(expected), dict(counts.items()))
+
+    def test_count_no_format(self):
+        self.assertRaises(TypeError, Kmers.count_kmers, "Fasta/f002", 11)
+        with open("Fasta/f002") as handle:
+            self.assertRaises(TypeError, Kmers.count_kmers, handle, 11)
+        self.assertRaises(TypeError, list, Kmers.sketch_records("Fasta/f002", 11))
+
+    def test_count_fastq(self):
+        counts = Kmers.count_kmers("Quality/example.fastq", 12, "fastq", canonical=False)
+        expected = Counter()
+        for record in SeqIO.parse("Quality/example.fastq", "fastq"):
+            expected.update(simple_kmers(record.seq, 12, canonical=False))
+        self.assertEqual(dict(expected), dict(counts.items()))
+
+
+class MinHashTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(2)
+        self.seq = "".join(rng.choice("ACGT") for i in range(20000))
+        self.other = "".join(rng.choice("ACGT") for i in range(10000))
+
+    def sketch(self, seq, size=2000, k=21):
+        sketch = Kmers.MinHashSketch(k, size)
+        sketch.add(seq)
+        return sketch
+
+    def test_identical(self):
+        first = self.sketch(self.seq)
+        second = self.sketch(reverse_complement(self.seq))
+        self.assertEqual(2000, len(first))
+        self.assertEqual(first.hashes, second.hashes)
+        self.assertEqual(1.0, first.jaccard(second))
+        self.assertEqual(1.0, first.containment(second))
+
+    def test_overlap(self):
+        first = self.sketch(self.seq)
+        second = self.sketch(self.seq[:10000] + self.other)
+        # About a third of the k-mers are shared
+        self.assertAlmostEqual(1 / 3.0, first.jaccard(second), delta=0.05)
+        self.assertAlmostEqual(0.5, second.containment(first), delta=0.05)
+        third = self.sketch(self.seq[5000:8000])
+        self.assertEqual(1.0, third.containment(first))
+        self.assertLess(first.containment(third), 0.3)
+
+    def test_unrelated(self):
+        self.assertLess(self.sketch(self.seq).jaccard(self.sketch(self.other)), 0.01)
+        self.assertEqual(0.0, Kmers.MinHashSketch(5).jaccard(Kmers.MinHashSketch(5)))
+
+    def test_incompatible(self):
+        first = self.sketch(self.seq, k=21)
+        second = self.sketch(self.seq, k=15)
+        self.assertRaises(ValueError, first.jaccard, second)
+        self.assertRaises(ValueError, first.containment, second)
+
+    def test_sketch_records(self):
+        records = [SeqRecord(Seq(self.seq), id="first"), self.other]
+        sketches = list(Kmers.sketch_records(records, 21, 500))
+        self.assertEqual(["first", None], [name for name, sketch in sketches])
+        self.assertEqual(self.sketch(self.seq, 500).hashes, sketches[0][1].hashes)
+        names = [name for name, sketch in
+                 Kmers.sketch_records("Quality/example.fastq", 11, 10, "fastq")]
+        self.assertEqual(names, [record.id for record in
+                                 SeqIO.parse("Quality/example.fastq", "fastq")])
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
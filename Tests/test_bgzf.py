@@ -52,12 +52,12 @@ class BgzfTests(unittest.TestCase):
         if os.path.isfile(self.temp_file):
             os.remove(self.temp_file)
 
-    def rewrite(self, compressed_input_file, output_file):
+    def rewrite(self, compressed_input_file, output_file, threads=1):
         h = gzip.open(compressed_input_file, "rb")
         data = h.read()
         h.close()
 
-        with bgzf.BgzfWriter(output_file, "wb") as h:
+        with bgzf.BgzfWriter(output_file, "wb", threads=threads) as h:
             h.write(data)
             self.assertFalse(h.seekable())
             self.assertFalse(h.isatty())
@@ -178,7 +178,7 @@ class BgzfTests(unittest.TestCase):
                                  "%r vs %r, mode %r" % (old[:10], new[:10], mode))
                 self.assertEqual(old, new)
 
-    def check_random(self, filename):
+    def check_random(self, filename, threads=1):
         """Check BGZF random access by reading blocks in forward & reverse order"""
         h = gzip.open(filename, "rb")
         old = h.read()
@@ -190,7 +190,7 @@ class BgzfTests(unittest.TestCase):
 
         # Forward, using explicit open/close
         new = b""
-        h = bgzf.BgzfReader(filename, "rb")
+        h = bgzf.BgzfReader(filename, "rb", threads=threads)
         self.assertTrue(h.seekable())
         self.assertFalse(h.isatty())
         self.assertEqual(h.fileno(), h._handle.fileno())
@@ -207,7 +207,7 @@ class BgzfTests(unittest.TestCase):
 
         # Reverse, using with statement
         new = b""
-        with bgzf.BgzfReader(filename, "rb") as h:
+        with bgzf.BgzfReader(filename, "rb", threads=threads) as h:
             for start, raw_len, data_start, data_len in blocks[::-1]:
                 h.seek(bgzf.make_virtual_offset(start, 0))
                 data = h.read(data_len)
@@ -219,7 +219,7 @@ class BgzfTests(unittest.TestCase):
 
         # Jump back - non-sequential seeking
         if len(blocks) >= 3:
-            h = bgzf.BgzfReader(filename, "rb", max_cache=1)
+            h = bgzf.BgzfReader(filename, "rb", max_cache=1, threads=threads)
             # Seek to a late block in the file,
             # half way into the third last block
             start, raw_len, data_start, data_len = blocks[-3]
@@ -252,7 +252,7 @@ class BgzfTests(unittest.TestCase):
                 real_offset = data_start + within_offset
                 v_offsets.append((voffset, real_offset))
         shuffle(v_offsets)
-        h = bgzf.BgzfReader(filename, "rb", max_cache=1)
+        h = bgzf.BgzfReader(filename, "rb", max_cache=1, threads=threads)
         for voffset, real_offset in v_offsets:
             h.seek(0)
             self.assertTrue(voffset >= 0 and real_offset >= 0)
@@ -291,6 +291,19 @@ class BgzfTests(unittest.TestCase):
         """Check random access to GenBank/cor6_6.gb.bgz"""
         self.check_random("GenBank/cor6_6.gb.bgz")
 
+    def test_random_threads(self):
+        """Check random access with blocks decompressed in background threads"""
+        self.check_random("SamBam/ex1.bam", threads=2)
+        self.check_random("GenBank/cor6_6.gb.bgz", threads=3)
+
+    def test_iter_threads(self):
+        """Check iteration with blocks decompressed in background threads"""
+        with open("GenBank/NC_000932.gb") as h:
+            old = h.readlines()
+        with bgzf.BgzfReader("GenBank/NC_000932.gb.bgz", "r", threads=2, readahead=3) as h:
+            new = list(h)
+        self.assertEqual(old, new)
+
     def test_text_wnts_xml(self):
         """Check text mode access to Blast/wnts.xml.bgz"""
         self.check_text("Blast/wnts.xml", "Blast/wnts.xml.bgz")
@@ -333,6 +346,11 @@ class BgzfTests(unittest.TestCase):
         # this example BAM file has simple block usage)
         self.check_blocks("SamBam/ex1.bam", temp_file)
 
+    def test_bam_ex1_threads(self):
+        """Reproduce BGZF compression for BAM file using threads"""
+        self.rewrite("SamBam/ex1.bam", self.temp_file, threads=3)
+        self.check_blocks("SamBam/ex1.bam", self.temp_file)
+
     def test_iter_bam_ex1(self):
         """Check iteration over SamBam/ex1.bam"""
         self.check_by_char("SamBam/ex1.bam", "SamBam/ex1.bam", True)
@@ -363,9 +381,15 @@ class BgzfTests(unittest.TestCase):
 
     def test_write_tell(self):
         """Check offset works during BGZF writing"""
+        self.check_write_tell(bgzf.open(self.temp_file, "w"))  # Text mode!
+
+    def test_write_tell_threads(self):
+        """Check offset works during BGZF writing using threads"""
+        self.check_write_tell(bgzf.BgzfWriter(self.temp_file, "w", threads=2))
+
+    def check_write_tell(self, h):
         temp_file = self.temp_file
 
-        h = bgzf.open(temp_file, "w")  # Text mode!
         # When opening new file, offset should be 0
         self.assertEqual(h.tell(), 0)
 
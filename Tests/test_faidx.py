@@ -0,0 +1,184 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for Bio.faidx (random access to indexed FASTA files).
+
+See also the doctests in faidx.py which are called via run_tests.py
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+from io import BytesIO
+
+from Bio import BiopythonWarning
+from Bio._py3k import StringIO
+from Bio import SeqIO
+from Bio import bgzf
+from Bio import faidx
+
+
+class FaidxTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp(prefix="biopython_faidx_")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_fasta(self, records, width, compress=False, line_end="\n"):
+        filename = os.path.join(self.temp_dir, "example.fasta")
+        lines = []
+        for name, seq in records:
+            lines.append(">%s some description" % name)
+            lines.extend(seq[i:i + width] for i in range(0, len(seq), width))
+        data = (line_end.join(lines) + line_end).encode("ascii")
+        if compress:
+            filename += ".gz"
+            handle = bgzf.BgzfWriter(filename, "wb")
+            # Several small blocks, so regions span block boundaries
+            for i in range(0, len(data), 1000):
+                handle.write(data[i:i + 1000])
+                handle.flush()
+        else:
+            handle = open(filename, "wb")
+            handle.write(data)
+        handle.close()
+        return filename
+
+    def example_records(self):
+        bases = "ACGTTGCAAGCTTCGA"
+        return [("alpha", (bases * 400)[:6397]),
+                ("beta", (bases * 3)[:17]),
+                ("gamma", ""),
+                ("delta", (bases[::-1] * 20)[:160])]
+
+    def check_regions(self, fasta, records):
+        self.assertEqual(list(fasta), [name for name, seq in records])
+        for name, seq in records:
+            lazy = fasta[name]
+            self.assertEqual(len(lazy), len(seq))
+            self.assertEqual(str(lazy), seq)
+            for start, end in [(0, 1), (0, 60), (59, 61), (3, 3), (5, 1),
+                               (len(seq) - 7, len(seq) + 10), (-20, -3),
+                               (100, 3000), (0, None)]:
+                self.assertEqual(str(lazy[start:end]), seq[start:end])
+            self.assertEqual(str(lazy[::7]), seq[::7])
+            self.assertEqual(str(lazy[50:3:-3]), seq[50:3:-3])
+            self.assertEqual(str(lazy[::-1]), seq[::-1])
+            if seq:
+                self.assertEqual(lazy[-1], seq[-1])
+                self.assertEqual(lazy[len(seq) // 2], seq[len(seq) // 2])
+            self.assertRaises(IndexError, lambda: lazy[len(seq)])
+            self.assertEqual(str(fasta.fetch(name, 5, 70)), seq[5:70])
+
+    def test_genbank_fna(self):
+        filename = "GenBank/NC_005816.fna"
+        record = SeqIO.read(filename, "fasta")
+        with faidx.IndexedFasta(filename, write_index=False) as fasta:
+            self.assertEqual(list(fasta.keys()), [record.id])
+            self.assertTrue(record.id in fasta)
+            self.assertFalse("missing" in fasta)
+            self.assertEqual(fasta.get("missing"), None)
+            seq = fasta[record.id]
+            self.assertEqual(str(seq), str(record.seq))
+            self.assertEqual(str(seq[1000:2345]), str(record.seq[1000:2345]))
+            entry, = fasta.entries()
+            self.assertEqual(entry.length, len(record))
+            self.assertEqual((entry.line_bases, entry.line_width), (70, 71))
+
+    def test_plain(self):
+        records = self.example_records()
+        filename = self.write_fasta(records, 60)
+        with faidx.IndexedFasta(filename) as fasta:
+            self.check_regions(fasta, records)
+        # Index was saved, in samtools format
+        with open(filename + ".fai") as handle:
+            lines = handle.read().splitlines()
+        self.assertEqual(lines[0], "alpha\t6397\t24\t60\t61")
+        self.assertEqual(lines[1], "beta\t17\t6551\t17\t18")
+        self.assertEqual(len(lines), 4)
+        # and is used when opening the file again
+        with faidx.IndexedFasta(filename) as fasta:
+            self.check_regions(fasta, records)
+
+    def test_windows_line_endings(self):
+        records = self.example_records()
+        filename = self.write_fasta(records, 50, line_end="\r\n")
+        with faidx.IndexedFasta(filename, write_index=False) as fasta:
+            self.assertEqual(fasta.entries()[0][3:], (50, 52))
+            self.check_regions(fasta, records)
+
+    def test_bgzf(self):
+        records = self.example_records()
+        filename = self.write_fasta(records, 60, compress=True)
+        with faidx.IndexedFasta(filename) as fasta:
+            self.check_regions(fasta, records)
+        self.assertTrue(os.path.isfile(filename + ".gzi"))
+        # Offsets in the .fai index refer to the decompressed data
+        plain = self.write_fasta(records, 60)
+        with open(filename + ".fai") as bgzf_fai:
+            with faidx.IndexedFasta(plain, write_index=False) as fasta:
+                self.assertEqual(faidx.read_index(bgzf_fai), fasta.entries())
+        with faidx.IndexedFasta(filename) as fasta:
+            self.check_regions(fasta, records)
+
+    def test_gzi_round_trip(self):
+        records = self.example_records()
+        filename = self.write_fasta(records, 60, compress=True)
+        with open(filename, "rb") as handle:
+            blocks = faidx.build_gzi(handle)
+        self.assertTrue(len(blocks) > 5)
+        self.assertEqual(blocks[0][1], 1000)
+        handle = BytesIO()
+        faidx.write_gzi(blocks, handle)
+        self.assertEqual(len(handle.getvalue()), 8 + 16 * len(blocks))
+        handle.seek(0)
+        self.assertEqual(faidx.read_gzi(handle), blocks)
+
+    def test_index_round_trip(self):
+        entries = [faidx.FaidxEntry("a", 10, 3, 4, 5),
+                   faidx.FaidxEntry("b", 0, 20, 0, 0)]
+        handle = StringIO()
+        faidx.write_index(entries, handle)
+        handle.seek(0)
+        self.assertEqual(faidx.read_index(handle), entries)
+
+    def test_bad_line_lengths(self):
+        handle = BytesIO(b">a\nACGT\nACG\nACGT\n")
+        self.assertRaises(ValueError, faidx.build_index, handle)
+        handle = BytesIO(b">a\nACGT\nACGTA\n")
+        self.assertRaises(ValueError, faidx.build_index, handle)
+        handle = BytesIO(b">a\nACGT\n\nACGT\n")
+        self.assertRaises(ValueError, faidx.build_index, handle)
+        handle = BytesIO(b">a\nACGT\n>a\nACGT\n")
+        self.assertRaises(ValueError, faidx.build_index, handle)
+        # Shorter last line, missing final new line and blank lines are fine
+        handle = BytesIO(b">a\nACGT\nAC\n\n>b x\nACGT\nACGT")
+        self.assertEqual(faidx.build_index(handle),
+                         [faidx.FaidxEntry("a", 6, 3, 4, 5),
+                          faidx.FaidxEntry("b", 8, 17, 4, 5)])
+
+    def test_unwritable_index(self):
+        records = self.example_records()
+        filename = self.write_fasta(records, 60)
+        index_filename = os.path.join(self.temp_dir, "missing", "example.fai")
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            with faidx.IndexedFasta(filename, index_filename=index_filename) as fasta:
+                self.assertEqual(str(fasta["beta"]), records[1][1])
+        self.assertEqual([w.category for w in caught], [BiopythonWarning])
+
+    def test_stale_index(self):
+        records = self.example_records()
+        filename = self.write_fasta(records, 60)
+        faidx.IndexedFasta(filename).close()
+        self.write_fasta(records, 40)
+        with faidx.IndexedFasta(filename) as fasta:
+            self.assertRaises(ValueError, str, fasta["alpha"])
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
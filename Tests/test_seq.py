@@ -175,6 +175,130 @@ class TestSeq(unittest.TestCase):
             Seq.Seq("ATC-CCA").ungap()
 
 
+class TestSeqBytes(unittest.TestCase):
+    def setUp(self):
+        self.data = bytearray(b"TCAAAAGGATGCATCATG")
+        self.s = Seq.Seq(self.data, IUPAC.unambiguous_dna)
+
+    def test_as_string(self):
+        self.assertEqual("TCAAAAGGATGCATCATG", str(self.s))
+        self.assertEqual(b"TCAAAAGGATGCATCATG", self.s.__bytes__())
+        self.assertEqual(Seq.Seq("TCAAAAGGATGCATCATG"), self.s)
+        self.assertEqual("Seq('TCAAAAGGATGCATCATG', IUPACUnambiguousDNA())", repr(self.s))
+
+    def test_indexing(self):
+        self.assertEqual("T", self.s[0])
+        self.assertEqual("G", self.s[-1])
+        self.assertEqual(18, len(self.s))
+
+    def test_slicing_shares_buffer(self):
+        sub = self.s[2:6]
+        self.assertEqual("AAAA", str(sub))
+        self.assertEqual("GATCTGAAC", str(self.s[::-2]))
+        self.data[2] = ord("G")
+        self.assertEqual("GAAA", str(sub))
+
+    def test_complement(self):
+        for data in ["TCAAAAGGATGCATCATG", "acgtRYKMNbdhv", "ACGU"]:
+            s = Seq.Seq(data)
+            b = Seq.Seq(data.encode("ascii"))
+            self.assertEqual(str(s.complement()), str(b.complement()))
+            self.assertEqual(str(s.reverse_complement()), str(b.reverse_complement()))
+            self.assertTrue(b.complement()._has_buffer())
+        self.assertRaises(ValueError, Seq.Seq(b"ACGTU").complement)
+
+    def test_methods(self):
+        self.assertEqual("tcaaaaggatgcatcatg", str(self.s.lower()))
+        self.assertEqual("UCAAAAGGAUGCAUCAUG", str(self.s.transcribe()))
+        self.assertEqual("TCAAAAGGATGCATCATG",
+                         str(self.s.transcribe().back_transcribe()))
+        self.assertEqual("SKGCIM", str(self.s.translate()))
+        self.assertEqual(1, self.s.find("CAA"))
+        self.assertEqual("TCAAAAGGATGCATCATGAA", str(self.s + Seq.Seq(b"AA")))
+
+    def test_copy(self):
+        s = copy.deepcopy(self.s[2:6])
+        self.data[2] = ord("G")
+        self.assertEqual("AAAA", str(s))
+
+    def test_bad_data(self):
+        self.assertRaises(TypeError, Seq.Seq, 5)
+        self.assertRaises(TypeError, Seq.Seq, array.array("i", [1, 2]))
+
+    def test_string_methods(self):
+        """String methods of byte buffers searched in small blocks."""
+        block_size = Seq._BLOCK_SIZE
+        Seq._BLOCK_SIZE = 4
+        try:
+            text = "AAAATGATAAAGATAGAAAAATATATA-CCGA--"
+            b = Seq.Seq(text.encode("ascii"))
+            positions = [0, 3, 20, 34, 40, -1, -5, -40]
+            for sub in ["A", "AA", "AAA", "ATA", "GATA", "ATATA", "-", "CCGA--",
+                        "X", text, text + "A"]:
+                self.assertEqual(sub in text, sub in b)
+                self.assertEqual(text.split(sub), [str(x) for x in b.split(sub)])
+                for maxsplit in [0, 1, 2]:
+                    self.assertEqual(text.split(sub, maxsplit),
+                                     [str(x) for x in b.split(sub, maxsplit)])
+                    self.assertEqual(text.rsplit(sub, maxsplit),
+                                     [str(x) for x in b.rsplit(sub, maxsplit)])
+                self.assertEqual(text.rsplit(sub), [str(x) for x in b.rsplit(sub)])
+                self.assertEqual(text.strip(sub), str(b.strip(sub)))
+                self.assertEqual(text.lstrip(sub), str(b.lstrip(sub)))
+                self.assertEqual(text.rstrip(sub), str(b.rstrip(sub)))
+                for start in positions:
+                    for end in positions + [sys.maxsize]:
+                        args = (sub, start, end)
+                        self.assertEqual(text.count(*args), b.count(*args), args)
+                        self.assertEqual(Seq.Seq(text).count_overlap(*args),
+                                         b.count_overlap(*args), args)
+                        self.assertEqual(text.find(*args), b.find(*args), args)
+                        self.assertEqual(text.rfind(*args), b.rfind(*args), args)
+                        self.assertEqual(text.startswith(*args), b.startswith(*args), args)
+                        self.assertEqual(text.endswith(*args), b.endswith(*args), args)
+            self.assertTrue(b.startswith(("X", "AAAA")))
+            self.assertTrue(b.endswith(("X", "A--")))
+            for other in [text, text[:-1], text + "A", text[:10] + "C" + text[11:], "", "B"]:
+                for value in [other, Seq.Seq(other), Seq.Seq(other.encode("ascii"))]:
+                    self.assertEqual(text == other, b == value)
+                    self.assertEqual(text != other, b != value)
+                    self.assertEqual(text < other, b < value)
+                    self.assertEqual(text <= other, b <= value)
+            self.assertNotEqual(b, Seq.UnknownSeq(len(text)))
+        finally:
+            Seq._BLOCK_SIZE = block_size
+
+    @unittest.skipIf(sys.version_info < (3, 4), "requires tracemalloc")
+    def test_no_copy(self):
+        """Searching or comparing a byte buffer does not copy it all."""
+        import tracemalloc
+        size = 10 * Seq._BLOCK_SIZE
+        s = Seq.Seq(b"ACGT" * (size // 4))
+        other = Seq.Seq(b"ACGT" * (size // 4))
+        text = "ACGT" * (size // 4)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", BiopythonWarning)
+            hash(s)
+            tracemalloc.start()
+            try:
+                self.assertEqual(size // 4, s.count("A"))
+                self.assertEqual(0, s.count_overlap("TT"))
+                self.assertEqual(-1, s.find("TT"))
+                self.assertEqual(-1, s.rfind("TT"))
+                self.assertNotIn("AA", s)
+                self.assertTrue(s.endswith("GT"))
+                self.assertEqual(s, other)
+                self.assertEqual(s, text)
+                self.assertFalse(s < other)
+                self.assertEqual(hash(text), hash(s))
+                self.assertEqual(len(s) - 1, len(s.strip("A")))
+                self.assertEqual(2, len(s.split("GTA", 1)))
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        self.assertLess(peak, size // 2)
+
+
 class TestSeqStringMethods(unittest.TestCase):
     def setUp(self):
         self.s = Seq.Seq("TCAAAAGGATGCATCATG", IUPAC.unambiguous_dna)
@@ -1292,6 +1416,30 @@ class TestTranslating(unittest.TestCase):
             self.assertTrue(message.startswith("This table contains"))
             self.assertTrue(message.endswith("be translated as amino acid."))
 
+    def test_translation_with_invalid_codon_after_stop(self):
+        seq = "ATGTAGTA?"
+        self.assertEqual("M", Seq.translate(seq, to_stop=True))
+        with self.assertRaises(TranslationError):
+            Seq.translate(seq)
+        self.assertEqual("M*-K", Seq.translate("ATGTAG---AAA", gap="-"))
+
+    def test_translate_many(self):
+        seqs = ["ATGGCCATTGTA", Seq.Seq("ATGTTTTGAGGG"), Seq.MutableSeq("atgNNN")]
+        self.assertEqual(["MAIV", "MF*G", "MX"], list(Seq.translate_many(seqs)))
+        self.assertEqual(["MAIV", "MF", "MX"],
+                         list(Seq.translate_many(seqs, to_stop=True)))
+        self.assertEqual(["MAIV", "MFWG", "MX"],
+                         list(Seq.translate_many(seqs, table=2)))
+
+    def test_translate_six_frames(self):
+        seq = "AUGGCCAUUGUAAUGGGCCGCUGAA"
+        rc = Seq.reverse_complement(seq)
+        expected = [Seq.translate(s[i:i + 3 * ((len(s) - i) // 3)])
+                    for s in (seq, rc) for i in range(3)]
+        self.assertEqual(expected, Seq.translate_six_frames(seq))
+        self.assertEqual(expected, Seq.translate_six_frames(Seq.Seq(seq)))
+        self.assertEqual(["", "", "", "", "", ""], Seq.translate_six_frames("A"))
+
 
 class TestStopCodons(unittest.TestCase):
     def setUp(self):